@@ -0,0 +1,125 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+# // Imports
+import time
+import random
+
+from PythonToSW import (
+    Call,
+    CallQueue
+)
+
+# // Main
+# Compares the old list-based pending calls (linear `get_call` + `list.remove`) against `CallQueue`.
+# For each queue depth, this measures:
+#   - handling calls from random positions in the queue (lookup + removal)
+#   - fetching the calls the addon hasn't received yet (the last 100 calls)
+# Run with `src` on `PYTHONPATH`: python benchmarks/bench_call_queue.py
+
+HANDLED = 200
+UNACKNOWLEDGED = 100
+
+class ListQueue():
+    """
+    The previous list-based approach, kept here for comparison.
+    """
+    
+    def __init__(self):
+        self.calls: list[Call] = []
+        self.sequence = 0
+    
+    def create(self, path: str, arguments: list) -> Call:
+        self.sequence += 1
+        call = Call(id = self.sequence, path = path, arguments = arguments)
+        self.calls.append(call)
+        return call
+    
+    def handle(self, call_id: int):
+        for call in self.calls:
+            if call.id == call_id:
+                self.calls.remove(call)
+                return
+    
+    def after(self, call_id: int) -> list[Call]:
+        return [call for call in self.calls if call.id > call_id]
+
+class RegistryQueue():
+    """
+    Adapts `CallQueue` to the same interface.
+    """
+    
+    def __init__(self):
+        self.calls = CallQueue()
+    
+    def create(self, path: str, arguments: list) -> Call:
+        return self.calls.create(path, arguments)
+    
+    def handle(self, call_id: int):
+        self.calls.pop(call_id)
+    
+    def after(self, call_id: int) -> list[Call]:
+        return self.calls.after(call_id)
+
+def bench(queue_class: type, depth: int) -> tuple[float, float]:
+    """
+    Benchmarks a queue implementation at a queue depth.
+    
+    Args:
+        queue_class (type): The queue implementation.
+        depth (int): The amount of calls to queue.
+    
+    Returns:
+        tuple[float, float]: Microseconds per handled call, and microseconds per unacknowledged-call fetch.
+    """
+    
+    queue = queue_class()
+    
+    for _ in range(depth):
+        queue.create("server.announce", ["a", "b"])
+    
+    random.seed(depth)
+    to_handle = random.sample(range(1, depth - UNACKNOWLEDGED), HANDLED)
+    
+    start = time.perf_counter()
+    
+    for call_id in to_handle:
+        queue.handle(call_id)
+    
+    handle_time = (time.perf_counter() - start) / HANDLED * 1e6
+    
+    start = time.perf_counter()
+    
+    for _ in range(100):
+        queue.after(depth - UNACKNOWLEDGED)
+    
+    after_time = (time.perf_counter() - start) / 100 * 1e6
+    
+    return handle_time, after_time
+
+if __name__ == "__main__":
+    print(f"{'depth':>8} | {'impl':>10} | {'us/handled call':>16} | {'us/fetch':>10}")
+    
+    for depth in (10_000, 50_000, 100_000):
+        for name, queue_class in (("list", ListQueue), ("CallQueue", RegistryQueue)):
+            handle_time, after_time = bench(queue_class, depth)
+            print(f"{depth:>8} | {name:>10} | {handle_time:>16.2f} | {after_time:>10.2f}")
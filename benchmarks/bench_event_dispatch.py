@@ -0,0 +1,99 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+# // Imports
+import time
+import threading
+
+from PythonToSW import (
+    Event,
+    Dispatcher
+)
+
+# // Main
+# Compares the old thread-per-fire `Event.fire_threaded` against firing on a `Dispatcher`.
+# For each workload, this measures:
+#   - the time spent in `fire_threaded` by the firing thread (what `on_tick` and callback dispatch pay)
+#   - the time until every fired callback has finished
+#   - the most threads alive at once, on top of the ones alive before
+# Run with `src` on `PYTHONPATH`: python benchmarks/bench_event_dispatch.py
+
+class ThreadPerFireEvent(Event):
+    """
+    The previous approach of starting a thread for every fire, kept here for comparison.
+    """
+    
+    def fire_threaded(self, *args, **kwargs):
+        thread = threading.Thread(target = self.fire, args = args, kwargs = kwargs, daemon = True)
+        thread.start()
+
+def bench(event: Event, fires: int, work_seconds: float) -> tuple[float, float, int]:
+    """
+    Benchmarks firing an event.
+    
+    Args:
+        event (Event): The event to fire.
+        fires (int): How many times to fire it.
+        work_seconds (float): How long each callback takes.
+    
+    Returns:
+        tuple[float, float, int]: Microseconds spent firing per fire, milliseconds until every callback finished, and the peak amount of threads started.
+    """
+    
+    done = threading.Semaphore(0)
+    baseline = threading.active_count()
+    peak = baseline
+    
+    def callback():
+        if work_seconds > 0:
+            time.sleep(work_seconds)
+            
+        done.release()
+    
+    event += callback
+    
+    fire_time = 0
+    start = time.perf_counter()
+    
+    for _ in range(fires):
+        fire_start = time.perf_counter()
+        event.fire_threaded()
+        fire_time += time.perf_counter() - fire_start
+        
+        peak = max(peak, threading.active_count())
+    
+    for _ in range(fires):
+        done.acquire()
+    
+    total_time = time.perf_counter() - start
+    event -= callback
+    
+    return fire_time / fires * 1e6, total_time * 1e3, peak - baseline
+
+if __name__ == "__main__":
+    print(f"{'fires':>6} | {'work':>6} | {'impl':>14} | {'us/fire':>8} | {'ms total':>9} | {'peak threads':>12}")
+    
+    for fires, work_seconds in ((20_000, 0), (2_000, 0.001), (500, 0.02)):
+        for name, event in (("thread/fire", ThreadPerFireEvent()), ("Dispatcher(32)", Event(Dispatcher(32)))):
+            fire_time, total_time, peak = bench(event, fires, work_seconds)
+            print(f"{fires:>6} | {work_seconds * 1000:>4.0f}ms | {name:>14} | {fire_time:>8.2f} | {total_time:>9.1f} | {peak:>12}")
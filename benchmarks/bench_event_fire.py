@@ -0,0 +1,130 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+# // Imports
+import time
+import asyncio
+import inspect
+
+from PythonToSW import Event
+
+# // Main
+# Compares the old `Event`, which checks every callback with `inspect.iscoroutinefunction` on every fire
+# and awaits async callbacks one after another, against the current one.
+# This measures:
+#   - firing an event with only sync callbacks (like `on_tick` with sync handlers)
+#   - firing an event with only sync callbacks asynchronously (what the addon also does for every fire)
+#   - firing an event with async callbacks that each wait 1ms, one after another and concurrently
+# Run with `src` on `PYTHONPATH`: python benchmarks/bench_event_fire.py
+
+FIRES = 20_000
+ASYNC_FIRES = 50
+
+class ReflectingEvent(Event):
+    """
+    The previous approach of checking every callback on every fire, kept here for comparison.
+    """
+    
+    def fire(self, *args, **kwargs):
+        for callback in self._callbacks:
+            if not inspect.iscoroutinefunction(callback):
+                callback(*args, **kwargs)
+    
+    async def fire_async(self, *args, **kwargs):
+        for callback in self._callbacks:
+            if inspect.iscoroutinefunction(callback):
+                await callback(*args, **kwargs)
+
+def bench_fire(event: Event, handlers: int) -> tuple[float, float]:
+    """
+    Benchmarks firing an event with sync callbacks.
+    
+    Args:
+        event (Event): The event to fire.
+        handlers (int): How many sync callbacks to subscribe.
+    
+    Returns:
+        tuple[float, float]: Microseconds per `fire`, and microseconds per `fire_async`.
+    """
+    
+    for _ in range(handlers):
+        event += lambda tick: None
+    
+    start = time.perf_counter()
+    
+    for tick in range(FIRES):
+        event.fire(tick)
+        
+    fire_time = (time.perf_counter() - start) / FIRES * 1e6
+    
+    async def fire_async():
+        for tick in range(FIRES):
+            await event.fire_async(tick)
+    
+    start = time.perf_counter()
+    asyncio.run(fire_async())
+    fire_async_time = (time.perf_counter() - start) / FIRES * 1e6
+    
+    return fire_time, fire_async_time
+
+def bench_async(event: Event, handlers: int) -> float:
+    """
+    Benchmarks firing an event with async callbacks that each wait 1ms.
+    
+    Args:
+        event (Event): The event to fire.
+        handlers (int): How many async callbacks to subscribe.
+    
+    Returns:
+        float: Milliseconds per `fire_async`.
+    """
+    
+    for _ in range(handlers):
+        async def callback(tick):
+            await asyncio.sleep(0.001)
+            
+        event += callback
+        
+    async def fire_async():
+        for tick in range(ASYNC_FIRES):
+            await event.fire_async(tick)
+    
+    start = time.perf_counter()
+    asyncio.run(fire_async())
+    
+    return (time.perf_counter() - start) / ASYNC_FIRES * 1e3
+
+if __name__ == "__main__":
+    print(f"{'handlers':>8} | {'impl':>12} | {'us/fire':>8} | {'us/fire_async':>13}")
+    
+    for handlers in (1, 12, 48):
+        for name, event_class in (("reflecting", ReflectingEvent), ("partitioned", Event)):
+            fire_time, fire_async_time = bench_fire(event_class(), handlers)
+            print(f"{handlers:>8} | {name:>12} | {fire_time:>8.2f} | {fire_async_time:>13.2f}")
+    
+    print()
+    print(f"{'handlers':>8} | {'impl':>12} | {'ms/fire_async (1ms handlers)':>28}")
+    
+    for handlers in (1, 12, 48):
+        for name, event in (("sequential", Event()), ("concurrent", Event(concurrent = True))):
+            print(f"{handlers:>8} | {name:>12} | {bench_async(event, handlers):>28.2f}")
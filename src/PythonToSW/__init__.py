@@ -33,13 +33,23 @@ from .libs import (
 )
 
 from .libs.persistence import Persistence
-from .libs.event import Event
+from .libs.event import (
+    Event,
+    Dispatcher
+)
+from .libs.metrics import Metrics
 
 from . import exceptions
 
 from .values import *
 from .enums import *
 from .models import *
+from .bulk import *
+from .calls import *
+from .cache import *
+from .registry import *
+from .fragments import *
+from .polling import *
 
 from .addon import *
 
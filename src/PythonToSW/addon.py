@@ -25,14 +25,22 @@ from __future__ import annotations
 import os
 import json
 import threading
+import asyncio
+import inspect
 import uvicorn
 import time
 from typing import Any, Callable
 from logging import WARNING
 from dataclasses import dataclass
-from concurrent.futures import TimeoutError
+from contextlib import asynccontextmanager
+from concurrent.futures import (
+    Future,
+    TimeoutError
+)
 import re
 
+from pydantic import ValidationError
+
 from fastapi import (
     FastAPI,
     Query,
@@ -52,19 +60,60 @@ from . import io
 from . import http
 from . import xml
 from . import logger
-from . import Event
+from . import (
+    Event,
+    Dispatcher
+)
 from . import Persistence
+from . import Metrics
 
 from . import (
     CallEnum,
-    CallbackEnum
+    CallbackEnum,
+    CallbackOverflowEnum,
+    CallPriorityEnum,
+    BuiltinEnum
 )
 
 from . import (
+    PROTOCOL_VERSION,
     Call,
+    HandledCall,
+    TriggeredCallback,
+    CallbackPolicy,
+    CallbackFilter,
+    Subscriptions,
+    Watch,
+    Watches,
+    UpdateResponse,
+    Handshake,
     Token
 )
 
+from . import get_builtin_path
+from .models import _from_lua_array
+from .calls import (
+    _set_result,
+    _set_exception
+)
+
+from . import (
+    CallQueue,
+    CallBatch,
+    CallProgram
+)
+
+from . import (
+    CacheRule,
+    DEFAULT_CACHE_RULES,
+    CallCache
+)
+
+from . import EntityRegistry
+
+from . import FragmentAssembler
+from . import PollScheduler
+
 from . import PACKAGE_PATH
 
 # // Main
@@ -90,6 +139,19 @@ class AddonConstants():
     TICK_INTERVAL: int = 2
     OK_TIME_THRESHOLD_SECONDS: float = 0.5
     CALL_TIMEOUT_SECONDS: int = 20
+    MAX_REQUEST_BYTES: int = 4000
+    LONG_POLL_TIMEOUT_SECONDS: float = 0.25
+    MIN_POLL_INTERVAL: int|None = None
+    MAX_POLL_INTERVAL: int = 32
+    MAX_IN_FLIGHT: int = 2
+    MAX_CALLBACK_BACKLOG: int = 2000
+    CALLBACK_OVERFLOW: CallbackOverflowEnum = CallbackOverflowEnum.DROP_OLDEST
+    MAX_CALLBACKS_PER_UPDATE: int = 64
+    CALL_BUDGET_MILLISECONDS: float = 4
+    MAX_CALLS_PER_TICK: int = 200
+    GAME_TPS: int = 60
+    EVENT_WORKERS: int = 32
+    CONCURRENT_ASYNC_CALLBACKS: bool = False
 
 class Addon():
     """
@@ -106,6 +168,7 @@ class Addon():
         addons_path: str = r"%appdata%/Stormworks/data/missions",
         uvicorn_log_level: int = WARNING,
         force_new_token: bool = False,
+        long_poll: bool = False,
         constants: AddonConstants = None
     ):
         r"""
@@ -119,6 +182,7 @@ class Addon():
             addons_path (str, optional): The path to plop addons in for Stormworks to recognise. Defaults to "\%appdata\%/Stormworks/data/missions".
             uvicorn_log_level (int, optional): The log level for Uvicorn. Defaults to `logging.WARNING`.
             force_new_token (bool, optional): Whether or not to force a new token every time the addon starts. Defaults to False.
+            long_poll (bool, optional): Whether or not to hold update requests from the addon open until a call is made (or `LONG_POLL_TIMEOUT_SECONDS` passes), so calls are sent straight away instead of on the next update. Defaults to False.
             constants (AddonConstants, optional): Constants to be used by the addon.
         """
         
@@ -132,21 +196,47 @@ class Addon():
             raise PTSConfigException(f"Addons path at {self.addons_path} does not exist.")
         
         self.copy_from = self._get_addon_copy_path(copy_from)
+        self.long_poll = long_poll
         self.started = False
         self.connected = False
         self.last_ok = 0
+        self.loop: asyncio.AbstractEventLoop|None = None
+        self._connection: Future = Future()
         self.constants = constants or AddonConstants()
         
         self.persistence = Persistence(os.path.join(self.path, self.name) + ".json")
         
         self.force_new_token = force_new_token
         self.token = self._get_token()
+        self.session = http.generate_short_id()
         
-        self.calls: list[Call] = []
+        self.metrics = Metrics()
+        self.dispatcher = Dispatcher(self.constants.EVENT_WORKERS)
+        self.calls = CallQueue(self.constants.CALL_TIMEOUT_SECONDS, self.metrics)
+        self.fragments = FragmentAssembler()
+        self.poll_scheduler = PollScheduler(self._get_min_poll_interval(), self.constants.MAX_POLL_INTERVAL)
+        self.calls.on_add.subscribe(self._on_calls_added)
+        
+        self._long_poll_waiter: asyncio.Future|None = None
+        self._held_updates = 0
         self.callbacks: dict[CallbackEnum, Event] = {}
+        self._callback_connections: dict[CallbackEnum, list[tuple[Callable, Callable, CallbackFilter|None]]] = {}
+        self.callback_policies: dict[CallbackEnum, CallbackPolicy] = {}
+        self.subscriptions_revision = 0
+        self.game_tick: int|None = None
+        self.cache: CallCache|None = None
+        self.registry: EntityRegistry|None = None
+        self.watches: dict[int, Watch] = {}
+        self.watches_revision = 0
+        self._watch_id = 0
         self.injected_lua_code: list[str] = []
+        
+        # function paths and callback names the addon refers to by index in the compact protocol
+        self.interned_paths: list[str] = [f"server.{function.value}" for function in CallEnum] + [get_builtin_path(builtin) for builtin in BuiltinEnum]
+        self.interned_callbacks: list[str] = [callback.value for callback in CallbackEnum]
+        self._path_ids: dict[str, int] = {path: index for index, path in enumerate(self.interned_paths, start = 1)}
 
-        self.app = FastAPI(title = self.name, docs_url = None, redoc_url = None, openapi_url = None)
+        self.app = FastAPI(title = self.name, docs_url = None, redoc_url = None, openapi_url = None, lifespan = self._lifespan)
     
         self.router = APIRouter(dependencies = [
             Depends(self._token_dependency),
@@ -155,9 +245,9 @@ class Addon():
     
         self.uvicorn_log_level = uvicorn_log_level
         
-        self.on_start = Event()
-        self.on_stop = Event()
-        self.on_tick = Event()
+        self.on_start = Event(self.dispatcher, self.constants.CONCURRENT_ASYNC_CALLBACKS)
+        self.on_stop = Event(self.dispatcher, self.constants.CONCURRENT_ASYNC_CALLBACKS)
+        self.on_tick = Event(self.dispatcher, self.constants.CONCURRENT_ASYNC_CALLBACKS)
         
     def _generate_token(self) -> str:
         """
@@ -300,9 +390,33 @@ class Addon():
         return (
             content.replace("__REQUEST_TOKEN", self.token)
             .replace("__PORT", str(self.port))
-            .replace("__TICK_INTERVAL", str(self.constants.TICK_INTERVAL))
+            .replace("__MIN_POLL_INTERVAL", str(self.poll_scheduler.min_interval))
+            .replace("__MAX_POLL_INTERVAL", str(self.poll_scheduler.max_interval))
+            .replace("__MAX_IN_FLIGHT", str(max(1, self.constants.MAX_IN_FLIGHT)))
+            .replace("__MAX_CALLBACK_BACKLOG", str(max(1, self.constants.MAX_CALLBACK_BACKLOG)))
+            .replace("__MAX_CALLBACKS_PER_UPDATE", str(max(1, self.constants.MAX_CALLBACKS_PER_UPDATE)))
+            .replace("__CALLBACK_OVERFLOW", json.dumps(self.constants.CALLBACK_OVERFLOW.value))
+            .replace("__CALL_BUDGET_MILLISECONDS", str(self.constants.CALL_BUDGET_MILLISECONDS))
+            .replace("__MAX_CALLS_PER_TICK", str(max(1, self.constants.MAX_CALLS_PER_TICK)))
+            .replace("__MAX_REQUEST_BYTES", str(self.constants.MAX_REQUEST_BYTES))
+            .replace("__LONG_POLL_TIMEOUT", str(self.constants.LONG_POLL_TIMEOUT_SECONDS if self.long_poll else 0))
+            .replace("__SUBSCRIPTIONS", "[==[" + json.dumps(self._get_subscriptions().encode()) + "]==]")
         )
         
+    def _get_min_poll_interval(self) -> int:
+        """
+        Returns the interval the addon polls at while there is work, in ticks.
+        Defaults to `TICK_INTERVAL` unless `MIN_POLL_INTERVAL` is set.
+        
+        Returns:
+            int: The interval in ticks.
+        """
+        
+        if self.constants.MIN_POLL_INTERVAL is None:
+            return self.constants.TICK_INTERVAL
+        
+        return self.constants.MIN_POLL_INTERVAL
+        
     def _get_addon_copy_path(self, name_or_path: str = None) -> str|None:
         """
         Gets the path to copy files from, if any.
@@ -450,6 +564,20 @@ class Addon():
         
         self._update_last_ok()
     
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """
+        The FastAPI lifespan for the addon. Grabs the event loop the server runs on
+        so async callbacks and async calls can be scheduled onto it.
+        
+        Args:
+            app (FastAPI): The FastAPI app.
+        """
+        
+        self.loop = asyncio.get_running_loop()
+        yield
+        self.loop = None
+    
     def _create_endpoints(self):
         """
         Creates the FastAPI endpoints for the addon.
@@ -466,47 +594,154 @@ class Addon():
             
             return "ok"
         
+        @self.router.get(
+            "/handshake",
+            response_model = Handshake
+        )
+        def handshake(version: int = 1) -> Handshake:
+            """
+            Agrees on a protocol version with the addon, and sends the tables
+            of interned function paths and callback names used by the compact protocol.
+            """
+            
+            return Handshake(
+                version = min(version, PROTOCOL_VERSION),
+                session = self.session,
+                paths = self.interned_paths,
+                callbacks = self.interned_callbacks
+            )
+        
         @self.router.get(
             "/update",
-            response_model = list[Call]
+            response_model = None
         )
-        def update(handled_calls: str, triggered_callbacks: str) -> list[Call]:
+        async def update(
+            handled_calls: str,
+            triggered_callbacks: str,
+            ack: int = 0,
+            session: str = "",
+            v: int = 1,
+            transfer: int = 0,
+            fragment: int = 0,
+            fragments: int = 0,
+            data: str = "",
+            wait: int = 0,
+            rtt: float = 0,
+            sub: int = -1,
+            dropped: str = "{}",
+            budget: str = "[]",
+            tick: int = -1,
+            watch: int = -1,
+            samples: str = "[]"
+        ) -> dict:
             """
-            Receives an update from the addon, and returns
-            a list of all unprocessed calls for the addon.
+            Receives an update from the addon, and returns all calls
+            the addon hasn't received yet (calls above the `ack` watermark).
+            
+            `v` is the protocol version agreed on at handshake. The addon doesn't send updates
+            until a handshake succeeds, so older versions come from outdated scripts and are rejected.
+            
+            Handled calls and triggered callbacks too large to fit in one URL are sent
+            as a transfer of `fragments` fragments, one per update (`transfer`, `fragment`, `data`).
+            
+            If `wait` is set and long polling is enabled, the request is held open until
+            there are calls to send or `LONG_POLL_TIMEOUT_SECONDS` passes.
+            
+            `rtt` is the smoothed round trip time of updates measured by the addon, in milliseconds.
+            
+            `sub` is the revision of the callbacks the addon is subscribed to. If outdated, the
+            callbacks to subscribe to and their policies and filters are sent back.
+            
+            `dropped` is how many triggers of each callback the addon dropped because its backlog was full.
+            
+            `budget` is `[overruns, overrun_ms, deferred]`: how many ticks calls took longer than `CALL_BUDGET_MILLISECONDS`
+            to execute, by how many milliseconds in total, and how many ticks calls were carried over to a later tick.
+            
+            `tick` is the addon's game tick when the update was sent, which scheduled calls are executed against.
+            
+            `watch` is the revision of the watches the addon has. If outdated, the watches are sent back.
+            
+            `samples` is `[[watch_id, tick, return_values], ...]`: the latest results of watches taken since the last update.
             """
             
+            if v < PROTOCOL_VERSION:
+                raise PTSHTTPException(400, "outdated_protocol", f"Protocol version {v} is no longer supported. Try `?reload_scripts`.")
+            
+            if rtt > 0:
+                self.metrics.set("update_rtt_ms", rtt)
+                
+            if tick >= 0:
+                self.game_tick = tick
+            
             try:
-                handled_calls: list[dict] = json.loads(handled_calls)
-                triggered_callbacks: list[dict] = json.loads(triggered_callbacks)
-            except json.JSONDecodeError as exception:
+                samples = self._decode_samples(json.loads(samples))
+                handled_calls = self._decode_handled_calls(json.loads(handled_calls))
+                triggered_callbacks = self._decode_triggered_callbacks(json.loads(triggered_callbacks))
+                
+                needed_fragment = None
+                
+                if fragments > 0:
+                    needed_fragment, payload = self.fragments.add(transfer, fragment, fragments, data)
+                    
+                    if payload is not None:
+                        payload_handled_calls, payload_triggered_callbacks = json.loads(payload)
+                        handled_calls += self._decode_handled_calls(payload_handled_calls)
+                        triggered_callbacks = self._decode_triggered_callbacks(payload_triggered_callbacks) + triggered_callbacks
+                
+                # counted once everything else decoded, so an update rejected here and sent again isn't counted twice
+                self._count_dropped_callbacks(json.loads(dropped))
+                self._count_budget_overruns(json.loads(budget))
+            except (json.JSONDecodeError, ValidationError, KeyError, IndexError, TypeError, ValueError) as exception:
                 self._error(f"Failed to decode update data: {exception}")
                 raise PTSHTTPException(400, "json_error", "Failed to decode update data.")
+            
+            # the addon is acking against a previous session (we restarted), so its watermark
+            # and handled calls refer to calls that no longer exist
+            if session != self.session:
+                handled_calls = []
+                ack = 0
+                
+            for call in self.calls.acknowledge(ack):
+                self._resolve_call(call, ())
+                
+            # calls that went unanswered for too long are dropped instead of being resent forever
+            for call in self.calls.expire():
+                self._fail_call(call, PTSCallException(f"Call with ID {call.id} expired."))
 
             for handled_call in handled_calls:
-                call_id =  handled_call["ID"]
-                return_values = handled_call["ReturnValues"]
-                
-                call = self.get_call(call_id)
+                call = self.get_call(handled_call.id)
                 
                 if call is None:
+                    self.metrics.increment("handled_calls_unmatched")
                     continue
                 
-                self._handle_call(call, return_values)
+                self._handle_call(call, handled_call.return_values, handled_call.error)
             
             for triggered_callback in triggered_callbacks:
-                name = triggered_callback["Name"]
-                arguments = triggered_callback["Arguments"]
-                
                 try:
-                    name = CallbackEnum(name)
+                    name = CallbackEnum(triggered_callback.name)
                 except ValueError as exception:
-                    self._error(f"Unknown callback name of {name}")
+                    self._error(f"Unknown callback name of {triggered_callback.name}")
                     continue
                 
-                self._handle_callback(name, arguments)
+                self._handle_callback(name, triggered_callback.arguments)
+                
+            self._handle_samples(samples)
+                
+            if wait and self.long_poll:
+                await self._wait_for_calls(ack)
 
-            return self.calls
+            response = UpdateResponse(
+                session = self.session,
+                calls = self._get_unacknowledged_calls(ack),
+                cancelled = self.calls.get_cancelled(ack),
+                fragment = needed_fragment,
+                poll_interval = self.poll_scheduler.next_interval(len(self.calls), len(triggered_callbacks)),
+                subscriptions = self._get_subscriptions() if sub != self.subscriptions_revision else None,
+                watches = self._get_watches() if watch != self.watches_revision else None
+            )
+            
+            return response.encode(self._path_ids)
 
         @self.router.get(
             "/error",
@@ -522,6 +757,140 @@ class Addon():
         
         self.app.include_router(self.router)
     
+    def _count_dropped_callbacks(self, dropped: dict[str, int]|list):
+        """
+        Adds the triggers the addon dropped to the metrics.
+        
+        Args:
+            dropped (dict[str, int]|list): The callback names mapped to how many of their triggers were dropped. Empty Lua tables arrive as lists.
+        """
+        
+        if not isinstance(dropped, dict):
+            return
+        
+        for name, count in dropped.items():
+            self.metrics.increment("callbacks_dropped", int(count))
+            self.metrics.increment(f"callbacks_dropped.{name}", int(count))
+            
+            self._warn(f"In-game addon dropped {int(count)} trigger(s) of {name} because its backlog was full")
+            
+        # the registry can't tell what the dropped triggers changed, so start over
+        if self.registry is not None and any(name.value in dropped for name in self.registry.get_callbacks()):
+            self.refresh_registry()
+    
+    def _count_budget_overruns(self, budget: list):
+        """
+        Adds the call execution budget overruns reported by the addon to the metrics.
+        
+        Args:
+            budget (list): `[overruns, overrun_ms, deferred]`, or an empty list if there is nothing to report.
+        """
+        
+        if len(budget) < 3:
+            return
+        
+        overruns, overrun_ms, deferred = budget[:3]
+        
+        self.metrics.increment("call_budget_overruns", int(overruns))
+        self.metrics.increment("call_budget_overrun_ms", int(overrun_ms))
+        self.metrics.increment("call_ticks_deferred", int(deferred))
+    
+    def _on_calls_added(self, calls: list[Call]):
+        """
+        Wakes held update requests whenever calls are added, so they are sent straight away.
+        
+        Args:
+            calls (list[Call]): The added calls.
+        """
+        
+        if self._long_poll_waiter is None or self.loop is None:
+            return
+        
+        self.loop.call_soon_threadsafe(self._wake_held_updates)
+        
+    def _wake_held_updates(self):
+        """
+        Releases all held update requests. Must be called on the event loop.
+        """
+        
+        waiter = self._long_poll_waiter
+        self._long_poll_waiter = None
+        
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+    
+    async def _wait_for_calls(self, ack: int):
+        """
+        Holds an update request until there are calls above `ack`, or `LONG_POLL_TIMEOUT_SECONDS` passes.
+        
+        Args:
+            ack (int): The ID of the latest call the addon has received.
+        """
+        
+        # grab the waiter before checking for calls, so calls added in between still wake us
+        if self._long_poll_waiter is None:
+            self._long_poll_waiter = asyncio.get_running_loop().create_future()
+            
+        waiter = self._long_poll_waiter
+        
+        if len(self.calls.after(ack)) > 0:
+            return
+        
+        self._held_updates += 1
+        
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.constants.LONG_POLL_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._held_updates -= 1
+            self._update_last_ok()
+    
+    def _decode_handled_calls(self, handled_calls: list) -> list[HandledCall]:
+        """
+        Decodes handled calls sent by the addon.
+        
+        Args:
+            handled_calls (list): The encoded handled calls.
+        
+        Returns:
+            list[HandledCall]: The decoded handled calls.
+        """
+        
+        return [HandledCall.decode(data) for data in handled_calls]
+    
+    def _decode_triggered_callbacks(self, triggered_callbacks: list) -> list[TriggeredCallback]:
+        """
+        Decodes triggered callbacks sent by the addon.
+        
+        Args:
+            triggered_callbacks (list): The encoded triggered callbacks.
+        
+        Returns:
+            list[TriggeredCallback]: The decoded triggered callbacks.
+        """
+        
+        return [TriggeredCallback.decode(data, self.interned_callbacks) for data in triggered_callbacks]
+    
+    def _decode_samples(self, samples: list) -> list[tuple[int, int, tuple[Any, ...]]]:
+        """
+        Decodes samples of watches sent by the addon.
+        
+        Args:
+            samples (list): `[[watch_id, tick, return_values], ...]`. Empty Lua tables arrive as objects.
+        
+        Returns:
+            list[tuple[int, int, tuple[Any, ...]]]: The watch ID, tick and return values of each sample.
+        """
+        
+        decoded = []
+        
+        for sample in _from_lua_array(samples):
+            watch_id, tick, return_values = _from_lua_array(sample)
+            decoded.append((int(watch_id), int(tick), tuple(_from_lua_array(return_values) or [])))
+        
+        return decoded
+    
     def _on_tick(self):
         """
         Fires the `on_tick` event on a separate thread.
@@ -533,7 +902,7 @@ class Addon():
             self._update_connected()
             
             if self.connected:
-                self.on_tick.fire_threaded()
+                self._fire_event(self.on_tick)
             
             time.sleep(self._calculate_tick_dt())
             
@@ -551,7 +920,12 @@ class Addon():
         """
         
         self._info(f"{self.name} has connected.")
-        self.on_start.fire_threaded()
+        
+        # callbacks triggered while we were disconnected may have been lost
+        if self.registry is not None:
+            self.refresh_registry()
+        
+        self._fire_event(self.on_start)
         
     def _on_stop(self):
         """
@@ -559,21 +933,81 @@ class Addon():
         """
         
         self._warn(f"{self.name} has disconnected.")
-        self.on_stop.fire_threaded()
+        self._fire_event(self.on_stop)
         
     def _update_connected(self):
         """
         Checks if we're connected.
         """
         
-        connected = time.time() - self.last_ok < self.constants.OK_TIME_THRESHOLD_SECONDS
+        # the addon polls less often while idle, so give it until its next poll is due
+        threshold = self.constants.OK_TIME_THRESHOLD_SECONDS + self.poll_scheduler.interval / self.constants.MAX_TPS
+        
+        # a held update means the addon is still there, even if it hasn't sent a request in a while
+        connected = self._held_updates > 0 or time.time() - self.last_ok < threshold
         
         if not self.connected and connected:
+            # a cancelled future would fail every waiter, so replace it with one that can be resolved
+            if self._connection.cancelled():
+                self._connection = Future()
+                
+            _set_result(self._connection, None)
             self._on_start()
         elif self.connected and not connected:
+            self._connection = Future()
             self._on_stop()
             
         self.connected = connected
+        
+    def _wait_for_connection(self):
+        """
+        Blocks until the addon is connected.
+        """
+        
+        self._connection.result()
+        
+    async def _wait_for_connection_async(self):
+        """
+        Waits until the addon is connected without blocking the event loop.<br>
+        The connection future is shared by every waiter, so it is shielded from waiters that give up.
+        """
+        
+        await asyncio.shield(asyncio.wrap_future(self._connection))
+        
+    def _fire_event(self, event: Event, *args):
+        """
+        Fires an event. Non-async callbacks are fired on the addon's worker pool, while async
+        callbacks are scheduled onto the server's event loop (if it is running).
+        
+        Args:
+            event (Event): The event to fire.
+            *args: The arguments to pass to the callbacks.
+        """
+        
+        if event.has_sync_callbacks():
+            self.dispatcher.submit(event.fire, *args)
+        
+        self.metrics.set("event_queue_depth", self.dispatcher.pending)
+        self.metrics.set("event_workers", self.dispatcher.workers)
+        
+        if self.loop is None or not event.has_async_callbacks():
+            return
+        
+        future = asyncio.run_coroutine_threadsafe(event.fire_async(*args), self.loop)
+        future.add_done_callback(self._on_async_event_done)
+        
+    def _on_async_event_done(self, future: Future):
+        """
+        Logs any exception raised by async callbacks fired through `_fire_event`.
+        
+        Args:
+            future (Future): The future of the fired async callbacks.
+        """
+        
+        if future.cancelled() or future.exception() is None:
+            return
+        
+        self._error(f"An async callback raised an exception: {future.exception()!r}")
     
     def attach_lua_code(self, code: str):
         """
@@ -619,78 +1053,466 @@ class Addon():
             PTSCallbackException: If the event does not exist.
         """
         
+        # invalidate and update the registry first, so callbacks don't get outdated results
+        if self.cache is not None:
+            self.cache.on_callback(name, arguments)
+            
+        if self.registry is not None:
+            self.registry.on_callback(name, arguments)
+        
         if name not in self.callbacks:
             return
         
         try:
-            self.callbacks[name].fire_threaded(*arguments)
+            self._fire_event(self.callbacks[name], *arguments)
         except Exception as exception:
             raise PTSCallbackException(f"Something went wrong with the `{name}` event. Are your callbacks expecting the right amount of arguments?") from exception
         
-    def connect(self, name: CallbackEnum, callback: Callable):
+    def connect(self, name: CallbackEnum, callback: Callable, filter: CallbackFilter|None = None):
         """
         Connects the passed callable argument to a specific game callback.
+        The addon only sends over game callbacks that have something connected to them.
         
         Args:
             name (CallbackEnum): The in-game callback to connect to
             callback (Callable): The callback function to call when the event is fired.
+            filter (CallbackFilter|None): Only call the callback function if the arguments pass this filter. Checked in-game, so triggers no callback function wants are never sent over.
         """
         
         if name not in self.callbacks:
-            self.callbacks[name] = Event()
+            self.callbacks[name] = Event(self.dispatcher, self.constants.CONCURRENT_ASYNC_CALLBACKS)
+        
+        handler = callback if filter is None else self._filter_callback(callback, filter)
+        
+        self.callbacks[name] += handler
+        self._callback_connections.setdefault(name, []).append((callback, handler, filter))
+        self.subscriptions_revision += 1
         
-        self.callbacks[name] += callback
         self._info(f"Connected callback to game callback: {name}")
         
-    def _handle_call(self, call: Call, return_values: list[Any]):
+    def disconnect(self, name: CallbackEnum, callback: Callable):
+        """
+        Disconnects the passed callable argument from a specific game callback.
+        Once nothing is connected to the game callback, the addon stops sending it over.
+        
+        Args:
+            name (CallbackEnum): The in-game callback to disconnect from
+            callback (Callable): The callback function to disconnect.
+            
+        Raises:
+            PTSCallbackException: If the callback isn't connected to the game callback.
+        """
+        
+        connections = self._callback_connections.get(name, [])
+        connection = next((connection for connection in connections if connection[0] == callback), None)
+        
+        if connection is None:
+            raise PTSCallbackException(f"Callback is not connected to game callback: {name}")
+        
+        connections.remove(connection)
+        self.callbacks[name] -= connection[1]
+        
+        if len(connections) == 0:
+            del self.callbacks[name]
+            del self._callback_connections[name]
+            
+        self.subscriptions_revision += 1
+        self._info(f"Disconnected callback from game callback: {name}")
+        
+    def _filter_callback(self, callback: Callable, callback_filter: CallbackFilter) -> Callable:
+        """
+        Wraps a callback function so it is only called if the arguments pass the filter.
+        
+        Args:
+            callback (Callable): The callback function to wrap.
+            callback_filter (CallbackFilter): The filter.
+        
+        Returns:
+            Callable: The wrapped callback function. Async if the callback function is.
+        """
+        
+        # the in-game addon sends triggers that pass any connected filter, so check this one again
+        if inspect.iscoroutinefunction(callback):
+            async def filtered_async(*args):
+                if callback_filter.matches(list(args)):
+                    await callback(*args)
+                    
+            return filtered_async
+        
+        def filtered(*args):
+            if callback_filter.matches(list(args)):
+                callback(*args)
+                
+        return filtered
+        
+    def _get_internal_callbacks(self) -> list[CallbackEnum]:
+        """
+        Returns the game callbacks the cache and entity registry need, whether or not something is connected to them.
+        
+        Returns:
+            list[CallbackEnum]: The game callbacks.
+        """
+        
+        names = []
+        
+        if self.cache is not None:
+            names += self.cache.get_callbacks()
+            
+        if self.registry is not None:
+            names += [name for name in self.registry.get_callbacks() if name not in names]
+            
+        return names
+        
+    def get_subscribed_callbacks(self) -> list[str]:
+        """
+        Returns the names of the game callbacks that have something connected to them, or that the cache or entity registry need.
+        
+        Returns:
+            list[str]: The names of the game callbacks.
+        """
+        
+        names = list(self.callbacks)
+        names += [name for name in self._get_internal_callbacks() if name not in self.callbacks]
+        
+        return [name.value for name in names]
+    
+    def _get_subscriptions(self) -> Subscriptions:
+        """
+        Returns the game callbacks the addon should listen for, along with their policies, filters and revision.
+        
+        Returns:
+            Subscriptions: The subscriptions.
+        """
+        
+        filters = {}
+        
+        internal_callbacks = self._get_internal_callbacks()
+        
+        for name, connections in list(self._callback_connections.items()):
+            # one connection without a filter (or the cache/registry) wants every trigger
+            if name not in internal_callbacks and all(connection[2] is not None for connection in connections):
+                filters[name.value] = [connection[2] for connection in connections]
+        
+        return Subscriptions(
+            revision = self.subscriptions_revision,
+            callbacks = self.get_subscribed_callbacks(),
+            policies = {name.value: policy for name, policy in list(self.callback_policies.items())},
+            filters = filters
+        )
+    
+    def set_callback_policy(self, name: CallbackEnum, policy: CallbackPolicy|None):
+        """
+        Sets how the addon deals with a game callback being triggered many times between updates.
+        Useful for game callbacks that can be triggered hundreds of times at once, like `onVehicleDamaged`.
+        
+        Args:
+            name (CallbackEnum): The in-game callback to set the policy of.
+            policy (CallbackPolicy|None): The policy, or None to send every trigger.
+        """
+        
+        if policy is None:
+            self.callback_policies.pop(name, None)
+        else:
+            self.callback_policies[name] = policy
+            
+        self.subscriptions_revision += 1
+        self._info(f"Set policy of game callback {name} to {policy.mode.value if policy else 'all'}")
+        
+    def enable_cache(self, rules: dict[CallEnum, CacheRule]|None = None) -> CallCache:
+        """
+        Enables caching the results of idempotent `server.` functions called through `call` and `call_async`.
+        Results expire after their rule's TTL in game ticks, and are invalidated when the game callbacks in their rule are triggered.
+        The addon listens for those game callbacks even if nothing is connected to them.
+        
+        addon.enable_cache({
+            **DEFAULT_CACHE_RULES,
+            CallEnum.GET_VEHICLE_DIAL: CacheRule(ttl = 10, invalidate_on = {CallbackEnum.ON_VEHICLE_DESPAWN: 0})
+        })
+        
+        Args:
+            rules (dict[CallEnum, CacheRule]|None, optional): The functions to cache, and how. Defaults to None (`DEFAULT_CACHE_RULES`).
+        
+        Returns:
+            CallCache: The cache. Hits, misses and invalidations are counted in `metrics`.
+        """
+        
+        self.cache = CallCache(
+            DEFAULT_CACHE_RULES if rules is None else rules,
+            clock = lambda: self.game_tick,
+            metrics = self.metrics
+        )
+        
+        self.subscriptions_revision += 1
+        self._info(f"Enabled cache for {len(self.cache.rules)} function(s)")
+        
+        return self.cache
+    
+    def enable_registry(self) -> EntityRegistry:
+        """
+        Enables mirroring the players, spawned vehicles and loaded objects tracked in-game, so they can be looked up without calling the game.
+        The registry takes a snapshot whenever the addon connects, and is kept up to date with game callbacks from then on.
+        The addon listens for those game callbacks even if nothing is connected to them.
+        
+        registry = addon.enable_registry()
+        player = registry.get_player(peer_id)
+        
+        Returns:
+            EntityRegistry: The registry. Snapshots and applied callbacks are counted in `metrics`.
+        """
+        
+        self.registry = EntityRegistry(metrics = self.metrics)
+        self.subscriptions_revision += 1
+        
+        self._info("Enabled entity registry")
+        
+        if self.connected:
+            self.refresh_registry()
+        
+        return self.registry
+    
+    def refresh_registry(self):
+        """
+        Takes a new snapshot for the entity registry, unless one is already being taken.
+        Game callbacks that arrive in the meantime are applied on top of the snapshot once it arrives.
+        
+        Raises:
+            PTSCallException: If the entity registry isn't enabled.
+        """
+        
+        if self.registry is None:
+            raise PTSCallException("The entity registry isn't enabled. Use `enable_registry` first.")
+        
+        if not self.registry.begin_snapshot():
+            return
+        
+        call = self.calls.create(get_builtin_path(BuiltinEnum.GET_ENTITIES), [], priority = CallPriorityEnum.HIGH)
+        call.future.add_done_callback(lambda future: self._on_registry_snapshot(self.registry, future))
+        
+    def _on_registry_snapshot(self, registry: EntityRegistry, future: Future):
+        """
+        Applies a snapshot to the entity registry once it arrives.
+        
+        Args:
+            registry (EntityRegistry): The registry the snapshot was taken for.
+            future (Future): The future of the snapshot call.
+        """
+        
+        if future.cancelled() or future.exception() is not None:
+            registry.abort_snapshot()
+            self._warn(f"Failed to take entity registry snapshot: {'cancelled' if future.cancelled() else future.exception()}")
+            return
+        
+        try:
+            registry.apply_snapshot(future.result()[0])
+        except (ValidationError, IndexError, TypeError, ValueError) as exception:
+            registry.abort_snapshot()
+            self._error(f"Failed to decode entity registry snapshot: {exception}")
+    
+    def watch(self, function: CallEnum, *args, period: int = 1) -> Watch:
+        """
+        Watches a `server.` function. The addon calls it every `period` ticks, and sends back its latest results with each update.
+        
+        watch = addon.watch(CallEnum.GET_VEHICLE_POS, vehicle_id, period = 10)
+        watch.on_sample += lambda tick, matrix, success: print(tick, matrix)
+        
+        Args:
+            function (CallEnum): The name of the function to watch.
+            *args: The arguments to call the function with.
+            period (int, optional): How often to call the function, in ticks. Defaults to 1.
+        
+        Returns:
+            Watch: The watch. Connect to `on_sample`, or read `latest` for the latest results.
+        """
+        
+        return self.watch_function(f"server.{function.value}", *args, period = period)
+    
+    def watch_function(self, path: str, *args, period: int = 1) -> Watch:
+        """
+        Watches a custom function. The addon calls it every `period` ticks, and sends back its latest results with each update.<br>
+        Only the latest results are sent, so samples taken between two updates are skipped if the function is called more often than the addon updates.
+        
+        Args:
+            path (str): The path of the function to watch.
+            *args: The arguments to call the function with.
+            period (int, optional): How often to call the function, in ticks. Defaults to 1.
+        
+        Returns:
+            Watch: The watch. Connect to `on_sample`, or read `latest` for the latest results.
+        """
+        
+        self._watch_id += 1
+        
+        watch = Watch(id = self._watch_id, path = path, arguments = list(args), period = period)
+        
+        self.watches[watch.id] = watch
+        self.watches_revision += 1
+        
+        self._info(f"Watching {path} every {period} tick(s)")
+        return watch
+    
+    def unwatch(self, watch: Watch):
+        """
+        Stops watching a function.
+        
+        Args:
+            watch (Watch): The watch to stop.
+            
+        Raises:
+            PTSCallException: If the watch isn't active.
+        """
+        
+        if self.watches.pop(watch.id, None) is None:
+            raise PTSCallException(f"Watch with ID {watch.id} is not active.")
+        
+        self.watches_revision += 1
+        self._info(f"Stopped watching {watch.path}")
+    
+    def _get_watches(self) -> Watches:
+        """
+        Returns the functions the addon should watch, along with their revision.
+        
+        Returns:
+            Watches: The watches.
+        """
+        
+        return Watches(
+            revision = self.watches_revision,
+            watches = list(self.watches.values())
+        )
+    
+    def _handle_samples(self, samples: list[tuple[int, int, tuple[Any, ...]]]):
+        """
+        Stores the latest results of watches and fires their `on_sample` event.
+        
+        Args:
+            samples (list[tuple[int, int, tuple[Any, ...]]]): The decoded samples. Samples of watches that are no longer active are ignored.
+        """
+        
+        for watch_id, tick, return_values in samples:
+            watch = self.watches.get(watch_id)
+            
+            if watch is None:
+                continue
+            
+            watch.latest = return_values
+            watch.tick = tick
+            
+            self.metrics.increment("watch_samples")
+            self._fire_event(watch.on_sample, tick, *watch.latest)
+    
+    def _handle_call(self, call: Call, return_values: list[Any], error: str|None = None):
         """
         Handles the finalization of a call to a function in the addon.
         
         Args:
             call (Call): The call to handle.
             return_values (list[Any]): The return values from the call.
+            error (str|None, optional): The error the call failed with in-game, if any. Defaults to None.
+        """
+        
+        # overlapping updates can carry the same handled call, only resolve it once
+        if not self.calls.remove(call):
+            return
+        
+        if error is not None:
+            self._fail_call(call, PTSCallException(f"Call with ID {call.id} failed in-game: {error}"))
+            return
+        
+        self._resolve_call(call, tuple(return_values))
+        
+    def _resolve_call(self, call: Call, return_values: tuple[Any, ...]):
+        """
+        Sets the result of a call's future, unless whoever was waiting on it gave up on it.
+        
+        Args:
+            call (Call): The call to resolve.
+            return_values (tuple[Any, ...]): The return values from the call.
+        """
+        
+        _set_result(call.future, return_values)
+        
+    def _fail_call(self, call: Call, exception: Exception):
         """
+        Sets the exception of a call's future, unless whoever was waiting on it gave up on it.
         
-        call.future.set_result(tuple(return_values))
-        self.calls.remove(call)
+        Args:
+            call (Call): The call to fail.
+            exception (Exception): The exception to set.
+        """
         
-    def get_call(self, call_id: str) -> Call|None:
+        _set_exception(call.future, exception)
+            
+    def _get_unacknowledged_calls(self, ack: int) -> list[Call]:
+        """
+        Returns all calls the addon hasn't received yet.
+        
+        Args:
+            ack (int): The ID of the latest call the addon has received.
+        
+        Returns:
+            list[Call]: The calls with an ID above `ack`, in order.
+        """
+        
+        return self.calls.after(ack)
+        
+    def get_call(self, call_id: int) -> Call|None:
         """
         Gets a call by its ID.
         
         Args:
-            call_id (str): The ID of the call to get.
+            call_id (int): The ID of the call to get.
         
         Returns:
             Call|None: The call if it exists, otherwise None.
         """
         
-        for call in self.calls:
-            if call.id == call_id:
-                return call
-            
-        return None
+        return self.calls.get(call_id)
         
-    def does_call_exist(self, call_id: str) -> bool:
+    def does_call_exist(self, call_id: int) -> bool:
         """
         Checks if a call with the given ID exists.
         
         Args:
-            call_id (str): The ID of the call to check for.
+            call_id (int): The ID of the call to check for.
         
         Returns:
             bool: True if the call exists, False otherwise.
         """
         
-        return self.get_call(call_id) is not None
+        return call_id in self.calls
+        
+    def _create_call(self, path: str, arguments: list[Any], no_reply: bool, read_only: bool, priority: CallPriorityEnum) -> tuple[Call, Future]:
+        """
+        Creates a call, or joins an identical pending one if the call is read-only.
+        
+        Args:
+            path (str): The path of the function to call.
+            arguments (list[Any]): The arguments to pass to the function.
+            no_reply (bool): Whether or not to fire and forget the call.
+            read_only (bool): Whether or not the function has no side effects.
+            priority (CallPriorityEnum): The priority class of the call.
+        
+        Returns:
+            tuple[Call, Future]: The call, and the future to wait on for its result.
+        """
+        
+        if read_only and not no_reply:
+            return self.calls.create_shared(path, arguments, priority = priority)
+        
+        call = self.calls.create(path, arguments, no_reply = no_reply, priority = priority)
+        return call, call.future
         
-    def call(self, function: CallEnum, *args) -> tuple[Any, ...]:
+    def call(self, function: CallEnum, *args, no_reply: bool = False, read_only: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> tuple[Any, ...]:
         """
-        Calls a `server.` function in the addon.
+        Calls a `server.` function in the addon.<br>
+        If the cache is enabled and has a rule for the function, cached results are returned instead of calling it again, and concurrent misses share one call.
         
         Args:
             function (CallEnum): The name of the function to call.
             *args: The arguments to pass to the function.
+            no_reply (bool, optional): Whether or not to fire and forget the call. If True, this returns immediately with an empty tuple and the addon won't send back a result. Defaults to False.
+            read_only (bool, optional): Whether or not the function has no side effects. If True, identical calls made while one is still pending share its result instead of calling the function again. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the call. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
             
         Raises:
             PTSCallException: If the call times out.
@@ -699,9 +1521,21 @@ class Addon():
             tuple[Any, ...]: Whatever the function returns.
         """
         
-        return self.call_function(f"server.{function.value}", *args)
+        if no_reply or self.cache is None or not self.cache.is_cached(function):
+            return self.call_function(f"server.{function.value}", *args, no_reply = no_reply, read_only = read_only, priority = priority)
         
-    def call_function(self, path: str, *args) -> tuple[Any, ...]:
+        cached = self.cache.get(function, list(args))
+        
+        if cached is not None:
+            return cached
+        
+        generation = self.cache.generation(function)
+        result = self.call_function(f"server.{function.value}", *args, read_only = True, priority = priority)
+        
+        self.cache.put(function, list(args), result, generation)
+        return result
+        
+    def call_function(self, path: str, *args, no_reply: bool = False, read_only: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> tuple[Any, ...]:
         """
         Calls a custom function in the addon.<br>
         You can inject custom functions into the addon script using `attach_lua_code` or `attach_lua_file`.
@@ -709,6 +1543,9 @@ class Addon():
         Args:
             path (str): The path of the function to call.
             *args: The arguments to pass to the function.
+            no_reply (bool, optional): Whether or not to fire and forget the call. If True, this returns immediately with an empty tuple and the addon won't send back a result. Defaults to False.
+            read_only (bool, optional): Whether or not the function has no side effects. If True, identical calls made while one is still pending share its result instead of calling the function again. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the call. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
             
         Raises:
             PTSCallException: If the call times out.
@@ -717,23 +1554,301 @@ class Addon():
             tuple[Any, ...]: Whatever the function returns.
         """
         
-        call_id = http.generate_uuid()
-
-        call = Call(
-            id = call_id,
-            path = path,
-            arguments = list(args)
-        )
-
-        self.calls.append(call)
+        call, future = self._create_call(path, list(args), no_reply, read_only, priority)
         
-        while not self.connected:
-            time.sleep(0.01)
+        if no_reply:
+            return ()
+        
+        self._wait_for_connection()
 
         try:
-            return call.future.result(self.constants.CALL_TIMEOUT_SECONDS)
+            return future.result(self.constants.CALL_TIMEOUT_SECONDS)
         except TimeoutError as exception:
-            raise PTSCallException(f"Call with ID {call_id} timed out.") from exception
+            future.cancel()
+            raise PTSCallException(f"Call with ID {call.id} timed out.") from exception
+        
+    async def call_async(self, function: CallEnum, *args, no_reply: bool = False, read_only: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> tuple[Any, ...]:
+        """
+        Calls a `server.` function in the addon without blocking the event loop.<br>
+        If the cache is enabled and has a rule for the function, cached results are returned instead of calling it again, and concurrent misses share one call.
+        
+        Args:
+            function (CallEnum): The name of the function to call.
+            *args: The arguments to pass to the function.
+            no_reply (bool, optional): Whether or not to fire and forget the call. If True, this returns immediately with an empty tuple and the addon won't send back a result. Defaults to False.
+            read_only (bool, optional): Whether or not the function has no side effects. If True, identical calls made while one is still pending share its result instead of calling the function again. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the call. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
+            
+        Raises:
+            PTSCallException: If the call times out.
+        
+        Returns:
+            tuple[Any, ...]: Whatever the function returns.
+        """
+        
+        if no_reply or self.cache is None or not self.cache.is_cached(function):
+            return await self.call_function_async(f"server.{function.value}", *args, no_reply = no_reply, read_only = read_only, priority = priority)
+        
+        cached = self.cache.get(function, list(args))
+        
+        if cached is not None:
+            return cached
+        
+        generation = self.cache.generation(function)
+        result = await self.call_function_async(f"server.{function.value}", *args, read_only = True, priority = priority)
+        
+        self.cache.put(function, list(args), result, generation)
+        return result
+        
+    async def call_function_async(self, path: str, *args, no_reply: bool = False, read_only: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> tuple[Any, ...]:
+        """
+        Calls a custom function in the addon without blocking the event loop.<br>
+        The call is awaited on the running event loop, so many calls can be in flight without a thread each.
+        
+        Args:
+            path (str): The path of the function to call.
+            *args: The arguments to pass to the function.
+            no_reply (bool, optional): Whether or not to fire and forget the call. If True, this returns immediately with an empty tuple and the addon won't send back a result. Defaults to False.
+            read_only (bool, optional): Whether or not the function has no side effects. If True, identical calls made while one is still pending share its result instead of calling the function again. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the call. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
+            
+        Raises:
+            PTSCallException: If the call times out.
+        
+        Returns:
+            tuple[Any, ...]: Whatever the function returns.
+        """
+        
+        call, future = self._create_call(path, list(args), no_reply, read_only, priority)
+        
+        if no_reply:
+            return ()
+        
+        await self._wait_for_connection_async()
+        
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.constants.CALL_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError as exception:
+            future.cancel()
+            raise PTSCallException(f"Call with ID {call.id} timed out.") from exception
+        
+    def call_builtin(self, builtin: BuiltinEnum, *args, no_reply: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> tuple[Any, ...]:
+        """
+        Calls a function built into the addon, like the bulk getters.<br>
+        Bulk getters return one flat array, which can be unpacked with `unpack_players`, `unpack_vehicle_positions` and `unpack_vehicle_components`.
+        
+        packed, = addon.call_builtin(BuiltinEnum.GET_PLAYERS)
+        players = unpack_players(packed)
+        
+        Args:
+            builtin (BuiltinEnum): The built-in function to call.
+            *args: The arguments to pass to the function.
+            no_reply (bool, optional): Whether or not to fire and forget the call. If True, this returns immediately with an empty tuple and the addon won't send back a result. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the call. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
+            
+        Raises:
+            PTSCallException: If the call times out.
+        
+        Returns:
+            tuple[Any, ...]: Whatever the function returns.
+        """
+        
+        return self.call_function(get_builtin_path(builtin), *args, no_reply = no_reply, priority = priority)
+    
+    async def call_builtin_async(self, builtin: BuiltinEnum, *args, no_reply: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> tuple[Any, ...]:
+        """
+        Calls a function built into the addon, like the bulk getters, without blocking the event loop.
+        
+        Args:
+            builtin (BuiltinEnum): The built-in function to call.
+            *args: The arguments to pass to the function.
+            no_reply (bool, optional): Whether or not to fire and forget the call. If True, this returns immediately with an empty tuple and the addon won't send back a result. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the call. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
+            
+        Raises:
+            PTSCallException: If the call times out.
+        
+        Returns:
+            tuple[Any, ...]: Whatever the function returns.
+        """
+        
+        return await self.call_function_async(get_builtin_path(builtin), *args, no_reply = no_reply, priority = priority)
+    
+    def schedule(self, function: CallEnum, *args, delay: int = 0, tick: int|None = None, no_reply: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> Future:
+        """
+        Schedules a call to a `server.` function, executed in-game at a game tick instead of as soon as possible.
+        
+        future = addon.schedule(CallEnum.ANNOUNCE, "Server", "Restarting!", delay = 600) # in 10 seconds
+        
+        Args:
+            function (CallEnum): The name of the function to call.
+            *args: The arguments to pass to the function.
+            delay (int, optional): How many game ticks after the addon receives the call to execute it. Defaults to 0.
+            tick (int|None, optional): The game tick to execute the call at (see `game_tick`). Overrides `delay`. Calls received after this tick are executed straight away. Defaults to None.
+            no_reply (bool, optional): Whether or not to fire and forget the call. If True, the future resolves with an empty tuple once the addon receives the call. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the call. Only used if the call is executed straight away. Defaults to CallPriorityEnum.NORMAL.
+        
+        Returns:
+            Future: A future resolving to whatever the function returns, once executed.
+        """
+        
+        return self.schedule_function(f"server.{function.value}", *args, delay = delay, tick = tick, no_reply = no_reply, priority = priority)
+    
+    def schedule_function(self, path: str, *args, delay: int = 0, tick: int|None = None, no_reply: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> Future:
+        """
+        Schedules a call to a custom function, executed in-game at a game tick instead of as soon as possible.<br>
+        Scheduled calls are run by the in-game addon on the tick they are scheduled for, so timing doesn't depend on how often the addon polls.
+        
+        Args:
+            path (str): The path of the function to call.
+            *args: The arguments to pass to the function.
+            delay (int, optional): How many game ticks after the addon receives the call to execute it. Defaults to 0.
+            tick (int|None, optional): The game tick to execute the call at (see `game_tick`). Overrides `delay`. Calls received after this tick are executed straight away. Defaults to None.
+            no_reply (bool, optional): Whether or not to fire and forget the call. If True, the future resolves with an empty tuple once the addon receives the call. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the call. Only used if the call is executed straight away. Defaults to CallPriorityEnum.NORMAL.
+        
+        Returns:
+            Future: A future resolving to whatever the function returns, once executed.
+        """
+        
+        wait = delay
+        
+        if tick is not None:
+            wait = 0 if self.game_tick is None else tick - self.game_tick
+        
+        call = self.calls.create(
+            path,
+            list(args),
+            no_reply = no_reply,
+            priority = priority,
+            delay = delay,
+            tick = tick,
+            schedule_seconds = max(wait, 0) / self.constants.GAME_TPS
+        )
+        
+        return call.future
+        
+    def batch(self, *, same_tick: bool = False, no_reply: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> CallBatch:
+        """
+        Creates a batch of calls that are sent to the addon together once the batch is flushed.
+        
+        with addon.batch() as batch:
+            position = batch.call(CallEnum.GET_PLAYER_POS, peer_id)
+            batch.call(CallEnum.ANNOUNCE, "Server", "Hello!")
+            
+        matrix, success = position.result()
+        
+        Args:
+            same_tick (bool, optional): Whether or not to guarantee all calls in the batch are executed within the same game tick. Defaults to False.
+            no_reply (bool, optional): Whether or not to fire and forget the calls in the batch. Their futures resolve to an empty tuple once the addon receives them. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the calls. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
+        
+        Returns:
+            CallBatch: The batch.
+        """
+        
+        return CallBatch(self.calls, same_tick = same_tick, no_reply = no_reply, priority = priority, timeout = self.constants.CALL_TIMEOUT_SECONDS)
+    
+    def _batch_from(self, calls: list[tuple], same_tick: bool, no_reply: bool, priority: CallPriorityEnum) -> CallBatch:
+        """
+        Creates and flushes a batch from a list of calls.
+        
+        Args:
+            calls (list[tuple]): The calls, each being a tuple of a `CallEnum` or function path followed by arguments.
+            same_tick (bool): Whether or not to guarantee all calls in the batch are executed within the same game tick.
+            no_reply (bool): Whether or not to fire and forget the calls in the batch.
+            priority (CallPriorityEnum): The priority class of the calls in the batch.
+        
+        Returns:
+            CallBatch: The flushed batch.
+        """
+        
+        with self.batch(same_tick = same_tick, no_reply = no_reply, priority = priority) as batch:
+            for function, *args in calls:
+                if isinstance(function, CallEnum):
+                    batch.call(function, *args)
+                else:
+                    batch.call_function(function, *args)
+        
+        return batch
+    
+    def call_many(self, calls: list[tuple], *, same_tick: bool = False, no_reply: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> list[tuple[Any, ...]]:
+        """
+        Calls many functions in the addon in one round trip.
+        
+        addon.call_many([
+            (CallEnum.ANNOUNCE, "Server", "Hello!"),
+            ("foo.bar.myFunction", 1, 2)
+        ])
+        
+        Args:
+            calls (list[tuple]): The calls, each being a tuple of a `CallEnum` or function path followed by arguments.
+            same_tick (bool, optional): Whether or not to guarantee all calls are executed within the same game tick. Defaults to False.
+            no_reply (bool, optional): Whether or not to fire and forget the calls. If True, this returns immediately with an empty tuple for each call. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the calls. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
+            
+        Raises:
+            PTSCallException: If the calls time out.
+        
+        Returns:
+            list[tuple[Any, ...]]: What each function returned, in order.
+        """
+        
+        batch = self._batch_from(calls, same_tick, no_reply, priority)
+        
+        if no_reply:
+            return [()] * len(batch)
+        
+        self._wait_for_connection()
+        
+        return batch.results()
+    
+    async def call_many_async(self, calls: list[tuple], *, same_tick: bool = False, no_reply: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> list[tuple[Any, ...]]:
+        """
+        Calls many functions in the addon in one round trip without blocking the event loop.
+        
+        Args:
+            calls (list[tuple]): The calls, each being a tuple of a `CallEnum` or function path followed by arguments.
+            same_tick (bool, optional): Whether or not to guarantee all calls are executed within the same game tick. Defaults to False.
+            no_reply (bool, optional): Whether or not to fire and forget the calls. If True, this returns immediately with an empty tuple for each call. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the calls. Calls of a higher priority are executed first in-game. Defaults to CallPriorityEnum.NORMAL.
+            
+        Raises:
+            PTSCallException: If the calls time out.
+        
+        Returns:
+            list[tuple[Any, ...]]: What each function returned, in order.
+        """
+        
+        batch = self._batch_from(calls, same_tick, no_reply, priority)
+        
+        if no_reply:
+            return [()] * len(batch)
+        
+        await self._wait_for_connection_async()
+        
+        return await batch.results_async()
+    
+    def program(self, *, priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> CallProgram:
+        """
+        Creates a call program: calls that can use the return values of earlier calls, executed in-game within the same tick.
+        The program is sent as one call once flushed, so dependent calls cost one round trip instead of one each.
+        
+        with addon.program() as program:
+            vehicle = program.call(CallEnum.SPAWN_ADDON_VEHICLE, matrix, addon_index, component_id)
+            program.call(CallEnum.SET_VEHICLE_KEYPAD, vehicle[0], "Code", 1234)
+            components = program.call(CallEnum.GET_VEHICLE_COMPONENTS, vehicle[0], output = True)
+            
+        data, success = components.future.result()
+        
+        Args:
+            priority (CallPriorityEnum, optional): The priority class of the program. Defaults to CallPriorityEnum.NORMAL.
+        
+        Returns:
+            CallProgram: The program. Use it as a context manager, or call `results` to flush it and wait for its outputs.
+        """
+        
+        return CallProgram(self.calls, priority = priority, timeout = self.constants.CALL_TIMEOUT_SECONDS)
         
     def start(self, on_start: Callable = None, on_stop: Callable = None):
         """
@@ -790,6 +1905,7 @@ class DedicatedServerAddon(Addon):
         copy_from: str = None,
         uvicorn_log_level: int = WARNING,
         force_new_token: bool = False,
+        long_poll: bool = False,
         constants: AddonConstants = None
     ):
         """
@@ -804,6 +1920,7 @@ class DedicatedServerAddon(Addon):
             copy_from (str, optional): The name of the addon to copy files from (playlist.xml, vehicles, NOT script). Can alternatively be a path to an addon directory. Defaults to None.
             uvicorn_log_level (int, optional): The log level for Uvicorn. Defaults to `logging.WARNING`.
             force_new_token (bool, optional): Whether or not to force a new token every time the addon starts. Defaults to False.
+            long_poll (bool, optional): Whether or not to hold update requests from the addon open until a call is made (or `LONG_POLL_TIMEOUT_SECONDS` passes), so calls are sent straight away instead of on the next update. Defaults to False.
             constants (AddonConstants, optional): Constants to be used by the addon.
         """
         
@@ -815,6 +1932,7 @@ class DedicatedServerAddon(Addon):
             addons_path = os.path.join(dedicated_server_path, "rom/data/missions"),
             uvicorn_log_level = uvicorn_log_level,
             force_new_token = force_new_token,
+            long_poll = long_poll,
             constants = constants
         )
         
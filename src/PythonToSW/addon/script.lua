@@ -43,6 +43,11 @@ SWToPython.Enums = {}
 ]]
 SWToPython.Libs = {}
 
+--[[
+    A table containing built-in functions that can be called from the PythonToSW server.
+]]
+SWToPython.Builtins = {}
+
 --------------------------------------------------------
 -- [Noir] Definition
 --------------------------------------------------------
@@ -12981,30 +12986,76 @@ Noir.Bootstrapper:WrapServiceMethodsForAllServices()
     A class representing a call from the PythonToSW server
 ]]
 ---@class SWToPython.Call: NoirDataclass
----@field New fun(self: SWToPython.Call, ID: string, path: string, arguments: table): SWToPython.Call
----@field ID string The ID of the call
+---@field New fun(self: SWToPython.Call, ID: integer, path: string, arguments: table, noReply: boolean, priority: integer, delay: integer, tick: integer|nil): SWToPython.Call
+---@field ID integer The ID of the call. This is a sequence number, so later calls have higher IDs
 ---@field Path string The path of the function to be called
 ---@field Arguments table The arguments of the call
+---@field NoReply boolean Whether or not the result of the call should not be sent back to the PythonToSW server
+---@field Priority integer The priority class of the call. Lower is executed first
+---@field Delay integer How many ticks after being received the call should be executed
+---@field Tick integer|nil The game tick (`TaskService.Ticks`) the call should be executed at. Overrides `Delay`
 SWToPython.Classes.Call = Noir.Libraries.Dataclasses:New("Call", {
-    Noir.Libraries.Dataclasses:Field("ID", "string"),
+    Noir.Libraries.Dataclasses:Field("ID", "number"),
     Noir.Libraries.Dataclasses:Field("Path", "string"),
-    Noir.Libraries.Dataclasses:Field("Arguments", "table")
+    Noir.Libraries.Dataclasses:Field("Arguments", "table"),
+    Noir.Libraries.Dataclasses:Field("NoReply", "boolean"),
+    Noir.Libraries.Dataclasses:Field("Priority", "number"),
+    Noir.Libraries.Dataclasses:Field("Delay", "number"),
+    Noir.Libraries.Dataclasses:Field("Tick", "number", "nil")
 })
 
 --[[
-    Calls the `server.` function in the addon and returns the result.
+    Returns if the call is scheduled for a later tick instead of being executed as soon as possible.
 ]]
----@return SWToPython.HandledCall?
-function SWToPython.Classes.Call:Call()
+---@return boolean
+function SWToPython.Classes.Call:IsScheduled()
+    return self.Delay > 0 or self.Tick ~= nil
+end
+
+--[[
+    Returns the game tick the call should be executed at.
+]]
+---@param receivedAt integer The tick the call was received at
+---@return integer
+function SWToPython.Classes.Call:GetTargetTick(receivedAt)
+    return self.Tick or (receivedAt + self.Delay)
+end
+
+--[[
+    Calls the function in the addon and returns its return values.<br>
+    If the function doesn't exist or errors, nil and the error are returned instead.
+]]
+---@return table?, string?
+function SWToPython.Classes.Call:Execute()
     local func = SWToPython.Uplink:GetFunction(self.Path)
 
     if not func then
-        SWToPython.Uplink:PropagateError("Function at "..self.Path.." does not exist.")
-        return
+        local err = "Function at "..self.Path.." does not exist."
+        SWToPython.Uplink:PropagateError(err)
+
+        return nil, err
     end
 
-    local returns = {func(table.unpack(self.Arguments))}
-    return SWToPython.Classes.HandledCall:New(self.ID, returns)
+    -- one failing call shouldn't take down the rest
+    local results = table.pack(pcall(func, table.unpack(self.Arguments)))
+
+    if not results[1] then
+        local err = "Function at "..self.Path.." errored: "..tostring(results[2])
+        SWToPython.Uplink:PropagateError(err)
+
+        return nil, err
+    end
+
+    return {table.unpack(results, 2, results.n)}
+end
+
+--[[
+    Calls the `server.` function in the addon and returns the result, which carries the error if the call failed.
+]]
+---@return SWToPython.HandledCall
+function SWToPython.Classes.Call:Call()
+    local returns, err = self:Execute()
+    return SWToPython.Classes.HandledCall:New(self.ID, returns or {}, err)
 end
 
 --[[
@@ -13016,10 +13067,30 @@ function SWToPython.Classes.Call:FromTable(tbl)
     return self:New(
         tbl.id,
         tbl.path,
-        tbl.arguments
+        tbl.arguments,
+        tbl.no_reply == true,
+        tbl.priority or 1,
+        tbl.delay or 0,
+        tbl.tick
     )
 end
 
+--[[
+    Returns a table representation of the call, in the same shape `FromTable` takes.
+]]
+---@return table
+function SWToPython.Classes.Call:ToTable()
+    return {
+        id = self.ID,
+        path = self.Path,
+        arguments = self.Arguments,
+        no_reply = self.NoReply,
+        priority = self.Priority,
+        delay = self.Delay,
+        tick = self.Tick
+    }
+end
+
 --------------------------------------------------------
 -- [SWToPython] Handled Call
 -- https://github.com/Cuh4/PythonToSW
@@ -13049,15 +13120,16 @@ end
     A class representing a call from the PythonToSW server that has been handled.
 ]]
 ---@class SWToPython.HandledCall: NoirHoardable
----@field New fun(self: SWToPython.HandledCall, ID: string, returnValues: table<integer, any>): SWToPython.HandledCall
+---@field New fun(self: SWToPython.HandledCall, ID: integer, returnValues: table<integer, any>, err: string|nil): SWToPython.HandledCall
 SWToPython.Classes.HandledCall = Noir.Class("HandledCall", Noir.Classes.Hoardable)
 
 --[[
     Initializes new HandledCall instances.
 ]]
----@param ID string
+---@param ID integer
 ---@param returnValues table<integer, any>
-function SWToPython.Classes.HandledCall:Init(ID, returnValues)
+---@param err string|nil
+function SWToPython.Classes.HandledCall:Init(ID, returnValues, err)
     self:InitFrom(Noir.Classes.Hoardable, ID)
 
     --[[
@@ -13070,6 +13142,11 @@ function SWToPython.Classes.HandledCall:Init(ID, returnValues)
     ]]
     self.ReturnValues = returnValues
 
+    --[[
+        The error the call failed with, if any.
+    ]]
+    self.Error = err
+
     --[[
         The time the call was handled.
     ]]
@@ -13084,6 +13161,7 @@ function SWToPython.Classes.HandledCall:ToTable()
     return {
         ID = self.ID,
         ReturnValues = self.ReturnValues,
+        Error = self.Error,
         Time = self.Time
     }
 end
@@ -13092,10 +13170,175 @@ end
     Table representation of a HandledCall. Use for sending to the PythonToSW server.
 ]]
 ---@class SwToPython.HandledCall.AsTable
----@field ID string
+---@field ID integer
 ---@field ReturnValues table<integer, any>
+---@field Error string|nil
 ---@field Time number
 
+--------------------------------------------------------
+-- [SWToPython] Handled Call
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    A class representing a payload too large to fit in one request, sent to the PythonToSW server as fragments across several updates.
+]]
+---@class SWToPython.Transfer: NoirClass
+---@field New fun(self: SWToPython.Transfer, ID: integer, version: integer, payload: string, fragmentSize: integer, handledCalls: table<integer, SWToPython.HandledCall>, triggeredCallbacks: table<integer, SWToPython.TriggeredCallback>): SWToPython.Transfer
+SWToPython.Classes.Transfer = Noir.Class("Transfer")
+
+--[[
+    Initializes new Transfer instances.
+]]
+---@param ID integer
+---@param version integer
+---@param payload string
+---@param fragmentSize integer
+---@param handledCalls table<integer, SWToPython.HandledCall>
+---@param triggeredCallbacks table<integer, SWToPython.TriggeredCallback>
+function SWToPython.Classes.Transfer:Init(ID, version, payload, fragmentSize, handledCalls, triggeredCallbacks)
+    --[[
+        The ID of the transfer.
+    ]]
+    self.ID = ID
+
+    --[[
+        The protocol version the payload was encoded with.
+    ]]
+    self.Version = version
+
+    --[[
+        The fragments of the payload.
+    ]]
+    ---@type table<integer, string>
+    self.Fragments = self:Split(payload, fragmentSize)
+
+    --[[
+        The index of the next fragment to send.
+    ]]
+    self.Next = 1
+
+    --[[
+        The handled calls in the payload.
+    ]]
+    self.HandledCalls = handledCalls
+
+    --[[
+        The triggered callbacks in the payload.
+    ]]
+    self.TriggeredCallbacks = triggeredCallbacks
+end
+
+--[[
+    Splits a payload into fragments of at most `size` bytes, without splitting UTF-8 characters.
+]]
+---@param payload string
+---@param size integer
+---@return table<integer, string>
+function SWToPython.Classes.Transfer:Split(payload, size)
+    local fragments = {}
+    local start = 1
+
+    while start <= #payload do
+        local finish = math.min(start + size - 1, #payload)
+
+        -- step back until the next byte isn't a UTF-8 continuation byte
+        while finish < #payload and finish > start and (payload:byte(finish + 1) & 0xC0) == 0x80 do
+            finish = finish - 1
+        end
+
+        table.insert(fragments, payload:sub(start, finish))
+        start = finish + 1
+    end
+
+    return fragments
+end
+
+--[[
+    Returns the next fragment to send and its index (starting at 0), then moves on to the one after.<br>
+    Once every fragment has been sent, the last one is resent until the PythonToSW server acknowledges the transfer, in case its answer was lost.
+]]
+---@return integer, string
+function SWToPython.Classes.Transfer:NextFragment()
+    if self.Next > #self.Fragments then
+        return #self.Fragments - 1, self.Fragments[#self.Fragments]
+    end
+
+    local index = self.Next
+    self.Next = index + 1
+
+    return index - 1, self.Fragments[index]
+end
+
+--[[
+    Handles the index of the next fragment the PythonToSW server needs.<br>
+    Returns if the transfer is complete. Once every fragment has been sent, missing fragments are resent.
+]]
+---@param needed integer
+---@return boolean
+function SWToPython.Classes.Transfer:Acknowledge(needed)
+    if needed >= #self.Fragments then
+        return true
+    end
+
+    if self.Next > #self.Fragments then
+        self.Next = needed + 1
+    end
+
+    return false
+end
+
+--[[
+    Returns if the transfer contains a handled call.
+]]
+---@param handledCall SWToPython.HandledCall
+---@return boolean
+function SWToPython.Classes.Transfer:HasHandledCall(handledCall)
+    for _, transferredHandledCall in ipairs(self.HandledCalls) do
+        if transferredHandledCall == handledCall then
+            return true
+        end
+    end
+
+    return false
+end
+
+--[[
+    Returns if the transfer contains a triggered callback.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+---@return boolean
+function SWToPython.Classes.Transfer:HasTriggeredCallback(triggeredCallback)
+    for _, transferredTriggeredCallback in ipairs(self.TriggeredCallbacks) do
+        if transferredTriggeredCallback == triggeredCallback then
+            return true
+        end
+    end
+
+    return false
+end
+
+
 --------------------------------------------------------
 -- [SWToPython] Trigged Callback
 -- https://github.com/Cuh4/PythonToSW
@@ -13181,7 +13424,7 @@ end
 ---@field Time number
 
 --------------------------------------------------------
--- [SWToPython] ID
+-- [SWToPython] Protocol
 -- https://github.com/Cuh4/PythonToSW
 --------------------------------------------------------
 
@@ -13206,508 +13449,2951 @@ end
 -------------------------------
 
 --[[
-    A service that provides an ID that is incremented on every retrieval call.
+    A library for encoding and decoding data sent between the addon and the PythonToSW server.<br>
+    Data is sent as positional arrays, with function paths and callback names interned to indexes from tables
+    sent by the PythonToSW server at handshake.
 ]]
----@class SWToPython.ID: NoirService
-SWToPython.ID = Noir.Services:CreateService(
-    "ID",
-    false,
-    "A service that provides an ID that is incremented on every retrieval call.",
-    "A service that provides an ID that is incremented on every retrieval call. Other services can use this for unique identifiers.",
+---@class SWToPython.Protocol: NoirLibrary
+SWToPython.Libs.Protocol = Noir.Libraries:Create(
+    "Protocol",
+    "A library for encoding and decoding data sent between the addon and the PythonToSW server.",
+    "A library for encoding and decoding data sent between the addon and the PythonToSW server, as positional arrays with interned function paths and callback names.",
     {"Cuh4 (https://github.com/Cuh4)"}
 )
 
 --[[
-    Called when the service is initialized.
+    The newest protocol version the addon supports.
 ]]
-function SWToPython.ID:ServiceInit()
-    --[[
-        The current ID.<br>
-        Don't access this directly, use `:GetID()` instead.
-    ]]
-    ---@type integer
-    self._ID = self:EnsuredLoad("ID", 1)
-end
+SWToPython.Libs.Protocol.Version = 2
 
 --[[
-    Returns the current ID, but incrementing it and saving it beforehand.
+    JSON encodes a value without any whitespace, keeping URLs short.
 ]]
----@return integer
-function SWToPython.ID:GetID()
-    self._ID = self._ID + 1
-    self:Save("ID", self._ID)
+---@param obj any
+---@return string
+function SWToPython.Libs.Protocol:Encode(obj)
+    local kind = Noir.Libraries.JSON:KindOf(obj)
 
-    return self._ID
-end
+    if kind == "array" then
+        local parts = {}
 
---------------------------------------------------------
--- [SWToPython] Uplink
--- https://github.com/Cuh4/PythonToSW
---------------------------------------------------------
+        for index, value in ipairs(obj) do
+            parts[index] = self:Encode(value)
+        end
 
---[[
-    Copyright (C) 2025 Cuh4
+        return "["..table.concat(parts, ",").."]"
+    elseif kind == "table" then
+        local parts = {}
 
-    Licensed under the Apache License, Version 2.0 (the "License");
-    you may not use this file except in compliance with the License.
-    You may obtain a copy of the License at
+        for key, value in pairs(obj) do
+            table.insert(parts, "\""..Noir.Libraries.JSON:EscapeString(tostring(key)).."\":"..self:Encode(value))
+        end
 
-        http://www.apache.org/licenses/LICENSE-2.0
+        return "{"..table.concat(parts, ",").."}"
+    elseif kind == "string" then
+        return "\""..Noir.Libraries.JSON:EscapeString(obj).."\""
+    elseif kind == "number" or kind == "boolean" then
+        return tostring(obj)
+    else
+        return "null"
+    end
+end
 
-    Unless required by applicable law or agreed to in writing, software
-    distributed under the License is distributed on an "AS IS" BASIS,
-    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-    See the License for the specific language governing permissions and
-    limitations under the License.
+--[[
+    Encodes a handled call to send to the PythonToSW server.
 ]]
+---@param handledCall SWToPython.HandledCall
+---@return table
+function SWToPython.Libs.Protocol:EncodeHandledCall(handledCall)
+    return {handledCall.ID, handledCall.ReturnValues, handledCall.Error}
+end
 
--------------------------------
--- // Main
--------------------------------
+--[[
+    Encodes a triggered callback to send to the PythonToSW server.<br>
+    The callback name is replaced with its interned index if it has one.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+---@param callbackIDs table<string, integer>
+---@return table
+function SWToPython.Libs.Protocol:EncodeTriggeredCallback(triggeredCallback, callbackIDs)
+    return {callbackIDs[triggeredCallback.Name] or triggeredCallback.Name, triggeredCallback.Arguments}
+end
 
 --[[
-    A service that interacts with the localhost PythonToSW server.
-    This service receives events, acts accordingly, and returns whatever data needed.
+    Decodes a call sent by the PythonToSW server.<br>
+    Calls are `{id, path, arguments, noReply, priority, delay, tick}` where `path` may be an interned index.
 ]]
----@class SWToPython.Uplink: NoirService
-SWToPython.Uplink = Noir.Services:CreateService(
-    "Uplink",
-    false,
-    "A service that interacts with the localhost PythonToSW server.",
-    "A service that interacts with the localhost PythonToSW server. This service receives events, acts accordingly, and returns whatever data needed.",
-    {"Cuh4 (https://github.com/Cuh4)"}
-)
+---@param tbl table
+---@param paths table<integer, string>
+---@return SWToPython.Call
+function SWToPython.Libs.Protocol:DecodeCall(tbl, paths)
+    local path = tbl[2]
+
+    if type(path) == "number" then
+        path = paths[path] or ""
+    end
+
+    return SWToPython.Classes.Call:New(tbl[1], path, tbl[3], tbl[4] == 1, tbl[5] or 1, tbl[6] or 0, tbl[7])
+end
 
 --[[
-    Called when the service is initialized.
+    Decodes a response to an update.
 ]]
-function SWToPython.Uplink:ServiceInit()
-    --[[
-        The status of the PythonToSW server.
-    ]]
-    self.Alive = true
+---@param update table
+---@param paths table<integer, string>
+---@return SWToPython.Protocol.Update
+function SWToPython.Libs.Protocol:DecodeUpdate(update, paths)
+    local session, calls, cancelled, fragment, pollInterval = update.s, update.c, update.x, update.f, update.p
+    local subscriptions, watches = update.u, update.w
 
-    --[[
-        How often to check if the PythonToSW server is alive.
-    ]]
-    self.AliveCheckTickInterval = 12 * 64
+    local decodedCalls = {}
 
-    --[[
-        The port of the PythonToSW server.
-    ]]
-    ---@type integer
-    ---@diagnostic disable-next-line: undefined-global
-    self.Port = __PORT
+    for index, call in ipairs(calls or {}) do
+        decodedCalls[index] = self:DecodeCall(call, paths)
+    end
 
-    --[[
-        The request token for the PythonToSW server.
-    ]]
-    self.Token = "__REQUEST_TOKEN"
+    if subscriptions then
+        subscriptions = self:DecodeSubscriptions(subscriptions)
+    end
 
-    --[[
-        The tick interval between updates.
-    ]]
-    ---@type integer
-    ---@diagnostic disable-next-line: undefined-global
-    self.TickInterval = __TICK_INTERVAL
+    if watches then
+        watches = self:DecodeWatches(watches, paths)
+    end
 
-    --[[
-        The callbacks to listen for.
-    ]]
-    self.Callbacks = {
-        "onClearOilSpill",
-        "onCreate",
-        "onDestroy",
-        "onCustomCommand",
-        "onChatMessage",
-        "onPlayerJoin",
-        "onPlayerSit",
-        "onPlayerUnsit",
-        "onCharacterSit",
-        "onCharacterUnsit",
-        "onCharacterPickup",
-        "onCreatureSit",
-        "onCreatureUnsit",
-        "onCreaturePickup",
-        "onEquipmentPickup",
-        "onEquipmentDrop",
-        "onPlayerRespawn",
-        "onPlayerLeave",
-        "onToggleMap",
-        "onPlayerDie",
-        "onVehicleSpawn",
-        "onGroupSpawn",
-        "onVehicleDespawn",
-        "onVehicleLoad",
-        "onVehicleUnload",
-        "onVehicleTeleport",
-        "onObjectLoad",
-        "onObjectUnload",
-        "onButtonPress",
-        "onSpawnAddonComponent",
-        "onVehicleDamaged",
-        "onFireExtinguished",
-        "onForestFireSpawned",
-        "onForestFireExtinguished",
-        "onTornado",
-        "onMeteor",
-        "onTsunami",
-        "onWhirlpool",
-        "onVolcano",
-        "onOilSpill"
+    return {
+        Session = session,
+        Calls = decodedCalls,
+        Cancelled = cancelled or {},
+        Fragment = fragment,
+        PollInterval = pollInterval,
+        Subscriptions = subscriptions,
+        Watches = watches
+    }
+end
+
+--[[
+    Decodes the functions to watch.<br>
+    Watches are `{id, path, arguments, period}` where `path` may be an interned index.
+]]
+---@param watches table
+---@param paths table<integer, string>
+---@return SWToPython.Protocol.Watches
+function SWToPython.Libs.Protocol:DecodeWatches(watches, paths)
+    local revision, items = watches[1], watches[2]
+
+    local decodedWatches = {}
+
+    for _, watch in ipairs(items or {}) do
+        local ID, path, arguments, period = watch[1], watch[2], watch[3], watch[4]
+
+        if type(path) == "number" then
+            path = paths[path] or ""
+        end
+
+        table.insert(decodedWatches, {
+            ID = ID,
+            Path = path,
+            Arguments = arguments or {},
+            Period = period or 1
+        })
+    end
+
+    return {
+        Revision = revision,
+        Watches = decodedWatches
+    }
+end
+
+--[[
+    Decodes the callbacks to listen for and their policies.<br>
+    Argument indexes are converted from the 0-based indexes used by the PythonToSW server.
+]]
+---@param subscriptions table
+---@return SWToPython.Protocol.Subscriptions
+function SWToPython.Libs.Protocol:DecodeSubscriptions(subscriptions)
+    local revision, callbacks, policies, filters = subscriptions[1], subscriptions[2], subscriptions[3], subscriptions[4]
+
+    local decodedPolicies = {}
+
+    for name, policy in pairs(policies or {}) do
+        local mode, key, sum, every = policy[1], policy[2], policy[3], policy[4]
+
+        local decodedPolicy = {
+            Mode = mode,
+            Key = {},
+            Sum = {},
+            Every = every or 1
+        }
+
+        for _, index in pairs(key or {}) do
+            table.insert(decodedPolicy.Key, index + 1)
+        end
+
+        for _, index in pairs(sum or {}) do
+            table.insert(decodedPolicy.Sum, index + 1)
+        end
+
+        decodedPolicies[name] = decodedPolicy
+    end
+
+    local decodedFilters = {}
+
+    for name, callbackFilters in pairs(filters or {}) do
+        decodedFilters[name] = {}
+
+        for _, callbackFilter in pairs(callbackFilters) do
+            table.insert(decodedFilters[name], self:DecodeCallbackFilter(callbackFilter))
+        end
+    end
+
+    return {
+        Revision = revision,
+        Callbacks = callbacks or {},
+        Policies = decodedPolicies,
+        Filters = decodedFilters
     }
+end
+
+--[[
+    Decodes the conditions of a callback filter.
+]]
+---@param conditions table
+---@return table<integer, SWToPython.Protocol.CallbackCondition>
+function SWToPython.Libs.Protocol:DecodeCallbackFilter(conditions)
+    local decodedConditions = {}
+
+    for _, condition in pairs(conditions or {}) do
+        local index, op, value = condition[1], condition[2], condition[3]
+
+        local decodedCondition = {
+            Index = index + 1,
+            Op = op,
+            Value = value
+        }
+
+        -- look values up instead of searching through them
+        if op == "in" then
+            decodedCondition.Value = {}
+
+            for _, item in pairs(value or {}) do
+                decodedCondition.Value[item] = true
+            end
+        end
+
+        table.insert(decodedConditions, decodedCondition)
+    end
+
+    return decodedConditions
+end
+
+--[[
+    A decoded response to an update.
+]]
+---@class SWToPython.Protocol.Update
+---@field Session string
+---@field Calls table<integer, SWToPython.Call>
+---@field Cancelled table<integer, integer>
+---@field Fragment integer|nil The index of the next fragment of the transfer sent with the update that the PythonToSW server needs
+---@field PollInterval integer|nil The tick interval the PythonToSW server wants between updates
+---@field Subscriptions SWToPython.Protocol.Subscriptions|nil The callbacks to listen for, if the ones listened for are outdated
+---@field Watches SWToPython.Protocol.Watches|nil The functions to watch, if the ones watched are outdated
+
+--[[
+    The functions the PythonToSW server wants the addon to watch.
+]]
+---@class SWToPython.Protocol.Watches
+---@field Revision integer
+---@field Watches table<integer, SWToPython.Protocol.Watch>
+
+--[[
+    A function called every `Period` ticks, whose latest results are sent with each update.
+]]
+---@class SWToPython.Protocol.Watch
+---@field ID integer
+---@field Path string
+---@field Arguments table
+---@field Period integer
+
+--[[
+    The callbacks the PythonToSW server wants the addon to listen for.
+]]
+---@class SWToPython.Protocol.Subscriptions
+---@field Revision integer
+---@field Callbacks table<integer, string>
+---@field Policies table<string, SWToPython.Protocol.CallbackPolicy>
+---@field Filters table<string, table<integer, table<integer, SWToPython.Protocol.CallbackCondition>>> Triggers are only kept if they pass all conditions of any filter of their callback
+
+--[[
+    How a callback being triggered many times between updates is dealt with.
+]]
+---@class SWToPython.Protocol.CallbackPolicy
+---@field Mode "all"|"latest"|"aggregate"|"sample"
+---@field Key table<integer, integer> The indexes of the arguments that make up the key
+---@field Sum table<integer, integer> The indexes of the arguments that are added up
+---@field Every integer Only 1 in this many triggers is kept when sampling
+
+--[[
+    A check on a single argument of a callback.
+]]
+---@class SWToPython.Protocol.CallbackCondition
+---@field Index integer The index of the argument
+---@field Op "eq"|"prefix"|"in"
+---@field Value any The value to compare against. A lookup table for "in"
+
+--------------------------------------------------------
+-- [SWToPython] Entities
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    A service that keeps track of spawned vehicles and loaded objects.<br>
+    The game has no way to list these, so they're tracked from callbacks and saved, surviving addon reloads.
+]]
+---@class SWToPython.Entities: NoirService
+SWToPython.Entities = Noir.Services:CreateService(
+    "Entities",
+    false,
+    "A service that keeps track of spawned vehicles and loaded objects.",
+    "A service that keeps track of spawned vehicles and loaded objects. The game has no way to list these, so they're tracked from callbacks and saved, surviving addon reloads.",
+    {"Cuh4 (https://github.com/Cuh4)"}
+)
+
+--[[
+    Called when the service is initialized.
+]]
+function SWToPython.Entities:ServiceInit()
+    --[[
+        Spawned vehicles, indexed by vehicle ID.
+    ]]
+    ---@type table<integer, SWToPython.Entities.Vehicle>
+    self.Vehicles = self:EnsuredLoad("Vehicles", {})
+
+    --[[
+        Loaded objects, indexed by object ID.
+    ]]
+    ---@type table<integer, boolean>
+    self.Objects = self:EnsuredLoad("Objects", {})
+end
+
+--[[
+    Called when the service is started.
+]]
+function SWToPython.Entities:ServiceStart()
+    Noir.Callbacks:Connect("onVehicleSpawn", function(vehicle_id, peer_id, x, y, z, group_cost, group_id)
+        self.Vehicles[vehicle_id] = {
+            Group = group_id or -1,
+            Owner = peer_id,
+            Loaded = false
+        }
+    end)
+
+    Noir.Callbacks:Connect("onVehicleDespawn", function(vehicle_id)
+        self.Vehicles[vehicle_id] = nil
+    end)
+
+    Noir.Callbacks:Connect("onVehicleLoad", function(vehicle_id)
+        if self.Vehicles[vehicle_id] then
+            self.Vehicles[vehicle_id].Loaded = true
+        end
+    end)
+
+    Noir.Callbacks:Connect("onVehicleUnload", function(vehicle_id)
+        if self.Vehicles[vehicle_id] then
+            self.Vehicles[vehicle_id].Loaded = false
+        end
+    end)
+
+    Noir.Callbacks:Connect("onObjectLoad", function(object_id)
+        self.Objects[object_id] = true
+    end)
+
+    Noir.Callbacks:Connect("onObjectUnload", function(object_id)
+        self.Objects[object_id] = nil
+    end)
+end
+
+--[[
+    Returns every online player, spawned vehicle and loaded object, each as one flat array:<br>
+    `{{peerID, name, steamID, admin, auth, ...}, {vehicleID, groupID, ownerPeerID, loaded, ...}, {objectID, ...}}`.<br>
+    The group ID and owner peer ID are -1 if the vehicle has none.
+]]
+---@return table<integer, table<integer, any>>
+function SWToPython.Entities:GetSnapshot()
+    local players, vehicles, objects = {}, {}, {}
+
+    for _, player in pairs(server.getPlayers()) do
+        -- dedicated servers list themselves as a player
+        if player.steam_id == 0 then
+            goto continue
+        end
+
+        table.insert(players, player.id)
+        table.insert(players, player.name)
+        table.insert(players, tostring(player.steam_id))
+        table.insert(players, player.admin or false)
+        table.insert(players, player.auth or false)
+
+        ::continue::
+    end
+
+    for vehicleID, vehicle in pairs(self.Vehicles) do
+        table.insert(vehicles, vehicleID)
+        table.insert(vehicles, vehicle.Group)
+        table.insert(vehicles, vehicle.Owner)
+        table.insert(vehicles, vehicle.Loaded)
+    end
+
+    for objectID in pairs(self.Objects) do
+        table.insert(objects, objectID)
+    end
+
+    return {players, vehicles, objects}
+end
+
+--[[
+    A spawned vehicle.
+]]
+---@class SWToPython.Entities.Vehicle
+---@field Group integer The group ID of the vehicle, or -1 if unknown
+---@field Owner integer The peer ID of the player who spawned the vehicle, or -1 if spawned by a script
+---@field Loaded boolean Whether or not the vehicle is loaded
+
+--------------------------------------------------------
+-- [SWToPython] ID
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    A service that provides an ID that is incremented on every retrieval call.
+]]
+---@class SWToPython.ID: NoirService
+SWToPython.ID = Noir.Services:CreateService(
+    "ID",
+    false,
+    "A service that provides an ID that is incremented on every retrieval call.",
+    "A service that provides an ID that is incremented on every retrieval call. Other services can use this for unique identifiers.",
+    {"Cuh4 (https://github.com/Cuh4)"}
+)
+
+--[[
+    Called when the service is initialized.
+]]
+function SWToPython.ID:ServiceInit()
+    --[[
+        The current ID.<br>
+        Don't access this directly, use `:GetID()` instead.
+    ]]
+    ---@type integer
+    self._ID = self:EnsuredLoad("ID", 1)
+end
+
+--[[
+    Returns the current ID, but incrementing it and saving it beforehand.
+]]
+---@return integer
+function SWToPython.ID:GetID()
+    self._ID = self._ID + 1
+    self:Save("ID", self._ID)
+
+    return self._ID
+end
+
+--------------------------------------------------------
+-- [SWToPython] Uplink
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    A service that interacts with the localhost PythonToSW server.
+    This service receives events, acts accordingly, and returns whatever data needed.
+]]
+---@class SWToPython.Uplink: NoirService
+SWToPython.Uplink = Noir.Services:CreateService(
+    "Uplink",
+    false,
+    "A service that interacts with the localhost PythonToSW server.",
+    "A service that interacts with the localhost PythonToSW server. This service receives events, acts accordingly, and returns whatever data needed.",
+    {"Cuh4 (https://github.com/Cuh4)"}
+)
+
+--[[
+    Called when the service is initialized.
+]]
+function SWToPython.Uplink:ServiceInit()
+    --[[
+        The status of the PythonToSW server.
+    ]]
+    self.Alive = true
+
+    --[[
+        How often to check if the PythonToSW server is alive.
+    ]]
+    self.AliveCheckTickInterval = 12 * 64
+
+    --[[
+        The port of the PythonToSW server.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.Port = __PORT
+
+    --[[
+        The request token for the PythonToSW server.
+    ]]
+    self.Token = "__REQUEST_TOKEN"
+
+    --[[
+        The tick interval between updates while there is work.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MinPollInterval = __MIN_POLL_INTERVAL
+
+    --[[
+        The tick interval between updates while idle.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxPollInterval = __MAX_POLL_INTERVAL
+
+    --[[
+        The current tick interval between updates. The PythonToSW server tells us what this should be with every update.
+    ]]
+    self.PollInterval = self.MinPollInterval
+
+    --[[
+        The tick the last update was sent on.
+    ]]
+    self.LastUpdateTick = 0
+
+    --[[
+        The maximum size of a request URL in bytes.<br>
+        Handled calls and triggered callbacks that don't fit are sent in later updates, and ones too large to ever fit are sent as a transfer.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxRequestBytes = __MAX_REQUEST_BYTES
+
+    --[[
+        Bytes of the request URL reserved for the endpoint, token and other small parameters.
+    ]]
+    self.RequestOverheadBytes = 256
+
+    --[[
+        How long the PythonToSW server holds update requests open for until a call is made, in seconds.<br>
+        0 if long polling is disabled.
+    ]]
+    ---@type number
+    ---@diagnostic disable-next-line: undefined-global
+    self.LongPollTimeout = __LONG_POLL_TIMEOUT
+
+    --[[
+        When the current long poll was sent (in milliseconds), or nil if there isn't one.
+    ]]
+    ---@type number|nil
+    self.LongPollSentAt = nil
+
+    --[[
+        The callbacks that can be listened for.
+    ]]
+    self.Callbacks = {
+        "onClearOilSpill",
+        "onCreate",
+        "onDestroy",
+        "onCustomCommand",
+        "onChatMessage",
+        "onPlayerJoin",
+        "onPlayerSit",
+        "onPlayerUnsit",
+        "onCharacterSit",
+        "onCharacterUnsit",
+        "onCharacterPickup",
+        "onCreatureSit",
+        "onCreatureUnsit",
+        "onCreaturePickup",
+        "onEquipmentPickup",
+        "onEquipmentDrop",
+        "onPlayerRespawn",
+        "onPlayerLeave",
+        "onToggleMap",
+        "onPlayerDie",
+        "onVehicleSpawn",
+        "onGroupSpawn",
+        "onVehicleDespawn",
+        "onVehicleLoad",
+        "onVehicleUnload",
+        "onVehicleTeleport",
+        "onObjectLoad",
+        "onObjectUnload",
+        "onButtonPress",
+        "onSpawnAddonComponent",
+        "onVehicleDamaged",
+        "onFireExtinguished",
+        "onForestFireSpawned",
+        "onForestFireExtinguished",
+        "onTornado",
+        "onMeteor",
+        "onTsunami",
+        "onWhirlpool",
+        "onVolcano",
+        "onOilSpill"
+    }
+
+    --[[
+        The callbacks the PythonToSW server wants, mapped to their connection.<br>
+        Callbacks nothing in the PythonToSW server is connected to aren't listened for at all.
+    ]]
+    ---@type table<string, NoirConnection>
+    self.Subscriptions = {}
+
+    --[[
+        The revision of the subscribed callbacks and their policies. The PythonToSW server sends them when this is outdated.
+    ]]
+    ---@type integer
+    self.SubscriptionsRevision = -1
+
+    --[[
+        Functions called every so often, whose latest results are sent to the PythonToSW server. Indexed by watch ID.
+    ]]
+    ---@type table<integer, SWToPython.Uplink.Watch>
+    self.Watches = {}
+
+    --[[
+        The revision of the watches. The PythonToSW server sends them when this is outdated.
+    ]]
+    ---@type integer
+    self.WatchesRevision = -1
+
+    --[[
+        How callbacks triggered many times between updates are dealt with. Callbacks without a policy are always sent.
+    ]]
+    ---@type table<string, SWToPython.Protocol.CallbackPolicy>
+    self.CallbackPolicies = {}
+
+    --[[
+        How long calls can take to execute per tick in milliseconds, before the rest are carried over to the next tick.
+    ]]
+    ---@type number
+    ---@diagnostic disable-next-line: undefined-global
+    self.CallBudgetMilliseconds = __CALL_BUDGET_MILLISECONDS
+
+    --[[
+        The maximum amount of calls executed per tick.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxCallsPerTick = __MAX_CALLS_PER_TICK
+
+    --[[
+        Received calls waiting to be executed, per priority class (0 = high, 1 = normal, 2 = low).
+    ]]
+    ---@type table<integer, SWToPython.Uplink.CallQueue>
+    self.PendingCalls = {
+        [0] = {Items = {}, First = 1, Last = 0},
+        [1] = {Items = {}, First = 1, Last = 0},
+        [2] = {Items = {}, First = 1, Last = 0}
+    }
+
+    --[[
+        The IDs of received calls waiting to be executed. Calls removed from here (e.g. cancelled) are skipped.
+    ]]
+    ---@type table<integer, SWToPython.Call>
+    self.PendingCallIDs = {}
+
+    --[[
+        Received calls that haven't been executed yet, indexed by their ID.<br>
+        Saved so calls acknowledged through the watermark aren't lost if the addon reloads before executing them.
+    ]]
+    ---@type table<integer, table>
+    self.SavedCalls = self:EnsuredLoad("Calls", {})
+
+    --[[
+        The last tick (`TaskService.Ticks`) before the addon reloaded. Ticks start from 0 again after a reload, so saved scheduled calls are rescheduled relative to this.
+    ]]
+    ---@type integer
+    self.SavedTick = self:Load("Tick", 0)
+
+    --[[
+        Received calls scheduled for a later tick, along with the tasks that execute them.
+    ]]
+    ---@type table<integer, NoirTask>
+    self.ScheduledCalls = {}
+
+    --[[
+        The tick the call execution budget was last reset in, along with what has been used of it.
+    ]]
+    self.BudgetTick = -1
+    self.BudgetUsed = 0
+    self.BudgetCalls = 0
+    self.BudgetOverran = false
+    self.BudgetDeferred = false
+
+    --[[
+        Call execution budget overruns since last reported to the PythonToSW server.
+    ]]
+    ---@type SWToPython.Uplink.BudgetStats
+    self.BudgetStats = {Overruns = 0, OverrunMilliseconds = 0, Deferred = 0}
+
+    --[[
+        The maximum amount of unsent triggered callbacks. Once reached, `CallbackOverflow` decides what is dropped.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxCallbackBacklog = __MAX_CALLBACK_BACKLOG
+
+    --[[
+        What to do when the backlog of triggered callbacks is full.<br>
+        "drop_oldest" drops the oldest unsent trigger, "drop_by_callback" drops the oldest unsent trigger of the callback with the most unsent triggers,
+        and "summarize" keeps only the latest unsent trigger of each callback. Either way, the PythonToSW server is told how many triggers of each callback were dropped.
+    ]]
+    ---@type "drop_oldest"|"drop_by_callback"|"summarize"
+    ---@diagnostic disable-next-line: undefined-global
+    self.CallbackOverflow = __CALLBACK_OVERFLOW
+
+    --[[
+        The maximum amount of triggered callbacks sent in one update, so a large backlog (e.g. after the PythonToSW server was down) is sent over several updates.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxCallbacksPerUpdate = __MAX_CALLBACKS_PER_UPDATE
+
+    --[[
+        Triggered callbacks in the order they were triggered, per callback. Used to find what to drop when the backlog is full.
+    ]]
+    ---@type table<string, SWToPython.Uplink.Backlog>
+    self.CallbackBacklog = {}
+
+    --[[
+        The amount of unsent triggered callbacks.
+    ]]
+    self.TriggeredCallbackCount = 0
+
+    --[[
+        How many triggers of each callback were dropped since last reported to the PythonToSW server.
+    ]]
+    ---@type table<string, integer>
+    self.DroppedCallbacks = self:EnsuredLoad("DroppedCallbacks", {})
+
+    --[[
+        The filters triggers of callbacks must pass (any of) to be kept. Callbacks without filters are always kept.
+    ]]
+    ---@type table<string, table<integer, table<integer, SWToPython.Protocol.CallbackCondition>>>
+    self.CallbackFilters = {}
+
+    --[[
+        Unsent triggered callbacks that later triggers with the same key are merged into, indexed by key.
+    ]]
+    ---@type table<string, SWToPython.TriggeredCallback>
+    self.CoalescedCallbacks = {}
+
+    --[[
+        The keys of triggered callbacks in `CoalescedCallbacks`.
+    ]]
+    ---@type table<SWToPython.TriggeredCallback, string>
+    self.CoalesceKeys = {}
+
+    --[[
+        How many times each sampled callback has been triggered, modulo its sample rate.
+    ]]
+    ---@type table<string, integer>
+    self.SampleCounts = {}
+
+    --[[
+        A table of triggered callbacks.
+    ]]
+    ---@type table<integer, SWToPython.TriggeredCallback>
+    self.TriggeredCallbacks = {}
+
+    --[[
+        A table of handled calls.
+    ]]
+    ---@type table<integer, SWToPython.HandledCall>
+    self.HandledCalls = {}
+
+    --[[
+        The session of the PythonToSW server that the watermark belongs to.<br>
+        Changes whenever the PythonToSW server restarts.
+    ]]
+    ---@type string
+    self.Session = self:EnsuredLoad("Session", "")
+
+    --[[
+        The ID of the latest call received from the PythonToSW server.<br>
+        Sent with every update so the server only sends calls above it.
+    ]]
+    ---@type integer
+    self.Watermark = self:EnsuredLoad("Watermark", 0)
+
+    --[[
+        IDs of calls the PythonToSW server cancelled before they were received.<br>
+        These are skipped if they arrive through an overlapping update.
+    ]]
+    ---@type table<integer, boolean>
+    self.CancelledCalls = {}
+
+    --[[
+        The protocol version agreed on with the PythonToSW server at handshake.<br>
+        Updates aren't sent until a handshake succeeds.
+    ]]
+    ---@type integer
+    self.Protocol = SWToPython.Libs.Protocol.Version
+
+    --[[
+        Interned function paths, indexed by their ID. Sent by the PythonToSW server at handshake.
+    ]]
+    ---@type table<integer, string>
+    self.Paths = {}
+
+    --[[
+        Interned callback names mapped to their ID. Sent by the PythonToSW server at handshake.
+    ]]
+    ---@type table<string, integer>
+    self.CallbackIDs = {}
+
+    --[[
+        The session of the PythonToSW server the last handshake was performed with.
+    ]]
+    ---@type string|nil
+    self.HandshakeSession = nil
+
+    --[[
+        When the handshake waiting for a response was sent (in milliseconds), or nil if there isn't one.
+    ]]
+    ---@type number|nil
+    self.HandshakeSentAt = nil
+
+    --[[
+        The transfer currently being sent to the PythonToSW server, if any.
+    ]]
+    ---@type SWToPython.Transfer|nil
+    self.Transfer = nil
+
+    --[[
+        The amount of outgoing requests that haven't received a response yet.
+    ]]
+    self.Outgoing = 0
+
+    --[[
+        The maximum amount of updates that can be waiting for a response at once.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxInFlight = __MAX_IN_FLIGHT
+
+    --[[
+        Updates waiting for a response, indexed by their request ID.
+    ]]
+    ---@type table<integer, SWToPython.Uplink.InFlightUpdate>
+    self.InFlight = {}
+
+    --[[
+        Handled calls and triggered callbacks sent in updates that are waiting for a response, mapped to the request ID of the update.<br>
+        These aren't sent again by other updates.
+    ]]
+    ---@type table<SWToPython.HandledCall|SWToPython.TriggeredCallback, integer>
+    self.InFlightItems = {}
+
+    --[[
+        The ID of the last update sent. Also makes every update URL unique.
+    ]]
+    self.RequestID = 0
+
+    --[[
+        The smoothed round trip time of updates in milliseconds, or nil if no update has been answered yet.
+    ]]
+    ---@type number|nil
+    self.RTT = nil
+end
+
+--[[
+    Called when the service is started.
+]]
+function SWToPython.Uplink:ServiceStart()
+    -- subscribe to the callbacks connected before the PythonToSW server generated this script
+    ---@diagnostic disable-next-line: undefined-global
+    self:Subscribe(SWToPython.Libs.Protocol:DecodeSubscriptions((Noir.Libraries.JSON:Decode(__SUBSCRIPTIONS))))
+
+    --[[
+        A repeated task for updating the PythonToSW server with new data.
+    ]]
+    self.UpdateTask = Noir.Services.TaskService:AddTickTask(function()
+        self:Poll()
+    end, self.MinPollInterval, nil, true)
+
+    --[[
+        A repeated task for executing received calls under the per-tick budget.
+    ]]
+    self.ExecuteTask = Noir.Services.TaskService:AddTickTask(function()
+        self:ExecuteCalls()
+    end, 1, nil, true)
+
+    --[[
+        A repeated task for checking if the PythonToSW server is alive.
+    ]]
+    self.CheckAliveTask = Noir.Services.TaskService:AddTickTask(function()
+        self:CheckAlive()
+    end, self.AliveCheckTickInterval, nil, true)
+
+    -- Load handled calls from previous session
+    if Noir.AddonReason == "AddonReload" then
+        Noir.Services.HoarderService:LoadAll(
+            self,
+            "HandledCalls",
+            self.HandledCalls,
+            SWToPython.Classes.HandledCall,
+            {}
+        )
+
+        Noir.Services.HoarderService:LoadAll(
+            self,
+            "TriggeredCallbacks",
+            self.TriggeredCallbacks,
+            SWToPython.Classes.TriggeredCallback,
+            {}
+        )
+
+        for _, triggeredCallback in ipairs(self:GetSortedTriggeredCallbacks()) do
+            self:AddToBacklog(triggeredCallback)
+        end
+    end
+
+    -- Requeue calls received but not executed before the addon reloaded (or the save was loaded)
+    self:RestoreCalls()
+end
+
+--[[
+    Returns a function from a path, or nil if not found.<br>
+    Example path: "server.announce", "foo.bar.myFunction", etc.
+]]
+---@param path string
+---@return function|nil
+function SWToPython.Uplink:GetFunction(path)
+    local at = _ENV
+
+    for _, segment in pairs(Noir.Libraries.String:Split(path, ".")) do
+        local nextPoint = at[segment]
+
+        if not nextPoint then
+            return nil
+        end
+
+        if type(nextPoint) ~= "table" and type(nextPoint) ~= "function" then
+            return nil
+        end
+
+        at = nextPoint
+    end
+
+    if type(at) == "function" then
+        return at
+    else
+        return nil
+    end
+end
+
+--[[
+    Sends a request to the PythonToSW server.
+]]
+---@param endpoint string
+---@param params table<string, any>
+---@param callback fun(response: any)|nil
+---@param overrideAliveCheck boolean|nil
+function SWToPython.Uplink:Request(endpoint, params, callback, overrideAliveCheck)
+    if not self.Alive and not overrideAliveCheck then
+        return
+    end
+
+    -- Pass token with request
+    params["token"] = self.Token
+
+    -- JSON encode certain data
+    for key, value in pairs(params) do
+        if type(value) == "table" then
+            params[key] = Noir.Libraries.JSON:Encode(value)
+        end
+    end
+
+    -- Send the request
+    Noir.Services.HTTPService:GET(
+        endpoint..Noir.Libraries.HTTP:URLParameters(params),
+        self.Port,
+        function (response)
+            self.Outgoing = self.Outgoing - 1
+
+            -- http queue fuckery
+            if not self.Alive and not overrideAliveCheck then
+                return
+            end
+
+            -- if the request failed, the server is likely down. we'll validate this later
+            if not response:IsOk() then
+                if not self.Alive then
+                    return
+                end
+
+                warn("Uplink:Request(): Request returned not ok. Proceeding to assume the PythonToSW server is down. Response: %s", response.Text)
+                self:SetAlive(false)
+
+                return
+            end
+
+            -- decode the data
+            local data = response:JSON()
+
+            if not data then
+                warn("Uplink:Request(): Failed to parse response from request to '%s' on PythonToSW server. Response: %s", endpoint, response.Text)
+                return
+            end
+
+            if data["detail"] and Noir.Libraries.String:StartsWith(data["detail"], "no_auth") then
+                warn("Uplink:Request(): Can't send request. Outdated token. Try `?reload_scripts`.")
+                return
+            end
+
+            if data["detail"] then
+                warn("Uplink:Request(): Sent request, but got an error from PythonToSW server: %s", data["detail"])
+                return
+            end
+
+            if callback then
+                callback(data)
+            end
+        end
+    )
+
+    self.Outgoing = self.Outgoing + 1
+end
+
+--[[
+    Sets if the PythonToSW server is alive.
+]]
+---@param alive boolean
+function SWToPython.Uplink:SetAlive(alive)
+    if self.Alive == alive then
+        warn("Uplink:SetAlive(): Attempted to set alive to what it is already.")
+        return
+    end
+
+    self.Alive = alive
+
+    if self.Alive then
+        -- the handshake, long poll and other updates may have been lost while the server was down
+        self.HandshakeSession = nil
+        self.HandshakeSentAt = nil
+        self.LongPollSentAt = nil
+
+        for requestID in pairs(self.InFlight) do
+            self:FailInFlight(requestID)
+        end
+
+        print("Uplink:SetAlive(): PythonToSW server is alive.")
+    else
+        warn("Uplink:SetAlive(): PythonToSW server is not alive.")
+    end
+end
+
+--[[
+    Propagates an error to the PythonToSW server.
+]]
+---@param message string
+function SWToPython.Uplink:PropagateError(message)
+    warn("Uplink:PropagateError(): "..message)
+    self:Request("/error", {message = message})
+end
+
+--[[
+    Agrees on a protocol version with the PythonToSW server, and receives the tables of interned function paths and callback names.<br>
+    Does nothing while a handshake is waiting for a response, unless it has been waiting long enough to have been lost.
+]]
+function SWToPython.Uplink:Handshake()
+    local now = server.getTimeMillisec()
+
+    if self.HandshakeSentAt and now - self.HandshakeSentAt < math.max(5000, (self.RTT or 0) * 4) then
+        return
+    end
+
+    self.HandshakeSentAt = now
+
+    self:Request(
+        "/handshake",
+
+        {
+            version = SWToPython.Libs.Protocol.Version
+        },
+
+        ---@param handshake table
+        function(handshake)
+            self.HandshakeSentAt = nil
+            self.Paths = handshake.paths
+            self.CallbackIDs = {}
+
+            for index, name in ipairs(handshake.callbacks) do
+                self.CallbackIDs[name] = index
+            end
+
+            self.Protocol = handshake.version
+            self.HandshakeSession = handshake.session
+
+            if handshake.session ~= self.Session then
+                self:SetSession(handshake.session)
+            end
+        end
+    )
+end
+
+--[[
+    Sends an update if one is due, or straight away if there is something to send.
+]]
+function SWToPython.Uplink:Poll()
+    if Noir.Services.TaskService.Ticks - self.LastUpdateTick < self.PollInterval and not self:HasDataToSend() then
+        return
+    end
+
+    self:Update()
+end
+
+--[[
+    Sets the tick interval between updates, within the minimum and maximum.
+]]
+---@param interval integer
+function SWToPython.Uplink:SetPollInterval(interval)
+    self.PollInterval = math.min(math.max(interval, self.MinPollInterval), self.MaxPollInterval)
+end
+
+--[[
+    Handles the process of running calls from the PythonToSW server, returning values, etc.
+]]
+function SWToPython.Uplink:Update()
+    -- the server restarted (or we never shook hands), so the interned tables may be outdated. updates are encoded with them, so wait for a handshake
+    if self.HandshakeSession ~= self.Session then
+        self:Handshake()
+        return
+    end
+
+    -- the transfer was encoded for a different protocol version, so start it over
+    if self.Transfer and self.Transfer.Version ~= self.Protocol then
+        self.Transfer = nil
+    end
+
+    -- pace ourselves to the server, instead of piling up requests it hasn't answered yet
+    self:ExpireInFlight()
+
+    if self:GetInFlightCount() >= self.MaxInFlight then
+        return
+    end
+
+    local version = self.Protocol
+    local paths = self.Paths
+    local transfer = self.Transfer
+    local budget = self.MaxRequestBytes - self.RequestOverheadBytes
+
+    self.RequestID = self.RequestID + 1
+    local requestID = self.RequestID
+
+    local params = {
+        ack = self.Watermark,
+        session = self.Session,
+        v = version,
+        rid = requestID,
+        rtt = self.RTT and math.floor(self.RTT) or nil,
+        sub = self.SubscriptionsRevision,
+        watch = self.WatchesRevision,
+        tick = Noir.Services.TaskService.Ticks
+    }
+
+    -- with long polling, the server holds one update open at a time until a call is made.
+    -- other updates are only sent if there is something to send in the meantime
+    local longPoll = false
+
+    if self:IsLongPolling() then
+        if self:IsLongPollOutstanding() then
+            if not self:HasDataToSend() then
+                return
+            end
+        else
+            longPoll = true
+            params.wait = 1
+            self.LongPollSentAt = server.getTimeMillisec()
+        end
+    end
+
+    self.LastUpdateTick = Noir.Services.TaskService.Ticks
+
+    if transfer then
+        local index, fragment = transfer:NextFragment()
+
+        params.transfer = transfer.ID
+        params.fragment = index
+        params.fragments = #transfer.Fragments
+        params.data = fragment
+
+        budget = budget - self:GetEncodedSize(fragment)
+    end
+
+    -- report dropped callbacks, which are reported again if this update never gets a response
+    local dropped
+
+    if next(self.DroppedCallbacks) then
+        dropped = self.DroppedCallbacks
+        budget = budget - self:GetEncodedSize(Noir.Libraries.JSON:Encode(dropped))
+
+        self.DroppedCallbacks = {}
+        self:Save("DroppedCallbacks", self.DroppedCallbacks)
+    end
+
+    local handledCalls, _handledCalls, oversizedHandledCall
+    handledCalls, _handledCalls, budget, oversizedHandledCall = self:Pack(
+        self:GetSortedHandledCalls(),
+
+        function(handledCall)
+            return SWToPython.Libs.Protocol:EncodeHandledCall(handledCall)
+        end,
+
+        function(handledCall)
+            if self.InFlightItems[handledCall] or (transfer and transfer:HasHandledCall(handledCall)) then
+                return "skip"
+            end
+        end,
+
+        budget,
+        false
+    )
+
+    -- callbacks must be sent in order, so callbacks after one that doesn't fit wait for the next update
+    local triggeredCallbacks, _triggeredCallbacks, oversizedTriggeredCallback
+    triggeredCallbacks, _triggeredCallbacks, budget, oversizedTriggeredCallback = self:Pack(
+        self:GetSortedTriggeredCallbacks(),
+
+        function(triggeredCallback)
+            return SWToPython.Libs.Protocol:EncodeTriggeredCallback(triggeredCallback, self.CallbackIDs)
+        end,
+
+        function(triggeredCallback)
+            if self.InFlightItems[triggeredCallback] then
+                return "skip"
+            end
+
+            -- callbacks after one being transferred wait until it has been received
+            if transfer and transfer:HasTriggeredCallback(triggeredCallback) then
+                return "stop"
+            end
+        end,
+
+        budget,
+        true,
+        self.MaxCallbacksPerUpdate
+    )
+
+    -- only the latest sample of each watch is kept, so samples that don't fit are replaced by newer ones
+    local samples, _samples, oversizedSample
+    samples, _samples, budget, oversizedSample = self:Pack(
+        self:GetUnsentSamples(),
+
+        function(sample)
+            return sample
+        end,
+
+        function()
+        end,
+
+        budget,
+        false
+    )
+
+    for _, sample in ipairs(_samples) do
+        self.Watches[sample[1]].Unsent = false
+    end
+
+    if oversizedSample then
+        self.Watches[oversizedSample[1]].Unsent = false
+        self:PropagateError(("Sample of watch #%d is too large to send."):format(oversizedSample[1]))
+    end
+
+    if not transfer and (oversizedHandledCall or oversizedTriggeredCallback) then
+        self:StartTransfer({oversizedHandledCall}, {oversizedTriggeredCallback}, version)
+    end
+
+    params.handled_calls = handledCalls
+    params.triggered_callbacks = triggeredCallbacks
+
+    self:AddInFlight(requestID, _handledCalls, _triggeredCallbacks)
+
+    if #_samples > 0 then
+        params.samples = samples
+        self.InFlight[requestID].Samples = _samples
+    end
+
+    if dropped then
+        params.dropped = dropped
+        self.InFlight[requestID].Dropped = dropped
+    end
+
+    local budgetStats = self.BudgetStats
+
+    if budgetStats.Overruns > 0 or budgetStats.Deferred > 0 then
+        params.budget = {budgetStats.Overruns, math.floor(budgetStats.OverrunMilliseconds), budgetStats.Deferred}
+        self.InFlight[requestID].Budget = budgetStats
+
+        self.BudgetStats = {Overruns = 0, OverrunMilliseconds = 0, Deferred = 0}
+    end
+
+    self:Request(
+        "/update",
+        params,
+
+        ---@param _update table
+        function(_update)
+            if longPoll then
+                self.LongPollSentAt = nil
+            end
+
+            self:RemoveInFlight(requestID, not longPoll)
+
+            local update = SWToPython.Libs.Protocol:DecodeUpdate(_update, paths)
+
+            if update.Session ~= self.Session then
+                self:SetSession(update.Session)
+            end
+
+            if update.PollInterval then
+                self:SetPollInterval(update.PollInterval)
+            end
+
+            if update.Subscriptions then
+                self:Subscribe(update.Subscriptions)
+            end
+
+            if update.Watches then
+                self:SetWatches(update.Watches)
+            end
+
+            if transfer and update.Fragment and transfer:Acknowledge(update.Fragment) then
+                self:CompleteTransfer(transfer)
+            end
+
+            for _, callID in ipairs(update.Cancelled) do
+                self:CancelCall(callID)
+            end
+
+            for _, call in ipairs(update.Calls) do
+                -- already received through an earlier or overlapping update
+                if call.ID <= self.Watermark then
+                    goto continue
+                end
+
+                if not self.CancelledCalls[call.ID] then
+                    if call:IsScheduled() then
+                        self:ScheduleCall(call)
+                    else
+                        self:QueueCall(call)
+                    end
+                end
+
+                self:SetWatermark(call.ID)
+
+                ::continue::
+            end
+
+            for callID in pairs(self.CancelledCalls) do
+                if callID <= self.Watermark then
+                    self.CancelledCalls[callID] = nil
+                end
+            end
+
+            -- execute what fits in this tick's budget straight away, the rest is carried over
+            self:ExecuteCalls()
+
+            for _, triggeredCallback in pairs(_triggeredCallbacks) do
+                self:RemoveTriggeredCallback(triggeredCallback)
+            end
+
+            for _, handledCall in pairs(_handledCalls) do
+                self:RemoveHandledCall(handledCall)
+            end
+
+            -- poll again straight away, sending back the results of the calls we just handled
+            if longPoll then
+                self:Update()
+            end
+        end
+    )
+end
+
+--[[
+    Tracks an update that is waiting for a response, along with the handled calls and triggered callbacks it carries.
+]]
+---@param requestID integer
+---@param handledCalls table<integer, SWToPython.HandledCall>
+---@param triggeredCallbacks table<integer, SWToPython.TriggeredCallback>
+function SWToPython.Uplink:AddInFlight(requestID, handledCalls, triggeredCallbacks)
+    self.InFlight[requestID] = {
+        SentAt = server.getTimeMillisec(),
+        HandledCalls = handledCalls,
+        TriggeredCallbacks = triggeredCallbacks
+    }
+
+    for _, handledCall in ipairs(handledCalls) do
+        self.InFlightItems[handledCall] = requestID
+    end
+
+    for _, triggeredCallback in ipairs(triggeredCallbacks) do
+        self.InFlightItems[triggeredCallback] = requestID
+    end
+end
+
+--[[
+    Stops tracking an update, making whatever it carried sendable again (unless removed).<br>
+    If `measure` is true, the round trip time of the update is added to the smoothed RTT.
+]]
+---@param requestID integer
+---@param measure boolean
+function SWToPython.Uplink:RemoveInFlight(requestID, measure)
+    local inFlight = self.InFlight[requestID]
+
+    if not inFlight then
+        return
+    end
+
+    self.InFlight[requestID] = nil
+
+    for _, item in ipairs(inFlight.HandledCalls) do
+        self.InFlightItems[item] = nil
+    end
+
+    for _, item in ipairs(inFlight.TriggeredCallbacks) do
+        self.InFlightItems[item] = nil
+    end
+
+    if not measure then
+        return
+    end
+
+    local sample = server.getTimeMillisec() - inFlight.SentAt
+    self.RTT = self.RTT and (self.RTT * 0.875 + sample * 0.125) or sample
+end
+
+--[[
+    Stops tracking updates that never got a response (e.g. the request failed).
+]]
+function SWToPython.Uplink:ExpireInFlight()
+    local now = server.getTimeMillisec()
+    local timeout = math.max(5000, (self.RTT or 0) * 4) + self.LongPollTimeout * 1000
+
+    for requestID, inFlight in pairs(self.InFlight) do
+        if now - inFlight.SentAt > timeout then
+            self:FailInFlight(requestID)
+        end
+    end
+end
+
+--[[
+    Stops tracking an update that never got a response. The dropped callback counts, budget overruns and samples it carried are reported again.
+]]
+---@param requestID integer
+function SWToPython.Uplink:FailInFlight(requestID)
+    local inFlight = self.InFlight[requestID]
+
+    if not inFlight then
+        return
+    end
+
+    for callbackName, count in pairs(inFlight.Dropped or {}) do
+        self.DroppedCallbacks[callbackName] = (self.DroppedCallbacks[callbackName] or 0) + count
+    end
+
+    -- resend samples that haven't been replaced by a newer one since
+    for _, sample in ipairs(inFlight.Samples or {}) do
+        local watch = self.Watches[sample[1]]
+
+        if watch and watch.Sample == sample then
+            watch.Unsent = true
+        end
+    end
+
+    if inFlight.Budget then
+        self.BudgetStats.Overruns = self.BudgetStats.Overruns + inFlight.Budget.Overruns
+        self.BudgetStats.OverrunMilliseconds = self.BudgetStats.OverrunMilliseconds + inFlight.Budget.OverrunMilliseconds
+        self.BudgetStats.Deferred = self.BudgetStats.Deferred + inFlight.Budget.Deferred
+    end
+
+    self:RemoveInFlight(requestID, false)
+end
+
+--[[
+    Returns the amount of updates waiting for a response.
+]]
+---@return integer
+function SWToPython.Uplink:GetInFlightCount()
+    local count = 0
+
+    for _ in pairs(self.InFlight) do
+        count = count + 1
+    end
+
+    return count
+end
+
+--[[
+    Returns if long polling is enabled.
+]]
+---@return boolean
+function SWToPython.Uplink:IsLongPolling()
+    return self.LongPollTimeout > 0
+end
+
+--[[
+    Returns if a long poll is currently held open by the PythonToSW server.<br>
+    Long polls that never got a response (e.g. the request failed) are forgotten after a while.
+]]
+---@return boolean
+function SWToPython.Uplink:IsLongPollOutstanding()
+    if not self.LongPollSentAt then
+        return false
+    end
+
+    return server.getTimeMillisec() - self.LongPollSentAt < self.LongPollTimeout * 2000 + 1000
+end
+
+--[[
+    Returns if there are handled calls, triggered callbacks, samples or a transfer to send to the PythonToSW server, that aren't already on their way.
+]]
+---@return boolean
+function SWToPython.Uplink:HasDataToSend()
+    if self.Transfer then
+        return true
+    end
+
+    for _, handledCall in pairs(self.HandledCalls) do
+        if not self.InFlightItems[handledCall] then
+            return true
+        end
+    end
+
+    for _, triggeredCallback in pairs(self.TriggeredCallbacks) do
+        if not self.InFlightItems[triggeredCallback] then
+            return true
+        end
+    end
+
+    for _, watch in pairs(self.Watches) do
+        if watch.Unsent then
+            return true
+        end
+    end
+
+    return false
+end
+
+--[[
+    Returns the size of a string once URL encoded.
+]]
+---@param str string
+---@return integer
+function SWToPython.Uplink:GetEncodedSize(str)
+    return #Noir.Libraries.HTTP:URLEncode(str)
+end
+
+--[[
+    Packs items into a JSON array until the budget (in URL encoded bytes) runs out.<br>
+    Returns the JSON array, the packed items, the remaining budget, and the first item too large to ever fit in a request.
+]]
+---@param items table<integer, any>
+---@param encode fun(item: any): table
+---@param filter fun(item: any): "skip"|"stop"|nil Returns "skip" to leave an item out, or "stop" to stop packing
+---@param budget integer
+---@param ordered boolean If true, packing stops at the first item that doesn't fit so items are never sent out of order
+---@param limit integer|nil The maximum amount of items to pack
+---@return string, table<integer, any>, integer, any
+function SWToPython.Uplink:Pack(items, encode, filter, budget, ordered, limit)
+    local maxItemSize = self.MaxRequestBytes - self.RequestOverheadBytes
+    local parts = {}
+    local packed = {}
+    local oversized
+
+    for _, item in ipairs(items) do
+        if limit and #packed >= limit then
+            break
+        end
+
+        local action = filter(item)
+
+        if action == "stop" then
+            break
+        elseif action == "skip" then
+            goto continue
+        end
+
+        local part = SWToPython.Libs.Protocol:Encode(encode(item))
+        local size = self:GetEncodedSize(part) + 3 -- + encoded comma
+
+        if size > maxItemSize then
+            oversized = oversized or item
+        elseif size <= budget then
+            table.insert(parts, part)
+            table.insert(packed, item)
+            budget = budget - size
+
+            goto continue
+        end
+
+        if ordered then
+            break
+        end
+
+        ::continue::
+    end
+
+    return "["..table.concat(parts, ",").."]", packed, budget, oversized
+end
+
+--[[
+    Starts sending handled calls and triggered callbacks too large to fit in a request as a transfer.
+]]
+---@param handledCalls table<integer, SWToPython.HandledCall>
+---@param triggeredCallbacks table<integer, SWToPython.TriggeredCallback>
+---@param version integer
+function SWToPython.Uplink:StartTransfer(handledCalls, triggeredCallbacks, version)
+    local encodedHandledCalls = {}
+    local encodedTriggeredCallbacks = {}
+
+    for index, handledCall in ipairs(handledCalls) do
+        encodedHandledCalls[index] = SWToPython.Libs.Protocol:EncodeHandledCall(handledCall)
+    end
+
+    for index, triggeredCallback in ipairs(triggeredCallbacks) do
+        encodedTriggeredCallbacks[index] = SWToPython.Libs.Protocol:EncodeTriggeredCallback(triggeredCallback, self.CallbackIDs)
+    end
+
+    local payload = "["..SWToPython.Libs.Protocol:Encode(encodedHandledCalls)..","..SWToPython.Libs.Protocol:Encode(encodedTriggeredCallbacks).."]"
+
+    -- fragments take up to half of a request, and URL encoding can triple their size
+    local fragmentSize = math.max(1, (self.MaxRequestBytes - self.RequestOverheadBytes) // 6)
+
+    self.Transfer = SWToPython.Classes.Transfer:New(
+        SWToPython.ID:GetID(),
+        version,
+        payload,
+        fragmentSize,
+        handledCalls,
+        triggeredCallbacks
+    )
+end
+
+--[[
+    Completes a transfer once the PythonToSW server has received all of it.
+]]
+---@param transfer SWToPython.Transfer
+function SWToPython.Uplink:CompleteTransfer(transfer)
+    for _, handledCall in ipairs(transfer.HandledCalls) do
+        self:RemoveHandledCall(handledCall)
+    end
+
+    for _, triggeredCallback in ipairs(transfer.TriggeredCallbacks) do
+        self:RemoveTriggeredCallback(triggeredCallback)
+    end
+
+    if self.Transfer == transfer then
+        self.Transfer = nil
+    end
+end
+
+--[[
+    Sets the session of the PythonToSW server.<br>
+    Resets the watermark and discards handled calls from the previous session, since the server no longer knows about them.
+]]
+---@param session string
+function SWToPython.Uplink:SetSession(session)
+    self.Session = session
+    self:Save("Session", session)
+
+    self:SetWatermark(0)
+    self.CancelledCalls = {}
+    self.PendingCallIDs = {}
+
+    self.SavedCalls = {}
+    self:Save("Calls", self.SavedCalls)
+    self.Transfer = nil
+
+    for callID in pairs(Noir.Libraries.Table:Copy(self.ScheduledCalls)) do
+        self:UnscheduleCall(callID)
+    end
+
+    -- the new server may be connected to different callbacks (and watch different functions under the same IDs) under the same revision
+    self.SubscriptionsRevision = -1
+    self.WatchesRevision = -1
+
+    for watchID in pairs(Noir.Libraries.Table:Copy(self.Watches)) do
+        self:RemoveWatch(watchID)
+    end
+
+    for _, handledCall in pairs(Noir.Libraries.Table:Copy(self.HandledCalls)) do
+        self:RemoveHandledCall(handledCall)
+    end
+end
+
+--[[
+    Cancels a call the PythonToSW server no longer wants.<br>
+    If the call has already been handled, its result is discarded instead of being sent. Otherwise, the call is skipped when received.
+]]
+---@param callID integer
+function SWToPython.Uplink:CancelCall(callID)
+    local handledCall = self.HandledCalls[callID]
+
+    if handledCall then
+        self:RemoveHandledCall(handledCall)
+        return
+    end
+
+    if self.PendingCallIDs[callID] then
+        self.PendingCallIDs[callID] = nil
+        self:UnsaveCall(callID)
+        return
+    end
+
+    if self:UnscheduleCall(callID) then
+        return
+    end
+
+    if callID > self.Watermark then
+        self.CancelledCalls[callID] = true
+    end
+end
+
+--[[
+    Sets the ID of the latest call received from the PythonToSW server.
+]]
+---@param watermark integer
+function SWToPython.Uplink:SetWatermark(watermark)
+    self.Watermark = watermark
+    self:Save("Watermark", watermark)
+end
+
+--[[
+    Returns handled calls, oldest first.
+]]
+---@return table<integer, SWToPython.HandledCall>
+function SWToPython.Uplink:GetSortedHandledCalls()
+    ---@type table<integer, SWToPython.HandledCall>
+    local handledCalls = {}
+
+    for _, handledCall in pairs(self.HandledCalls) do
+        table.insert(handledCalls, handledCall)
+    end
+
+    table.sort(handledCalls, function (handledCallA, handledCallB)
+        -- things that happened in the same millisecond keep the order they happened in
+        if handledCallA.Time == handledCallB.Time then
+            return handledCallA.ID < handledCallB.ID
+        end
+
+        return handledCallA.Time < handledCallB.Time
+    end)
+
+    return handledCalls
+end
+
+--[[
+    Returns triggered callbacks, oldest first.
+]]
+---@return table<integer, SWToPython.TriggeredCallback>
+function SWToPython.Uplink:GetSortedTriggeredCallbacks()
+    ---@type table<integer, SWToPython.TriggeredCallback>
+    local triggeredCallbacks = {}
+
+    for _, triggeredCallback in pairs(self.TriggeredCallbacks) do
+        table.insert(triggeredCallbacks, triggeredCallback)
+    end
+
+    table.sort(triggeredCallbacks, function (triggeredCallbackA, triggeredCallbackB)
+        -- things that happened in the same millisecond keep the order they happened in
+        if triggeredCallbackA.Time == triggeredCallbackB.Time then
+            return triggeredCallbackA.ID < triggeredCallbackB.ID
+        end
+
+        return triggeredCallbackA.Time < triggeredCallbackB.Time
+    end)
+
+    return triggeredCallbacks
+end
+
+--[[
+    Queues a received call to be executed under the per-tick budget.
+]]
+---@param call SWToPython.Call
+function SWToPython.Uplink:QueueCall(call)
+    local queue = self.PendingCalls[call.Priority] or self.PendingCalls[1]
+
+    queue.Last = queue.Last + 1
+    queue.Items[queue.Last] = call
+
+    self.PendingCallIDs[call.ID] = call
+    self:SaveCall(call)
+end
+
+--[[
+    Saves a received call until it is executed, so it survives the addon reloading.
+]]
+---@param call SWToPython.Call
+---@param targetTick integer|nil The tick the call is scheduled for, if it is scheduled
+function SWToPython.Uplink:SaveCall(call, targetTick)
+    local savedCall = call:ToTable()
+
+    if targetTick then
+        savedCall.delay = 0
+        savedCall.tick = targetTick
+    end
+
+    self.SavedCalls[call.ID] = savedCall
+end
+
+--[[
+    Stops saving a call, as it has been executed or no longer needs to be.
+]]
+---@param callID integer
+function SWToPython.Uplink:UnsaveCall(callID)
+    self.SavedCalls[callID] = nil
+end
+
+--[[
+    Requeues saved calls, oldest first. These were received before the addon reloaded but weren't executed.
+]]
+function SWToPython.Uplink:RestoreCalls()
+    ---@type table<integer, integer>
+    local callIDs = {}
+
+    for callID in pairs(self.SavedCalls) do
+        table.insert(callIDs, callID)
+    end
+
+    table.sort(callIDs)
+
+    for _, callID in ipairs(callIDs) do
+        local savedCall = self.SavedCalls[callID]
+        local call = SWToPython.Classes.Call:FromTable(savedCall)
+
+        if call:IsScheduled() then
+            -- scheduled calls are saved with their target tick, so schedule them for the ticks they had left
+            call.Tick = nil
+            call.Delay = math.max(savedCall.tick - self.SavedTick, 1)
+
+            self:ScheduleCall(call)
+        else
+            self:QueueCall(call)
+        end
+    end
+end
+
+--[[
+    Schedules a received call to be executed at its target tick.<br>
+    Scheduled calls are executed on time instead of under the per-tick budget. Calls whose target tick has passed are executed straight away.
+]]
+---@param call SWToPython.Call
+function SWToPython.Uplink:ScheduleCall(call)
+    local now = Noir.Services.TaskService.Ticks
+    local delay = call:GetTargetTick(now) - now
+
+    if delay <= 0 then
+        self:HandleCall(call)
+        return
+    end
+
+    self.ScheduledCalls[call.ID] = Noir.Services.TaskService:AddTickTask(function()
+        self.ScheduledCalls[call.ID] = nil
+        self:HandleCall(call)
+    end, delay)
+
+    self:SaveCall(call, now + delay)
+end
+
+--[[
+    Stops a scheduled call from being executed.<br>
+    Returns if the call was scheduled.
+]]
+---@param callID integer
+---@return boolean
+function SWToPython.Uplink:UnscheduleCall(callID)
+    local task = self.ScheduledCalls[callID]
+
+    if not task then
+        return false
+    end
+
+    task:Remove()
+    self.ScheduledCalls[callID] = nil
+    self:UnsaveCall(callID)
+
+    return true
+end
+
+--[[
+    Removes and returns the next call to execute, highest priority first, or nil if there are none.
+]]
+---@return SWToPython.Call|nil
+function SWToPython.Uplink:NextPendingCall()
+    for priority = 0, 2 do
+        local queue = self.PendingCalls[priority]
+
+        while queue.First <= queue.Last do
+            local call = queue.Items[queue.First]
+
+            queue.Items[queue.First] = nil
+            queue.First = queue.First + 1
+
+            -- skip calls cancelled (or dropped by a session change) while waiting
+            if self.PendingCallIDs[call.ID] == call then
+                self.PendingCallIDs[call.ID] = nil
+                return call
+            end
+        end
+    end
+end
+
+--[[
+    Returns if there are calls waiting to be executed.
+]]
+---@return boolean
+function SWToPython.Uplink:HasPendingCalls()
+    return next(self.PendingCallIDs) ~= nil
+end
+
+--[[
+    Executes pending calls until this tick's budget (`CallBudgetMilliseconds` and `MaxCallsPerTick`) runs out.<br>
+    At least one call is executed per tick, so calls always make progress.
+]]
+function SWToPython.Uplink:ExecuteCalls()
+    local tick = Noir.Services.TaskService.Ticks
+
+    if tick ~= self.BudgetTick then
+        self.BudgetTick = tick
+        self.BudgetUsed = 0
+        self.BudgetCalls = 0
+        self.BudgetOverran = false
+        self.BudgetDeferred = false
+
+        -- saved for rescheduling scheduled calls after a reload
+        self:Save("Tick", tick)
+    end
+
+    while self:HasPendingCalls() do
+        if self.BudgetCalls > 0 and (self.BudgetUsed >= self.CallBudgetMilliseconds or self.BudgetCalls >= self.MaxCallsPerTick) then
+            if not self.BudgetDeferred then
+                self.BudgetDeferred = true
+                self.BudgetStats.Deferred = self.BudgetStats.Deferred + 1
+            end
+
+            break
+        end
+
+        local call = self:NextPendingCall()
+
+        if not call then
+            break
+        end
+
+        local startedAt = server.getTimeMillisec()
+        self:HandleCall(call)
+
+        self.BudgetUsed = self.BudgetUsed + (server.getTimeMillisec() - startedAt)
+        self.BudgetCalls = self.BudgetCalls + 1
+    end
+
+    -- no more calls run this tick once over budget, so the overrun is the total for the tick
+    if self.BudgetUsed > self.CallBudgetMilliseconds and not self.BudgetOverran then
+        self.BudgetOverran = true
+        self.BudgetStats.Overruns = self.BudgetStats.Overruns + 1
+        self.BudgetStats.OverrunMilliseconds = self.BudgetStats.OverrunMilliseconds + (self.BudgetUsed - self.CallBudgetMilliseconds)
+    end
+end
+
+--[[
+    Handles a call.
+]]
+---@param call SWToPython.Call
+function SWToPython.Uplink:HandleCall(call)
+    -- unsaved before executing, so a call that takes the addon down isn't executed again after it reloads
+    self:UnsaveCall(call.ID)
+
+    if self:HasHandledCall(call) then
+        return
+    end
+
+    -- No result is expected, so skip creating and hoarding a handled call. The watermark acknowledges it instead
+    if call.NoReply then
+        call:Execute()
+        return
+    end
+
+    local handledCall = call:Call()
+
+    self.HandledCalls[handledCall.ID] = handledCall
+    handledCall:Hoard(self, "HandledCalls")
+end
+
+--[[
+    Returns if a call has been handled.
+]]
+---@param call SWToPython.Call
+---@return boolean
+function SWToPython.Uplink:HasHandledCall(call)
+    return self.HandledCalls[call.ID] ~= nil
+end
+
+--[[
+    Removes a handled call.
+]]
+---@param handledCall SWToPython.HandledCall
+function SWToPython.Uplink:RemoveHandledCall(handledCall)
+    self.HandledCalls[handledCall.ID] = nil
+    handledCall:Unhoard(self, "HandledCalls")
+end
+
+--[[
+    Handles a callback, applying its filters and policy before queueing it.<br>
+    Returns the triggered callback the trigger ended up in, or nil if it was filtered, sampled out or dropped.
+]]
+---@param callbackName string
+---@param arguments table<integer, any>
+---@return SWToPython.TriggeredCallback|nil
+function SWToPython.Uplink:HandleCallback(callbackName, arguments)
+    if not self:PassesFilters(callbackName, arguments) then
+        return
+    end
+
+    local policy = self.CallbackPolicies[callbackName]
+    local key
+
+    if policy and policy.Mode == "sample" then
+        local count = self.SampleCounts[callbackName] or 0
+        self.SampleCounts[callbackName] = (count + 1) % policy.Every
+
+        if count ~= 0 then
+            return
+        end
+    elseif policy and (policy.Mode == "latest" or policy.Mode == "aggregate") then
+        key = self:GetCoalesceKey(callbackName, policy, arguments)
+
+        local pending = self.CoalescedCallbacks[key]
+
+        if pending and self:IsUnsent(pending) then
+            if policy.Mode == "aggregate" then
+                for _, index in ipairs(policy.Sum) do
+                    arguments[index] = (tonumber(pending.Arguments[index]) or 0) + (tonumber(arguments[index]) or 0)
+                end
+            end
+
+            pending.Arguments = arguments
+            pending:Hoard(self, "TriggeredCallbacks")
+
+            return pending
+        end
+    end
+
+    if self.TriggeredCallbackCount >= self.MaxCallbackBacklog and not self:DropFromBacklog(callbackName) then
+        self:CountDroppedCallback(callbackName)
+        return
+    end
+
+    local triggeredCallback = SWToPython.Classes.TriggeredCallback:New(SWToPython.ID:GetID(), callbackName, arguments)
+    self.TriggeredCallbacks[triggeredCallback.ID] = triggeredCallback
+    self:AddToBacklog(triggeredCallback)
+
+    triggeredCallback:Hoard(self, "TriggeredCallbacks")
+
+    if key then
+        self:RemoveCoalesceKey(key)
+        self.CoalescedCallbacks[key] = triggeredCallback
+        self.CoalesceKeys[triggeredCallback] = key
+    end
+
+    return triggeredCallback
+end
+
+--[[
+    Returns if the arguments of a callback pass any of its filters, or if the callback has no filters.
+]]
+---@param callbackName string
+---@param arguments table<integer, any>
+---@return boolean
+function SWToPython.Uplink:PassesFilters(callbackName, arguments)
+    local filters = self.CallbackFilters[callbackName]
+
+    if not filters then
+        return true
+    end
+
+    for _, conditions in ipairs(filters) do
+        local passes = true
+
+        for _, condition in ipairs(conditions) do
+            local argument = arguments[condition.Index]
 
-    --[[
-        A table of triggered callbacks.
-    ]]
-    ---@type table<integer, SWToPython.TriggeredCallback>
-    self.TriggeredCallbacks = {}
+            if condition.Op == "eq" then
+                passes = argument == condition.Value
+            elseif condition.Op == "prefix" then
+                passes = type(argument) == "string" and argument:sub(1, #condition.Value) == condition.Value
+            elseif condition.Op == "in" then
+                passes = argument ~= nil and condition.Value[argument] == true
+            else
+                passes = false
+            end
 
-    --[[
-        A table of handled calls.
-    ]]
-    ---@type table<string, SWToPython.HandledCall>
-    self.HandledCalls = {}
+            if not passes then
+                break
+            end
+        end
 
-    --[[
-        The amount of outgoing requests that haven't received a response yet.
-    ]]
-    self.Outgoing = 0
+        if passes then
+            return true
+        end
+    end
+
+    return false
 end
 
 --[[
-    Called when the service is started.
+    Returns the key triggers of a callback are merged by, made up of the callback name and the key arguments.
 ]]
-function SWToPython.Uplink:ServiceStart()
-    self:HandleCallbacks()
+---@param callbackName string
+---@param policy SWToPython.Protocol.CallbackPolicy
+---@param arguments table<integer, any>
+---@return string
+function SWToPython.Uplink:GetCoalesceKey(callbackName, policy, arguments)
+    local parts = {callbackName}
 
-    --[[
-        A repeated task for updating the PythonToSW server with new data.
-    ]]
-    self.UpdateTask = Noir.Services.TaskService:AddTickTask(function()
-        self:Update()
-    end, self.TickInterval, nil, true)
+    for _, index in ipairs(policy.Key) do
+        table.insert(parts, tostring(arguments[index]))
+    end
 
-    --[[
-        A repeated task for checking if the PythonToSW server is alive.
-    ]]
-    self.CheckAliveTask = Noir.Services.TaskService:AddTickTask(function()
-        self:CheckAlive()
-    end, self.AliveCheckTickInterval, nil, true)
+    return table.concat(parts, "\0")
+end
 
-    -- Load handled calls from previous session
-    if Noir.AddonReason == "AddonReload" then
-        Noir.Services.HoarderService:LoadAll(
-            self,
-            "HandledCalls",
-            self.HandledCalls,
-            SWToPython.Classes.HandledCall,
-            {}
-        )
+--[[
+    Returns if a triggered callback is still waiting to be sent, and isn't on its way in an update or transfer.<br>
+    Only these can be merged into or dropped.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+---@return boolean
+function SWToPython.Uplink:IsUnsent(triggeredCallback)
+    return self.TriggeredCallbacks[triggeredCallback.ID] == triggeredCallback
+        and not self.InFlightItems[triggeredCallback]
+        and not (self.Transfer and self.Transfer:HasTriggeredCallback(triggeredCallback))
+end
 
-        Noir.Services.HoarderService:LoadAll(
-            self,
-            "TriggeredCallbacks",
-            self.TriggeredCallbacks,
-            SWToPython.Classes.TriggeredCallback,
-            {}
-        )
+--[[
+    Stops merging triggers into the triggered callback with the provided key.
+]]
+---@param key string
+function SWToPython.Uplink:RemoveCoalesceKey(key)
+    local triggeredCallback = self.CoalescedCallbacks[key]
+
+    if not triggeredCallback then
+        return
     end
+
+    self.CoalescedCallbacks[key] = nil
+    self.CoalesceKeys[triggeredCallback] = nil
 end
 
 --[[
-    Returns a function from a path, or nil if not found.<br>
-    Example path: "server.announce", "foo.bar.myFunction", etc.
+    Removes a triggered callback.
 ]]
----@param path string
----@return function|nil
-function SWToPython.Uplink:GetFunction(path)
-    local at = _ENV
+---@param triggeredCallback SWToPython.TriggeredCallback
+function SWToPython.Uplink:RemoveTriggeredCallback(triggeredCallback)
+    if self.TriggeredCallbacks[triggeredCallback.ID] ~= triggeredCallback then
+        return
+    end
 
-    for _, segment in pairs(Noir.Libraries.String:Split(path, ".")) do
-        local nextPoint = at[segment]
+    self.TriggeredCallbacks[triggeredCallback.ID] = nil
+    triggeredCallback:Unhoard(self, "TriggeredCallbacks")
 
-        if not nextPoint then
-            return nil
-        end
+    self:RemoveFromBacklog(triggeredCallback)
 
-        if type(nextPoint) ~= "table" and type(nextPoint) ~= "function" then
-            return nil
-        end
+    local key = self.CoalesceKeys[triggeredCallback]
 
-        at = nextPoint
+    if key then
+        self:RemoveCoalesceKey(key)
     end
+end
 
-    if type(at) == "function" then
-        return at
-    else
-        return nil
+--[[
+    Adds a triggered callback to the end of the backlog of its callback.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+function SWToPython.Uplink:AddToBacklog(triggeredCallback)
+    local backlog = self.CallbackBacklog[triggeredCallback.Name]
+
+    if not backlog then
+        backlog = {Items = {}, First = 1, Last = 0, Count = 0}
+        self.CallbackBacklog[triggeredCallback.Name] = backlog
     end
+
+    backlog.Last = backlog.Last + 1
+    backlog.Items[backlog.Last] = triggeredCallback
+    backlog.Count = backlog.Count + 1
+
+    self.TriggeredCallbackCount = self.TriggeredCallbackCount + 1
 end
 
 --[[
-    Sends a request to the PythonToSW server.
+    Removes a triggered callback from the backlog of its callback.
 ]]
----@param endpoint string
----@param params table<string, any>
----@param callback fun(response: any)|nil
----@param overrideAliveCheck boolean|nil
-function SWToPython.Uplink:Request(endpoint, params, callback, overrideAliveCheck)
-    if not self.Alive and not overrideAliveCheck then
+---@param triggeredCallback SWToPython.TriggeredCallback
+function SWToPython.Uplink:RemoveFromBacklog(triggeredCallback)
+    local backlog = self.CallbackBacklog[triggeredCallback.Name]
+
+    if not backlog then
         return
     end
 
-    -- Pass token with request
-    params["token"] = self.Token
+    backlog.Count = backlog.Count - 1
+    self.TriggeredCallbackCount = self.TriggeredCallbackCount - 1
 
-    -- JSON encode certain data
-    for key, value in pairs(params) do
-        if type(value) == "table" then
-            params[key] = Noir.Libraries.JSON:Encode(value)
+    -- triggered callbacks are mostly removed in order, so this keeps the backlog from growing
+    while backlog.First <= backlog.Last and self.TriggeredCallbacks[backlog.Items[backlog.First].ID] ~= backlog.Items[backlog.First] do
+        backlog.Items[backlog.First] = nil
+        backlog.First = backlog.First + 1
+    end
+end
+
+--[[
+    Returns the oldest unsent triggered callback in a backlog, or nil if there isn't one.
+]]
+---@param backlog SWToPython.Uplink.Backlog
+---@return SWToPython.TriggeredCallback|nil
+function SWToPython.Uplink:GetOldestUnsent(backlog)
+    for index = backlog.First, backlog.Last do
+        local triggeredCallback = backlog.Items[index]
+
+        if triggeredCallback and self:IsUnsent(triggeredCallback) then
+            return triggeredCallback
         end
     end
+end
 
-    -- Send the request
-    Noir.Services.HTTPService:GET(
-        endpoint..Noir.Libraries.HTTP:URLParameters(params),
-        self.Port,
-        function (response)
-            self.Outgoing = self.Outgoing - 1
+--[[
+    Drops a triggered callback from the full backlog according to `CallbackOverflow`.<br>
+    Returns false if nothing was dropped, in which case the new trigger should be dropped instead.
+]]
+---@param callbackName string The callback of the new trigger
+---@return boolean
+function SWToPython.Uplink:DropFromBacklog(callbackName)
+    if self.CallbackOverflow == "summarize" then
+        return self:SummarizeBacklog(callbackName)
+    end
 
-            -- http queue fuckery
-            if not self.Alive and not overrideAliveCheck then
-                return
-            end
+    local victim, victimBacklog
 
-            -- if the request failed, the server is likely down. we'll validate this later
-            if not response:IsOk() then
-                if not self.Alive then
-                    return
-                end
+    for _, backlog in pairs(self.CallbackBacklog) do
+        local candidate = backlog.Count > 0 and self:GetOldestUnsent(backlog)
 
-                warn("Uplink:Request(): Request returned not ok. Proceeding to assume the PythonToSW server is down. Response: %s", response.Text)
-                self:SetAlive(false)
+        if not candidate then
+            goto continue
+        end
 
-                return
+        if not victim then
+            victim, victimBacklog = candidate, backlog
+        elseif self.CallbackOverflow == "drop_by_callback" and backlog.Count ~= victimBacklog.Count then
+            if backlog.Count > victimBacklog.Count then
+                victim, victimBacklog = candidate, backlog
             end
+        elseif candidate.ID < victim.ID then
+            victim, victimBacklog = candidate, backlog
+        end
 
-            -- decode the data
-            local data = response:JSON()
+        ::continue::
+    end
 
-            if not data then
-                warn("Uplink:Request(): Failed to parse response from request to '%s' on PythonToSW server. Response: %s", endpoint, response.Text)
-                return
-            end
+    if not victim then
+        return false
+    end
 
-            if data["detail"] and Noir.Libraries.String:StartsWith(data["detail"], "no_auth") then
-                warn("Uplink:Request(): Can't send request. Outdated token. Try `?reload_scripts`.")
-                return
-            end
+    self:RemoveTriggeredCallback(victim)
+    self:CountDroppedCallback(victim.Name)
 
-            if data["detail"] then
-                warn("Uplink:Request(): Sent request, but got an error from PythonToSW server: %s", data["detail"])
-                return
-            end
+    return true
+end
 
-            if callback then
-                callback(data)
+--[[
+    Makes room in the full backlog by keeping only the latest unsent trigger of each callback.<br>
+    If every callback is already down to one unsent trigger, the unsent trigger of the new trigger's callback is dropped so the new one replaces it.
+    Returns false if nothing was dropped.
+]]
+---@param callbackName string The callback of the new trigger
+---@return boolean
+function SWToPython.Uplink:SummarizeBacklog(callbackName)
+    ---@type table<integer, SWToPython.TriggeredCallback>
+    local dropped = {}
+
+    ---@type SWToPython.TriggeredCallback|nil
+    local replaced
+
+    for name, backlog in pairs(self.CallbackBacklog) do
+        local latest
+
+        -- newest first, so every unsent trigger after the first one found is older
+        for index = backlog.Last, backlog.First, -1 do
+            local triggeredCallback = backlog.Items[index]
+
+            if triggeredCallback and self:IsUnsent(triggeredCallback) then
+                if latest then
+                    table.insert(dropped, triggeredCallback)
+                else
+                    latest = triggeredCallback
+                end
             end
         end
-    )
 
-    self.Outgoing = self.Outgoing + 1
+        if name == callbackName then
+            replaced = latest
+        end
+    end
+
+    if #dropped == 0 and replaced then
+        table.insert(dropped, replaced)
+    end
+
+    for _, triggeredCallback in ipairs(dropped) do
+        self:RemoveTriggeredCallback(triggeredCallback)
+        self:CountDroppedCallback(triggeredCallback.Name)
+    end
+
+    return #dropped > 0
+end
+
+--[[
+    Counts a dropped trigger of a callback, to be reported to the PythonToSW server.
+]]
+---@param callbackName string
+function SWToPython.Uplink:CountDroppedCallback(callbackName)
+    self.DroppedCallbacks[callbackName] = (self.DroppedCallbacks[callbackName] or 0) + 1
+end
+
+--[[
+    Listens for the provided callbacks only, connecting to new ones and disconnecting from ones no longer wanted.<br>
+    Also applies the policies and filters of the callbacks.
+]]
+---@param subscriptions SWToPython.Protocol.Subscriptions
+function SWToPython.Uplink:Subscribe(subscriptions)
+    local wanted = {}
+
+    for _, callbackName in pairs(subscriptions.Callbacks) do
+        wanted[callbackName] = true
+    end
+
+    for callbackName, connection in pairs(self.Subscriptions) do
+        if not wanted[callbackName] then
+            connection:Disconnect()
+            self.Subscriptions[callbackName] = nil
+        end
+    end
+
+    for _, callbackName in pairs(self.Callbacks) do
+        if wanted[callbackName] and not self.Subscriptions[callbackName] then
+            self.Subscriptions[callbackName] = Noir.Callbacks:Connect(callbackName, function(...)
+                self:HandleCallback(callbackName, {...})
+            end, true)
+        end
+    end
+
+    -- triggers already merged stay as they are, new ones follow the new policies
+    self.CallbackPolicies = subscriptions.Policies
+    self.CallbackFilters = subscriptions.Filters
+    self.CoalescedCallbacks = {}
+    self.CoalesceKeys = {}
+    self.SampleCounts = {}
+
+    self.SubscriptionsRevision = subscriptions.Revision
+end
+
+--[[
+    Replaces the watched functions with the ones provided by the PythonToSW server.<br>
+    Watch IDs are never reused within a session, so watches that are still wanted are kept as they are.
+]]
+---@param watches SWToPython.Protocol.Watches
+function SWToPython.Uplink:SetWatches(watches)
+    local wanted = {}
+
+    for _, watch in ipairs(watches.Watches) do
+        wanted[watch.ID] = true
+    end
+
+    for watchID in pairs(Noir.Libraries.Table:Copy(self.Watches)) do
+        if not wanted[watchID] then
+            self:RemoveWatch(watchID)
+        end
+    end
+
+    for _, _watch in ipairs(watches.Watches) do
+        if self.Watches[_watch.ID] then
+            goto continue
+        end
+
+        ---@type SWToPython.Uplink.Watch
+        local watch = {
+            ID = _watch.ID,
+            Path = _watch.Path,
+            Arguments = _watch.Arguments,
+            Unsent = false
+        }
+
+        watch.Task = Noir.Services.TaskService:AddTickTask(function()
+            self:SampleWatch(watch)
+        end, _watch.Period, nil, true)
+
+        self.Watches[watch.ID] = watch
+        self:SampleWatch(watch)
+
+        ::continue::
+    end
+
+    self.WatchesRevision = watches.Revision
+end
+
+--[[
+    Stops watching a function.
+]]
+---@param watchID integer
+function SWToPython.Uplink:RemoveWatch(watchID)
+    local watch = self.Watches[watchID]
+
+    if not watch then
+        return
+    end
+
+    watch.Task:Remove()
+    self.Watches[watchID] = nil
+end
+
+--[[
+    Calls a watched function, keeping its results as the latest sample to send.<br>
+    Errors are only propagated when they change, so a failing watch doesn't flood the PythonToSW server.
+]]
+---@param watch SWToPython.Uplink.Watch
+function SWToPython.Uplink:SampleWatch(watch)
+    local func = self:GetFunction(watch.Path)
+    local results, err
+
+    if func then
+        results = table.pack(pcall(func, table.unpack(watch.Arguments)))
+
+        if not results[1] then
+            err = "Watched function at "..watch.Path.." errored: "..tostring(results[2])
+        end
+    else
+        err = "Watched function at "..watch.Path.." does not exist."
+    end
+
+    if err then
+        if err ~= watch.Error then
+            self:PropagateError(err)
+        end
+
+        watch.Error = err
+        return
+    end
+
+    watch.Error = nil
+    watch.Sample = {watch.ID, Noir.Services.TaskService.Ticks, {table.unpack(results, 2, results.n)}}
+    watch.Unsent = true
+end
+
+--[[
+    Returns the latest samples of watches that haven't been sent yet, in order of watch ID.
+]]
+---@return table<integer, table>
+function SWToPython.Uplink:GetUnsentSamples()
+    local samples = {}
+
+    for _, watch in pairs(self.Watches) do
+        if watch.Unsent then
+            table.insert(samples, watch.Sample)
+        end
+    end
+
+    table.sort(samples, function(sampleA, sampleB)
+        return sampleA[1] < sampleB[1]
+    end)
+
+    return samples
 end
 
 --[[
-    Sets if the PythonToSW server is alive.
+    Checks if the PythonToSW server is alive.
 ]]
----@param alive boolean
-function SWToPython.Uplink:SetAlive(alive)
-    if self.Alive == alive then
-        warn("Uplink:SetAlive(): Attempted to set alive to what it is already.")
+function SWToPython.Uplink:CheckAlive()
+    if self.Alive then
         return
     end
 
-    self.Alive = alive
+    print("Uplink:CheckAlive(): Checking if PythonToSW server is alive...")
 
-    if self.Alive then
-        print("Uplink:SetAlive(): PythonToSW server is alive.")
-    else
-        warn("Uplink:SetAlive(): PythonToSW server is not alive.")
-    end
+    self:Request("/ok", {}, function(response)
+        self:SetAlive(true)
+    end, true)
 end
 
 --[[
-    Propagates an error to the PythonToSW server.
+    An update waiting for a response.
 ]]
----@param message string
-function SWToPython.Uplink:PropagateError(message)
-    warn("Uplink:PropagateError(): "..message)
-    self:Request("/error", {message = message})
-end
+---@class SWToPython.Uplink.InFlightUpdate
+---@field SentAt number When the update was sent, in milliseconds
+---@field HandledCalls table<integer, SWToPython.HandledCall> The handled calls the update carries
+---@field TriggeredCallbacks table<integer, SWToPython.TriggeredCallback> The triggered callbacks the update carries
+---@field Dropped table<string, integer>|nil The dropped callback counts the update reports
+---@field Budget SWToPython.Uplink.BudgetStats|nil The budget overruns the update reports
+---@field Samples table<integer, table>|nil The samples of watches the update carries
 
 --[[
-    Handles the process of running calls from the PythonToSW server, returning values, etc.
+    A function called every so often, whose latest results are sent to the PythonToSW server.
 ]]
-function SWToPython.Uplink:Update()
-    local _handledCalls = Noir.Libraries.Table:Copy(self.HandledCalls)
-    local _triggeredCallbacks = Noir.Libraries.Table:Copy(self.TriggeredCallbacks)
+---@class SWToPython.Uplink.Watch
+---@field ID integer
+---@field Path string
+---@field Arguments table
+---@field Task NoirTask The repeated task that calls the function
+---@field Sample table|nil The latest sample: `{ID, tick, returnValues}`
+---@field Unsent boolean Whether or not the latest sample is yet to be sent
+---@field Error string|nil The error the function last failed with
 
-    self:Request(
-        "/update",
+--[[
+    A queue of received calls of one priority class.
+]]
+---@class SWToPython.Uplink.CallQueue
+---@field Items table<integer, SWToPython.Call>
+---@field First integer The index of the first item
+---@field Last integer The index of the last item
 
-        {
-            handled_calls = self:HandledCallsToTable(),
-            triggered_callbacks = self:TriggeredCallbacksToTable()
-        },
+--[[
+    Call execution budget overruns.
+]]
+---@class SWToPython.Uplink.BudgetStats
+---@field Overruns integer How many ticks calls took longer than the budget to execute
+---@field OverrunMilliseconds number How many milliseconds over the budget calls took in total
+---@field Deferred integer How many ticks calls were carried over to a later tick
 
-        ---@param calls table<integer, table>
-        function(calls)
-            for _, _call in ipairs(calls) do
-                local call = SWToPython.Classes.Call:FromTable(_call)
+--[[
+    The triggered callbacks of a callback in the order they were triggered.
+]]
+---@class SWToPython.Uplink.Backlog
+---@field Items table<integer, SWToPython.TriggeredCallback>
+---@field First integer The index of the first item
+---@field Last integer The index of the last item
+---@field Count integer The amount of unsent triggered callbacks
 
-                if self:HasHandledCall(call) then
-                    return
-                end
+--------------------------------------------------------
+-- [SWToPython] Batch
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
 
-                self:HandleCall(call)
-            end
+--[[
+    Copyright (C) 2025 Cuh4
 
-            for _, triggeredCallback in pairs(_triggeredCallbacks) do
-                self:RemoveTriggeredCallback(triggeredCallback)
-            end
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
 
-            for _, handledCall in pairs(_handledCalls) do
-                self:RemoveHandledCall(handledCall)
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    Calls multiple functions in one go, guaranteeing they are all executed within the same tick.<br>
+    Used by the PythonToSW server for batches created with `same_tick`. Returns `{true, returnValues}` for each call,
+    or `{false, error}` for calls that failed. A failing call doesn't stop the rest of the batch.
+]]
+---@param calls table<integer, table> A list of `{path, arguments}` pairs
+---@return table<integer, table>
+function SWToPython.Builtins.Batch(calls)
+    local results = {}
+
+    for index, call in ipairs(calls) do
+        local path, arguments = call[1], call[2]
+        local func = SWToPython.Uplink:GetFunction(path)
+
+        if func then
+            -- one failing call shouldn't take down the rest of the batch
+            local packed = table.pack(pcall(func, table.unpack(arguments)))
+
+            if packed[1] then
+                results[index] = {true, {table.unpack(packed, 2, packed.n)}}
+            else
+                local err = "Function at "..path.." errored: "..tostring(packed[2])
+                SWToPython.Uplink:PropagateError(err)
+
+                results[index] = {false, err}
             end
+        else
+            local err = "Function at "..path.." does not exist."
+            SWToPython.Uplink:PropagateError(err)
+
+            results[index] = {false, err}
         end
-    )
+    end
+
+    return results
 end
 
+--------------------------------------------------------
+-- [SWToPython] Bulk
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
 --[[
-    Converts handled calls to table representations.
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
 ]]
----@return table<integer, SwToPython.HandledCall.AsTable>
-function SWToPython.Uplink:HandledCallsToTable()
-    ---@type table<integer, SwToPython.HandledCall.AsTable>
-    local handledCalls = {}
 
-    for _, handledCall in pairs(self.HandledCalls) do
-        table.insert(handledCalls, handledCall:ToTable())
-    end
+-------------------------------
+-- // Main
+-------------------------------
 
-    table.sort(handledCalls, function (handledCallA, handledCallB)
-        return handledCallA.Time < handledCallB.Time
-    end)
+--[[
+    Rounds a number to the provided amount of decimal places, keeping it short once JSON encoded.
+]]
+---@param number number
+---@param precision integer
+---@return number
+local function round(number, precision)
+    local multiplier = 10 ^ precision
+    local rounded = math.floor(number * multiplier + 0.5) / multiplier
 
-    return handledCalls
+    return math.tointeger(rounded) or rounded
 end
 
 --[[
-    Converts triggered callbacks to table representations.
+    Reads the value of a vehicle component, or nil if it couldn't be read.<br>
+    Buttons can be `false`, so `false` can't mark a failed read.
 ]]
----@return table<integer, SwToPython.TriggeredCallback.AsTable>
-function SWToPython.Uplink:TriggeredCallbacksToTable()
-    ---@type table<integer, SwToPython.TriggeredCallback.AsTable>
-    local triggeredCallbacks = {}
+---@param vehicleID integer
+---@param componentType "dial"|"button"|"battery"|"tank"|"seat"
+---@param name string|integer
+---@param precision integer
+---@return any|nil
+local function readComponent(vehicleID, componentType, name, precision)
+    local data, success
 
-    for _, triggeredCallback in pairs(self.TriggeredCallbacks) do
-        table.insert(triggeredCallbacks, triggeredCallback:ToTable())
-    end
+    if componentType == "dial" then
+        data, success = server.getVehicleDial(vehicleID, name)
+        return success and round(data.value, precision) or nil
+    elseif componentType == "button" then
+        data, success = server.getVehicleButton(vehicleID, name)
 
-    table.sort(triggeredCallbacks, function (triggeredCallbackA, triggeredCallbackB)
-        return triggeredCallbackA.Time < triggeredCallbackB.Time
-    end)
+        if success then
+            return data.on
+        end
+    elseif componentType == "battery" then
+        data, success = server.getVehicleBattery(vehicleID, name)
+        return success and round(data.charge, precision) or nil
+    elseif componentType == "tank" then
+        data, success = server.getVehicleTank(vehicleID, name)
+        return success and round(data.value, precision) or nil
+    elseif componentType == "seat" then
+        data, success = server.getVehicleSeat(vehicleID, name)
+        return success and (data.seated_id or 0) or nil
+    end
 
-    return triggeredCallbacks
+    return nil
 end
 
 --[[
-    Handles a call.
+    Returns every player along with their position and the vehicle they're sat in, as one flat array:<br>
+    `{peerID, name, x, y, z, vehicleID, ...}`. The position is `false` if it couldn't be read, and the vehicle ID is 0 if the player isn't sat in one.
 ]]
----@param call SWToPython.Call
-function SWToPython.Uplink:HandleCall(call)
-    if self:HasHandledCall(call) then
-        return
-    end
+---@param precision integer|nil The amount of decimal places to round positions to. Defaults to 2
+---@return table<integer, any>
+function SWToPython.Builtins.GetPlayers(precision)
+    precision = precision or 2
 
-    local handledCall = call:Call()
+    local packed = {}
 
-    if not handledCall then
-        warn("Uplink:HandleCall(): Failed to handle call. ID: %s", call.ID)
-        return
+    for _, player in pairs(server.getPlayers()) do
+        local position, success = server.getPlayerPos(player.id)
+        local characterID, hasCharacter = server.getPlayerCharacterID(player.id)
+        local vehicleID, isSeated = 0, false
+
+        if hasCharacter then
+            vehicleID, isSeated = server.getCharacterVehicle(characterID)
+        end
+
+        table.insert(packed, player.id)
+        table.insert(packed, player.name)
+
+        for index = 13, 15 do
+            table.insert(packed, success and round(position[index], precision) or false)
+        end
+
+        table.insert(packed, isSeated and vehicleID or 0)
     end
 
-    self.HandledCalls[handledCall.ID] = handledCall
-    handledCall:Hoard(self, "HandledCalls")
+    return packed
 end
 
 --[[
-    Returns if a call has been handled.
+    Returns the positions of vehicles as one flat array: `{vehicleID, x, y, z, ...}`.<br>
+    Vehicles whose position couldn't be read (e.g. despawned) are left out.
 ]]
----@param call SWToPython.Call
----@return boolean
-function SWToPython.Uplink:HasHandledCall(call)
-    return self.HandledCalls[call.ID] ~= nil
+---@param vehicleIDs table<integer, integer>
+---@param precision integer|nil The amount of decimal places to round positions to. Defaults to 2
+---@return table<integer, number>
+function SWToPython.Builtins.GetVehiclePositions(vehicleIDs, precision)
+    precision = precision or 2
+
+    local packed = {}
+
+    for _, vehicleID in ipairs(vehicleIDs) do
+        local position, success = server.getVehiclePos(vehicleID)
+
+        if success then
+            table.insert(packed, vehicleID)
+
+            for index = 13, 15 do
+                table.insert(packed, round(position[index], precision))
+            end
+        end
+    end
+
+    return packed
 end
 
 --[[
-    Removes a handled call.
+    Reads the same components of many vehicles in one go, returning the values as one flat array, vehicle by vehicle.<br>
+    Values that couldn't be read are left as nil holes, so every other value keeps its position.
 ]]
----@param handledCall SWToPython.HandledCall
-function SWToPython.Uplink:RemoveHandledCall(handledCall)
-    self.HandledCalls[handledCall.ID] = nil
-    handledCall:Unhoard(self, "HandledCalls")
+---@param vehicleIDs table<integer, integer>
+---@param reads table<integer, any> A flat list of `componentType, name` pairs, e.g. `{"dial", "Speed", "button", "Lights"}`
+---@param precision integer|nil The amount of decimal places to round numbers to. Defaults to 2
+---@return table<integer, any>
+function SWToPython.Builtins.ReadVehicleComponents(vehicleIDs, reads, precision)
+    precision = precision or 2
+
+    local packed = {}
+    local count = 0
+
+    for _, vehicleID in ipairs(vehicleIDs) do
+        for index = 1, #reads, 2 do
+            -- table.insert can't insert nil, so index explicitly
+            count = count + 1
+            packed[count] = readComponent(vehicleID, reads[index], reads[index + 1], precision)
+        end
+    end
+
+    return packed
 end
 
+--------------------------------------------------------
+-- [SWToPython] Entities
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
 --[[
-    Handles a callback.
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
 ]]
----@param callbackName string
----@param arguments table<integer, any>
----@return SWToPython.TriggeredCallback
-function SWToPython.Uplink:HandleCallback(callbackName, arguments)
-    local triggeredCallback = SWToPython.Classes.TriggeredCallback:New(SWToPython.ID:GetID(), callbackName, arguments)
-    self.TriggeredCallbacks[triggeredCallback.ID] = triggeredCallback
 
-    triggeredCallback:Hoard(self, "TriggeredCallbacks")
+-------------------------------
+-- // Main
+-------------------------------
 
-    return triggeredCallback
+--[[
+    Returns every online player, spawned vehicle and loaded object, each as one flat array:<br>
+    `{{peerID, name, steamID, admin, auth, ...}, {vehicleID, groupID, ownerPeerID, loaded, ...}, {objectID, ...}}`.<br>
+    The group ID and owner peer ID are -1 if the vehicle has none.
+]]
+---@return table<integer, table<integer, any>>
+function SWToPython.Builtins.GetEntities()
+    return SWToPython.Entities:GetSnapshot()
 end
 
+--------------------------------------------------------
+-- [SWToPython] Program
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
 --[[
-    Removes a triggered callback.
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
 ]]
----@param triggeredCallback SWToPython.TriggeredCallback
-function SWToPython.Uplink:RemoveTriggeredCallback(triggeredCallback)
-    self.TriggeredCallbacks[triggeredCallback.ID] = nil
-    triggeredCallback:Unhoard(self, "TriggeredCallbacks")
-end
+
+-------------------------------
+-- // Main
+-------------------------------
 
 --[[
-    Handle all callbacks.
+    Replaces references to the return values of earlier steps (`{["$r"] = {step, index, keys...}}`) within an argument.<br>
+    Steps and indexes are 0-based, while keys are used as-is.
 ]]
-function SWToPython.Uplink:HandleCallbacks()
-    for _, callbackName in pairs(self.Callbacks) do
-        Noir.Callbacks:Connect(callbackName, function(...)
-            self:HandleCallback(callbackName, {...})
-        end)
+---@param value any
+---@param results table<integer, table>
+---@return any
+local function resolve(value, results)
+    if type(value) ~= "table" then
+        return value
+    end
+
+    local ref = value["$r"]
+
+    if ref then
+        local resolved = (results[ref[1] + 1] or {})[ref[2] + 1]
+
+        for index = 3, #ref do
+            if type(resolved) ~= "table" then
+                return nil
+            end
+
+            resolved = resolved[ref[index]]
+        end
+
+        return resolved
+    end
+
+    local resolvedTable = {}
+
+    for key, item in pairs(value) do
+        resolvedTable[key] = resolve(item, results)
     end
+
+    return resolvedTable
 end
 
 --[[
-    Checks if the PythonToSW server is alive.
+    Executes a sequence of calls within the same tick, where later calls can use the return values of earlier ones.<br>
+    Used by the PythonToSW server for call programs. Returns `true` and the return values of the output steps,
+    or `false`, the (0-based) index of the step that failed and its error. Steps after a failed one are skipped.
 ]]
-function SWToPython.Uplink:CheckAlive()
-    if self.Alive then
-        return
+---@param steps table<integer, table> A list of `{path, arguments}` pairs
+---@param outputs table<integer, integer> The (0-based) indexes of the steps to return the return values of
+---@return boolean, any, string|nil
+function SWToPython.Builtins.Program(steps, outputs)
+    local results = {}
+
+    for index, step in ipairs(steps) do
+        local path, arguments = step[1], step[2]
+        local func = SWToPython.Uplink:GetFunction(path)
+
+        if not func then
+            return false, index - 1, "Function at "..path.." does not exist."
+        end
+
+        -- resolved references may be nil, so unpack up to the amount of arguments sent
+        local resolved = resolve(arguments, results)
+        local packed = table.pack(pcall(func, table.unpack(resolved, 1, #arguments)))
+
+        if not packed[1] then
+            return false, index - 1, tostring(packed[2])
+        end
+
+        results[index] = {table.unpack(packed, 2, packed.n)}
     end
 
-    print("Uplink:CheckAlive(): Checking if PythonToSW server is alive...")
+    local outputResults = {}
 
-    self:Request("/ok", {}, function(response)
-        self:SetAlive(true)
-    end, true)
+    for _, stepIndex in ipairs(outputs) do
+        table.insert(outputResults, results[stepIndex + 1] or {})
+    end
+
+    return true, outputResults
 end
 
 --------------------------------------------------------
@@ -0,0 +1,158 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# // Imports
+from __future__ import annotations
+
+from typing import Any
+from pydantic import BaseModel
+
+from . import (
+    BuiltinEnum,
+    VehicleComponentEnum
+)
+
+from .models import _from_lua_array
+
+# // Main
+__all__ = [
+    "BUILTINS_PATH",
+    "PLAYER_STRIDE",
+    "VEHICLE_POSITION_STRIDE",
+    "PlayerState",
+    "get_builtin_path",
+    "pack_component_reads",
+    "unpack_players",
+    "unpack_vehicle_positions",
+    "unpack_vehicle_components"
+]
+
+BUILTINS_PATH: str = "SWToPython.Builtins"
+PLAYER_STRIDE: int = 6
+VEHICLE_POSITION_STRIDE: int = 4
+
+class PlayerState(BaseModel):
+    """
+    Represents a player as returned by `BuiltinEnum.GET_PLAYERS`.
+    `position` is None if it couldn't be read, and `vehicle_id` is None if the player isn't sat in a vehicle.
+    """
+    
+    peer_id: int
+    name: str
+    position: tuple[float, float, float]|None
+    vehicle_id: int|None
+
+def get_builtin_path(builtin: BuiltinEnum) -> str:
+    """
+    Returns the path of a function built into the in-game addon.
+    
+    Args:
+        builtin (BuiltinEnum): The built-in function.
+    
+    Returns:
+        str: The path of the function.
+    """
+    
+    return f"{BUILTINS_PATH}.{builtin.value}"
+
+def pack_component_reads(reads: list[tuple[VehicleComponentEnum, str|int]]) -> list[Any]:
+    """
+    Packs vehicle component reads into the flat list `BuiltinEnum.READ_VEHICLE_COMPONENTS` takes.
+    
+    Args:
+        reads (list[tuple[VehicleComponentEnum, str|int]]): The type and name of each component to read.
+    
+    Returns:
+        list[Any]: The packed reads: `[type, name, type, name, ...]`.
+    """
+    
+    return [value for component, name in reads for value in (component.value, name)]
+
+def _chunk(packed: Any, stride: int) -> list[list[Any]]:
+    """
+    Splits a flat array returned by a bulk getter into entries.
+    
+    Args:
+        packed (Any): The flat array. Empty arrays arrive as objects.
+        stride (int): How many values make up one entry.
+    
+    Returns:
+        list[list[Any]]: The entries.
+    """
+    
+    values = _from_lua_array(packed) or []
+    return [values[index:index + stride] for index in range(0, len(values) - stride + 1, stride)]
+
+def unpack_players(packed: Any) -> list[PlayerState]:
+    """
+    Unpacks the flat array returned by `BuiltinEnum.GET_PLAYERS`.
+    
+    Args:
+        packed (Any): `[peer_id, name, x, y, z, vehicle_id, ...]`.
+    
+    Returns:
+        list[PlayerState]: The players.
+    """
+    
+    return [
+        PlayerState(
+            peer_id = peer_id,
+            name = name,
+            position = None if x is False else (x, y, z),
+            vehicle_id = vehicle_id or None
+        )
+        for peer_id, name, x, y, z, vehicle_id in _chunk(packed, PLAYER_STRIDE)
+    ]
+
+def unpack_vehicle_positions(packed: Any) -> dict[int, tuple[float, float, float]]:
+    """
+    Unpacks the flat array returned by `BuiltinEnum.GET_VEHICLE_POSITIONS`.
+    
+    Args:
+        packed (Any): `[vehicle_id, x, y, z, ...]`.
+    
+    Returns:
+        dict[int, tuple[float, float, float]]: Vehicle IDs mapped to their position. Vehicles whose position couldn't be read are left out.
+    """
+    
+    return {vehicle_id: (x, y, z) for vehicle_id, x, y, z in _chunk(packed, VEHICLE_POSITION_STRIDE)}
+
+def unpack_vehicle_components(packed: Any, vehicle_ids: list[int], reads_count: int) -> dict[int, list[Any]]:
+    """
+    Unpacks the flat array returned by `BuiltinEnum.READ_VEHICLE_COMPONENTS`.
+    
+    Args:
+        packed (Any): The values of every read, vehicle by vehicle. Reads that failed are nil holes, so the array may arrive as an object.
+        vehicle_ids (list[int]): The vehicle IDs passed to the function, in the same order.
+        reads_count (int): How many components were read per vehicle.
+    
+    Returns:
+        dict[int, list[Any]]: Vehicle IDs mapped to the value of each read. Values that couldn't be read are None.
+    """
+    
+    if reads_count <= 0:
+        return {vehicle_id: [] for vehicle_id in vehicle_ids}
+    
+    # failed reads at the end of the array are dropped by Lua entirely
+    values = _from_lua_array(packed) or []
+    values = values + [None] * (len(vehicle_ids) * reads_count - len(values))
+    
+    return dict(zip(vehicle_ids, _chunk(values, reads_count)))
@@ -0,0 +1,307 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# // Imports
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Callable
+
+from pydantic import (
+    BaseModel,
+    Field
+)
+
+from . import Metrics
+from . import (
+    CallEnum,
+    CallbackEnum
+)
+
+from . import BaseValue
+
+# // Main
+__all__ = [
+    "CacheRule",
+    "DEFAULT_CACHE_RULES",
+    "CallCache"
+]
+
+class CacheRule(BaseModel):
+    """
+    Represents how the results of a `server.` function are cached.
+    
+    `ttl` is how many game ticks results are kept for, or None to keep them until invalidated.
+    `invalidate_on` maps game callbacks to the index of the callback argument that is compared against the
+    call argument at index `argument`. Only results with a matching argument are invalidated, or every result
+    of the function if the index is None.
+    """
+    
+    ttl: int|None = Field(default = None, ge = 1)
+    invalidate_on: dict[CallbackEnum, int|None] = {}
+    argument: int = Field(default = 0, ge = 0)
+
+DEFAULT_CACHE_RULES: dict[CallEnum, CacheRule] = {
+    CallEnum.GET_ADDON_INDEX: CacheRule(),
+    CallEnum.GET_ZONES: CacheRule(),
+    CallEnum.GET_PLAYERS: CacheRule(
+        ttl = 600,
+        invalidate_on = {CallbackEnum.ON_PLAYER_JOIN: None, CallbackEnum.ON_PLAYER_LEAVE: None}
+    ),
+    CallEnum.GET_VEHICLE_DATA: CacheRule(
+        ttl = 60,
+        invalidate_on = {CallbackEnum.ON_VEHICLE_DESPAWN: 0, CallbackEnum.ON_VEHICLE_UNLOAD: 0}
+    )
+}
+
+class CallCache():
+    """
+    A thread-safe read-through cache for the results of idempotent `server.` functions, keyed by function and arguments.
+    
+    Results expire after their rule's TTL in game ticks, as told by `clock`. Nothing is cached while the game tick is
+    unknown, and results from before the game tick went backwards (the addon reloaded) are treated as expired.
+    
+    Every invalidation bumps the function's generation. Results are only stored if the generation hasn't changed
+    since the call was made, so a call racing an invalidation can't put an outdated result back.
+    """
+    
+    def __init__(self, rules: dict[CallEnum, CacheRule], clock: Callable[[], int|None], metrics: Metrics|None = None):
+        """
+        Initializes a new instance of the `CallCache` class.
+        
+        Args:
+            rules (dict[CallEnum, CacheRule]): The functions to cache, and how.
+            clock (Callable[[], int|None]): Returns the current game tick, or None if unknown.
+            metrics (Metrics|None, optional): Where to count hits, misses and invalidations. Defaults to None (a new instance).
+        """
+        
+        self.rules = dict(rules)
+        self.clock = clock
+        self.metrics = metrics or Metrics()
+        
+        self._entries: dict[CallEnum, dict[str, tuple[list[Any], tuple[Any, ...], int]]] = {}
+        self._generations: dict[CallEnum, int] = {}
+        self._lock = threading.Lock()
+        
+    def _get_key(self, arguments: list[Any]) -> str:
+        """
+        Returns the cache key for a list of arguments.
+        
+        Args:
+            arguments (list[Any]): The arguments.
+        
+        Returns:
+            str: The key.
+        """
+        
+        return json.dumps(
+            [argument.build() if BaseValue.is_value(argument) else argument for argument in arguments],
+            sort_keys = True,
+            default = str
+        )
+        
+    def is_cached(self, function: CallEnum) -> bool:
+        """
+        Returns if the results of a function are cached.
+        
+        Args:
+            function (CallEnum): The function.
+        
+        Returns:
+            bool: True if the function has a rule.
+        """
+        
+        return function in self.rules
+    
+    def generation(self, function: CallEnum) -> int:
+        """
+        Returns how many times a function's results have been invalidated. Pass this to `put`.
+        
+        Args:
+            function (CallEnum): The function.
+        
+        Returns:
+            int: The generation.
+        """
+        
+        with self._lock:
+            return self._generations.get(function, 0)
+    
+    def get(self, function: CallEnum, arguments: list[Any]) -> tuple[Any, ...]|None:
+        """
+        Returns the cached result of a call, counting a hit or miss.
+        
+        Args:
+            function (CallEnum): The function.
+            arguments (list[Any]): The arguments of the call.
+        
+        Returns:
+            tuple[Any, ...]|None: The cached result, or None if there is none (or it expired).
+        """
+        
+        rule = self.rules.get(function)
+        
+        if rule is None:
+            return None
+        
+        now = self.clock()
+        key = self._get_key(arguments)
+        
+        with self._lock:
+            entry = self._entries.get(function, {}).get(key)
+            
+            if entry is not None and now is not None and not self._is_expired(rule, entry[2], now):
+                self.metrics.increment("cache_hits")
+                self.metrics.increment(f"cache_hits.{function.value}")
+                
+                return entry[1]
+            
+            if entry is not None:
+                del self._entries[function][key]
+        
+        self.metrics.increment("cache_misses")
+        self.metrics.increment(f"cache_misses.{function.value}")
+        
+        return None
+    
+    def _is_expired(self, rule: CacheRule, stored_at: int, now: int) -> bool:
+        """
+        Returns if a result has expired.
+        
+        Args:
+            rule (CacheRule): The rule of the result's function.
+            stored_at (int): The game tick the result was stored at.
+            now (int): The current game tick.
+        
+        Returns:
+            bool: True if expired.
+        """
+        
+        if now < stored_at:
+            return True
+        
+        return rule.ttl is not None and now - stored_at >= rule.ttl
+    
+    def put(self, function: CallEnum, arguments: list[Any], result: tuple[Any, ...], generation: int):
+        """
+        Stores the result of a call, unless the function was invalidated since `generation` was taken.
+        
+        Args:
+            function (CallEnum): The function.
+            arguments (list[Any]): The arguments of the call.
+            result (tuple[Any, ...]): What the function returned.
+            generation (int): The function's generation from before the call was made.
+        """
+        
+        if function not in self.rules:
+            return
+        
+        now = self.clock()
+        
+        if now is None:
+            return
+        
+        key = self._get_key(arguments)
+        
+        with self._lock:
+            if self._generations.get(function, 0) != generation:
+                return
+            
+            self._entries.setdefault(function, {})[key] = (list(arguments), result, now)
+    
+    def invalidate(self, function: CallEnum|None = None):
+        """
+        Invalidates every cached result of a function.
+        
+        Args:
+            function (CallEnum|None, optional): The function, or None for every function. Defaults to None.
+        """
+        
+        with self._lock:
+            functions = list(self.rules) if function is None else [function]
+            
+            for invalidated in functions:
+                self._invalidate(invalidated, lambda entry: True)
+    
+    def _invalidate(self, function: CallEnum, predicate: Callable[[tuple[list[Any], tuple[Any, ...], int]], bool]):
+        """
+        Removes the cached results of a function that match a predicate, and bumps its generation. Must be called with the lock held.
+        
+        Args:
+            function (CallEnum): The function.
+            predicate (Callable): Returns True for entries to remove.
+        """
+        
+        self._generations[function] = self._generations.get(function, 0) + 1
+        entries = self._entries.get(function, {})
+        
+        for key, entry in list(entries.items()):
+            if predicate(entry):
+                del entries[key]
+                self.metrics.increment("cache_invalidations")
+    
+    def on_callback(self, name: CallbackEnum, arguments: list[Any]):
+        """
+        Invalidates the results that a game callback being triggered makes outdated.
+        
+        Args:
+            name (CallbackEnum): The game callback.
+            arguments (list[Any]): The arguments it was triggered with.
+        """
+        
+        with self._lock:
+            for function, rule in self.rules.items():
+                if name not in rule.invalidate_on:
+                    continue
+                
+                index = rule.invalidate_on[name]
+                
+                if index is None:
+                    self._invalidate(function, lambda entry: True)
+                    continue
+                
+                if index >= len(arguments):
+                    continue
+                
+                value = arguments[index]
+                self._invalidate(function, lambda entry: len(entry[0]) > rule.argument and entry[0][rule.argument] == value)
+                
+    def get_callbacks(self) -> list[CallbackEnum]:
+        """
+        Returns the game callbacks the cache invalidates results on, which the addon must listen for.
+        
+        Returns:
+            list[CallbackEnum]: The game callbacks.
+        """
+        
+        return list(dict.fromkeys(name for rule in self.rules.values() for name in rule.invalidate_on))
+    
+    def __len__(self) -> int:
+        """
+        Returns the amount of cached results.
+        
+        Returns:
+            int: The amount of cached results.
+        """
+        
+        with self._lock:
+            return sum(len(entries) for entries in self._entries.values())
@@ -0,0 +1,1126 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# // Imports
+from __future__ import annotations
+
+import json
+import threading
+import itertools
+import collections
+import heapq
+import asyncio
+import time
+from typing import Any, Iterator
+from concurrent.futures import (
+    Future,
+    InvalidStateError,
+    TimeoutError
+)
+
+from .exceptions import PTSCallException
+
+from . import Metrics
+from . import Event
+from . import (
+    CallEnum,
+    CallPriorityEnum,
+    BuiltinEnum
+)
+from . import BaseValue
+from . import Call
+from . import get_builtin_path
+from .models import _from_lua_array
+
+# // Main
+__all__ = [
+    "BATCH_FUNCTION_PATH",
+    "PROGRAM_FUNCTION_PATH",
+    "CallQueue",
+    "CallBatch",
+    "ProgramRef",
+    "ProgramStep",
+    "CallProgram"
+]
+
+BATCH_FUNCTION_PATH: str = get_builtin_path(BuiltinEnum.BATCH)
+PROGRAM_FUNCTION_PATH: str = get_builtin_path(BuiltinEnum.PROGRAM)
+
+def _set_result(future: Future, result: Any) -> bool:
+    """
+    Sets the result of a future, unless it is already done (e.g. cancelled by whoever was waiting on it).
+    Safe to call while the future may be cancelled from another thread.
+    
+    Args:
+        future (Future): The future.
+        result (Any): The result to set.
+    
+    Returns:
+        bool: True if the result was set, False if the future was already done.
+    """
+    
+    try:
+        future.set_result(result)
+    except InvalidStateError:
+        return False
+    
+    return True
+
+def _set_exception(future: Future, exception: BaseException) -> bool:
+    """
+    Sets the exception of a future, unless it is already done (e.g. cancelled by whoever was waiting on it).
+    Safe to call while the future may be cancelled from another thread.
+    
+    Args:
+        future (Future): The future.
+        exception (BaseException): The exception to set.
+    
+    Returns:
+        bool: True if the exception was set, False if the future was already done.
+    """
+    
+    try:
+        future.set_exception(exception)
+    except InvalidStateError:
+        return False
+    
+    return True
+
+class CallQueue():
+    """
+    A thread-safe registry of pending calls.
+    
+    Calls are stored in a dict keyed by ID. IDs are handed out in order under the same
+    lock calls are inserted with, so the dict's insertion order is also ID order.
+    This gives O(1) lookups and removals while keeping the queue ordered.
+    
+    Calls are given a deadline when they are first sent to the addon, pushed back by however long
+    scheduled calls wait in-game. Calls that are still queued past their deadline are purged by `expire`, and calls whose future is cancelled
+    are removed straight away. Either way, their IDs are reported by `get_cancelled` so the
+    addon can be told to skip them.
+    
+    Read-only calls created with `create_shared` are coalesced: identical calls (same path, arguments
+    and priority) made while one is still pending share that call, and each waiter is given its own future.
+    The shared call is only cancelled once every waiter has given up on it.
+    
+    `on_add` is fired with the added calls whenever calls are added.
+    """
+    
+    def __init__(self, timeout: float|None = None, metrics: Metrics|None = None):
+        """
+        Initializes a new instance of the `CallQueue` class.
+        
+        Args:
+            timeout (float|None, optional): How long calls can go unanswered after being sent before they expire, in seconds. Defaults to None (never).
+            metrics (Metrics|None, optional): The metrics to count expired and cancelled calls in. Defaults to None (a new instance).
+        """
+        
+        self.timeout = timeout
+        self.metrics = metrics or Metrics()
+        self.on_add = Event()
+        
+        self._calls: dict[int, Call] = {}
+        self._no_reply_ids: collections.deque[int] = collections.deque()
+        self._deadlines: list[tuple[float, int]] = []
+        self._cancelled: dict[int, float|None] = {}
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+        
+        self._shared: dict[tuple[str, str, int], tuple[Call, int]] = {}
+        self._shared_lock = threading.Lock()
+    
+    def create(self, path: str, arguments: list[Any], **fields) -> Call:
+        """
+        Creates a call and adds it to the queue.
+        
+        Args:
+            path (str): The path of the function to call.
+            arguments (list[Any]): The arguments to pass to the function.
+            **fields: Any other fields to create the call with.
+        
+        Returns:
+            Call: The created call.
+        """
+        
+        return self.add(Call(path = path, arguments = arguments, **fields))
+    
+    def create_shared(self, path: str, arguments: list[Any], priority: CallPriorityEnum = CallPriorityEnum.NORMAL) -> tuple[Call, Future]:
+        """
+        Creates a read-only call, or joins an identical call that is still pending.<br>
+        Only use this for functions without side effects, as identical calls are only executed once.
+        
+        Args:
+            path (str): The path of the function to call.
+            arguments (list[Any]): The arguments to pass to the function.
+            priority (CallPriorityEnum, optional): The priority class of the call. Defaults to CallPriorityEnum.NORMAL.
+        
+        Returns:
+            tuple[Call, Future]: The shared call, and a future for this waiter. Cancelling the future only cancels the call once no one else is waiting on it.
+        """
+        
+        key = (path, json.dumps(arguments, default = str), priority.value)
+        waiter = Future()
+        
+        with self._shared_lock:
+            call, waiters = self._shared.get(key, (None, 0))
+            
+            if call is not None and not call.future.done():
+                self._shared[key] = (call, waiters + 1)
+                self.metrics.increment("calls_coalesced")
+            else:
+                call = Call(path = path, arguments = arguments, priority = priority)
+                call.future.add_done_callback(lambda _, key = key, call = call: self._unshare(key, call))
+                
+                self._shared[key] = (call, 1)
+                self.add(call)
+        
+        call.future.add_done_callback(lambda future: self._copy_result(future, waiter))
+        waiter.add_done_callback(lambda future: self._release_shared(key, call) if future.cancelled() else None)
+        
+        return call, waiter
+    
+    def _copy_result(self, source: Future, target: Future):
+        """
+        Copies the outcome of a shared call's future to a waiter's future, unless the waiter gave up on it.
+        
+        Args:
+            source (Future): The shared call's future.
+            target (Future): The waiter's future.
+        """
+        
+        if source.cancelled():
+            target.cancel()
+        elif source.exception() is not None:
+            _set_exception(target, source.exception())
+        else:
+            _set_result(target, source.result())
+    
+    def _unshare(self, key: tuple[str, str, int], call: Call):
+        """
+        Stops a finished call from being joined by new waiters.
+        
+        Args:
+            key (tuple[str, str, int]): The key the call is shared under.
+            call (Call): The call.
+        """
+        
+        with self._shared_lock:
+            if self._shared.get(key, (None, 0))[0] is call:
+                del self._shared[key]
+    
+    def _release_shared(self, key: tuple[str, str, int], call: Call):
+        """
+        Releases a waiter of a shared call, cancelling the call if no one else is waiting on it.
+        
+        Args:
+            key (tuple[str, str, int]): The key the call is shared under.
+            call (Call): The call.
+        """
+        
+        with self._shared_lock:
+            shared, waiters = self._shared.get(key, (None, 0))
+            
+            if shared is not call:
+                return
+            
+            if waiters > 1:
+                self._shared[key] = (call, waiters - 1)
+                return
+            
+            del self._shared[key]
+        
+        self.cancel(call)
+    
+    def add(self, call: Call) -> Call:
+        """
+        Gives a call the next ID and adds it to the queue.
+        
+        Args:
+            call (Call): The call to add.
+        
+        Returns:
+            Call: The added call.
+        """
+        
+        return self.add_many([call])[0]
+    
+    def add_many(self, calls: list[Call]) -> list[Call]:
+        """
+        Gives calls consecutive IDs and adds them to the queue at once,
+        so they are always sent to the addon together.
+        
+        Args:
+            calls (list[Call]): The calls to add.
+        
+        Returns:
+            list[Call]: The added calls.
+        """
+        
+        with self._lock:
+            for call in calls:
+                call.id = next(self._sequence)
+                self._calls[call.id] = call
+                
+                if call.no_reply:
+                    self._no_reply_ids.append(call.id)
+        
+        for call in calls:
+            call.future.add_done_callback(lambda future, call = call: self._on_call_done(call, future))
+        
+        self.on_add.fire(calls)
+        return calls
+    
+    def _on_call_done(self, call: Call, future: Future):
+        """
+        Removes a call from the queue if its future was cancelled.
+        
+        Args:
+            call (Call): The call.
+            future (Future): The future of the call.
+        """
+        
+        if not future.cancelled():
+            return
+        
+        if self._discard(call.id):
+            self.metrics.increment("calls_cancelled")
+    
+    def _discard(self, call_id: int) -> bool:
+        """
+        Removes a call from the queue, remembering its ID if it has been sent to the addon.
+        
+        Args:
+            call_id (int): The ID of the call to discard.
+        
+        Returns:
+            bool: True if the call was in the queue, False otherwise.
+        """
+        
+        with self._lock:
+            call = self._calls.pop(call_id, None)
+            
+            if call is None:
+                return False
+            
+            if call.deadline is not None:
+                self._cancelled[call_id] = self._get_forget_time(time.monotonic())
+            
+            return True
+    
+    def cancel(self, call: Call) -> bool:
+        """
+        Cancels a pending call, removing it from the queue and cancelling its future.
+        
+        Args:
+            call (Call): The call to cancel.
+        
+        Returns:
+            bool: True if the call was pending and is now cancelled, False otherwise.
+        """
+        
+        # the future's done callback removes the call
+        return call.future.cancel()
+    
+    def expire(self, now: float|None = None) -> list[Call]:
+        """
+        Removes and returns all calls that are past their deadline.
+        
+        Args:
+            now (float|None, optional): The current `time.monotonic()` time. Defaults to None (now).
+        
+        Returns:
+            list[Call]: The expired calls.
+        """
+        
+        now = time.monotonic() if now is None else now
+        calls = []
+        
+        with self._lock:
+            while len(self._deadlines) > 0 and self._deadlines[0][0] <= now:
+                _, call_id = heapq.heappop(self._deadlines)
+                call = self._calls.pop(call_id, None)
+                
+                if call is None:
+                    continue
+                
+                self._cancelled[call_id] = self._get_forget_time(now)
+                calls.append(call)
+        
+        if len(calls) > 0:
+            self.metrics.increment("calls_expired", len(calls))
+        
+        return calls
+    
+    def _get_forget_time(self, now: float) -> float|None:
+        """
+        Returns when the ID of a call cancelled now stops being reported to the addon.
+        
+        Args:
+            now (float): The current `time.monotonic()` time.
+        
+        Returns:
+            float|None: The `time.monotonic()` time, or None if the ID is reported until the addon's watermark passes it.
+        """
+        
+        return None if self.timeout is None else now + self.timeout
+    
+    def get_cancelled(self, ack: int, now: float|None = None) -> list[int]:
+        """
+        Returns the IDs of calls that were cancelled or expired after being sent to the addon.<br>
+        The response carrying them may never reach the addon, so each ID is returned until the addon's
+        watermark passes it or it has been reported for `timeout` seconds. Every ID is returned at least once.
+        
+        Args:
+            ack (int): The ID of the latest call the addon has received.
+            now (float|None, optional): The current `time.monotonic()` time. Defaults to None (now).
+        
+        Returns:
+            list[int]: The IDs of the calls.
+        """
+        
+        now = time.monotonic() if now is None else now
+        
+        with self._lock:
+            cancelled = list(self._cancelled)
+            
+            self._cancelled = {
+                call_id: forget_at for call_id, forget_at in self._cancelled.items()
+                if call_id > ack and (forget_at is None or forget_at > now)
+            }
+        
+        return cancelled
+    
+    def acknowledge(self, call_id: int) -> list[Call]:
+        """
+        Removes and returns all `no_reply` calls up to and including the provided ID.<br>
+        These calls will never receive a result, so they are done as soon as the addon has received them.
+        
+        Args:
+            call_id (int): The ID of the latest call the addon has received.
+        
+        Returns:
+            list[Call]: The removed calls.
+        """
+        
+        calls = []
+        
+        with self._lock:
+            while len(self._no_reply_ids) > 0 and self._no_reply_ids[0] <= call_id:
+                call = self._calls.pop(self._no_reply_ids.popleft(), None)
+                
+                if call is not None:
+                    calls.append(call)
+        
+        return calls
+    
+    def get(self, call_id: int) -> Call|None:
+        """
+        Gets a call by its ID.
+        
+        Args:
+            call_id (int): The ID of the call to get.
+        
+        Returns:
+            Call|None: The call if it exists, otherwise None.
+        """
+        
+        return self._calls.get(call_id)
+    
+    def pop(self, call_id: int) -> Call|None:
+        """
+        Removes a call from the queue by its ID and returns it.
+        
+        Args:
+            call_id (int): The ID of the call to remove.
+        
+        Returns:
+            Call|None: The removed call, or None if it wasn't in the queue.
+        """
+        
+        with self._lock:
+            return self._calls.pop(call_id, None)
+    
+    def remove(self, call: Call) -> bool:
+        """
+        Removes a call from the queue.
+        
+        Args:
+            call (Call): The call to remove.
+        
+        Returns:
+            bool: True if the call was in the queue, False otherwise.
+        """
+        
+        return self.pop(call.id) is not None
+    
+    def after(self, call_id: int) -> list[Call]:
+        """
+        Returns all calls with an ID above the provided one, in order.
+        Only walks the calls above `call_id`, not the whole queue.
+        
+        Calls returned for the first time are given their deadline.
+        
+        Args:
+            call_id (int): The ID to return calls after.
+        
+        Returns:
+            list[Call]: The calls after `call_id`.
+        """
+        
+        calls = []
+        now = time.monotonic()
+        
+        with self._lock:
+            for call in reversed(self._calls.values()):
+                if call.id <= call_id:
+                    break
+                
+                if call.deadline is None and self.timeout is not None:
+                    call.deadline = now + self.timeout + call.schedule_seconds
+                    heapq.heappush(self._deadlines, (call.deadline, call.id))
+                
+                calls.append(call)
+        
+        calls.reverse()
+        return calls
+    
+    def clear(self):
+        """
+        Removes all calls from the queue.
+        """
+        
+        with self._lock:
+            self._calls.clear()
+            self._no_reply_ids.clear()
+            self._deadlines.clear()
+            self._cancelled.clear()
+        
+        with self._shared_lock:
+            self._shared.clear()
+    
+    def __contains__(self, call_id: int) -> bool:
+        """
+        Returns whether or not a call with the provided ID is in the queue.
+        
+        Args:
+            call_id (int): The ID of the call to check for.
+        
+        Returns:
+            bool: Whether or not the call is in the queue.
+        """
+        
+        return call_id in self._calls
+    
+    def __len__(self) -> int:
+        """
+        Returns the amount of calls in the queue.
+        
+        Returns:
+            int: The amount of calls in the queue.
+        """
+        
+        return len(self._calls)
+    
+    def __iter__(self) -> Iterator[Call]:
+        """
+        Returns an iterator over a snapshot of the calls in the queue, in order.
+        
+        Returns:
+            Iterator[Call]: An iterator over the calls in the queue.
+        """
+        
+        with self._lock:
+            return iter(list(self._calls.values()))
+
+class CallBatch():
+    """
+    Collects calls and adds them to a call queue at once when flushed, so they are all sent
+    to the addon in the same update instead of one round trip each.
+    
+    Can be used as a context manager, which flushes the batch on exit.
+    """
+    
+    def __init__(self, queue: CallQueue, *, same_tick: bool = False, no_reply: bool = False, priority: CallPriorityEnum = CallPriorityEnum.NORMAL, timeout: float|None = None):
+        """
+        Initializes a new instance of the `CallBatch` class.
+        
+        Args:
+            queue (CallQueue): The queue to add the calls to.
+            same_tick (bool, optional): Whether or not to guarantee all calls are executed within the same game tick. Defaults to False.
+            no_reply (bool, optional): Whether or not the calls should skip returning results. Their futures resolve to an empty tuple once the addon receives them. Defaults to False.
+            priority (CallPriorityEnum, optional): The priority class of the calls. Defaults to CallPriorityEnum.NORMAL.
+            timeout (float|None, optional): How long to wait for results in seconds. Defaults to None (no timeout).
+        """
+        
+        self.queue = queue
+        self.same_tick = same_tick
+        self.no_reply = no_reply
+        self.priority = priority
+        self.timeout = timeout
+        self.flushed = False
+        
+        self._entries: list[tuple[str, list[Any]]] = []
+        self._futures: list[Future] = []
+        self._call: Call|None = None
+    
+    def call(self, function: CallEnum, *args) -> Future:
+        """
+        Adds a call to a `server.` function to the batch.
+        
+        Args:
+            function (CallEnum): The name of the function to call.
+            *args: The arguments to pass to the function.
+        
+        Raises:
+            PTSCallException: If the batch has already been flushed.
+        
+        Returns:
+            Future: A future for whatever the function returns.
+        """
+        
+        return self.call_function(f"server.{function.value}", *args)
+    
+    def call_function(self, path: str, *args) -> Future:
+        """
+        Adds a call to a custom function to the batch.
+        
+        Args:
+            path (str): The path of the function to call.
+            *args: The arguments to pass to the function.
+        
+        Raises:
+            PTSCallException: If the batch has already been flushed.
+        
+        Returns:
+            Future: A future for whatever the function returns.
+        """
+        
+        if self.flushed:
+            raise PTSCallException("Cannot add calls to a batch that has already been flushed.")
+        
+        future = Future()
+        
+        self._entries.append((path, list(args)))
+        self._futures.append(future)
+        
+        return future
+    
+    def flush(self):
+        """
+        Adds all calls in the batch to the queue.
+        """
+        
+        if self.flushed:
+            return
+        
+        self.flushed = True
+        
+        if len(self._entries) == 0:
+            return
+        
+        if self.same_tick:
+            self._flush_as_single_call()
+            return
+        
+        self.queue.add_many([
+            Call(path = path, arguments = arguments, no_reply = self.no_reply, priority = self.priority, future = future)
+            for (path, arguments), future in zip(self._entries, self._futures)
+        ])
+    
+    def _flush_as_single_call(self):
+        """
+        Adds the batch to the queue as one call to the in-game batch function, which executes
+        every call in the batch in one go. The results are then fanned out to each future.
+        """
+        
+        entries = [
+            [path, [argument.build() if BaseValue.is_value(argument) else argument for argument in arguments]]
+            for path, arguments in self._entries
+        ]
+        
+        self._call = self.queue.create(BATCH_FUNCTION_PATH, [entries], no_reply = self.no_reply, priority = self.priority)
+        self._call.future.add_done_callback(self._distribute)
+    
+    def _distribute(self, future: Future):
+        """
+        Distributes the results of the in-game batch function to the futures of the batch.
+        
+        Args:
+            future (Future): The future of the batch call.
+        """
+        
+        if future.cancelled():
+            for batch_future in self._futures:
+                batch_future.cancel()
+            
+            return
+        
+        exception = future.exception()
+        
+        if exception is not None:
+            for batch_future in self._futures:
+                _set_exception(batch_future, exception)
+            
+            return
+        
+        if self.no_reply:
+            for batch_future in self._futures:
+                _set_result(batch_future, ())
+            
+            return
+        
+        # each call in the batch returns `true, results`, or `false, error` if it failed
+        for index, (batch_future, entry) in enumerate(zip(self._futures, _from_lua_array(future.result()[0]))):
+            succeeded, result = _from_lua_array(entry)
+            
+            if succeeded is False:
+                _set_exception(batch_future, PTSCallException(f"Call {index} of batch failed in-game: {result}"))
+                continue
+            
+            _set_result(batch_future, tuple(_from_lua_array(result) or []))
+    
+    def cancel(self):
+        """
+        Cancels every call in the batch that hasn't received a result yet.
+        """
+        
+        if self._call is not None:
+            self.queue.cancel(self._call)
+        
+        for future in self._futures:
+            future.cancel()
+    
+    def futures(self) -> list[Future]:
+        """
+        Returns the futures for each call in the batch, in order.
+        
+        Returns:
+            list[Future]: The futures.
+        """
+        
+        return list(self._futures)
+    
+    def results(self) -> list[tuple[Any, ...]]:
+        """
+        Flushes the batch if needed and waits for the results of every call in it.
+        
+        Raises:
+            PTSCallException: If the batch times out.
+        
+        Returns:
+            list[tuple[Any, ...]]: What each function returned, in order.
+        """
+        
+        self.flush()
+        
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        results = []
+        
+        try:
+            for future in self._futures:
+                remaining = None if deadline is None else max(0, deadline - time.monotonic())
+                results.append(future.result(remaining))
+        except TimeoutError as exception:
+            self.cancel()
+            raise PTSCallException(f"Batch of {len(self._futures)} calls timed out.") from exception
+        
+        return results
+    
+    async def results_async(self) -> list[tuple[Any, ...]]:
+        """
+        Flushes the batch if needed and waits for the results of every call in it without blocking the event loop.
+        
+        Raises:
+            PTSCallException: If the batch times out.
+        
+        Returns:
+            list[tuple[Any, ...]]: What each function returned, in order.
+        """
+        
+        self.flush()
+        
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*[asyncio.wrap_future(future) for future in self._futures]),
+                self.timeout
+            )
+        except asyncio.TimeoutError as exception:
+            self.cancel()
+            raise PTSCallException(f"Batch of {len(self._futures)} calls timed out.") from exception
+    
+    def __enter__(self) -> CallBatch:
+        """
+        Returns the batch for use in a `with` statement.
+        
+        Returns:
+            CallBatch: This batch.
+        """
+        
+        return self
+    
+    def __exit__(self, exception_type, exception, traceback):
+        """
+        Flushes the batch, unless the `with` block raised an exception.
+        """
+        
+        if exception is not None:
+            return
+        
+        self.flush()
+    
+    def __len__(self) -> int:
+        """
+        Returns the amount of calls in the batch.
+        
+        Returns:
+            int: The amount of calls in the batch.
+        """
+        
+        return len(self._entries)
+
+class ProgramRef():
+    """
+    A reference to a return value of an earlier step in a call program, resolved in-game.
+    Indexing a reference goes into the table it refers to (using Lua keys, so arrays start at 1).
+    """
+    
+    def __init__(self, program: CallProgram, step: int, index: int, keys: tuple[Any, ...] = ()):
+        """
+        Initializes a new instance of the `ProgramRef` class.
+        
+        Args:
+            program (CallProgram): The program the step belongs to.
+            step (int): The index of the step.
+            index (int): The index of the return value.
+            keys (tuple[Any, ...], optional): The keys to follow into the return value. Defaults to ().
+        """
+        
+        self.program = program
+        self.step = step
+        self.index = index
+        self.keys = keys
+        
+    def __getitem__(self, key: Any) -> ProgramRef:
+        """
+        Returns a reference to a value within the table this refers to.
+        
+        Args:
+            key (Any): The Lua key of the value.
+        
+        Returns:
+            ProgramRef: The reference.
+        """
+        
+        return ProgramRef(self.program, self.step, self.index, self.keys + (key,))
+    
+    def encode(self) -> dict[str, list[Any]]:
+        """
+        Encodes the reference as `{"$r": [step, index, *keys]}`.
+        
+        Returns:
+            dict[str, list[Any]]: The encoded reference.
+        """
+        
+        return {"$r": [self.step, self.index, *self.keys]}
+
+class ProgramStep():
+    """
+    A call in a call program. Index it to refer to its return values in later steps.
+    """
+    
+    def __init__(self, program: CallProgram, index: int, path: str, output: bool):
+        """
+        Initializes a new instance of the `ProgramStep` class.
+        
+        Args:
+            program (CallProgram): The program the step belongs to.
+            index (int): The index of the step.
+            path (str): The path of the function the step calls.
+            output (bool): Whether or not the step's return values are sent back.
+        """
+        
+        self.program = program
+        self.index = index
+        self.path = path
+        self.output = output
+        self.future = Future()
+        
+    def __getitem__(self, index: int) -> ProgramRef:
+        """
+        Returns a reference to one of the step's return values.
+        
+        Args:
+            index (int): The index of the return value, starting at 0.
+        
+        Returns:
+            ProgramRef: The reference.
+        """
+        
+        return ProgramRef(self.program, self.index, index)
+
+class CallProgram():
+    """
+    A sequence of calls where later calls can use the return values of earlier ones.
+    The whole program is sent as one call, and executed in-game within the same tick.
+    Only the return values of steps marked as outputs are sent back.
+    
+    Can be used as a context manager, which flushes the program on exit.
+    
+    If a step errors, the rest of the program is skipped and every step's future raises `PTSCallException`.
+    """
+    
+    def __init__(self, queue: CallQueue, *, priority: CallPriorityEnum = CallPriorityEnum.NORMAL, timeout: float|None = None):
+        """
+        Initializes a new instance of the `CallProgram` class.
+        
+        Args:
+            queue (CallQueue): The queue to add the program to.
+            priority (CallPriorityEnum, optional): The priority class of the program. Defaults to CallPriorityEnum.NORMAL.
+            timeout (float|None, optional): How long to wait for results in seconds. Defaults to None (no timeout).
+        """
+        
+        self.queue = queue
+        self.priority = priority
+        self.timeout = timeout
+        self.flushed = False
+        
+        self._steps: list[ProgramStep] = []
+        self._entries: list[list[Any]] = []
+        self._call: Call|None = None
+        
+    def call(self, function: CallEnum, *args, output: bool = False) -> ProgramStep:
+        """
+        Adds a call to a `server.` function to the program.
+        
+        Args:
+            function (CallEnum): The name of the function to call.
+            *args: The arguments to pass to the function. May contain references to earlier steps.
+            output (bool, optional): Whether or not to send back the return values of this call. Defaults to False.
+        
+        Raises:
+            PTSCallException: If the program has already been flushed, or an argument refers to a step that can't be used.
+        
+        Returns:
+            ProgramStep: The step.
+        """
+        
+        return self.call_function(f"server.{function.value}", *args, output = output)
+    
+    def call_function(self, path: str, *args, output: bool = False) -> ProgramStep:
+        """
+        Adds a call to a custom function to the program.
+        
+        Args:
+            path (str): The path of the function to call.
+            *args: The arguments to pass to the function. May contain references to earlier steps.
+            output (bool, optional): Whether or not to send back the return values of this call. Defaults to False.
+        
+        Raises:
+            PTSCallException: If the program has already been flushed, or an argument refers to a step that can't be used.
+        
+        Returns:
+            ProgramStep: The step.
+        """
+        
+        if self.flushed:
+            raise PTSCallException("Cannot add calls to a program that has already been flushed.")
+        
+        step = ProgramStep(self, len(self._steps), path, output)
+        
+        self._entries.append([path, [self._encode_argument(argument) for argument in args]])
+        self._steps.append(step)
+        
+        return step
+    
+    def _encode_argument(self, argument: Any) -> Any:
+        """
+        Encodes an argument of a step, replacing references to earlier steps and building custom values.
+        
+        Args:
+            argument (Any): The argument.
+        
+        Raises:
+            PTSCallException: If the argument refers to a step of another program.
+        
+        Returns:
+            Any: The encoded argument.
+        """
+        
+        if isinstance(argument, ProgramStep):
+            argument = argument[0]
+        
+        if isinstance(argument, ProgramRef):
+            if argument.program is not self:
+                raise PTSCallException("Steps can only refer to earlier steps of the same program.")
+            
+            return argument.encode()
+        
+        if BaseValue.is_value(argument):
+            return argument.build()
+        
+        if isinstance(argument, (list, tuple)):
+            return [self._encode_argument(item) for item in argument]
+        
+        if isinstance(argument, dict):
+            return {key: self._encode_argument(value) for key, value in argument.items()}
+        
+        return argument
+    
+    def flush(self):
+        """
+        Adds the program to the queue as one call to the in-game program function.
+        """
+        
+        if self.flushed:
+            return
+        
+        self.flushed = True
+        
+        if len(self._steps) == 0:
+            return
+        
+        outputs = [step.index for step in self._steps if step.output]
+        
+        self._call = self.queue.create(PROGRAM_FUNCTION_PATH, [self._entries, outputs], priority = self.priority)
+        self._call.future.add_done_callback(self._distribute)
+        
+    def _distribute(self, future: Future):
+        """
+        Distributes the outputs of the in-game program function to the futures of the steps.
+        Steps that aren't outputs resolve to an empty tuple.
+        
+        Args:
+            future (Future): The future of the program call.
+        """
+        
+        if future.cancelled():
+            for step in self._steps:
+                step.future.cancel()
+            
+            return
+        
+        exception = future.exception()
+        result = future.result() if exception is None else ()
+        
+        # the program returns `true, outputs`, or `false, step, error` if a step failed
+        if exception is None and result[0] is False:
+            _, index, error = result
+            exception = PTSCallException(f"Step {index} ({self._steps[index].path}) of program failed in-game: {error}")
+            
+        if exception is not None:
+            for step in self._steps:
+                _set_exception(step.future, exception)
+                
+            return
+        
+        outputs = iter(_from_lua_array(result[1]))
+        
+        for step in self._steps:
+            # outputs are consumed even for steps given up on, so later steps still get their own
+            _set_result(step.future, tuple(_from_lua_array(next(outputs, []))) if step.output else ())
+    
+    def cancel(self):
+        """
+        Cancels the program, unless it has already received a result.
+        """
+        
+        if self._call is not None:
+            self.queue.cancel(self._call)
+        
+        for step in self._steps:
+            step.future.cancel()
+    
+    def results(self) -> list[tuple[Any, ...]]:
+        """
+        Flushes the program if needed and waits for its outputs.
+        
+        Raises:
+            PTSCallException: If the program times out or a step failed in-game.
+        
+        Returns:
+            list[tuple[Any, ...]]: What each output step returned, in order.
+        """
+        
+        self.flush()
+        outputs = [step for step in self._steps if step.output]
+        
+        try:
+            # every step is resolved at once, so waiting on one is enough
+            if len(self._steps) > 0:
+                self._steps[0].future.result(self.timeout)
+        except TimeoutError as exception:
+            self.cancel()
+            raise PTSCallException(f"Program of {len(self._steps)} calls timed out.") from exception
+        
+        return [step.future.result() for step in outputs]
+    
+    async def results_async(self) -> list[tuple[Any, ...]]:
+        """
+        Flushes the program if needed and waits for its outputs without blocking the event loop.
+        
+        Raises:
+            PTSCallException: If the program times out or a step failed in-game.
+        
+        Returns:
+            list[tuple[Any, ...]]: What each output step returned, in order.
+        """
+        
+        self.flush()
+        outputs = [step for step in self._steps if step.output]
+        
+        try:
+            if len(self._steps) > 0:
+                await asyncio.wait_for(asyncio.wrap_future(self._steps[0].future), self.timeout)
+        except asyncio.TimeoutError as exception:
+            self.cancel()
+            raise PTSCallException(f"Program of {len(self._steps)} calls timed out.") from exception
+        
+        return [step.future.result() for step in outputs]
+    
+    def __enter__(self) -> CallProgram:
+        """
+        Returns the program for use in a `with` statement.
+        
+        Returns:
+            CallProgram: This program.
+        """
+        
+        return self
+    
+    def __exit__(self, exception_type, exception, traceback):
+        """
+        Flushes the program, unless the `with` block raised an exception.
+        """
+        
+        if exception is not None:
+            return
+        
+        self.flush()
+    
+    def __len__(self) -> int:
+        """
+        Returns the amount of calls in the program.
+        
+        Returns:
+            int: The amount of calls in the program.
+        """
+        
+        return len(self._entries)
@@ -25,9 +25,75 @@ from enum import Enum
 # // Main
 __all__ = [
     "CallEnum",
-    "CallbackEnum"
+    "CallbackEnum",
+    "CallbackPolicyEnum",
+    "CallbackFilterEnum",
+    "CallbackOverflowEnum",
+    "CallPriorityEnum",
+    "BuiltinEnum",
+    "VehicleComponentEnum"
 ]
 
+class CallbackPolicyEnum(Enum):
+    """
+    An enum for the ways the addon can deal with a game callback being triggered many times between updates.
+    """
+    
+    KEEP_ALL = "all"
+    LATEST = "latest"
+    AGGREGATE = "aggregate"
+    SAMPLE = "sample"
+
+class CallbackFilterEnum(Enum):
+    """
+    An enum for the ways a game callback argument can be checked by a callback filter.
+    """
+    
+    EQUALS = "eq"
+    PREFIX = "prefix"
+    ONE_OF = "in"
+
+class CallPriorityEnum(Enum):
+    """
+    An enum for the priority classes of calls. The addon executes calls of a higher priority first.
+    """
+    
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+class BuiltinEnum(Enum):
+    """
+    An enum for the functions built into the in-game addon. Bulk getters return one flat array, packed to keep payloads small.
+    """
+    
+    BATCH = "Batch"
+    PROGRAM = "Program"
+    GET_PLAYERS = "GetPlayers"
+    GET_VEHICLE_POSITIONS = "GetVehiclePositions"
+    READ_VEHICLE_COMPONENTS = "ReadVehicleComponents"
+    GET_ENTITIES = "GetEntities"
+
+class VehicleComponentEnum(Enum):
+    """
+    An enum for the vehicle components `BuiltinEnum.READ_VEHICLE_COMPONENTS` can read.
+    """
+    
+    DIAL = "dial"
+    BUTTON = "button"
+    BATTERY = "battery"
+    TANK = "tank"
+    SEAT = "seat"
+
+class CallbackOverflowEnum(Enum):
+    """
+    An enum for what the addon drops once its backlog of triggered callbacks is full.
+    """
+    
+    DROP_OLDEST = "drop_oldest"
+    DROP_BY_CALLBACK = "drop_by_callback"
+    SUMMARIZE = "summarize"
+
 class CallbackEnum(Enum):
     """
     An enum for all the available callbacks in Stormworks.
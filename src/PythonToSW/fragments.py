@@ -0,0 +1,132 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# // Imports
+import threading
+import time
+
+# // Main
+__all__ = [
+    "FragmentAssembler"
+]
+
+class FragmentAssembler():
+    """
+    Reassembles payloads the addon had to split across several updates because they didn't fit in one URL.
+    
+    Each payload is sent as a transfer with an ID, made up of a known amount of fragments.
+    Transfers that stop receiving fragments are discarded after a timeout.
+    
+    Completed transfers are remembered until the same timeout passes, so fragments the addon
+    resends because it never got our answer are answered with `count` instead of starting the transfer over.
+    """
+    
+    def __init__(self, timeout: float = 60, max_fragments: int = 4096):
+        """
+        Initializes a new instance of the `FragmentAssembler` class.
+        
+        Args:
+            timeout (float, optional): How long a transfer can go without receiving a fragment before it is discarded, in seconds. Defaults to 60.
+            max_fragments (int, optional): The maximum amount of fragments a transfer can be made up of. Defaults to 4096.
+        """
+        
+        self.timeout = timeout
+        self.max_fragments = max_fragments
+        
+        self._transfers: dict[int, tuple[list[str|None], float]] = {}
+        self._completed: dict[int, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        
+    def add(self, transfer_id: int, index: int, count: int, data: str) -> tuple[int, str|None]:
+        """
+        Adds a fragment to a transfer.
+        
+        Args:
+            transfer_id (int): The ID of the transfer.
+            index (int): The index of the fragment, starting at 0.
+            count (int): The amount of fragments in the transfer.
+            data (str): The fragment.
+        
+        Raises:
+            ValueError: If the fragment is invalid.
+        
+        Returns:
+            tuple[int, str|None]: The index of the next fragment needed (`count` once complete), and the reassembled payload once complete.
+        """
+        
+        if count < 1 or count > self.max_fragments or index < 0 or index >= count:
+            raise ValueError(f"Invalid fragment {index}/{count} for transfer {transfer_id}.")
+        
+        now = time.monotonic()
+        
+        with self._lock:
+            self._purge(now)
+            
+            # already reassembled, the addon just hasn't been told yet
+            completed_count, _ = self._completed.get(transfer_id, (None, None))
+            
+            if completed_count == count:
+                self._completed[transfer_id] = (count, now)
+                return count, None
+            
+            fragments, _ = self._transfers.get(transfer_id, (None, None))
+            
+            # a transfer with a different fragment count is a new transfer reusing the ID
+            if fragments is None or len(fragments) != count:
+                fragments = [None] * count
+            
+            fragments[index] = data
+            
+            try:
+                needed = fragments.index(None)
+            except ValueError:
+                self._transfers.pop(transfer_id, None)
+                self._completed[transfer_id] = (count, now)
+                return count, "".join(fragments)
+            
+            self._transfers[transfer_id] = (fragments, now)
+            return needed, None
+        
+    def _purge(self, now: float):
+        """
+        Discards transfers that timed out, and forgets completed transfers after the same timeout. Must be called with the lock held.
+        
+        Args:
+            now (float): The current `time.monotonic()` time.
+        """
+        
+        for transfer_id, (_, updated_at) in list(self._transfers.items()):
+            if now - updated_at > self.timeout:
+                del self._transfers[transfer_id]
+                
+        for transfer_id, (_, completed_at) in list(self._completed.items()):
+            if now - completed_at > self.timeout:
+                del self._completed[transfer_id]
+                
+    def __len__(self) -> int:
+        """
+        Returns the amount of incomplete transfers.
+        
+        Returns:
+            int: The amount of incomplete transfers.
+        """
+        
+        return len(self._transfers)
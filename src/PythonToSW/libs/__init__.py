@@ -23,5 +23,6 @@ limitations under the License.
 from . import event
 from . import http
 from . import io
+from . import metrics
 from . import persistence
 from . import xml
\ No newline at end of file
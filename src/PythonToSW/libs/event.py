@@ -20,22 +20,195 @@ limitations under the License.
 """
 
 # // Imports
-from threading import Thread
+from __future__ import annotations
+
+from threading import (
+    Thread,
+    Lock,
+    Semaphore
+)
+import queue
+import sys
 import inspect
+import asyncio
 from typing import Callable
 
 # // Main
+class Dispatcher():
+    """
+    A bounded pool of daemon worker threads that functions are submitted to.
+    
+    Workers are started as needed, up to `max_workers`, and are reused instead of a thread being created
+    for every submission. Submissions wait in a queue while every worker is busy.
+    Exceptions raised by submitted functions are reported through `sys.excepthook`, like they would be in a thread.
+    """
+    
+    _default: Dispatcher|None = None
+    _default_lock = Lock()
+    
+    def __init__(self, max_workers: int = 32):
+        """
+        Initializes a new instance of the `Dispatcher` class.
+        
+        Args:
+            max_workers (int, optional): The most worker threads to run at once. Defaults to 32
+        """
+        
+        if max_workers < 1:
+            raise ValueError("max_workers must be 1 or above")
+        
+        self.max_workers = max_workers
+        
+        self._queue: queue.SimpleQueue[tuple[Callable, tuple, dict]] = queue.SimpleQueue()
+        self._workers: list[Thread] = []
+        self._idle = Semaphore(0)
+        self._pending = 0
+        self._lock = Lock()
+        
+    @classmethod
+    def get_default(cls) -> Dispatcher:
+        """
+        Returns the dispatcher shared by events that weren't given one, creating it if needed.
+        
+        Returns:
+            Dispatcher: The shared dispatcher
+        """
+        
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            
+            return cls._default
+        
+    @classmethod
+    def set_default(cls, dispatcher: Dispatcher):
+        """
+        Replaces the dispatcher shared by events that weren't given one.
+        
+        Args:
+            dispatcher (Dispatcher): The new shared dispatcher
+        """
+        
+        with cls._default_lock:
+            cls._default = dispatcher
+    
+    @property
+    def pending(self) -> int:
+        """
+        Returns the amount of submitted functions that are queued or running.
+        
+        Returns:
+            int: The amount of functions
+        """
+        
+        return self._pending
+    
+    @property
+    def workers(self) -> int:
+        """
+        Returns the amount of worker threads started.
+        
+        Returns:
+            int: The amount of worker threads
+        """
+        
+        return len(self._workers)
+    
+    def submit(self, function: Callable, *args, **kwargs):
+        """
+        Queues a function to be called on a worker thread.
+        
+        Args:
+            function (Callable): The function to call
+            *args: The arguments to pass to the function
+            **kwargs: The keyword arguments to pass to the function
+        """
+        
+        with self._lock:
+            self._pending += 1
+        
+        self._queue.put((function, args, kwargs))
+        
+        # an idle worker will pick it up, otherwise start another one if allowed
+        if self._idle.acquire(blocking = False):
+            return
+        
+        with self._lock:
+            if len(self._workers) >= self.max_workers:
+                return
+            
+            worker = Thread(target = self._work, name = f"Dispatcher-{len(self._workers) + 1}", daemon = True)
+            self._workers.append(worker)
+        
+        worker.start()
+        
+    def _work(self):
+        """
+        Calls queued functions forever. Ran by every worker thread.
+        """
+        
+        while True:
+            function, args, kwargs = self._queue.get()
+            
+            try:
+                function(*args, **kwargs)
+            except Exception:
+                sys.excepthook(*sys.exc_info())
+            finally:
+                with self._lock:
+                    self._pending -= 1
+                
+                self._idle.release()
+
 class Event():
     """
     An event that functional callbacks can subscribe to (+ with async support!)
+    
+    Callbacks are sorted into sync and async ones when they subscribe or unsubscribe, instead of every time the event is fired.
     """
 
-    def __init__(self):
+    def __init__(self, dispatcher: Dispatcher|None = None, concurrent: bool = False):
         """
         Initializes a new instance of the `Event` class.
+        
+        Args:
+            dispatcher (Dispatcher|None, optional): The worker pool `fire_threaded` fires callbacks on. Defaults to None (the shared `Dispatcher.get_default()`)
+            concurrent (bool, optional): Whether or not `fire_async` runs async callbacks concurrently instead of one after another. Defaults to False
         """    
     
         self._callbacks = []
+        self._sync_callbacks: tuple[Callable, ...] = ()
+        self._async_callbacks: tuple[Callable, ...] = ()
+        self.dispatcher = dispatcher
+        self.concurrent = concurrent
+        
+    def _partition(self):
+        """
+        Sorts the subscribed callbacks into sync and async ones.
+        """
+        
+        self._sync_callbacks = tuple(callback for callback in self._callbacks if not inspect.iscoroutinefunction(callback))
+        self._async_callbacks = tuple(callback for callback in self._callbacks if inspect.iscoroutinefunction(callback))
+
+    def has_sync_callbacks(self) -> bool:
+        """
+        Returns whether or not any non-async callbacks are subscribed to this event.
+        
+        Returns:
+            bool: True if there are non-async callbacks
+        """
+        
+        return len(self._sync_callbacks) > 0
+    
+    def has_async_callbacks(self) -> bool:
+        """
+        Returns whether or not any async callbacks are subscribed to this event.
+        
+        Returns:
+            bool: True if there are async callbacks
+        """
+        
+        return len(self._async_callbacks) > 0
 
     def subscribe(self, callback: Callable):
         """
@@ -46,6 +219,7 @@ class Event():
         """    
         
         self._callbacks.append(callback)
+        self._partition()
     
     def unsubscribe(self, callback: Callable):
         """
@@ -56,6 +230,7 @@ class Event():
         """        
         
         self._callbacks.remove(callback)
+        self._partition()
     
     def fire(self, *args, **kwargs):
         """
@@ -66,34 +241,46 @@ class Event():
             **kwargs: The keyword arguments to pass to the callbacks
         """        
         
-        for callback in self._callbacks:
-            if not inspect.iscoroutinefunction(callback):
-                callback(*args, **kwargs)
+        for callback in self._sync_callbacks:
+            callback(*args, **kwargs)
                 
     def fire_threaded(self, *args, **kwargs):
         """
-        Fire this event in a separate thread (non-async callbacks only).
+        Fire this event on a worker thread of this event's dispatcher (non-async callbacks only).
         
         Args:
             *args: The arguments to pass to the callbacks
             **kwargs: The keyword arguments to pass to the callbacks
         """        
         
-        thread = Thread(target = self.fire, args = args, kwargs = kwargs, daemon = True)
-        thread.start()
+        (self.dispatcher or Dispatcher.get_default()).submit(self.fire, *args, **kwargs)
                 
     async def fire_async(self, *args, **kwargs):
         """
         Fire this event (async callbacks only).
         
+        If this event is concurrent, the callbacks are ran concurrently and one raising an exception doesn't stop the others.
+        Their exceptions are reported through `sys.excepthook` instead of being raised.
+        
         Args:
             *args: The arguments to pass to the callbacks
             **kwargs: The keyword arguments to pass to the callbacks
         """        
         
-        for callback in self._callbacks:
-            if inspect.iscoroutinefunction(callback):
+        if not self.concurrent:
+            for callback in self._async_callbacks:
                 await callback(*args, **kwargs)
+                
+            return
+        
+        results = await asyncio.gather(
+            *[callback(*args, **kwargs) for callback in self._async_callbacks],
+            return_exceptions = True
+        )
+        
+        for result in results:
+            if isinstance(result, Exception):
+                sys.excepthook(type(result), result, result.__traceback__)
     
     def __add__(self, callback: Callable):
         """
@@ -126,4 +313,14 @@ class Event():
             **kwargs: The keyword arguments to pass to the callbacks
         """    
         
-        self.fire(*args, **kwargs)
\ No newline at end of file
+        self.fire(*args, **kwargs)
+        
+    def __len__(self) -> int:
+        """
+        Returns the amount of callbacks subscribed to this event.
+        
+        Returns:
+            int: The amount of callbacks
+        """
+        
+        return len(self._callbacks)
\ No newline at end of file
@@ -26,6 +26,7 @@ from urllib.parse import (
 )
 
 from uuid import uuid4
+from secrets import token_hex
 
 # // Main
 def generate_uuid() -> str:
@@ -38,6 +39,19 @@ def generate_uuid() -> str:
     
     return str(uuid4())
 
+def generate_short_id(length: int = 8) -> str:
+    """
+    Generate a short random hexadecimal ID.
+    
+    Args:
+        length (int, optional): The length of the ID. Defaults to 8.
+    
+    Returns:
+        str: The generated ID.
+    """
+    
+    return token_hex((length + 1) // 2)[:length]
+
 def url_encode(string: str) -> str:
     """
     URL encode a string.
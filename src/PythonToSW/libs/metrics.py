@@ -0,0 +1,93 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# // Imports
+import threading
+
+# // Main
+class Metrics():
+    """
+    A thread-safe collection of named counters and gauges.
+    """
+    
+    def __init__(self):
+        """
+        Initializes a new instance of the Metrics class.
+        """
+        
+        self._counters: dict[str, int|float] = {}
+        self._lock = threading.Lock()
+        
+    def increment(self, name: str, amount: int = 1):
+        """
+        Increments a counter.
+        
+        Args:
+            name (str): The name of the counter
+            amount (int, optional): The amount to increment by. Defaults to 1
+        """
+        
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+            
+    def set(self, name: str, value: int|float):
+        """
+        Sets a gauge to a value.
+        
+        Args:
+            name (str): The name of the gauge
+            value (int|float): The value to set the gauge to
+        """
+        
+        with self._lock:
+            self._counters[name] = value
+            
+    def get(self, name: str) -> int|float:
+        """
+        Returns the value of a counter or gauge.
+        
+        Args:
+            name (str): The name of the counter or gauge
+            
+        Returns:
+            int|float: The value of the counter or gauge, or 0 if it has never been set
+        """
+        
+        return self._counters.get(name, 0)
+    
+    def snapshot(self) -> dict[str, int|float]:
+        """
+        Returns a copy of all counters and gauges.
+        
+        Returns:
+            dict[str, int|float]: The counters and gauges, keyed by name
+        """
+        
+        with self._lock:
+            return dict(self._counters)
+        
+    def reset(self):
+        """
+        Resets all counters and gauges.
+        """
+        
+        with self._lock:
+            self._counters.clear()
@@ -20,10 +20,13 @@ limitations under the License.
 """
 
 # // Imports
+from __future__ import annotations
+
 from pydantic import (
     BaseModel,
     Field,
     field_serializer,
+    field_validator,
     SerializationInfo,
     ConfigDict
 )
@@ -35,15 +38,53 @@ from typing import (
 
 from concurrent.futures import Future
 
-from . import CallEnum
+from . import (
+    CallEnum,
+    CallPriorityEnum,
+    CallbackPolicyEnum,
+    CallbackFilterEnum
+)
+
 from . import BaseValue
+from . import Event
 
 # // Main
 __all__ = [
+    "PROTOCOL_VERSION",
     "Call",
+    "HandledCall",
+    "TriggeredCallback",
+    "CallbackPolicy",
+    "CallbackCondition",
+    "CallbackFilter",
+    "Subscriptions",
+    "Watch",
+    "Watches",
+    "UpdateResponse",
+    "Handshake",
     "Token"
 ]
 
+PROTOCOL_VERSION: int = 2
+
+def _from_lua_array(value: Any) -> Any:
+    """
+    Converts a Lua array that was JSON encoded as an object back into a list.
+    Noir encodes empty arrays and arrays with nil holes as objects keyed by index.
+    
+    Args:
+        value (Any): The value to convert.
+    
+    Returns:
+        Any: The list, or the value as-is if it isn't an object.
+    """
+    
+    if not isinstance(value, dict):
+        return value
+    
+    indexes = [int(key) for key in value.keys() if str(key).isdigit()]
+    return [value.get(str(index)) for index in range(1, max(indexes, default = 0) + 1)]
+
 class Token(BaseModel):
     """
     Represents a token for an addon.
@@ -55,16 +96,26 @@ class Token(BaseModel):
 class Call(BaseModel):
     """
     Represents a call to a function in the addon.
+    The ID is a session-scoped sequence number given by the call queue, so calls are ordered by their ID.
+    The deadline is set by the call queue when the call is first sent to the addon.
+    The addon executes calls of a higher priority first, under a per-tick execution budget.
+    Scheduled calls (`delay` or `tick`) are instead executed at their target game tick.
     """
     
     model_config = ConfigDict(
         arbitrary_types_allowed = True
     )
 
-    id: str
+    id: int = 0
     path: str
     arguments: list[Union[Any, BaseValue]]
+    no_reply: bool = False
+    priority: CallPriorityEnum = CallPriorityEnum.NORMAL
+    delay: int = Field(default = 0, ge = 0)
+    tick: int|None = Field(default = None, ge = 0)
     future: Future = Field(default_factory = Future, exclude = True)
+    deadline: float|None = Field(default = None, exclude = True)
+    schedule_seconds: float = Field(default = 0, exclude = True)
     
     @field_serializer("arguments")
     def serialize_arguments(self, arguments: Union[Any, BaseValue], _info: SerializationInfo):
@@ -83,4 +134,521 @@ class Call(BaseModel):
             if BaseValue.is_value(argument):
                 arguments[index] = argument.build()
                 
-        return arguments
\ No newline at end of file
+        return arguments
+    
+    def encode(self, path_ids: dict[str, int]) -> list:
+        """
+        Encodes the call as a compact positional array: `[id, path, arguments(, 1 if no_reply(, priority(, delay(, tick))))]`.<br>
+        Interned paths are replaced with their ID. Trailing defaults are left out.
+        
+        Args:
+            path_ids (dict[str, int]): Interned paths mapped to their ID.
+        
+        Returns:
+            list: The encoded call.
+        """
+        
+        data = [
+            self.id,
+            path_ids.get(self.path, self.path),
+            self.serialize_arguments(self.arguments, None),
+            1 if self.no_reply else 0,
+            self.priority.value,
+            self.delay
+        ]
+        
+        if self.tick is not None:
+            data.append(self.tick)
+            return data
+        
+        defaults = [0, CallPriorityEnum.NORMAL.value, 0]
+        
+        while len(data) > 3 and data[-1] == defaults[len(data) - 4]:
+            data.pop()
+        
+        return data
+
+class HandledCall(BaseModel):
+    """
+    Represents a call that has been handled by the addon.
+    `error` is set if the function errored or doesn't exist.
+    """
+    
+    id: int
+    return_values: list[Any]
+    error: str|None = None
+    
+    @field_validator("return_values", mode = "before")
+    @classmethod
+    def validate_return_values(cls, return_values: Any) -> Any:
+        """
+        Converts return values encoded as an object back into a list.
+        
+        Args:
+            return_values (Any): The return values.
+        
+        Returns:
+            Any: The return values as a list.
+        """
+        
+        return _from_lua_array(return_values)
+    
+    @classmethod
+    def decode(cls, data: Any) -> HandledCall:
+        """
+        Decodes a handled call sent by the addon.
+        
+        Args:
+            data (Any): The handled call, as `[id, return_values(, error)]`.
+        
+        Returns:
+            HandledCall: The decoded handled call.
+        """
+        
+        return cls(id = data[0], return_values = data[1], error = data[2] if len(data) > 2 else None)
+
+class TriggeredCallback(BaseModel):
+    """
+    Represents a game callback that has been triggered in the addon.
+    """
+    
+    name: str
+    arguments: list[Any]
+    
+    @field_validator("arguments", mode = "before")
+    @classmethod
+    def validate_arguments(cls, arguments: Any) -> Any:
+        """
+        Converts arguments encoded as an object back into a list.
+        
+        Args:
+            arguments (Any): The arguments.
+        
+        Returns:
+            Any: The arguments as a list.
+        """
+        
+        return _from_lua_array(arguments)
+    
+    @classmethod
+    def decode(cls, data: Any, callbacks: list[str]) -> TriggeredCallback:
+        """
+        Decodes a triggered callback sent by the addon.
+        
+        Args:
+            data (Any): The triggered callback, as `[name, arguments]`.
+            callbacks (list[str]): The interned callback names. `name` is a 1-based index into this if it isn't a string.
+        
+        Returns:
+            TriggeredCallback: The decoded triggered callback.
+        """
+        
+        name, arguments = data[0], data[1]
+        
+        if isinstance(name, int):
+            name = callbacks[name - 1]
+        
+        return cls(name = name, arguments = arguments)
+
+class CallbackPolicy(BaseModel):
+    """
+    Represents how the addon deals with a game callback being triggered many times between updates.
+    Argument indexes start at 0, and refer to the arguments the game callback is triggered with.
+    
+    - `KEEP_ALL`: Every trigger is sent.
+    - `LATEST`: Triggers with the same `key` arguments replace the unsent trigger before them.
+    - `AGGREGATE`: Like `LATEST`, but the `sum` arguments are added onto the unsent trigger before them.
+    - `SAMPLE`: Only 1 in `every` triggers is sent.
+    """
+    
+    mode: CallbackPolicyEnum = CallbackPolicyEnum.KEEP_ALL
+    key: list[int] = []
+    sum: list[int] = []
+    every: int = Field(default = 1, ge = 1)
+    
+    @field_validator("key", "sum")
+    @classmethod
+    def validate_indexes(cls, value: list[int]) -> list[int]:
+        """
+        Ensures argument indexes aren't negative.
+        
+        Args:
+            value (list[int]): The argument indexes.
+        
+        Raises:
+            ValueError: If an index is negative.
+        
+        Returns:
+            list[int]: The argument indexes.
+        """
+        
+        if any(index < 0 for index in value):
+            raise ValueError("Argument indexes must not be negative.")
+        
+        return value
+    
+    @classmethod
+    def keep_all(cls) -> CallbackPolicy:
+        """
+        Returns a policy that sends every trigger.
+        
+        Returns:
+            CallbackPolicy: The policy.
+        """
+        
+        return cls()
+    
+    @classmethod
+    def latest(cls, *key: int) -> CallbackPolicy:
+        """
+        Returns a policy that only sends the latest trigger per key.
+        
+        Args:
+            *key (int): The indexes of the arguments that make up the key. No key means only the latest trigger is sent.
+        
+        Returns:
+            CallbackPolicy: The policy.
+        """
+        
+        return cls(mode = CallbackPolicyEnum.LATEST, key = list(key))
+    
+    @classmethod
+    def aggregate(cls, key: list[int], sum: list[int]) -> CallbackPolicy:
+        """
+        Returns a policy that sends one trigger per key, with the `sum` arguments added up.
+        
+        Args:
+            key (list[int]): The indexes of the arguments that make up the key.
+            sum (list[int]): The indexes of the numeric arguments to add up.
+        
+        Returns:
+            CallbackPolicy: The policy.
+        """
+        
+        return cls(mode = CallbackPolicyEnum.AGGREGATE, key = key, sum = sum)
+    
+    @classmethod
+    def sample(cls, every: int) -> CallbackPolicy:
+        """
+        Returns a policy that only sends 1 in `every` triggers.
+        
+        Args:
+            every (int): Send 1 in this many triggers.
+        
+        Returns:
+            CallbackPolicy: The policy.
+        """
+        
+        return cls(mode = CallbackPolicyEnum.SAMPLE, every = every)
+    
+    def encode(self) -> list:
+        """
+        Encodes the policy as a compact positional array: `[mode, key, sum, every]`.
+        
+        Returns:
+            list: The encoded policy.
+        """
+        
+        return [self.mode.value, self.key, self.sum, self.every]
+
+class CallbackCondition(BaseModel):
+    """
+    Represents a check on a single argument of a game callback.
+    The argument index starts at 0.
+    """
+    
+    index: int = Field(ge = 0)
+    op: CallbackFilterEnum
+    value: Any
+    
+    def matches(self, arguments: list[Any]) -> bool:
+        """
+        Returns whether or not the arguments pass this condition.
+        
+        Args:
+            arguments (list[Any]): The arguments the game callback was triggered with.
+        
+        Returns:
+            bool: True if the arguments pass.
+        """
+        
+        if self.index >= len(arguments):
+            return False
+        
+        argument = arguments[self.index]
+        
+        if self.op == CallbackFilterEnum.EQUALS:
+            return argument == self.value
+        
+        if self.op == CallbackFilterEnum.PREFIX:
+            return isinstance(argument, str) and argument.startswith(self.value)
+        
+        return argument in self.value
+    
+    def encode(self) -> list:
+        """
+        Encodes the condition as a compact positional array: `[index, op, value]`.
+        
+        Returns:
+            list: The encoded condition.
+        """
+        
+        return [self.index, self.op.value, self.value]
+
+class CallbackFilter(BaseModel):
+    """
+    Represents a filter on the arguments of a game callback. All conditions must pass.
+    Filters are checked in-game, so triggers that don't pass are never sent over.
+    
+    Filters can be combined with `&`:
+    
+    ```python
+    CallbackFilter.prefix(0, "?") & CallbackFilter.equals(1, 0)
+    ```
+    """
+    
+    conditions: list[CallbackCondition] = []
+    
+    @classmethod
+    def equals(cls, index: int, value: Any) -> CallbackFilter:
+        """
+        Returns a filter that passes if the argument at `index` equals `value`.
+        
+        Args:
+            index (int): The index of the argument.
+            value (Any): The value the argument must equal.
+        
+        Returns:
+            CallbackFilter: The filter.
+        """
+        
+        return cls(conditions = [CallbackCondition(index = index, op = CallbackFilterEnum.EQUALS, value = value)])
+    
+    @classmethod
+    def prefix(cls, index: int, prefix: str) -> CallbackFilter:
+        """
+        Returns a filter that passes if the argument at `index` is a string starting with `prefix`.
+        
+        Args:
+            index (int): The index of the argument.
+            prefix (str): The prefix the argument must start with.
+        
+        Returns:
+            CallbackFilter: The filter.
+        """
+        
+        return cls(conditions = [CallbackCondition(index = index, op = CallbackFilterEnum.PREFIX, value = prefix)])
+    
+    @classmethod
+    def one_of(cls, index: int, values: list[Any]) -> CallbackFilter:
+        """
+        Returns a filter that passes if the argument at `index` is one of `values`.
+        
+        Args:
+            index (int): The index of the argument.
+            values (list[Any]): The values the argument can be.
+        
+        Returns:
+            CallbackFilter: The filter.
+        """
+        
+        return cls(conditions = [CallbackCondition(index = index, op = CallbackFilterEnum.ONE_OF, value = list(values))])
+    
+    def matches(self, arguments: list[Any]) -> bool:
+        """
+        Returns whether or not the arguments pass every condition of this filter.
+        
+        Args:
+            arguments (list[Any]): The arguments the game callback was triggered with.
+        
+        Returns:
+            bool: True if the arguments pass.
+        """
+        
+        return all(condition.matches(arguments) for condition in self.conditions)
+    
+    def encode(self) -> list:
+        """
+        Encodes the filter as a compact positional array of conditions.
+        
+        Returns:
+            list: The encoded filter.
+        """
+        
+        return [condition.encode() for condition in self.conditions]
+    
+    def __and__(self, other: CallbackFilter) -> CallbackFilter:
+        """
+        Combines two filters into one that only passes if both do.
+        
+        Args:
+            other (CallbackFilter): The filter to combine with.
+        
+        Returns:
+            CallbackFilter: The combined filter.
+        """
+        
+        return CallbackFilter(conditions = self.conditions + other.conditions)
+
+class Subscriptions(BaseModel):
+    """
+    Represents the game callbacks the addon should listen for, and the policies and filters applied to them.
+    A trigger is sent if it passes any of the filters of its callback. Callbacks without filters are always sent.
+    `revision` changes whenever any of these do, so the addon only receives them when outdated.
+    """
+    
+    revision: int
+    callbacks: list[str]
+    policies: dict[str, CallbackPolicy] = {}
+    filters: dict[str, list[CallbackFilter]] = {}
+    
+    def encode(self) -> list:
+        """
+        Encodes the subscriptions to send to the addon.
+        
+        Returns:
+            list: The encoded subscriptions.
+        """
+        
+        return [
+            self.revision,
+            self.callbacks,
+            {name: policy.encode() for name, policy in self.policies.items()},
+            {name: [callback_filter.encode() for callback_filter in filters] for name, filters in self.filters.items()}
+        ]
+
+class Watch(BaseModel):
+    """
+    Represents a function the addon calls every `period` ticks, sending back its latest results with each update.
+    `on_sample` is fired with the tick a sample was taken at and the function's return values.
+    """
+    
+    model_config = ConfigDict(
+        arbitrary_types_allowed = True
+    )
+    
+    id: int
+    path: str
+    arguments: list[Union[Any, BaseValue]]
+    period: int = Field(default = 1, ge = 1)
+    on_sample: Event = Field(default_factory = Event, exclude = True)
+    latest: tuple|None = Field(default = None, exclude = True)
+    tick: int|None = Field(default = None, exclude = True)
+    
+    @field_serializer("arguments")
+    def serialize_arguments(self, arguments: Union[Any, BaseValue], _info: SerializationInfo):
+        """
+        Converts custom values to their Stormworks representation during serialization.
+        
+        Args:
+            arguments (Union[Any, BaseValue]): The list of arguments to validate.
+            _info (SerializationInfo): Serialization information.
+        
+        Returns:
+            list: The validated list of arguments.
+        """
+        
+        return [argument.build() if BaseValue.is_value(argument) else argument for argument in arguments]
+    
+    def encode(self, path_ids: dict[str, int]) -> list:
+        """
+        Encodes the watch as a compact positional array: `[id, path, arguments, period]`.<br>
+        Interned paths are replaced with their ID.
+        
+        Args:
+            path_ids (dict[str, int]): Interned paths mapped to their ID.
+        
+        Returns:
+            list: The encoded watch.
+        """
+        
+        return [
+            self.id,
+            path_ids.get(self.path, self.path),
+            self.serialize_arguments(self.arguments, None),
+            self.period
+        ]
+
+class Watches(BaseModel):
+    """
+    Represents the functions the addon should watch.
+    `revision` changes whenever a watch is added or removed, so the addon only receives them when outdated.
+    """
+    
+    revision: int
+    watches: list[Watch]
+    
+    def encode(self, path_ids: dict[str, int]) -> list:
+        """
+        Encodes the watches to send to the addon.
+        
+        Args:
+            path_ids (dict[str, int]): Interned paths mapped to their ID.
+        
+        Returns:
+            list: The encoded watches.
+        """
+        
+        return [
+            self.revision,
+            [watch.encode(path_ids) for watch in self.watches]
+        ]
+
+class UpdateResponse(BaseModel):
+    """
+    Represents the response to an update request from the addon.
+    `fragment` is the index of the next fragment needed if the update carried a fragment of a transfer.
+    `poll_interval` is how many ticks the addon should wait before its next update.
+    `subscriptions` is only set if the addon's subscribed callbacks are outdated.
+    `watches` is only set if the addon's watches are outdated.
+    """
+    
+    session: str
+    calls: list[Call]
+    cancelled: list[int] = []
+    fragment: int|None = None
+    poll_interval: int|None = None
+    subscriptions: Subscriptions|None = None
+    watches: Watches|None = None
+    
+    def encode(self, path_ids: dict[str, int]) -> dict:
+        """
+        Encodes the response to send to the addon.
+        
+        Args:
+            path_ids (dict[str, int]): Interned paths mapped to their ID.
+        
+        Returns:
+            dict: The encoded response.
+        """
+        
+        data = {
+            "s": self.session,
+            "c": [call.encode(path_ids) for call in self.calls],
+            "x": self.cancelled
+        }
+        
+        if self.fragment is not None:
+            data["f"] = self.fragment
+            
+        if self.poll_interval is not None:
+            data["p"] = self.poll_interval
+            
+        if self.subscriptions is not None:
+            data["u"] = self.subscriptions.encode()
+            
+        if self.watches is not None:
+            data["w"] = self.watches.encode(path_ids)
+        
+        return data
+
+class Handshake(BaseModel):
+    """
+    Represents the response to a handshake from the addon.
+    Contains the protocol version to use, as well as the tables of interned function paths and callback names.
+    """
+    
+    version: int
+    session: str
+    paths: list[str]
+    callbacks: list[str]
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# // Imports
+import threading
+
+# // Main
+__all__ = [
+    "PollScheduler"
+]
+
+class PollScheduler():
+    """
+    Decides how many ticks the addon should wait before its next update.
+    
+    The addon is told to poll at the minimum interval while there is work (pending calls or
+    recent callbacks). Once idle, the interval doubles with every update up to the maximum.
+    """
+    
+    def __init__(self, min_interval: int, max_interval: int, rate_smoothing: float = 0.2, rate_threshold: float = 0.1):
+        """
+        Initializes a new instance of the `PollScheduler` class.
+        
+        Args:
+            min_interval (int): The interval to poll at while there is work, in ticks.
+            max_interval (int): The interval to back off to while idle, in ticks.
+            rate_smoothing (float, optional): How much each update affects the callback rate (0-1). Defaults to 0.2.
+            rate_threshold (float, optional): The callbacks per update above which the addon isn't considered idle. Defaults to 0.1.
+        """
+        
+        self.min_interval = max(1, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.rate_smoothing = rate_smoothing
+        self.rate_threshold = rate_threshold
+        
+        self.interval = self.min_interval
+        self.callback_rate = 0.0
+        
+        self._lock = threading.Lock()
+        
+    def next_interval(self, pending_calls: int, callbacks: int) -> int:
+        """
+        Returns the interval the addon should wait before its next update, based on an update.
+        
+        Args:
+            pending_calls (int): The amount of calls waiting to be sent or answered.
+            callbacks (int): The amount of callbacks the update carried.
+        
+        Returns:
+            int: The interval in ticks.
+        """
+        
+        with self._lock:
+            self.callback_rate += (callbacks - self.callback_rate) * self.rate_smoothing
+            
+            if pending_calls > 0 or callbacks > 0:
+                self.interval = self.min_interval
+            elif self.callback_rate < self.rate_threshold:
+                self.interval = min(self.max_interval, self.interval * 2)
+                
+            return self.interval
@@ -0,0 +1,332 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+# // Imports
+from __future__ import annotations
+
+import threading
+from typing import Any
+from pydantic import BaseModel
+
+from . import Metrics
+from . import CallbackEnum
+
+from .models import _from_lua_array
+from .bulk import _chunk
+
+# // Main
+__all__ = [
+    "REGISTRY_CALLBACKS",
+    "PlayerEntity",
+    "VehicleEntity",
+    "EntityRegistry"
+]
+
+REGISTRY_CALLBACKS: list[CallbackEnum] = [
+    CallbackEnum.ON_PLAYER_JOIN,
+    CallbackEnum.ON_PLAYER_LEAVE,
+    CallbackEnum.ON_VEHICLE_SPAWN,
+    CallbackEnum.ON_VEHICLE_DESPAWN,
+    CallbackEnum.ON_VEHICLE_LOAD,
+    CallbackEnum.ON_VEHICLE_UNLOAD,
+    CallbackEnum.ON_OBJECT_LOAD,
+    CallbackEnum.ON_OBJECT_UNLOAD
+]
+
+class PlayerEntity(BaseModel):
+    """
+    Represents a player in the entity registry.
+    """
+    
+    peer_id: int
+    name: str
+    steam_id: str
+    admin: bool
+    auth: bool
+
+class VehicleEntity(BaseModel):
+    """
+    Represents a spawned vehicle in the entity registry.
+    `group_id` is None if unknown, and `owner` is None if the vehicle wasn't spawned by a player.
+    """
+    
+    vehicle_id: int
+    group_id: int|None
+    owner: int|None
+    loaded: bool
+
+def _optional_id(value: Any) -> int|None:
+    """
+    Converts an ID the game uses -1 for when there is none.
+    
+    Args:
+        value (Any): The ID.
+    
+    Returns:
+        int|None: The ID, or None if there is none.
+    """
+    
+    value = int(value)
+    return None if value < 0 else value
+
+def _steam_id(value: Any) -> str:
+    """
+    Converts a Steam ID to a string. Callbacks send them as numbers, while Noir stores them as strings.
+    
+    Args:
+        value (Any): The Steam ID.
+    
+    Returns:
+        str: The Steam ID.
+    """
+    
+    return value if isinstance(value, str) else str(int(value))
+
+class EntityRegistry():
+    """
+    A thread-safe mirror of the players, spawned vehicles and loaded objects tracked in-game by Noir's services.
+    
+    The registry is filled by a snapshot (`BuiltinEnum.GET_ENTITIES`), then kept up to date with the
+    game callbacks in `REGISTRY_CALLBACKS`. Callbacks that arrive while a snapshot is pending are held back
+    and applied on top of it once it arrives, in order, so triggers the snapshot missed aren't lost.
+    """
+    
+    def __init__(self, metrics: Metrics|None = None):
+        """
+        Initializes a new instance of the `EntityRegistry` class.
+        
+        Args:
+            metrics (Metrics|None, optional): Where to count snapshots and applied callbacks. Defaults to None (a new instance).
+        """
+        
+        self.metrics = metrics or Metrics()
+        
+        self._players: dict[int, PlayerEntity] = {}
+        self._vehicles: dict[int, VehicleEntity] = {}
+        self._objects: set[int] = set()
+        self._pending: list[tuple[CallbackEnum, list[Any]]]|None = None
+        self._synced = False
+        self._lock = threading.Lock()
+        
+    @property
+    def synced(self) -> bool:
+        """
+        Returns if the registry has received a snapshot yet.
+        
+        Returns:
+            bool: True if a snapshot has been applied.
+        """
+        
+        return self._synced
+        
+    def get_callbacks(self) -> list[CallbackEnum]:
+        """
+        Returns the game callbacks the registry is kept up to date with.
+        
+        Returns:
+            list[CallbackEnum]: The callbacks.
+        """
+        
+        return list(REGISTRY_CALLBACKS)
+        
+    def begin_snapshot(self) -> bool:
+        """
+        Starts holding back callbacks until a snapshot is applied or aborted.
+        
+        Returns:
+            bool: False if a snapshot is already pending, True otherwise.
+        """
+        
+        with self._lock:
+            if self._pending is not None:
+                return False
+            
+            self._pending = []
+            return True
+        
+    def apply_snapshot(self, packed: Any):
+        """
+        Replaces the registry's contents with a snapshot, then applies the callbacks held back while it was pending.
+        
+        Args:
+            packed (Any): What `BuiltinEnum.GET_ENTITIES` returned: `[players, vehicles, objects]`.
+        """
+        
+        players, vehicles, objects = _from_lua_array(packed)
+        
+        with self._lock:
+            self._players = {
+                int(peer_id): PlayerEntity(peer_id = peer_id, name = name, steam_id = _steam_id(steam_id), admin = admin, auth = auth)
+                for peer_id, name, steam_id, admin, auth in _chunk(players, 5)
+            }
+            
+            self._vehicles = {
+                int(vehicle_id): VehicleEntity(vehicle_id = vehicle_id, group_id = _optional_id(group_id), owner = _optional_id(owner), loaded = loaded)
+                for vehicle_id, group_id, owner, loaded in _chunk(vehicles, 4)
+            }
+            
+            self._objects = {int(object_id) for object_id in _from_lua_array(objects) or []}
+            
+            for name, arguments in self._pending or []:
+                self._apply(name, arguments)
+            
+            self._pending = None
+            self._synced = True
+        
+        self.metrics.increment("registry_snapshots")
+        
+    def abort_snapshot(self):
+        """
+        Stops waiting for a snapshot, applying the callbacks held back while it was pending.
+        """
+        
+        with self._lock:
+            for name, arguments in self._pending or []:
+                self._apply(name, arguments)
+            
+            self._pending = None
+        
+    def on_callback(self, name: CallbackEnum, arguments: list[Any]):
+        """
+        Applies a triggered game callback, or holds it back if a snapshot is pending.
+        
+        Args:
+            name (CallbackEnum): The callback.
+            arguments (list[Any]): The arguments it was triggered with.
+        """
+        
+        if name not in REGISTRY_CALLBACKS:
+            return
+        
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((name, arguments))
+                return
+            
+            self._apply(name, arguments)
+        
+    def _apply(self, name: CallbackEnum, arguments: list[Any]):
+        """
+        Applies a triggered game callback. The lock must be held.
+        
+        Args:
+            name (CallbackEnum): The callback.
+            arguments (list[Any]): The arguments it was triggered with.
+        """
+        
+        if name == CallbackEnum.ON_PLAYER_JOIN:
+            steam_id, player_name, peer_id, admin, auth = arguments[:5]
+            self._players[int(peer_id)] = PlayerEntity(peer_id = peer_id, name = player_name, steam_id = _steam_id(steam_id), admin = admin, auth = auth)
+        elif name == CallbackEnum.ON_PLAYER_LEAVE:
+            self._players.pop(int(arguments[2]), None)
+        elif name == CallbackEnum.ON_VEHICLE_SPAWN:
+            vehicle_id, owner = int(arguments[0]), _optional_id(arguments[1])
+            group_id = _optional_id(arguments[6]) if len(arguments) > 6 else None
+            self._vehicles[vehicle_id] = VehicleEntity(vehicle_id = vehicle_id, group_id = group_id, owner = owner, loaded = False)
+        elif name == CallbackEnum.ON_VEHICLE_DESPAWN:
+            self._vehicles.pop(int(arguments[0]), None)
+        elif name in (CallbackEnum.ON_VEHICLE_LOAD, CallbackEnum.ON_VEHICLE_UNLOAD):
+            vehicle_id = int(arguments[0])
+            vehicle = self._vehicles.get(vehicle_id)
+            
+            # entities are replaced instead of modified, so ones handed out never change under the reader
+            if vehicle is not None:
+                self._vehicles[vehicle_id] = vehicle.model_copy(update = {"loaded": name == CallbackEnum.ON_VEHICLE_LOAD})
+        elif name == CallbackEnum.ON_OBJECT_LOAD:
+            self._objects.add(int(arguments[0]))
+        elif name == CallbackEnum.ON_OBJECT_UNLOAD:
+            self._objects.discard(int(arguments[0]))
+        
+        self.metrics.increment("registry_deltas")
+        
+    def get_player(self, peer_id: int) -> PlayerEntity|None:
+        """
+        Returns an online player by their peer ID.
+        
+        Args:
+            peer_id (int): The peer ID of the player.
+        
+        Returns:
+            PlayerEntity|None: The player, or None if they aren't online.
+        """
+        
+        return self._players.get(peer_id)
+        
+    def get_players(self) -> list[PlayerEntity]:
+        """
+        Returns every online player.
+        
+        Returns:
+            list[PlayerEntity]: The players.
+        """
+        
+        return list(self._players.values())
+        
+    def get_vehicle(self, vehicle_id: int) -> VehicleEntity|None:
+        """
+        Returns a spawned vehicle by its ID.
+        
+        Args:
+            vehicle_id (int): The ID of the vehicle.
+        
+        Returns:
+            VehicleEntity|None: The vehicle, or None if it isn't spawned.
+        """
+        
+        return self._vehicles.get(vehicle_id)
+        
+    def get_vehicles(self, owner: int|None = None) -> list[VehicleEntity]:
+        """
+        Returns every spawned vehicle, or only the ones spawned by a player.
+        
+        Args:
+            owner (int|None, optional): The peer ID of the player to get the vehicles of. Defaults to None (every vehicle).
+        
+        Returns:
+            list[VehicleEntity]: The vehicles.
+        """
+        
+        vehicles = list(self._vehicles.values())
+        return vehicles if owner is None else [vehicle for vehicle in vehicles if vehicle.owner == owner]
+        
+    def is_object_loaded(self, object_id: int) -> bool:
+        """
+        Returns if an object is loaded.
+        
+        Args:
+            object_id (int): The ID of the object.
+        
+        Returns:
+            bool: True if the object is loaded.
+        """
+        
+        return object_id in self._objects
+        
+    def get_objects(self) -> list[int]:
+        """
+        Returns the IDs of every loaded object.
+        
+        Returns:
+            list[int]: The object IDs.
+        """
+        
+        return list(self._objects)
@@ -0,0 +1,61 @@
+--------------------------------------------------------
+-- [SWToPython] Batch
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    Calls multiple functions in one go, guaranteeing they are all executed within the same tick.<br>
+    Used by the PythonToSW server for batches created with `same_tick`. Returns `{true, returnValues}` for each call,
+    or `{false, error}` for calls that failed. A failing call doesn't stop the rest of the batch.
+]]
+---@param calls table<integer, table> A list of `{path, arguments}` pairs
+---@return table<integer, table>
+function SWToPython.Builtins.Batch(calls)
+    local results = {}
+
+    for index, call in ipairs(calls) do
+        local path, arguments = call[1], call[2]
+        local func = SWToPython.Uplink:GetFunction(path)
+
+        if func then
+            -- one failing call shouldn't take down the rest of the batch
+            local packed = table.pack(pcall(func, table.unpack(arguments)))
+
+            if packed[1] then
+                results[index] = {true, {table.unpack(packed, 2, packed.n)}}
+            else
+                local err = "Function at "..path.." errored: "..tostring(packed[2])
+                SWToPython.Uplink:PropagateError(err)
+
+                results[index] = {false, err}
+            end
+        else
+            local err = "Function at "..path.." does not exist."
+            SWToPython.Uplink:PropagateError(err)
+
+            results[index] = {false, err}
+        end
+    end
+
+    return results
+end
\ No newline at end of file
@@ -0,0 +1,157 @@
+--------------------------------------------------------
+-- [SWToPython] Bulk
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    Rounds a number to the provided amount of decimal places, keeping it short once JSON encoded.
+]]
+---@param number number
+---@param precision integer
+---@return number
+local function round(number, precision)
+    local multiplier = 10 ^ precision
+    local rounded = math.floor(number * multiplier + 0.5) / multiplier
+
+    return math.tointeger(rounded) or rounded
+end
+
+--[[
+    Reads the value of a vehicle component, or nil if it couldn't be read.<br>
+    Buttons can be `false`, so `false` can't mark a failed read.
+]]
+---@param vehicleID integer
+---@param componentType "dial"|"button"|"battery"|"tank"|"seat"
+---@param name string|integer
+---@param precision integer
+---@return any|nil
+local function readComponent(vehicleID, componentType, name, precision)
+    local data, success
+
+    if componentType == "dial" then
+        data, success = server.getVehicleDial(vehicleID, name)
+        return success and round(data.value, precision) or nil
+    elseif componentType == "button" then
+        data, success = server.getVehicleButton(vehicleID, name)
+
+        if success then
+            return data.on
+        end
+    elseif componentType == "battery" then
+        data, success = server.getVehicleBattery(vehicleID, name)
+        return success and round(data.charge, precision) or nil
+    elseif componentType == "tank" then
+        data, success = server.getVehicleTank(vehicleID, name)
+        return success and round(data.value, precision) or nil
+    elseif componentType == "seat" then
+        data, success = server.getVehicleSeat(vehicleID, name)
+        return success and (data.seated_id or 0) or nil
+    end
+
+    return nil
+end
+
+--[[
+    Returns every player along with their position and the vehicle they're sat in, as one flat array:<br>
+    `{peerID, name, x, y, z, vehicleID, ...}`. The position is `false` if it couldn't be read, and the vehicle ID is 0 if the player isn't sat in one.
+]]
+---@param precision integer|nil The amount of decimal places to round positions to. Defaults to 2
+---@return table<integer, any>
+function SWToPython.Builtins.GetPlayers(precision)
+    precision = precision or 2
+
+    local packed = {}
+
+    for _, player in pairs(server.getPlayers()) do
+        local position, success = server.getPlayerPos(player.id)
+        local characterID, hasCharacter = server.getPlayerCharacterID(player.id)
+        local vehicleID, isSeated = 0, false
+
+        if hasCharacter then
+            vehicleID, isSeated = server.getCharacterVehicle(characterID)
+        end
+
+        table.insert(packed, player.id)
+        table.insert(packed, player.name)
+
+        for index = 13, 15 do
+            table.insert(packed, success and round(position[index], precision) or false)
+        end
+
+        table.insert(packed, isSeated and vehicleID or 0)
+    end
+
+    return packed
+end
+
+--[[
+    Returns the positions of vehicles as one flat array: `{vehicleID, x, y, z, ...}`.<br>
+    Vehicles whose position couldn't be read (e.g. despawned) are left out.
+]]
+---@param vehicleIDs table<integer, integer>
+---@param precision integer|nil The amount of decimal places to round positions to. Defaults to 2
+---@return table<integer, number>
+function SWToPython.Builtins.GetVehiclePositions(vehicleIDs, precision)
+    precision = precision or 2
+
+    local packed = {}
+
+    for _, vehicleID in ipairs(vehicleIDs) do
+        local position, success = server.getVehiclePos(vehicleID)
+
+        if success then
+            table.insert(packed, vehicleID)
+
+            for index = 13, 15 do
+                table.insert(packed, round(position[index], precision))
+            end
+        end
+    end
+
+    return packed
+end
+
+--[[
+    Reads the same components of many vehicles in one go, returning the values as one flat array, vehicle by vehicle.<br>
+    Values that couldn't be read are left as nil holes, so every other value keeps its position.
+]]
+---@param vehicleIDs table<integer, integer>
+---@param reads table<integer, any> A flat list of `componentType, name` pairs, e.g. `{"dial", "Speed", "button", "Lights"}`
+---@param precision integer|nil The amount of decimal places to round numbers to. Defaults to 2
+---@return table<integer, any>
+function SWToPython.Builtins.ReadVehicleComponents(vehicleIDs, reads, precision)
+    precision = precision or 2
+
+    local packed = {}
+    local count = 0
+
+    for _, vehicleID in ipairs(vehicleIDs) do
+        for index = 1, #reads, 2 do
+            -- table.insert can't insert nil, so index explicitly
+            count = count + 1
+            packed[count] = readComponent(vehicleID, reads[index], reads[index + 1], precision)
+        end
+    end
+
+    return packed
+end
\ No newline at end of file
@@ -0,0 +1,34 @@
+--------------------------------------------------------
+-- [SWToPython] Entities
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    Returns every online player, spawned vehicle and loaded object, each as one flat array:<br>
+    `{{peerID, name, steamID, admin, auth, ...}, {vehicleID, groupID, ownerPeerID, loaded, ...}, {objectID, ...}}`.<br>
+    The group ID and owner peer ID are -1 if the vehicle has none.
+]]
+---@return table<integer, table<integer, any>>
+function SWToPython.Builtins.GetEntities()
+    return SWToPython.Entities:GetSnapshot()
+end
\ No newline at end of file
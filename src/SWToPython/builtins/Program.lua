@@ -0,0 +1,100 @@
+--------------------------------------------------------
+-- [SWToPython] Program
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    Replaces references to the return values of earlier steps (`{["$r"] = {step, index, keys...}}`) within an argument.<br>
+    Steps and indexes are 0-based, while keys are used as-is.
+]]
+---@param value any
+---@param results table<integer, table>
+---@return any
+local function resolve(value, results)
+    if type(value) ~= "table" then
+        return value
+    end
+
+    local ref = value["$r"]
+
+    if ref then
+        local resolved = (results[ref[1] + 1] or {})[ref[2] + 1]
+
+        for index = 3, #ref do
+            if type(resolved) ~= "table" then
+                return nil
+            end
+
+            resolved = resolved[ref[index]]
+        end
+
+        return resolved
+    end
+
+    local resolvedTable = {}
+
+    for key, item in pairs(value) do
+        resolvedTable[key] = resolve(item, results)
+    end
+
+    return resolvedTable
+end
+
+--[[
+    Executes a sequence of calls within the same tick, where later calls can use the return values of earlier ones.<br>
+    Used by the PythonToSW server for call programs. Returns `true` and the return values of the output steps,
+    or `false`, the (0-based) index of the step that failed and its error. Steps after a failed one are skipped.
+]]
+---@param steps table<integer, table> A list of `{path, arguments}` pairs
+---@param outputs table<integer, integer> The (0-based) indexes of the steps to return the return values of
+---@return boolean, any, string|nil
+function SWToPython.Builtins.Program(steps, outputs)
+    local results = {}
+
+    for index, step in ipairs(steps) do
+        local path, arguments = step[1], step[2]
+        local func = SWToPython.Uplink:GetFunction(path)
+
+        if not func then
+            return false, index - 1, "Function at "..path.." does not exist."
+        end
+
+        -- resolved references may be nil, so unpack up to the amount of arguments sent
+        local resolved = resolve(arguments, results)
+        local packed = table.pack(pcall(func, table.unpack(resolved, 1, #arguments)))
+
+        if not packed[1] then
+            return false, index - 1, tostring(packed[2])
+        end
+
+        results[index] = {table.unpack(packed, 2, packed.n)}
+    end
+
+    local outputResults = {}
+
+    for _, stepIndex in ipairs(outputs) do
+        table.insert(outputResults, results[stepIndex + 1] or {})
+    end
+
+    return true, outputResults
+end
\ No newline at end of file
@@ -27,30 +27,76 @@
     A class representing a call from the PythonToSW server
 ]]
 ---@class SWToPython.Call: NoirDataclass
----@field New fun(self: SWToPython.Call, ID: string, path: string, arguments: table): SWToPython.Call
----@field ID string The ID of the call
+---@field New fun(self: SWToPython.Call, ID: integer, path: string, arguments: table, noReply: boolean, priority: integer, delay: integer, tick: integer|nil): SWToPython.Call
+---@field ID integer The ID of the call. This is a sequence number, so later calls have higher IDs
 ---@field Path string The path of the function to be called
 ---@field Arguments table The arguments of the call
+---@field NoReply boolean Whether or not the result of the call should not be sent back to the PythonToSW server
+---@field Priority integer The priority class of the call. Lower is executed first
+---@field Delay integer How many ticks after being received the call should be executed
+---@field Tick integer|nil The game tick (`TaskService.Ticks`) the call should be executed at. Overrides `Delay`
 SWToPython.Classes.Call = Noir.Libraries.Dataclasses:New("Call", {
-    Noir.Libraries.Dataclasses:Field("ID", "string"),
+    Noir.Libraries.Dataclasses:Field("ID", "number"),
     Noir.Libraries.Dataclasses:Field("Path", "string"),
-    Noir.Libraries.Dataclasses:Field("Arguments", "table")
+    Noir.Libraries.Dataclasses:Field("Arguments", "table"),
+    Noir.Libraries.Dataclasses:Field("NoReply", "boolean"),
+    Noir.Libraries.Dataclasses:Field("Priority", "number"),
+    Noir.Libraries.Dataclasses:Field("Delay", "number"),
+    Noir.Libraries.Dataclasses:Field("Tick", "number", "nil")
 })
 
 --[[
-    Calls the `server.` function in the addon and returns the result.
+    Returns if the call is scheduled for a later tick instead of being executed as soon as possible.
 ]]
----@return SWToPython.HandledCall?
-function SWToPython.Classes.Call:Call()
+---@return boolean
+function SWToPython.Classes.Call:IsScheduled()
+    return self.Delay > 0 or self.Tick ~= nil
+end
+
+--[[
+    Returns the game tick the call should be executed at.
+]]
+---@param receivedAt integer The tick the call was received at
+---@return integer
+function SWToPython.Classes.Call:GetTargetTick(receivedAt)
+    return self.Tick or (receivedAt + self.Delay)
+end
+
+--[[
+    Calls the function in the addon and returns its return values.<br>
+    If the function doesn't exist or errors, nil and the error are returned instead.
+]]
+---@return table?, string?
+function SWToPython.Classes.Call:Execute()
     local func = SWToPython.Uplink:GetFunction(self.Path)
 
     if not func then
-        SWToPython.Uplink:PropagateError("Function at "..self.Path.." does not exist.")
-        return
+        local err = "Function at "..self.Path.." does not exist."
+        SWToPython.Uplink:PropagateError(err)
+
+        return nil, err
     end
 
-    local returns = {func(table.unpack(self.Arguments))}
-    return SWToPython.Classes.HandledCall:New(self.ID, returns)
+    -- one failing call shouldn't take down the rest
+    local results = table.pack(pcall(func, table.unpack(self.Arguments)))
+
+    if not results[1] then
+        local err = "Function at "..self.Path.." errored: "..tostring(results[2])
+        SWToPython.Uplink:PropagateError(err)
+
+        return nil, err
+    end
+
+    return {table.unpack(results, 2, results.n)}
+end
+
+--[[
+    Calls the `server.` function in the addon and returns the result, which carries the error if the call failed.
+]]
+---@return SWToPython.HandledCall
+function SWToPython.Classes.Call:Call()
+    local returns, err = self:Execute()
+    return SWToPython.Classes.HandledCall:New(self.ID, returns or {}, err)
 end
 
 --[[
@@ -62,6 +108,26 @@ function SWToPython.Classes.Call:FromTable(tbl)
     return self:New(
         tbl.id,
         tbl.path,
-        tbl.arguments
+        tbl.arguments,
+        tbl.no_reply == true,
+        tbl.priority or 1,
+        tbl.delay or 0,
+        tbl.tick
     )
+end
+
+--[[
+    Returns a table representation of the call, in the same shape `FromTable` takes.
+]]
+---@return table
+function SWToPython.Classes.Call:ToTable()
+    return {
+        id = self.ID,
+        path = self.Path,
+        arguments = self.Arguments,
+        no_reply = self.NoReply,
+        priority = self.Priority,
+        delay = self.Delay,
+        tick = self.Tick
+    }
 end
\ No newline at end of file
@@ -27,15 +27,16 @@
     A class representing a call from the PythonToSW server that has been handled.
 ]]
 ---@class SWToPython.HandledCall: NoirHoardable
----@field New fun(self: SWToPython.HandledCall, ID: string, returnValues: table<integer, any>): SWToPython.HandledCall
+---@field New fun(self: SWToPython.HandledCall, ID: integer, returnValues: table<integer, any>, err: string|nil): SWToPython.HandledCall
 SWToPython.Classes.HandledCall = Noir.Class("HandledCall", Noir.Classes.Hoardable)
 
 --[[
     Initializes new HandledCall instances.
 ]]
----@param ID string
+---@param ID integer
 ---@param returnValues table<integer, any>
-function SWToPython.Classes.HandledCall:Init(ID, returnValues)
+---@param err string|nil
+function SWToPython.Classes.HandledCall:Init(ID, returnValues, err)
     self:InitFrom(Noir.Classes.Hoardable, ID)
 
     --[[
@@ -48,6 +49,11 @@ function SWToPython.Classes.HandledCall:Init(ID, returnValues)
     ]]
     self.ReturnValues = returnValues
 
+    --[[
+        The error the call failed with, if any.
+    ]]
+    self.Error = err
+
     --[[
         The time the call was handled.
     ]]
@@ -62,6 +68,7 @@ function SWToPython.Classes.HandledCall:ToTable()
     return {
         ID = self.ID,
         ReturnValues = self.ReturnValues,
+        Error = self.Error,
         Time = self.Time
     }
 end
@@ -70,6 +77,7 @@ end
     Table representation of a HandledCall. Use for sending to the PythonToSW server.
 ]]
 ---@class SwToPython.HandledCall.AsTable
----@field ID string
+---@field ID integer
 ---@field ReturnValues table<integer, any>
+---@field Error string|nil
 ---@field Time number
\ No newline at end of file
@@ -0,0 +1,162 @@
+--------------------------------------------------------
+-- [SWToPython] Handled Call
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    A class representing a payload too large to fit in one request, sent to the PythonToSW server as fragments across several updates.
+]]
+---@class SWToPython.Transfer: NoirClass
+---@field New fun(self: SWToPython.Transfer, ID: integer, version: integer, payload: string, fragmentSize: integer, handledCalls: table<integer, SWToPython.HandledCall>, triggeredCallbacks: table<integer, SWToPython.TriggeredCallback>): SWToPython.Transfer
+SWToPython.Classes.Transfer = Noir.Class("Transfer")
+
+--[[
+    Initializes new Transfer instances.
+]]
+---@param ID integer
+---@param version integer
+---@param payload string
+---@param fragmentSize integer
+---@param handledCalls table<integer, SWToPython.HandledCall>
+---@param triggeredCallbacks table<integer, SWToPython.TriggeredCallback>
+function SWToPython.Classes.Transfer:Init(ID, version, payload, fragmentSize, handledCalls, triggeredCallbacks)
+    --[[
+        The ID of the transfer.
+    ]]
+    self.ID = ID
+
+    --[[
+        The protocol version the payload was encoded with.
+    ]]
+    self.Version = version
+
+    --[[
+        The fragments of the payload.
+    ]]
+    ---@type table<integer, string>
+    self.Fragments = self:Split(payload, fragmentSize)
+
+    --[[
+        The index of the next fragment to send.
+    ]]
+    self.Next = 1
+
+    --[[
+        The handled calls in the payload.
+    ]]
+    self.HandledCalls = handledCalls
+
+    --[[
+        The triggered callbacks in the payload.
+    ]]
+    self.TriggeredCallbacks = triggeredCallbacks
+end
+
+--[[
+    Splits a payload into fragments of at most `size` bytes, without splitting UTF-8 characters.
+]]
+---@param payload string
+---@param size integer
+---@return table<integer, string>
+function SWToPython.Classes.Transfer:Split(payload, size)
+    local fragments = {}
+    local start = 1
+
+    while start <= #payload do
+        local finish = math.min(start + size - 1, #payload)
+
+        -- step back until the next byte isn't a UTF-8 continuation byte
+        while finish < #payload and finish > start and (payload:byte(finish + 1) & 0xC0) == 0x80 do
+            finish = finish - 1
+        end
+
+        table.insert(fragments, payload:sub(start, finish))
+        start = finish + 1
+    end
+
+    return fragments
+end
+
+--[[
+    Returns the next fragment to send and its index (starting at 0), then moves on to the one after.<br>
+    Once every fragment has been sent, the last one is resent until the PythonToSW server acknowledges the transfer, in case its answer was lost.
+]]
+---@return integer, string
+function SWToPython.Classes.Transfer:NextFragment()
+    if self.Next > #self.Fragments then
+        return #self.Fragments - 1, self.Fragments[#self.Fragments]
+    end
+
+    local index = self.Next
+    self.Next = index + 1
+
+    return index - 1, self.Fragments[index]
+end
+
+--[[
+    Handles the index of the next fragment the PythonToSW server needs.<br>
+    Returns if the transfer is complete. Once every fragment has been sent, missing fragments are resent.
+]]
+---@param needed integer
+---@return boolean
+function SWToPython.Classes.Transfer:Acknowledge(needed)
+    if needed >= #self.Fragments then
+        return true
+    end
+
+    if self.Next > #self.Fragments then
+        self.Next = needed + 1
+    end
+
+    return false
+end
+
+--[[
+    Returns if the transfer contains a handled call.
+]]
+---@param handledCall SWToPython.HandledCall
+---@return boolean
+function SWToPython.Classes.Transfer:HasHandledCall(handledCall)
+    for _, transferredHandledCall in ipairs(self.HandledCalls) do
+        if transferredHandledCall == handledCall then
+            return true
+        end
+    end
+
+    return false
+end
+
+--[[
+    Returns if the transfer contains a triggered callback.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+---@return boolean
+function SWToPython.Classes.Transfer:HasTriggeredCallback(triggeredCallback)
+    for _, transferredTriggeredCallback in ipairs(self.TriggeredCallbacks) do
+        if transferredTriggeredCallback == triggeredCallback then
+            return true
+        end
+    end
+
+    return false
+end
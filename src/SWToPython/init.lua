@@ -41,4 +41,9 @@ SWToPython.Enums = {}
 --[[
     A table containing libraries used throughout the addon.
 ]]
-SWToPython.Libs = {}
\ No newline at end of file
+SWToPython.Libs = {}
+
+--[[
+    A table containing built-in functions that can be called from the PythonToSW server.
+]]
+SWToPython.Builtins = {}
\ No newline at end of file
@@ -0,0 +1,316 @@
+--------------------------------------------------------
+-- [SWToPython] Protocol
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    A library for encoding and decoding data sent between the addon and the PythonToSW server.<br>
+    Data is sent as positional arrays, with function paths and callback names interned to indexes from tables
+    sent by the PythonToSW server at handshake.
+]]
+---@class SWToPython.Protocol: NoirLibrary
+SWToPython.Libs.Protocol = Noir.Libraries:Create(
+    "Protocol",
+    "A library for encoding and decoding data sent between the addon and the PythonToSW server.",
+    "A library for encoding and decoding data sent between the addon and the PythonToSW server, as positional arrays with interned function paths and callback names.",
+    {"Cuh4 (https://github.com/Cuh4)"}
+)
+
+--[[
+    The newest protocol version the addon supports.
+]]
+SWToPython.Libs.Protocol.Version = 2
+
+--[[
+    JSON encodes a value without any whitespace, keeping URLs short.
+]]
+---@param obj any
+---@return string
+function SWToPython.Libs.Protocol:Encode(obj)
+    local kind = Noir.Libraries.JSON:KindOf(obj)
+
+    if kind == "array" then
+        local parts = {}
+
+        for index, value in ipairs(obj) do
+            parts[index] = self:Encode(value)
+        end
+
+        return "["..table.concat(parts, ",").."]"
+    elseif kind == "table" then
+        local parts = {}
+
+        for key, value in pairs(obj) do
+            table.insert(parts, "\""..Noir.Libraries.JSON:EscapeString(tostring(key)).."\":"..self:Encode(value))
+        end
+
+        return "{"..table.concat(parts, ",").."}"
+    elseif kind == "string" then
+        return "\""..Noir.Libraries.JSON:EscapeString(obj).."\""
+    elseif kind == "number" or kind == "boolean" then
+        return tostring(obj)
+    else
+        return "null"
+    end
+end
+
+--[[
+    Encodes a handled call to send to the PythonToSW server.
+]]
+---@param handledCall SWToPython.HandledCall
+---@return table
+function SWToPython.Libs.Protocol:EncodeHandledCall(handledCall)
+    return {handledCall.ID, handledCall.ReturnValues, handledCall.Error}
+end
+
+--[[
+    Encodes a triggered callback to send to the PythonToSW server.<br>
+    The callback name is replaced with its interned index if it has one.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+---@param callbackIDs table<string, integer>
+---@return table
+function SWToPython.Libs.Protocol:EncodeTriggeredCallback(triggeredCallback, callbackIDs)
+    return {callbackIDs[triggeredCallback.Name] or triggeredCallback.Name, triggeredCallback.Arguments}
+end
+
+--[[
+    Decodes a call sent by the PythonToSW server.<br>
+    Calls are `{id, path, arguments, noReply, priority, delay, tick}` where `path` may be an interned index.
+]]
+---@param tbl table
+---@param paths table<integer, string>
+---@return SWToPython.Call
+function SWToPython.Libs.Protocol:DecodeCall(tbl, paths)
+    local path = tbl[2]
+
+    if type(path) == "number" then
+        path = paths[path] or ""
+    end
+
+    return SWToPython.Classes.Call:New(tbl[1], path, tbl[3], tbl[4] == 1, tbl[5] or 1, tbl[6] or 0, tbl[7])
+end
+
+--[[
+    Decodes a response to an update.
+]]
+---@param update table
+---@param paths table<integer, string>
+---@return SWToPython.Protocol.Update
+function SWToPython.Libs.Protocol:DecodeUpdate(update, paths)
+    local session, calls, cancelled, fragment, pollInterval = update.s, update.c, update.x, update.f, update.p
+    local subscriptions, watches = update.u, update.w
+
+    local decodedCalls = {}
+
+    for index, call in ipairs(calls or {}) do
+        decodedCalls[index] = self:DecodeCall(call, paths)
+    end
+
+    if subscriptions then
+        subscriptions = self:DecodeSubscriptions(subscriptions)
+    end
+
+    if watches then
+        watches = self:DecodeWatches(watches, paths)
+    end
+
+    return {
+        Session = session,
+        Calls = decodedCalls,
+        Cancelled = cancelled or {},
+        Fragment = fragment,
+        PollInterval = pollInterval,
+        Subscriptions = subscriptions,
+        Watches = watches
+    }
+end
+
+--[[
+    Decodes the functions to watch.<br>
+    Watches are `{id, path, arguments, period}` where `path` may be an interned index.
+]]
+---@param watches table
+---@param paths table<integer, string>
+---@return SWToPython.Protocol.Watches
+function SWToPython.Libs.Protocol:DecodeWatches(watches, paths)
+    local revision, items = watches[1], watches[2]
+
+    local decodedWatches = {}
+
+    for _, watch in ipairs(items or {}) do
+        local ID, path, arguments, period = watch[1], watch[2], watch[3], watch[4]
+
+        if type(path) == "number" then
+            path = paths[path] or ""
+        end
+
+        table.insert(decodedWatches, {
+            ID = ID,
+            Path = path,
+            Arguments = arguments or {},
+            Period = period or 1
+        })
+    end
+
+    return {
+        Revision = revision,
+        Watches = decodedWatches
+    }
+end
+
+--[[
+    Decodes the callbacks to listen for and their policies.<br>
+    Argument indexes are converted from the 0-based indexes used by the PythonToSW server.
+]]
+---@param subscriptions table
+---@return SWToPython.Protocol.Subscriptions
+function SWToPython.Libs.Protocol:DecodeSubscriptions(subscriptions)
+    local revision, callbacks, policies, filters = subscriptions[1], subscriptions[2], subscriptions[3], subscriptions[4]
+
+    local decodedPolicies = {}
+
+    for name, policy in pairs(policies or {}) do
+        local mode, key, sum, every = policy[1], policy[2], policy[3], policy[4]
+
+        local decodedPolicy = {
+            Mode = mode,
+            Key = {},
+            Sum = {},
+            Every = every or 1
+        }
+
+        for _, index in pairs(key or {}) do
+            table.insert(decodedPolicy.Key, index + 1)
+        end
+
+        for _, index in pairs(sum or {}) do
+            table.insert(decodedPolicy.Sum, index + 1)
+        end
+
+        decodedPolicies[name] = decodedPolicy
+    end
+
+    local decodedFilters = {}
+
+    for name, callbackFilters in pairs(filters or {}) do
+        decodedFilters[name] = {}
+
+        for _, callbackFilter in pairs(callbackFilters) do
+            table.insert(decodedFilters[name], self:DecodeCallbackFilter(callbackFilter))
+        end
+    end
+
+    return {
+        Revision = revision,
+        Callbacks = callbacks or {},
+        Policies = decodedPolicies,
+        Filters = decodedFilters
+    }
+end
+
+--[[
+    Decodes the conditions of a callback filter.
+]]
+---@param conditions table
+---@return table<integer, SWToPython.Protocol.CallbackCondition>
+function SWToPython.Libs.Protocol:DecodeCallbackFilter(conditions)
+    local decodedConditions = {}
+
+    for _, condition in pairs(conditions or {}) do
+        local index, op, value = condition[1], condition[2], condition[3]
+
+        local decodedCondition = {
+            Index = index + 1,
+            Op = op,
+            Value = value
+        }
+
+        -- look values up instead of searching through them
+        if op == "in" then
+            decodedCondition.Value = {}
+
+            for _, item in pairs(value or {}) do
+                decodedCondition.Value[item] = true
+            end
+        end
+
+        table.insert(decodedConditions, decodedCondition)
+    end
+
+    return decodedConditions
+end
+
+--[[
+    A decoded response to an update.
+]]
+---@class SWToPython.Protocol.Update
+---@field Session string
+---@field Calls table<integer, SWToPython.Call>
+---@field Cancelled table<integer, integer>
+---@field Fragment integer|nil The index of the next fragment of the transfer sent with the update that the PythonToSW server needs
+---@field PollInterval integer|nil The tick interval the PythonToSW server wants between updates
+---@field Subscriptions SWToPython.Protocol.Subscriptions|nil The callbacks to listen for, if the ones listened for are outdated
+---@field Watches SWToPython.Protocol.Watches|nil The functions to watch, if the ones watched are outdated
+
+--[[
+    The functions the PythonToSW server wants the addon to watch.
+]]
+---@class SWToPython.Protocol.Watches
+---@field Revision integer
+---@field Watches table<integer, SWToPython.Protocol.Watch>
+
+--[[
+    A function called every `Period` ticks, whose latest results are sent with each update.
+]]
+---@class SWToPython.Protocol.Watch
+---@field ID integer
+---@field Path string
+---@field Arguments table
+---@field Period integer
+
+--[[
+    The callbacks the PythonToSW server wants the addon to listen for.
+]]
+---@class SWToPython.Protocol.Subscriptions
+---@field Revision integer
+---@field Callbacks table<integer, string>
+---@field Policies table<string, SWToPython.Protocol.CallbackPolicy>
+---@field Filters table<string, table<integer, table<integer, SWToPython.Protocol.CallbackCondition>>> Triggers are only kept if they pass all conditions of any filter of their callback
+
+--[[
+    How a callback being triggered many times between updates is dealt with.
+]]
+---@class SWToPython.Protocol.CallbackPolicy
+---@field Mode "all"|"latest"|"aggregate"|"sample"
+---@field Key table<integer, integer> The indexes of the arguments that make up the key
+---@field Sum table<integer, integer> The indexes of the arguments that are added up
+---@field Every integer Only 1 in this many triggers is kept when sampling
+
+--[[
+    A check on a single argument of a callback.
+]]
+---@class SWToPython.Protocol.CallbackCondition
+---@field Index integer The index of the argument
+---@field Op "eq"|"prefix"|"in"
+---@field Value any The value to compare against. A lookup table for "in"
\ No newline at end of file
@@ -0,0 +1,137 @@
+--------------------------------------------------------
+-- [SWToPython] Entities
+-- https://github.com/Cuh4/PythonToSW
+--------------------------------------------------------
+
+--[[
+    Copyright (C) 2025 Cuh4
+
+    Licensed under the Apache License, Version 2.0 (the "License");
+    you may not use this file except in compliance with the License.
+    You may obtain a copy of the License at
+
+        http://www.apache.org/licenses/LICENSE-2.0
+
+    Unless required by applicable law or agreed to in writing, software
+    distributed under the License is distributed on an "AS IS" BASIS,
+    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+    See the License for the specific language governing permissions and
+    limitations under the License.
+]]
+
+-------------------------------
+-- // Main
+-------------------------------
+
+--[[
+    A service that keeps track of spawned vehicles and loaded objects.<br>
+    The game has no way to list these, so they're tracked from callbacks and saved, surviving addon reloads.
+]]
+---@class SWToPython.Entities: NoirService
+SWToPython.Entities = Noir.Services:CreateService(
+    "Entities",
+    false,
+    "A service that keeps track of spawned vehicles and loaded objects.",
+    "A service that keeps track of spawned vehicles and loaded objects. The game has no way to list these, so they're tracked from callbacks and saved, surviving addon reloads.",
+    {"Cuh4 (https://github.com/Cuh4)"}
+)
+
+--[[
+    Called when the service is initialized.
+]]
+function SWToPython.Entities:ServiceInit()
+    --[[
+        Spawned vehicles, indexed by vehicle ID.
+    ]]
+    ---@type table<integer, SWToPython.Entities.Vehicle>
+    self.Vehicles = self:EnsuredLoad("Vehicles", {})
+
+    --[[
+        Loaded objects, indexed by object ID.
+    ]]
+    ---@type table<integer, boolean>
+    self.Objects = self:EnsuredLoad("Objects", {})
+end
+
+--[[
+    Called when the service is started.
+]]
+function SWToPython.Entities:ServiceStart()
+    Noir.Callbacks:Connect("onVehicleSpawn", function(vehicle_id, peer_id, x, y, z, group_cost, group_id)
+        self.Vehicles[vehicle_id] = {
+            Group = group_id or -1,
+            Owner = peer_id,
+            Loaded = false
+        }
+    end)
+
+    Noir.Callbacks:Connect("onVehicleDespawn", function(vehicle_id)
+        self.Vehicles[vehicle_id] = nil
+    end)
+
+    Noir.Callbacks:Connect("onVehicleLoad", function(vehicle_id)
+        if self.Vehicles[vehicle_id] then
+            self.Vehicles[vehicle_id].Loaded = true
+        end
+    end)
+
+    Noir.Callbacks:Connect("onVehicleUnload", function(vehicle_id)
+        if self.Vehicles[vehicle_id] then
+            self.Vehicles[vehicle_id].Loaded = false
+        end
+    end)
+
+    Noir.Callbacks:Connect("onObjectLoad", function(object_id)
+        self.Objects[object_id] = true
+    end)
+
+    Noir.Callbacks:Connect("onObjectUnload", function(object_id)
+        self.Objects[object_id] = nil
+    end)
+end
+
+--[[
+    Returns every online player, spawned vehicle and loaded object, each as one flat array:<br>
+    `{{peerID, name, steamID, admin, auth, ...}, {vehicleID, groupID, ownerPeerID, loaded, ...}, {objectID, ...}}`.<br>
+    The group ID and owner peer ID are -1 if the vehicle has none.
+]]
+---@return table<integer, table<integer, any>>
+function SWToPython.Entities:GetSnapshot()
+    local players, vehicles, objects = {}, {}, {}
+
+    for _, player in pairs(server.getPlayers()) do
+        -- dedicated servers list themselves as a player
+        if player.steam_id == 0 then
+            goto continue
+        end
+
+        table.insert(players, player.id)
+        table.insert(players, player.name)
+        table.insert(players, tostring(player.steam_id))
+        table.insert(players, player.admin or false)
+        table.insert(players, player.auth or false)
+
+        ::continue::
+    end
+
+    for vehicleID, vehicle in pairs(self.Vehicles) do
+        table.insert(vehicles, vehicleID)
+        table.insert(vehicles, vehicle.Group)
+        table.insert(vehicles, vehicle.Owner)
+        table.insert(vehicles, vehicle.Loaded)
+    end
+
+    for objectID in pairs(self.Objects) do
+        table.insert(objects, objectID)
+    end
+
+    return {players, vehicles, objects}
+end
+
+--[[
+    A spawned vehicle.
+]]
+---@class SWToPython.Entities.Vehicle
+---@field Group integer The group ID of the vehicle, or -1 if unknown
+---@field Owner integer The peer ID of the player who spawned the vehicle, or -1 if spawned by a script
+---@field Loaded boolean Whether or not the vehicle is loaded
\ No newline at end of file
@@ -63,14 +63,58 @@ function SWToPython.Uplink:ServiceInit()
     self.Token = "__REQUEST_TOKEN"
 
     --[[
-        The tick interval between updates.
+        The tick interval between updates while there is work.
     ]]
     ---@type integer
     ---@diagnostic disable-next-line: undefined-global
-    self.TickInterval = __TICK_INTERVAL
+    self.MinPollInterval = __MIN_POLL_INTERVAL
 
     --[[
-        The callbacks to listen for.
+        The tick interval between updates while idle.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxPollInterval = __MAX_POLL_INTERVAL
+
+    --[[
+        The current tick interval between updates. The PythonToSW server tells us what this should be with every update.
+    ]]
+    self.PollInterval = self.MinPollInterval
+
+    --[[
+        The tick the last update was sent on.
+    ]]
+    self.LastUpdateTick = 0
+
+    --[[
+        The maximum size of a request URL in bytes.<br>
+        Handled calls and triggered callbacks that don't fit are sent in later updates, and ones too large to ever fit are sent as a transfer.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxRequestBytes = __MAX_REQUEST_BYTES
+
+    --[[
+        Bytes of the request URL reserved for the endpoint, token and other small parameters.
+    ]]
+    self.RequestOverheadBytes = 256
+
+    --[[
+        How long the PythonToSW server holds update requests open for until a call is made, in seconds.<br>
+        0 if long polling is disabled.
+    ]]
+    ---@type number
+    ---@diagnostic disable-next-line: undefined-global
+    self.LongPollTimeout = __LONG_POLL_TIMEOUT
+
+    --[[
+        When the current long poll was sent (in milliseconds), or nil if there isn't one.
+    ]]
+    ---@type number|nil
+    self.LongPollSentAt = nil
+
+    --[[
+        The callbacks that can be listened for.
     ]]
     self.Callbacks = {
         "onClearOilSpill",
@@ -115,6 +159,165 @@ function SWToPython.Uplink:ServiceInit()
         "onOilSpill"
     }
 
+    --[[
+        The callbacks the PythonToSW server wants, mapped to their connection.<br>
+        Callbacks nothing in the PythonToSW server is connected to aren't listened for at all.
+    ]]
+    ---@type table<string, NoirConnection>
+    self.Subscriptions = {}
+
+    --[[
+        The revision of the subscribed callbacks and their policies. The PythonToSW server sends them when this is outdated.
+    ]]
+    ---@type integer
+    self.SubscriptionsRevision = -1
+
+    --[[
+        Functions called every so often, whose latest results are sent to the PythonToSW server. Indexed by watch ID.
+    ]]
+    ---@type table<integer, SWToPython.Uplink.Watch>
+    self.Watches = {}
+
+    --[[
+        The revision of the watches. The PythonToSW server sends them when this is outdated.
+    ]]
+    ---@type integer
+    self.WatchesRevision = -1
+
+    --[[
+        How callbacks triggered many times between updates are dealt with. Callbacks without a policy are always sent.
+    ]]
+    ---@type table<string, SWToPython.Protocol.CallbackPolicy>
+    self.CallbackPolicies = {}
+
+    --[[
+        How long calls can take to execute per tick in milliseconds, before the rest are carried over to the next tick.
+    ]]
+    ---@type number
+    ---@diagnostic disable-next-line: undefined-global
+    self.CallBudgetMilliseconds = __CALL_BUDGET_MILLISECONDS
+
+    --[[
+        The maximum amount of calls executed per tick.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxCallsPerTick = __MAX_CALLS_PER_TICK
+
+    --[[
+        Received calls waiting to be executed, per priority class (0 = high, 1 = normal, 2 = low).
+    ]]
+    ---@type table<integer, SWToPython.Uplink.CallQueue>
+    self.PendingCalls = {
+        [0] = {Items = {}, First = 1, Last = 0},
+        [1] = {Items = {}, First = 1, Last = 0},
+        [2] = {Items = {}, First = 1, Last = 0}
+    }
+
+    --[[
+        The IDs of received calls waiting to be executed. Calls removed from here (e.g. cancelled) are skipped.
+    ]]
+    ---@type table<integer, SWToPython.Call>
+    self.PendingCallIDs = {}
+
+    --[[
+        Received calls that haven't been executed yet, indexed by their ID.<br>
+        Saved so calls acknowledged through the watermark aren't lost if the addon reloads before executing them.
+    ]]
+    ---@type table<integer, table>
+    self.SavedCalls = self:EnsuredLoad("Calls", {})
+
+    --[[
+        The last tick (`TaskService.Ticks`) before the addon reloaded. Ticks start from 0 again after a reload, so saved scheduled calls are rescheduled relative to this.
+    ]]
+    ---@type integer
+    self.SavedTick = self:Load("Tick", 0)
+
+    --[[
+        Received calls scheduled for a later tick, along with the tasks that execute them.
+    ]]
+    ---@type table<integer, NoirTask>
+    self.ScheduledCalls = {}
+
+    --[[
+        The tick the call execution budget was last reset in, along with what has been used of it.
+    ]]
+    self.BudgetTick = -1
+    self.BudgetUsed = 0
+    self.BudgetCalls = 0
+    self.BudgetOverran = false
+    self.BudgetDeferred = false
+
+    --[[
+        Call execution budget overruns since last reported to the PythonToSW server.
+    ]]
+    ---@type SWToPython.Uplink.BudgetStats
+    self.BudgetStats = {Overruns = 0, OverrunMilliseconds = 0, Deferred = 0}
+
+    --[[
+        The maximum amount of unsent triggered callbacks. Once reached, `CallbackOverflow` decides what is dropped.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxCallbackBacklog = __MAX_CALLBACK_BACKLOG
+
+    --[[
+        What to do when the backlog of triggered callbacks is full.<br>
+        "drop_oldest" drops the oldest unsent trigger, "drop_by_callback" drops the oldest unsent trigger of the callback with the most unsent triggers,
+        and "summarize" keeps only the latest unsent trigger of each callback. Either way, the PythonToSW server is told how many triggers of each callback were dropped.
+    ]]
+    ---@type "drop_oldest"|"drop_by_callback"|"summarize"
+    ---@diagnostic disable-next-line: undefined-global
+    self.CallbackOverflow = __CALLBACK_OVERFLOW
+
+    --[[
+        The maximum amount of triggered callbacks sent in one update, so a large backlog (e.g. after the PythonToSW server was down) is sent over several updates.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxCallbacksPerUpdate = __MAX_CALLBACKS_PER_UPDATE
+
+    --[[
+        Triggered callbacks in the order they were triggered, per callback. Used to find what to drop when the backlog is full.
+    ]]
+    ---@type table<string, SWToPython.Uplink.Backlog>
+    self.CallbackBacklog = {}
+
+    --[[
+        The amount of unsent triggered callbacks.
+    ]]
+    self.TriggeredCallbackCount = 0
+
+    --[[
+        How many triggers of each callback were dropped since last reported to the PythonToSW server.
+    ]]
+    ---@type table<string, integer>
+    self.DroppedCallbacks = self:EnsuredLoad("DroppedCallbacks", {})
+
+    --[[
+        The filters triggers of callbacks must pass (any of) to be kept. Callbacks without filters are always kept.
+    ]]
+    ---@type table<string, table<integer, table<integer, SWToPython.Protocol.CallbackCondition>>>
+    self.CallbackFilters = {}
+
+    --[[
+        Unsent triggered callbacks that later triggers with the same key are merged into, indexed by key.
+    ]]
+    ---@type table<string, SWToPython.TriggeredCallback>
+    self.CoalescedCallbacks = {}
+
+    --[[
+        The keys of triggered callbacks in `CoalescedCallbacks`.
+    ]]
+    ---@type table<SWToPython.TriggeredCallback, string>
+    self.CoalesceKeys = {}
+
+    --[[
+        How many times each sampled callback has been triggered, modulo its sample rate.
+    ]]
+    ---@type table<string, integer>
+    self.SampleCounts = {}
+
     --[[
         A table of triggered callbacks.
     ]]
@@ -124,27 +327,125 @@ function SWToPython.Uplink:ServiceInit()
     --[[
         A table of handled calls.
     ]]
-    ---@type table<string, SWToPython.HandledCall>
+    ---@type table<integer, SWToPython.HandledCall>
     self.HandledCalls = {}
 
+    --[[
+        The session of the PythonToSW server that the watermark belongs to.<br>
+        Changes whenever the PythonToSW server restarts.
+    ]]
+    ---@type string
+    self.Session = self:EnsuredLoad("Session", "")
+
+    --[[
+        The ID of the latest call received from the PythonToSW server.<br>
+        Sent with every update so the server only sends calls above it.
+    ]]
+    ---@type integer
+    self.Watermark = self:EnsuredLoad("Watermark", 0)
+
+    --[[
+        IDs of calls the PythonToSW server cancelled before they were received.<br>
+        These are skipped if they arrive through an overlapping update.
+    ]]
+    ---@type table<integer, boolean>
+    self.CancelledCalls = {}
+
+    --[[
+        The protocol version agreed on with the PythonToSW server at handshake.<br>
+        Updates aren't sent until a handshake succeeds.
+    ]]
+    ---@type integer
+    self.Protocol = SWToPython.Libs.Protocol.Version
+
+    --[[
+        Interned function paths, indexed by their ID. Sent by the PythonToSW server at handshake.
+    ]]
+    ---@type table<integer, string>
+    self.Paths = {}
+
+    --[[
+        Interned callback names mapped to their ID. Sent by the PythonToSW server at handshake.
+    ]]
+    ---@type table<string, integer>
+    self.CallbackIDs = {}
+
+    --[[
+        The session of the PythonToSW server the last handshake was performed with.
+    ]]
+    ---@type string|nil
+    self.HandshakeSession = nil
+
+    --[[
+        When the handshake waiting for a response was sent (in milliseconds), or nil if there isn't one.
+    ]]
+    ---@type number|nil
+    self.HandshakeSentAt = nil
+
+    --[[
+        The transfer currently being sent to the PythonToSW server, if any.
+    ]]
+    ---@type SWToPython.Transfer|nil
+    self.Transfer = nil
+
     --[[
         The amount of outgoing requests that haven't received a response yet.
     ]]
     self.Outgoing = 0
+
+    --[[
+        The maximum amount of updates that can be waiting for a response at once.
+    ]]
+    ---@type integer
+    ---@diagnostic disable-next-line: undefined-global
+    self.MaxInFlight = __MAX_IN_FLIGHT
+
+    --[[
+        Updates waiting for a response, indexed by their request ID.
+    ]]
+    ---@type table<integer, SWToPython.Uplink.InFlightUpdate>
+    self.InFlight = {}
+
+    --[[
+        Handled calls and triggered callbacks sent in updates that are waiting for a response, mapped to the request ID of the update.<br>
+        These aren't sent again by other updates.
+    ]]
+    ---@type table<SWToPython.HandledCall|SWToPython.TriggeredCallback, integer>
+    self.InFlightItems = {}
+
+    --[[
+        The ID of the last update sent. Also makes every update URL unique.
+    ]]
+    self.RequestID = 0
+
+    --[[
+        The smoothed round trip time of updates in milliseconds, or nil if no update has been answered yet.
+    ]]
+    ---@type number|nil
+    self.RTT = nil
 end
 
 --[[
     Called when the service is started.
 ]]
 function SWToPython.Uplink:ServiceStart()
-    self:HandleCallbacks()
+    -- subscribe to the callbacks connected before the PythonToSW server generated this script
+    ---@diagnostic disable-next-line: undefined-global
+    self:Subscribe(SWToPython.Libs.Protocol:DecodeSubscriptions((Noir.Libraries.JSON:Decode(__SUBSCRIPTIONS))))
 
     --[[
         A repeated task for updating the PythonToSW server with new data.
     ]]
     self.UpdateTask = Noir.Services.TaskService:AddTickTask(function()
-        self:Update()
-    end, self.TickInterval, nil, true)
+        self:Poll()
+    end, self.MinPollInterval, nil, true)
+
+    --[[
+        A repeated task for executing received calls under the per-tick budget.
+    ]]
+    self.ExecuteTask = Noir.Services.TaskService:AddTickTask(function()
+        self:ExecuteCalls()
+    end, 1, nil, true)
 
     --[[
         A repeated task for checking if the PythonToSW server is alive.
@@ -170,7 +471,14 @@ function SWToPython.Uplink:ServiceStart()
             SWToPython.Classes.TriggeredCallback,
             {}
         )
+
+        for _, triggeredCallback in ipairs(self:GetSortedTriggeredCallbacks()) do
+            self:AddToBacklog(triggeredCallback)
+        end
     end
+
+    -- Requeue calls received but not executed before the addon reloaded (or the save was loaded)
+    self:RestoreCalls()
 end
 
 --[[
@@ -289,6 +597,15 @@ function SWToPython.Uplink:SetAlive(alive)
     self.Alive = alive
 
     if self.Alive then
+        -- the handshake, long poll and other updates may have been lost while the server was down
+        self.HandshakeSession = nil
+        self.HandshakeSentAt = nil
+        self.LongPollSentAt = nil
+
+        for requestID in pairs(self.InFlight) do
+            self:FailInFlight(requestID)
+        end
+
         print("Uplink:SetAlive(): PythonToSW server is alive.")
     else
         warn("Uplink:SetAlive(): PythonToSW server is not alive.")
@@ -305,153 +622,1420 @@ function SWToPython.Uplink:PropagateError(message)
 end
 
 --[[
-    Handles the process of running calls from the PythonToSW server, returning values, etc.
+    Agrees on a protocol version with the PythonToSW server, and receives the tables of interned function paths and callback names.<br>
+    Does nothing while a handshake is waiting for a response, unless it has been waiting long enough to have been lost.
 ]]
-function SWToPython.Uplink:Update()
-    local _handledCalls = Noir.Libraries.Table:Copy(self.HandledCalls)
-    local _triggeredCallbacks = Noir.Libraries.Table:Copy(self.TriggeredCallbacks)
+function SWToPython.Uplink:Handshake()
+    local now = server.getTimeMillisec()
+
+    if self.HandshakeSentAt and now - self.HandshakeSentAt < math.max(5000, (self.RTT or 0) * 4) then
+        return
+    end
+
+    self.HandshakeSentAt = now
 
     self:Request(
-        "/update",
+        "/handshake",
 
         {
-            handled_calls = self:HandledCallsToTable(),
-            triggered_callbacks = self:TriggeredCallbacksToTable()
+            version = SWToPython.Libs.Protocol.Version
         },
 
-        ---@param calls table<integer, table>
-        function(calls)
-            for _, _call in ipairs(calls) do
-                local call = SWToPython.Classes.Call:FromTable(_call)
-
-                if self:HasHandledCall(call) then
-                    return
-                end
+        ---@param handshake table
+        function(handshake)
+            self.HandshakeSentAt = nil
+            self.Paths = handshake.paths
+            self.CallbackIDs = {}
 
-                self:HandleCall(call)
+            for index, name in ipairs(handshake.callbacks) do
+                self.CallbackIDs[name] = index
             end
 
-            for _, triggeredCallback in pairs(_triggeredCallbacks) do
-                self:RemoveTriggeredCallback(triggeredCallback)
-            end
+            self.Protocol = handshake.version
+            self.HandshakeSession = handshake.session
 
-            for _, handledCall in pairs(_handledCalls) do
-                self:RemoveHandledCall(handledCall)
+            if handshake.session ~= self.Session then
+                self:SetSession(handshake.session)
             end
         end
     )
 end
 
 --[[
-    Converts handled calls to table representations.
+    Sends an update if one is due, or straight away if there is something to send.
 ]]
----@return table<integer, SwToPython.HandledCall.AsTable>
-function SWToPython.Uplink:HandledCallsToTable()
-    ---@type table<integer, SwToPython.HandledCall.AsTable>
-    local handledCalls = {}
-
-    for _, handledCall in pairs(self.HandledCalls) do
-        table.insert(handledCalls, handledCall:ToTable())
+function SWToPython.Uplink:Poll()
+    if Noir.Services.TaskService.Ticks - self.LastUpdateTick < self.PollInterval and not self:HasDataToSend() then
+        return
     end
 
-    table.sort(handledCalls, function (handledCallA, handledCallB)
-        return handledCallA.Time < handledCallB.Time
-    end)
-
-    return handledCalls
+    self:Update()
 end
 
 --[[
-    Converts triggered callbacks to table representations.
+    Sets the tick interval between updates, within the minimum and maximum.
 ]]
----@return table<integer, SwToPython.TriggeredCallback.AsTable>
-function SWToPython.Uplink:TriggeredCallbacksToTable()
-    ---@type table<integer, SwToPython.TriggeredCallback.AsTable>
-    local triggeredCallbacks = {}
-
-    for _, triggeredCallback in pairs(self.TriggeredCallbacks) do
-        table.insert(triggeredCallbacks, triggeredCallback:ToTable())
-    end
-
-    table.sort(triggeredCallbacks, function (triggeredCallbackA, triggeredCallbackB)
-        return triggeredCallbackA.Time < triggeredCallbackB.Time
-    end)
-
-    return triggeredCallbacks
+---@param interval integer
+function SWToPython.Uplink:SetPollInterval(interval)
+    self.PollInterval = math.min(math.max(interval, self.MinPollInterval), self.MaxPollInterval)
 end
 
 --[[
-    Handles a call.
+    Handles the process of running calls from the PythonToSW server, returning values, etc.
 ]]
----@param call SWToPython.Call
-function SWToPython.Uplink:HandleCall(call)
-    if self:HasHandledCall(call) then
+function SWToPython.Uplink:Update()
+    -- the server restarted (or we never shook hands), so the interned tables may be outdated. updates are encoded with them, so wait for a handshake
+    if self.HandshakeSession ~= self.Session then
+        self:Handshake()
         return
     end
 
-    local handledCall = call:Call()
+    -- the transfer was encoded for a different protocol version, so start it over
+    if self.Transfer and self.Transfer.Version ~= self.Protocol then
+        self.Transfer = nil
+    end
 
-    if not handledCall then
-        warn("Uplink:HandleCall(): Failed to handle call. ID: %s", call.ID)
+    -- pace ourselves to the server, instead of piling up requests it hasn't answered yet
+    self:ExpireInFlight()
+
+    if self:GetInFlightCount() >= self.MaxInFlight then
         return
     end
 
-    self.HandledCalls[handledCall.ID] = handledCall
-    handledCall:Hoard(self, "HandledCalls")
-end
-
---[[
-    Returns if a call has been handled.
-]]
----@param call SWToPython.Call
----@return boolean
-function SWToPython.Uplink:HasHandledCall(call)
-    return self.HandledCalls[call.ID] ~= nil
-end
+    local version = self.Protocol
+    local paths = self.Paths
+    local transfer = self.Transfer
+    local budget = self.MaxRequestBytes - self.RequestOverheadBytes
+
+    self.RequestID = self.RequestID + 1
+    local requestID = self.RequestID
+
+    local params = {
+        ack = self.Watermark,
+        session = self.Session,
+        v = version,
+        rid = requestID,
+        rtt = self.RTT and math.floor(self.RTT) or nil,
+        sub = self.SubscriptionsRevision,
+        watch = self.WatchesRevision,
+        tick = Noir.Services.TaskService.Ticks
+    }
 
---[[
-    Removes a handled call.
-]]
----@param handledCall SWToPython.HandledCall
-function SWToPython.Uplink:RemoveHandledCall(handledCall)
-    self.HandledCalls[handledCall.ID] = nil
-    handledCall:Unhoard(self, "HandledCalls")
-end
+    -- with long polling, the server holds one update open at a time until a call is made.
+    -- other updates are only sent if there is something to send in the meantime
+    local longPoll = false
 
---[[
-    Handles a callback.
-]]
----@param callbackName string
----@param arguments table<integer, any>
----@return SWToPython.TriggeredCallback
-function SWToPython.Uplink:HandleCallback(callbackName, arguments)
-    local triggeredCallback = SWToPython.Classes.TriggeredCallback:New(SWToPython.ID:GetID(), callbackName, arguments)
-    self.TriggeredCallbacks[triggeredCallback.ID] = triggeredCallback
+    if self:IsLongPolling() then
+        if self:IsLongPollOutstanding() then
+            if not self:HasDataToSend() then
+                return
+            end
+        else
+            longPoll = true
+            params.wait = 1
+            self.LongPollSentAt = server.getTimeMillisec()
+        end
+    end
 
-    triggeredCallback:Hoard(self, "TriggeredCallbacks")
+    self.LastUpdateTick = Noir.Services.TaskService.Ticks
 
-    return triggeredCallback
-end
+    if transfer then
+        local index, fragment = transfer:NextFragment()
 
---[[
-    Removes a triggered callback.
-]]
----@param triggeredCallback SWToPython.TriggeredCallback
-function SWToPython.Uplink:RemoveTriggeredCallback(triggeredCallback)
-    self.TriggeredCallbacks[triggeredCallback.ID] = nil
-    triggeredCallback:Unhoard(self, "TriggeredCallbacks")
-end
+        params.transfer = transfer.ID
+        params.fragment = index
+        params.fragments = #transfer.Fragments
+        params.data = fragment
 
---[[
-    Handle all callbacks.
-]]
-function SWToPython.Uplink:HandleCallbacks()
-    for _, callbackName in pairs(self.Callbacks) do
-        Noir.Callbacks:Connect(callbackName, function(...)
-            self:HandleCallback(callbackName, {...})
-        end)
+        budget = budget - self:GetEncodedSize(fragment)
     end
-end
+
+    -- report dropped callbacks, which are reported again if this update never gets a response
+    local dropped
+
+    if next(self.DroppedCallbacks) then
+        dropped = self.DroppedCallbacks
+        budget = budget - self:GetEncodedSize(Noir.Libraries.JSON:Encode(dropped))
+
+        self.DroppedCallbacks = {}
+        self:Save("DroppedCallbacks", self.DroppedCallbacks)
+    end
+
+    local handledCalls, _handledCalls, oversizedHandledCall
+    handledCalls, _handledCalls, budget, oversizedHandledCall = self:Pack(
+        self:GetSortedHandledCalls(),
+
+        function(handledCall)
+            return SWToPython.Libs.Protocol:EncodeHandledCall(handledCall)
+        end,
+
+        function(handledCall)
+            if self.InFlightItems[handledCall] or (transfer and transfer:HasHandledCall(handledCall)) then
+                return "skip"
+            end
+        end,
+
+        budget,
+        false
+    )
+
+    -- callbacks must be sent in order, so callbacks after one that doesn't fit wait for the next update
+    local triggeredCallbacks, _triggeredCallbacks, oversizedTriggeredCallback
+    triggeredCallbacks, _triggeredCallbacks, budget, oversizedTriggeredCallback = self:Pack(
+        self:GetSortedTriggeredCallbacks(),
+
+        function(triggeredCallback)
+            return SWToPython.Libs.Protocol:EncodeTriggeredCallback(triggeredCallback, self.CallbackIDs)
+        end,
+
+        function(triggeredCallback)
+            if self.InFlightItems[triggeredCallback] then
+                return "skip"
+            end
+
+            -- callbacks after one being transferred wait until it has been received
+            if transfer and transfer:HasTriggeredCallback(triggeredCallback) then
+                return "stop"
+            end
+        end,
+
+        budget,
+        true,
+        self.MaxCallbacksPerUpdate
+    )
+
+    -- only the latest sample of each watch is kept, so samples that don't fit are replaced by newer ones
+    local samples, _samples, oversizedSample
+    samples, _samples, budget, oversizedSample = self:Pack(
+        self:GetUnsentSamples(),
+
+        function(sample)
+            return sample
+        end,
+
+        function()
+        end,
+
+        budget,
+        false
+    )
+
+    for _, sample in ipairs(_samples) do
+        self.Watches[sample[1]].Unsent = false
+    end
+
+    if oversizedSample then
+        self.Watches[oversizedSample[1]].Unsent = false
+        self:PropagateError(("Sample of watch #%d is too large to send."):format(oversizedSample[1]))
+    end
+
+    if not transfer and (oversizedHandledCall or oversizedTriggeredCallback) then
+        self:StartTransfer({oversizedHandledCall}, {oversizedTriggeredCallback}, version)
+    end
+
+    params.handled_calls = handledCalls
+    params.triggered_callbacks = triggeredCallbacks
+
+    self:AddInFlight(requestID, _handledCalls, _triggeredCallbacks)
+
+    if #_samples > 0 then
+        params.samples = samples
+        self.InFlight[requestID].Samples = _samples
+    end
+
+    if dropped then
+        params.dropped = dropped
+        self.InFlight[requestID].Dropped = dropped
+    end
+
+    local budgetStats = self.BudgetStats
+
+    if budgetStats.Overruns > 0 or budgetStats.Deferred > 0 then
+        params.budget = {budgetStats.Overruns, math.floor(budgetStats.OverrunMilliseconds), budgetStats.Deferred}
+        self.InFlight[requestID].Budget = budgetStats
+
+        self.BudgetStats = {Overruns = 0, OverrunMilliseconds = 0, Deferred = 0}
+    end
+
+    self:Request(
+        "/update",
+        params,
+
+        ---@param _update table
+        function(_update)
+            if longPoll then
+                self.LongPollSentAt = nil
+            end
+
+            self:RemoveInFlight(requestID, not longPoll)
+
+            local update = SWToPython.Libs.Protocol:DecodeUpdate(_update, paths)
+
+            if update.Session ~= self.Session then
+                self:SetSession(update.Session)
+            end
+
+            if update.PollInterval then
+                self:SetPollInterval(update.PollInterval)
+            end
+
+            if update.Subscriptions then
+                self:Subscribe(update.Subscriptions)
+            end
+
+            if update.Watches then
+                self:SetWatches(update.Watches)
+            end
+
+            if transfer and update.Fragment and transfer:Acknowledge(update.Fragment) then
+                self:CompleteTransfer(transfer)
+            end
+
+            for _, callID in ipairs(update.Cancelled) do
+                self:CancelCall(callID)
+            end
+
+            for _, call in ipairs(update.Calls) do
+                -- already received through an earlier or overlapping update
+                if call.ID <= self.Watermark then
+                    goto continue
+                end
+
+                if not self.CancelledCalls[call.ID] then
+                    if call:IsScheduled() then
+                        self:ScheduleCall(call)
+                    else
+                        self:QueueCall(call)
+                    end
+                end
+
+                self:SetWatermark(call.ID)
+
+                ::continue::
+            end
+
+            for callID in pairs(self.CancelledCalls) do
+                if callID <= self.Watermark then
+                    self.CancelledCalls[callID] = nil
+                end
+            end
+
+            -- execute what fits in this tick's budget straight away, the rest is carried over
+            self:ExecuteCalls()
+
+            for _, triggeredCallback in pairs(_triggeredCallbacks) do
+                self:RemoveTriggeredCallback(triggeredCallback)
+            end
+
+            for _, handledCall in pairs(_handledCalls) do
+                self:RemoveHandledCall(handledCall)
+            end
+
+            -- poll again straight away, sending back the results of the calls we just handled
+            if longPoll then
+                self:Update()
+            end
+        end
+    )
+end
+
+--[[
+    Tracks an update that is waiting for a response, along with the handled calls and triggered callbacks it carries.
+]]
+---@param requestID integer
+---@param handledCalls table<integer, SWToPython.HandledCall>
+---@param triggeredCallbacks table<integer, SWToPython.TriggeredCallback>
+function SWToPython.Uplink:AddInFlight(requestID, handledCalls, triggeredCallbacks)
+    self.InFlight[requestID] = {
+        SentAt = server.getTimeMillisec(),
+        HandledCalls = handledCalls,
+        TriggeredCallbacks = triggeredCallbacks
+    }
+
+    for _, handledCall in ipairs(handledCalls) do
+        self.InFlightItems[handledCall] = requestID
+    end
+
+    for _, triggeredCallback in ipairs(triggeredCallbacks) do
+        self.InFlightItems[triggeredCallback] = requestID
+    end
+end
+
+--[[
+    Stops tracking an update, making whatever it carried sendable again (unless removed).<br>
+    If `measure` is true, the round trip time of the update is added to the smoothed RTT.
+]]
+---@param requestID integer
+---@param measure boolean
+function SWToPython.Uplink:RemoveInFlight(requestID, measure)
+    local inFlight = self.InFlight[requestID]
+
+    if not inFlight then
+        return
+    end
+
+    self.InFlight[requestID] = nil
+
+    for _, item in ipairs(inFlight.HandledCalls) do
+        self.InFlightItems[item] = nil
+    end
+
+    for _, item in ipairs(inFlight.TriggeredCallbacks) do
+        self.InFlightItems[item] = nil
+    end
+
+    if not measure then
+        return
+    end
+
+    local sample = server.getTimeMillisec() - inFlight.SentAt
+    self.RTT = self.RTT and (self.RTT * 0.875 + sample * 0.125) or sample
+end
+
+--[[
+    Stops tracking updates that never got a response (e.g. the request failed).
+]]
+function SWToPython.Uplink:ExpireInFlight()
+    local now = server.getTimeMillisec()
+    local timeout = math.max(5000, (self.RTT or 0) * 4) + self.LongPollTimeout * 1000
+
+    for requestID, inFlight in pairs(self.InFlight) do
+        if now - inFlight.SentAt > timeout then
+            self:FailInFlight(requestID)
+        end
+    end
+end
+
+--[[
+    Stops tracking an update that never got a response. The dropped callback counts, budget overruns and samples it carried are reported again.
+]]
+---@param requestID integer
+function SWToPython.Uplink:FailInFlight(requestID)
+    local inFlight = self.InFlight[requestID]
+
+    if not inFlight then
+        return
+    end
+
+    for callbackName, count in pairs(inFlight.Dropped or {}) do
+        self.DroppedCallbacks[callbackName] = (self.DroppedCallbacks[callbackName] or 0) + count
+    end
+
+    -- resend samples that haven't been replaced by a newer one since
+    for _, sample in ipairs(inFlight.Samples or {}) do
+        local watch = self.Watches[sample[1]]
+
+        if watch and watch.Sample == sample then
+            watch.Unsent = true
+        end
+    end
+
+    if inFlight.Budget then
+        self.BudgetStats.Overruns = self.BudgetStats.Overruns + inFlight.Budget.Overruns
+        self.BudgetStats.OverrunMilliseconds = self.BudgetStats.OverrunMilliseconds + inFlight.Budget.OverrunMilliseconds
+        self.BudgetStats.Deferred = self.BudgetStats.Deferred + inFlight.Budget.Deferred
+    end
+
+    self:RemoveInFlight(requestID, false)
+end
+
+--[[
+    Returns the amount of updates waiting for a response.
+]]
+---@return integer
+function SWToPython.Uplink:GetInFlightCount()
+    local count = 0
+
+    for _ in pairs(self.InFlight) do
+        count = count + 1
+    end
+
+    return count
+end
+
+--[[
+    Returns if long polling is enabled.
+]]
+---@return boolean
+function SWToPython.Uplink:IsLongPolling()
+    return self.LongPollTimeout > 0
+end
+
+--[[
+    Returns if a long poll is currently held open by the PythonToSW server.<br>
+    Long polls that never got a response (e.g. the request failed) are forgotten after a while.
+]]
+---@return boolean
+function SWToPython.Uplink:IsLongPollOutstanding()
+    if not self.LongPollSentAt then
+        return false
+    end
+
+    return server.getTimeMillisec() - self.LongPollSentAt < self.LongPollTimeout * 2000 + 1000
+end
+
+--[[
+    Returns if there are handled calls, triggered callbacks, samples or a transfer to send to the PythonToSW server, that aren't already on their way.
+]]
+---@return boolean
+function SWToPython.Uplink:HasDataToSend()
+    if self.Transfer then
+        return true
+    end
+
+    for _, handledCall in pairs(self.HandledCalls) do
+        if not self.InFlightItems[handledCall] then
+            return true
+        end
+    end
+
+    for _, triggeredCallback in pairs(self.TriggeredCallbacks) do
+        if not self.InFlightItems[triggeredCallback] then
+            return true
+        end
+    end
+
+    for _, watch in pairs(self.Watches) do
+        if watch.Unsent then
+            return true
+        end
+    end
+
+    return false
+end
+
+--[[
+    Returns the size of a string once URL encoded.
+]]
+---@param str string
+---@return integer
+function SWToPython.Uplink:GetEncodedSize(str)
+    return #Noir.Libraries.HTTP:URLEncode(str)
+end
+
+--[[
+    Packs items into a JSON array until the budget (in URL encoded bytes) runs out.<br>
+    Returns the JSON array, the packed items, the remaining budget, and the first item too large to ever fit in a request.
+]]
+---@param items table<integer, any>
+---@param encode fun(item: any): table
+---@param filter fun(item: any): "skip"|"stop"|nil Returns "skip" to leave an item out, or "stop" to stop packing
+---@param budget integer
+---@param ordered boolean If true, packing stops at the first item that doesn't fit so items are never sent out of order
+---@param limit integer|nil The maximum amount of items to pack
+---@return string, table<integer, any>, integer, any
+function SWToPython.Uplink:Pack(items, encode, filter, budget, ordered, limit)
+    local maxItemSize = self.MaxRequestBytes - self.RequestOverheadBytes
+    local parts = {}
+    local packed = {}
+    local oversized
+
+    for _, item in ipairs(items) do
+        if limit and #packed >= limit then
+            break
+        end
+
+        local action = filter(item)
+
+        if action == "stop" then
+            break
+        elseif action == "skip" then
+            goto continue
+        end
+
+        local part = SWToPython.Libs.Protocol:Encode(encode(item))
+        local size = self:GetEncodedSize(part) + 3 -- + encoded comma
+
+        if size > maxItemSize then
+            oversized = oversized or item
+        elseif size <= budget then
+            table.insert(parts, part)
+            table.insert(packed, item)
+            budget = budget - size
+
+            goto continue
+        end
+
+        if ordered then
+            break
+        end
+
+        ::continue::
+    end
+
+    return "["..table.concat(parts, ",").."]", packed, budget, oversized
+end
+
+--[[
+    Starts sending handled calls and triggered callbacks too large to fit in a request as a transfer.
+]]
+---@param handledCalls table<integer, SWToPython.HandledCall>
+---@param triggeredCallbacks table<integer, SWToPython.TriggeredCallback>
+---@param version integer
+function SWToPython.Uplink:StartTransfer(handledCalls, triggeredCallbacks, version)
+    local encodedHandledCalls = {}
+    local encodedTriggeredCallbacks = {}
+
+    for index, handledCall in ipairs(handledCalls) do
+        encodedHandledCalls[index] = SWToPython.Libs.Protocol:EncodeHandledCall(handledCall)
+    end
+
+    for index, triggeredCallback in ipairs(triggeredCallbacks) do
+        encodedTriggeredCallbacks[index] = SWToPython.Libs.Protocol:EncodeTriggeredCallback(triggeredCallback, self.CallbackIDs)
+    end
+
+    local payload = "["..SWToPython.Libs.Protocol:Encode(encodedHandledCalls)..","..SWToPython.Libs.Protocol:Encode(encodedTriggeredCallbacks).."]"
+
+    -- fragments take up to half of a request, and URL encoding can triple their size
+    local fragmentSize = math.max(1, (self.MaxRequestBytes - self.RequestOverheadBytes) // 6)
+
+    self.Transfer = SWToPython.Classes.Transfer:New(
+        SWToPython.ID:GetID(),
+        version,
+        payload,
+        fragmentSize,
+        handledCalls,
+        triggeredCallbacks
+    )
+end
+
+--[[
+    Completes a transfer once the PythonToSW server has received all of it.
+]]
+---@param transfer SWToPython.Transfer
+function SWToPython.Uplink:CompleteTransfer(transfer)
+    for _, handledCall in ipairs(transfer.HandledCalls) do
+        self:RemoveHandledCall(handledCall)
+    end
+
+    for _, triggeredCallback in ipairs(transfer.TriggeredCallbacks) do
+        self:RemoveTriggeredCallback(triggeredCallback)
+    end
+
+    if self.Transfer == transfer then
+        self.Transfer = nil
+    end
+end
+
+--[[
+    Sets the session of the PythonToSW server.<br>
+    Resets the watermark and discards handled calls from the previous session, since the server no longer knows about them.
+]]
+---@param session string
+function SWToPython.Uplink:SetSession(session)
+    self.Session = session
+    self:Save("Session", session)
+
+    self:SetWatermark(0)
+    self.CancelledCalls = {}
+    self.PendingCallIDs = {}
+
+    self.SavedCalls = {}
+    self:Save("Calls", self.SavedCalls)
+    self.Transfer = nil
+
+    for callID in pairs(Noir.Libraries.Table:Copy(self.ScheduledCalls)) do
+        self:UnscheduleCall(callID)
+    end
+
+    -- the new server may be connected to different callbacks (and watch different functions under the same IDs) under the same revision
+    self.SubscriptionsRevision = -1
+    self.WatchesRevision = -1
+
+    for watchID in pairs(Noir.Libraries.Table:Copy(self.Watches)) do
+        self:RemoveWatch(watchID)
+    end
+
+    for _, handledCall in pairs(Noir.Libraries.Table:Copy(self.HandledCalls)) do
+        self:RemoveHandledCall(handledCall)
+    end
+end
+
+--[[
+    Cancels a call the PythonToSW server no longer wants.<br>
+    If the call has already been handled, its result is discarded instead of being sent. Otherwise, the call is skipped when received.
+]]
+---@param callID integer
+function SWToPython.Uplink:CancelCall(callID)
+    local handledCall = self.HandledCalls[callID]
+
+    if handledCall then
+        self:RemoveHandledCall(handledCall)
+        return
+    end
+
+    if self.PendingCallIDs[callID] then
+        self.PendingCallIDs[callID] = nil
+        self:UnsaveCall(callID)
+        return
+    end
+
+    if self:UnscheduleCall(callID) then
+        return
+    end
+
+    if callID > self.Watermark then
+        self.CancelledCalls[callID] = true
+    end
+end
+
+--[[
+    Sets the ID of the latest call received from the PythonToSW server.
+]]
+---@param watermark integer
+function SWToPython.Uplink:SetWatermark(watermark)
+    self.Watermark = watermark
+    self:Save("Watermark", watermark)
+end
+
+--[[
+    Returns handled calls, oldest first.
+]]
+---@return table<integer, SWToPython.HandledCall>
+function SWToPython.Uplink:GetSortedHandledCalls()
+    ---@type table<integer, SWToPython.HandledCall>
+    local handledCalls = {}
+
+    for _, handledCall in pairs(self.HandledCalls) do
+        table.insert(handledCalls, handledCall)
+    end
+
+    table.sort(handledCalls, function (handledCallA, handledCallB)
+        -- things that happened in the same millisecond keep the order they happened in
+        if handledCallA.Time == handledCallB.Time then
+            return handledCallA.ID < handledCallB.ID
+        end
+
+        return handledCallA.Time < handledCallB.Time
+    end)
+
+    return handledCalls
+end
+
+--[[
+    Returns triggered callbacks, oldest first.
+]]
+---@return table<integer, SWToPython.TriggeredCallback>
+function SWToPython.Uplink:GetSortedTriggeredCallbacks()
+    ---@type table<integer, SWToPython.TriggeredCallback>
+    local triggeredCallbacks = {}
+
+    for _, triggeredCallback in pairs(self.TriggeredCallbacks) do
+        table.insert(triggeredCallbacks, triggeredCallback)
+    end
+
+    table.sort(triggeredCallbacks, function (triggeredCallbackA, triggeredCallbackB)
+        -- things that happened in the same millisecond keep the order they happened in
+        if triggeredCallbackA.Time == triggeredCallbackB.Time then
+            return triggeredCallbackA.ID < triggeredCallbackB.ID
+        end
+
+        return triggeredCallbackA.Time < triggeredCallbackB.Time
+    end)
+
+    return triggeredCallbacks
+end
+
+--[[
+    Queues a received call to be executed under the per-tick budget.
+]]
+---@param call SWToPython.Call
+function SWToPython.Uplink:QueueCall(call)
+    local queue = self.PendingCalls[call.Priority] or self.PendingCalls[1]
+
+    queue.Last = queue.Last + 1
+    queue.Items[queue.Last] = call
+
+    self.PendingCallIDs[call.ID] = call
+    self:SaveCall(call)
+end
+
+--[[
+    Saves a received call until it is executed, so it survives the addon reloading.
+]]
+---@param call SWToPython.Call
+---@param targetTick integer|nil The tick the call is scheduled for, if it is scheduled
+function SWToPython.Uplink:SaveCall(call, targetTick)
+    local savedCall = call:ToTable()
+
+    if targetTick then
+        savedCall.delay = 0
+        savedCall.tick = targetTick
+    end
+
+    self.SavedCalls[call.ID] = savedCall
+end
+
+--[[
+    Stops saving a call, as it has been executed or no longer needs to be.
+]]
+---@param callID integer
+function SWToPython.Uplink:UnsaveCall(callID)
+    self.SavedCalls[callID] = nil
+end
+
+--[[
+    Requeues saved calls, oldest first. These were received before the addon reloaded but weren't executed.
+]]
+function SWToPython.Uplink:RestoreCalls()
+    ---@type table<integer, integer>
+    local callIDs = {}
+
+    for callID in pairs(self.SavedCalls) do
+        table.insert(callIDs, callID)
+    end
+
+    table.sort(callIDs)
+
+    for _, callID in ipairs(callIDs) do
+        local savedCall = self.SavedCalls[callID]
+        local call = SWToPython.Classes.Call:FromTable(savedCall)
+
+        if call:IsScheduled() then
+            -- scheduled calls are saved with their target tick, so schedule them for the ticks they had left
+            call.Tick = nil
+            call.Delay = math.max(savedCall.tick - self.SavedTick, 1)
+
+            self:ScheduleCall(call)
+        else
+            self:QueueCall(call)
+        end
+    end
+end
+
+--[[
+    Schedules a received call to be executed at its target tick.<br>
+    Scheduled calls are executed on time instead of under the per-tick budget. Calls whose target tick has passed are executed straight away.
+]]
+---@param call SWToPython.Call
+function SWToPython.Uplink:ScheduleCall(call)
+    local now = Noir.Services.TaskService.Ticks
+    local delay = call:GetTargetTick(now) - now
+
+    if delay <= 0 then
+        self:HandleCall(call)
+        return
+    end
+
+    self.ScheduledCalls[call.ID] = Noir.Services.TaskService:AddTickTask(function()
+        self.ScheduledCalls[call.ID] = nil
+        self:HandleCall(call)
+    end, delay)
+
+    self:SaveCall(call, now + delay)
+end
+
+--[[
+    Stops a scheduled call from being executed.<br>
+    Returns if the call was scheduled.
+]]
+---@param callID integer
+---@return boolean
+function SWToPython.Uplink:UnscheduleCall(callID)
+    local task = self.ScheduledCalls[callID]
+
+    if not task then
+        return false
+    end
+
+    task:Remove()
+    self.ScheduledCalls[callID] = nil
+    self:UnsaveCall(callID)
+
+    return true
+end
+
+--[[
+    Removes and returns the next call to execute, highest priority first, or nil if there are none.
+]]
+---@return SWToPython.Call|nil
+function SWToPython.Uplink:NextPendingCall()
+    for priority = 0, 2 do
+        local queue = self.PendingCalls[priority]
+
+        while queue.First <= queue.Last do
+            local call = queue.Items[queue.First]
+
+            queue.Items[queue.First] = nil
+            queue.First = queue.First + 1
+
+            -- skip calls cancelled (or dropped by a session change) while waiting
+            if self.PendingCallIDs[call.ID] == call then
+                self.PendingCallIDs[call.ID] = nil
+                return call
+            end
+        end
+    end
+end
+
+--[[
+    Returns if there are calls waiting to be executed.
+]]
+---@return boolean
+function SWToPython.Uplink:HasPendingCalls()
+    return next(self.PendingCallIDs) ~= nil
+end
+
+--[[
+    Executes pending calls until this tick's budget (`CallBudgetMilliseconds` and `MaxCallsPerTick`) runs out.<br>
+    At least one call is executed per tick, so calls always make progress.
+]]
+function SWToPython.Uplink:ExecuteCalls()
+    local tick = Noir.Services.TaskService.Ticks
+
+    if tick ~= self.BudgetTick then
+        self.BudgetTick = tick
+        self.BudgetUsed = 0
+        self.BudgetCalls = 0
+        self.BudgetOverran = false
+        self.BudgetDeferred = false
+
+        -- saved for rescheduling scheduled calls after a reload
+        self:Save("Tick", tick)
+    end
+
+    while self:HasPendingCalls() do
+        if self.BudgetCalls > 0 and (self.BudgetUsed >= self.CallBudgetMilliseconds or self.BudgetCalls >= self.MaxCallsPerTick) then
+            if not self.BudgetDeferred then
+                self.BudgetDeferred = true
+                self.BudgetStats.Deferred = self.BudgetStats.Deferred + 1
+            end
+
+            break
+        end
+
+        local call = self:NextPendingCall()
+
+        if not call then
+            break
+        end
+
+        local startedAt = server.getTimeMillisec()
+        self:HandleCall(call)
+
+        self.BudgetUsed = self.BudgetUsed + (server.getTimeMillisec() - startedAt)
+        self.BudgetCalls = self.BudgetCalls + 1
+    end
+
+    -- no more calls run this tick once over budget, so the overrun is the total for the tick
+    if self.BudgetUsed > self.CallBudgetMilliseconds and not self.BudgetOverran then
+        self.BudgetOverran = true
+        self.BudgetStats.Overruns = self.BudgetStats.Overruns + 1
+        self.BudgetStats.OverrunMilliseconds = self.BudgetStats.OverrunMilliseconds + (self.BudgetUsed - self.CallBudgetMilliseconds)
+    end
+end
+
+--[[
+    Handles a call.
+]]
+---@param call SWToPython.Call
+function SWToPython.Uplink:HandleCall(call)
+    -- unsaved before executing, so a call that takes the addon down isn't executed again after it reloads
+    self:UnsaveCall(call.ID)
+
+    if self:HasHandledCall(call) then
+        return
+    end
+
+    -- No result is expected, so skip creating and hoarding a handled call. The watermark acknowledges it instead
+    if call.NoReply then
+        call:Execute()
+        return
+    end
+
+    local handledCall = call:Call()
+
+    self.HandledCalls[handledCall.ID] = handledCall
+    handledCall:Hoard(self, "HandledCalls")
+end
+
+--[[
+    Returns if a call has been handled.
+]]
+---@param call SWToPython.Call
+---@return boolean
+function SWToPython.Uplink:HasHandledCall(call)
+    return self.HandledCalls[call.ID] ~= nil
+end
+
+--[[
+    Removes a handled call.
+]]
+---@param handledCall SWToPython.HandledCall
+function SWToPython.Uplink:RemoveHandledCall(handledCall)
+    self.HandledCalls[handledCall.ID] = nil
+    handledCall:Unhoard(self, "HandledCalls")
+end
+
+--[[
+    Handles a callback, applying its filters and policy before queueing it.<br>
+    Returns the triggered callback the trigger ended up in, or nil if it was filtered, sampled out or dropped.
+]]
+---@param callbackName string
+---@param arguments table<integer, any>
+---@return SWToPython.TriggeredCallback|nil
+function SWToPython.Uplink:HandleCallback(callbackName, arguments)
+    if not self:PassesFilters(callbackName, arguments) then
+        return
+    end
+
+    local policy = self.CallbackPolicies[callbackName]
+    local key
+
+    if policy and policy.Mode == "sample" then
+        local count = self.SampleCounts[callbackName] or 0
+        self.SampleCounts[callbackName] = (count + 1) % policy.Every
+
+        if count ~= 0 then
+            return
+        end
+    elseif policy and (policy.Mode == "latest" or policy.Mode == "aggregate") then
+        key = self:GetCoalesceKey(callbackName, policy, arguments)
+
+        local pending = self.CoalescedCallbacks[key]
+
+        if pending and self:IsUnsent(pending) then
+            if policy.Mode == "aggregate" then
+                for _, index in ipairs(policy.Sum) do
+                    arguments[index] = (tonumber(pending.Arguments[index]) or 0) + (tonumber(arguments[index]) or 0)
+                end
+            end
+
+            pending.Arguments = arguments
+            pending:Hoard(self, "TriggeredCallbacks")
+
+            return pending
+        end
+    end
+
+    if self.TriggeredCallbackCount >= self.MaxCallbackBacklog and not self:DropFromBacklog(callbackName) then
+        self:CountDroppedCallback(callbackName)
+        return
+    end
+
+    local triggeredCallback = SWToPython.Classes.TriggeredCallback:New(SWToPython.ID:GetID(), callbackName, arguments)
+    self.TriggeredCallbacks[triggeredCallback.ID] = triggeredCallback
+    self:AddToBacklog(triggeredCallback)
+
+    triggeredCallback:Hoard(self, "TriggeredCallbacks")
+
+    if key then
+        self:RemoveCoalesceKey(key)
+        self.CoalescedCallbacks[key] = triggeredCallback
+        self.CoalesceKeys[triggeredCallback] = key
+    end
+
+    return triggeredCallback
+end
+
+--[[
+    Returns if the arguments of a callback pass any of its filters, or if the callback has no filters.
+]]
+---@param callbackName string
+---@param arguments table<integer, any>
+---@return boolean
+function SWToPython.Uplink:PassesFilters(callbackName, arguments)
+    local filters = self.CallbackFilters[callbackName]
+
+    if not filters then
+        return true
+    end
+
+    for _, conditions in ipairs(filters) do
+        local passes = true
+
+        for _, condition in ipairs(conditions) do
+            local argument = arguments[condition.Index]
+
+            if condition.Op == "eq" then
+                passes = argument == condition.Value
+            elseif condition.Op == "prefix" then
+                passes = type(argument) == "string" and argument:sub(1, #condition.Value) == condition.Value
+            elseif condition.Op == "in" then
+                passes = argument ~= nil and condition.Value[argument] == true
+            else
+                passes = false
+            end
+
+            if not passes then
+                break
+            end
+        end
+
+        if passes then
+            return true
+        end
+    end
+
+    return false
+end
+
+--[[
+    Returns the key triggers of a callback are merged by, made up of the callback name and the key arguments.
+]]
+---@param callbackName string
+---@param policy SWToPython.Protocol.CallbackPolicy
+---@param arguments table<integer, any>
+---@return string
+function SWToPython.Uplink:GetCoalesceKey(callbackName, policy, arguments)
+    local parts = {callbackName}
+
+    for _, index in ipairs(policy.Key) do
+        table.insert(parts, tostring(arguments[index]))
+    end
+
+    return table.concat(parts, "\0")
+end
+
+--[[
+    Returns if a triggered callback is still waiting to be sent, and isn't on its way in an update or transfer.<br>
+    Only these can be merged into or dropped.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+---@return boolean
+function SWToPython.Uplink:IsUnsent(triggeredCallback)
+    return self.TriggeredCallbacks[triggeredCallback.ID] == triggeredCallback
+        and not self.InFlightItems[triggeredCallback]
+        and not (self.Transfer and self.Transfer:HasTriggeredCallback(triggeredCallback))
+end
+
+--[[
+    Stops merging triggers into the triggered callback with the provided key.
+]]
+---@param key string
+function SWToPython.Uplink:RemoveCoalesceKey(key)
+    local triggeredCallback = self.CoalescedCallbacks[key]
+
+    if not triggeredCallback then
+        return
+    end
+
+    self.CoalescedCallbacks[key] = nil
+    self.CoalesceKeys[triggeredCallback] = nil
+end
+
+--[[
+    Removes a triggered callback.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+function SWToPython.Uplink:RemoveTriggeredCallback(triggeredCallback)
+    if self.TriggeredCallbacks[triggeredCallback.ID] ~= triggeredCallback then
+        return
+    end
+
+    self.TriggeredCallbacks[triggeredCallback.ID] = nil
+    triggeredCallback:Unhoard(self, "TriggeredCallbacks")
+
+    self:RemoveFromBacklog(triggeredCallback)
+
+    local key = self.CoalesceKeys[triggeredCallback]
+
+    if key then
+        self:RemoveCoalesceKey(key)
+    end
+end
+
+--[[
+    Adds a triggered callback to the end of the backlog of its callback.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+function SWToPython.Uplink:AddToBacklog(triggeredCallback)
+    local backlog = self.CallbackBacklog[triggeredCallback.Name]
+
+    if not backlog then
+        backlog = {Items = {}, First = 1, Last = 0, Count = 0}
+        self.CallbackBacklog[triggeredCallback.Name] = backlog
+    end
+
+    backlog.Last = backlog.Last + 1
+    backlog.Items[backlog.Last] = triggeredCallback
+    backlog.Count = backlog.Count + 1
+
+    self.TriggeredCallbackCount = self.TriggeredCallbackCount + 1
+end
+
+--[[
+    Removes a triggered callback from the backlog of its callback.
+]]
+---@param triggeredCallback SWToPython.TriggeredCallback
+function SWToPython.Uplink:RemoveFromBacklog(triggeredCallback)
+    local backlog = self.CallbackBacklog[triggeredCallback.Name]
+
+    if not backlog then
+        return
+    end
+
+    backlog.Count = backlog.Count - 1
+    self.TriggeredCallbackCount = self.TriggeredCallbackCount - 1
+
+    -- triggered callbacks are mostly removed in order, so this keeps the backlog from growing
+    while backlog.First <= backlog.Last and self.TriggeredCallbacks[backlog.Items[backlog.First].ID] ~= backlog.Items[backlog.First] do
+        backlog.Items[backlog.First] = nil
+        backlog.First = backlog.First + 1
+    end
+end
+
+--[[
+    Returns the oldest unsent triggered callback in a backlog, or nil if there isn't one.
+]]
+---@param backlog SWToPython.Uplink.Backlog
+---@return SWToPython.TriggeredCallback|nil
+function SWToPython.Uplink:GetOldestUnsent(backlog)
+    for index = backlog.First, backlog.Last do
+        local triggeredCallback = backlog.Items[index]
+
+        if triggeredCallback and self:IsUnsent(triggeredCallback) then
+            return triggeredCallback
+        end
+    end
+end
+
+--[[
+    Drops a triggered callback from the full backlog according to `CallbackOverflow`.<br>
+    Returns false if nothing was dropped, in which case the new trigger should be dropped instead.
+]]
+---@param callbackName string The callback of the new trigger
+---@return boolean
+function SWToPython.Uplink:DropFromBacklog(callbackName)
+    if self.CallbackOverflow == "summarize" then
+        return self:SummarizeBacklog(callbackName)
+    end
+
+    local victim, victimBacklog
+
+    for _, backlog in pairs(self.CallbackBacklog) do
+        local candidate = backlog.Count > 0 and self:GetOldestUnsent(backlog)
+
+        if not candidate then
+            goto continue
+        end
+
+        if not victim then
+            victim, victimBacklog = candidate, backlog
+        elseif self.CallbackOverflow == "drop_by_callback" and backlog.Count ~= victimBacklog.Count then
+            if backlog.Count > victimBacklog.Count then
+                victim, victimBacklog = candidate, backlog
+            end
+        elseif candidate.ID < victim.ID then
+            victim, victimBacklog = candidate, backlog
+        end
+
+        ::continue::
+    end
+
+    if not victim then
+        return false
+    end
+
+    self:RemoveTriggeredCallback(victim)
+    self:CountDroppedCallback(victim.Name)
+
+    return true
+end
+
+--[[
+    Makes room in the full backlog by keeping only the latest unsent trigger of each callback.<br>
+    If every callback is already down to one unsent trigger, the unsent trigger of the new trigger's callback is dropped so the new one replaces it.
+    Returns false if nothing was dropped.
+]]
+---@param callbackName string The callback of the new trigger
+---@return boolean
+function SWToPython.Uplink:SummarizeBacklog(callbackName)
+    ---@type table<integer, SWToPython.TriggeredCallback>
+    local dropped = {}
+
+    ---@type SWToPython.TriggeredCallback|nil
+    local replaced
+
+    for name, backlog in pairs(self.CallbackBacklog) do
+        local latest
+
+        -- newest first, so every unsent trigger after the first one found is older
+        for index = backlog.Last, backlog.First, -1 do
+            local triggeredCallback = backlog.Items[index]
+
+            if triggeredCallback and self:IsUnsent(triggeredCallback) then
+                if latest then
+                    table.insert(dropped, triggeredCallback)
+                else
+                    latest = triggeredCallback
+                end
+            end
+        end
+
+        if name == callbackName then
+            replaced = latest
+        end
+    end
+
+    if #dropped == 0 and replaced then
+        table.insert(dropped, replaced)
+    end
+
+    for _, triggeredCallback in ipairs(dropped) do
+        self:RemoveTriggeredCallback(triggeredCallback)
+        self:CountDroppedCallback(triggeredCallback.Name)
+    end
+
+    return #dropped > 0
+end
+
+--[[
+    Counts a dropped trigger of a callback, to be reported to the PythonToSW server.
+]]
+---@param callbackName string
+function SWToPython.Uplink:CountDroppedCallback(callbackName)
+    self.DroppedCallbacks[callbackName] = (self.DroppedCallbacks[callbackName] or 0) + 1
+end
+
+--[[
+    Listens for the provided callbacks only, connecting to new ones and disconnecting from ones no longer wanted.<br>
+    Also applies the policies and filters of the callbacks.
+]]
+---@param subscriptions SWToPython.Protocol.Subscriptions
+function SWToPython.Uplink:Subscribe(subscriptions)
+    local wanted = {}
+
+    for _, callbackName in pairs(subscriptions.Callbacks) do
+        wanted[callbackName] = true
+    end
+
+    for callbackName, connection in pairs(self.Subscriptions) do
+        if not wanted[callbackName] then
+            connection:Disconnect()
+            self.Subscriptions[callbackName] = nil
+        end
+    end
+
+    for _, callbackName in pairs(self.Callbacks) do
+        if wanted[callbackName] and not self.Subscriptions[callbackName] then
+            self.Subscriptions[callbackName] = Noir.Callbacks:Connect(callbackName, function(...)
+                self:HandleCallback(callbackName, {...})
+            end, true)
+        end
+    end
+
+    -- triggers already merged stay as they are, new ones follow the new policies
+    self.CallbackPolicies = subscriptions.Policies
+    self.CallbackFilters = subscriptions.Filters
+    self.CoalescedCallbacks = {}
+    self.CoalesceKeys = {}
+    self.SampleCounts = {}
+
+    self.SubscriptionsRevision = subscriptions.Revision
+end
+
+--[[
+    Replaces the watched functions with the ones provided by the PythonToSW server.<br>
+    Watch IDs are never reused within a session, so watches that are still wanted are kept as they are.
+]]
+---@param watches SWToPython.Protocol.Watches
+function SWToPython.Uplink:SetWatches(watches)
+    local wanted = {}
+
+    for _, watch in ipairs(watches.Watches) do
+        wanted[watch.ID] = true
+    end
+
+    for watchID in pairs(Noir.Libraries.Table:Copy(self.Watches)) do
+        if not wanted[watchID] then
+            self:RemoveWatch(watchID)
+        end
+    end
+
+    for _, _watch in ipairs(watches.Watches) do
+        if self.Watches[_watch.ID] then
+            goto continue
+        end
+
+        ---@type SWToPython.Uplink.Watch
+        local watch = {
+            ID = _watch.ID,
+            Path = _watch.Path,
+            Arguments = _watch.Arguments,
+            Unsent = false
+        }
+
+        watch.Task = Noir.Services.TaskService:AddTickTask(function()
+            self:SampleWatch(watch)
+        end, _watch.Period, nil, true)
+
+        self.Watches[watch.ID] = watch
+        self:SampleWatch(watch)
+
+        ::continue::
+    end
+
+    self.WatchesRevision = watches.Revision
+end
+
+--[[
+    Stops watching a function.
+]]
+---@param watchID integer
+function SWToPython.Uplink:RemoveWatch(watchID)
+    local watch = self.Watches[watchID]
+
+    if not watch then
+        return
+    end
+
+    watch.Task:Remove()
+    self.Watches[watchID] = nil
+end
+
+--[[
+    Calls a watched function, keeping its results as the latest sample to send.<br>
+    Errors are only propagated when they change, so a failing watch doesn't flood the PythonToSW server.
+]]
+---@param watch SWToPython.Uplink.Watch
+function SWToPython.Uplink:SampleWatch(watch)
+    local func = self:GetFunction(watch.Path)
+    local results, err
+
+    if func then
+        results = table.pack(pcall(func, table.unpack(watch.Arguments)))
+
+        if not results[1] then
+            err = "Watched function at "..watch.Path.." errored: "..tostring(results[2])
+        end
+    else
+        err = "Watched function at "..watch.Path.." does not exist."
+    end
+
+    if err then
+        if err ~= watch.Error then
+            self:PropagateError(err)
+        end
+
+        watch.Error = err
+        return
+    end
+
+    watch.Error = nil
+    watch.Sample = {watch.ID, Noir.Services.TaskService.Ticks, {table.unpack(results, 2, results.n)}}
+    watch.Unsent = true
+end
+
+--[[
+    Returns the latest samples of watches that haven't been sent yet, in order of watch ID.
+]]
+---@return table<integer, table>
+function SWToPython.Uplink:GetUnsentSamples()
+    local samples = {}
+
+    for _, watch in pairs(self.Watches) do
+        if watch.Unsent then
+            table.insert(samples, watch.Sample)
+        end
+    end
+
+    table.sort(samples, function(sampleA, sampleB)
+        return sampleA[1] < sampleB[1]
+    end)
+
+    return samples
+end
 
 --[[
     Checks if the PythonToSW server is alive.
@@ -466,4 +2050,52 @@ function SWToPython.Uplink:CheckAlive()
     self:Request("/ok", {}, function(response)
         self:SetAlive(true)
     end, true)
-end
\ No newline at end of file
+end
+
+--[[
+    An update waiting for a response.
+]]
+---@class SWToPython.Uplink.InFlightUpdate
+---@field SentAt number When the update was sent, in milliseconds
+---@field HandledCalls table<integer, SWToPython.HandledCall> The handled calls the update carries
+---@field TriggeredCallbacks table<integer, SWToPython.TriggeredCallback> The triggered callbacks the update carries
+---@field Dropped table<string, integer>|nil The dropped callback counts the update reports
+---@field Budget SWToPython.Uplink.BudgetStats|nil The budget overruns the update reports
+---@field Samples table<integer, table>|nil The samples of watches the update carries
+
+--[[
+    A function called every so often, whose latest results are sent to the PythonToSW server.
+]]
+---@class SWToPython.Uplink.Watch
+---@field ID integer
+---@field Path string
+---@field Arguments table
+---@field Task NoirTask The repeated task that calls the function
+---@field Sample table|nil The latest sample: `{ID, tick, returnValues}`
+---@field Unsent boolean Whether or not the latest sample is yet to be sent
+---@field Error string|nil The error the function last failed with
+
+--[[
+    A queue of received calls of one priority class.
+]]
+---@class SWToPython.Uplink.CallQueue
+---@field Items table<integer, SWToPython.Call>
+---@field First integer The index of the first item
+---@field Last integer The index of the last item
+
+--[[
+    Call execution budget overruns.
+]]
+---@class SWToPython.Uplink.BudgetStats
+---@field Overruns integer How many ticks calls took longer than the budget to execute
+---@field OverrunMilliseconds number How many milliseconds over the budget calls took in total
+---@field Deferred integer How many ticks calls were carried over to a later tick
+
+--[[
+    The triggered callbacks of a callback in the order they were triggered.
+]]
+---@class SWToPython.Uplink.Backlog
+---@field Items table<integer, SWToPython.TriggeredCallback>
+---@field First integer The index of the first item
+---@field Last integer The index of the last item
+---@field Count integer The amount of unsent triggered callbacks
\ No newline at end of file
@@ -0,0 +1,327 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+# // Imports
+import os
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from PythonToSW import Addon, CallEnum, CallPriorityEnum
+
+# // Main
+@pytest.fixture(scope = "function")
+def addon(tmp_path) -> Addon:
+    """
+    Creates an Addon instance with its endpoints, storing its data in a temporary directory
+    
+    Args:
+        tmp_path: The temporary directory
+    
+    Returns:
+        Addon: The Addon instance
+    """
+    
+    os.makedirs(tmp_path / "missions")
+    
+    addon = Addon("Test", str(tmp_path / "data"), port = 2500, addons_path = str(tmp_path / "missions"))
+    addon._create_endpoints()
+    
+    return addon
+
+@pytest.fixture(scope = "function")
+def client(addon: Addon) -> Iterator[TestClient]:
+    """
+    Creates a test client for the addon's server, running its lifespan
+    
+    Args:
+        addon (Addon): The Addon instance
+    
+    Yields:
+        TestClient: The test client
+    """
+    
+    with TestClient(addon.app) as client:
+        yield client
+
+def update(addon: Addon, client: TestClient, **params) -> dict:
+    """
+    Sends an update to the addon the way the in-game addon does, using the compact protocol
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+        **params: Parameters to send along with the update
+    
+    Returns:
+        dict: The response
+    """
+    
+    response = client.get("/update", params = {
+        "token": addon.token,
+        "session": addon.session,
+        "v": 2,
+        "handled_calls": "[]",
+        "triggered_callbacks": "[]",
+        **params
+    })
+    
+    assert response.status_code == 200, f"Update should succeed, got {response.status_code}: {response.text}"
+    return response.json()
+
+def test_dropped_callbacks(addon: Addon, client: TestClient):
+    """
+    Tests if triggers the addon dropped are counted in total and per callback
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    update(addon, client, dropped = json.dumps({"onPlayerJoin": 3, "onVehicleSpawn": 1}))
+    update(addon, client, dropped = json.dumps({"onPlayerJoin": 2}))
+    update(addon, client, dropped = "[]")
+    
+    assert addon.metrics.get("callbacks_dropped") == 6, "Dropped triggers should be counted in total"
+    assert addon.metrics.get("callbacks_dropped.onPlayerJoin") == 5, "Dropped triggers should be counted per callback"
+    assert addon.metrics.get("callbacks_dropped.onVehicleSpawn") == 1, "Dropped triggers should be counted per callback"
+    
+def test_samples(addon: Addon, client: TestClient):
+    """
+    Tests if samples update their watch, converting return values from Lua arrays, and samples of inactive watches are ignored
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    watch = addon.watch_function("foo.bar", period = 5)
+    
+    update(addon, client, samples = "{}")
+    assert watch.latest is None, "Watches shouldn't change without samples"
+    
+    update(addon, client, samples = json.dumps([[watch.id, 40, {"2": 5}], [watch.id + 1, 40, [1]]]))
+    
+    assert watch.latest == (None, 5), "Return values with nil holes should be converted back into a tuple"
+    assert watch.tick == 40, "The tick the sample was taken on should be stored"
+    assert addon.metrics.get("watch_samples") == 1, "Samples of inactive watches should be ignored"
+    
+def test_malformed_samples(addon: Addon, client: TestClient):
+    """
+    Tests if malformed samples are rejected before anything in the update is handled
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    watch = addon.watch_function("foo.bar")
+    
+    for samples in (json.dumps([[watch.id, 40]]), json.dumps([[watch.id, "soon", []]]), "5"):
+        response = client.get("/update", params = {
+            "token": addon.token,
+            "session": addon.session,
+            "v": 2,
+            "handled_calls": "[]",
+            "triggered_callbacks": "[]",
+            "dropped": json.dumps({"onPlayerJoin": 1}),
+            "samples": samples
+        })
+        
+        assert response.status_code == 400, f"Malformed samples ({samples}) should be rejected"
+        
+    assert watch.latest is None, "Malformed samples shouldn't update their watch"
+    assert addon.metrics.get("callbacks_dropped") == 0, "Rejected updates shouldn't be counted, as they are sent again"
+    
+def test_watch_revision(addon: Addon, client: TestClient):
+    """
+    Tests if watches are only sent to the addon while its watches are outdated
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    watch = addon.watch_function("foo.bar", 1, period = 5)
+    response = update(addon, client, watch = -1)
+    
+    assert "w" in response, "Watches should be sent to an addon that has none"
+    
+    revision, watches = response["w"]
+    
+    assert revision == addon.watches_revision, "Watches should be sent with their revision"
+    assert len(watches) == 1, "Every active watch should be sent"
+    assert "w" not in update(addon, client, watch = revision), "Watches shouldn't be sent again once the addon has them"
+    
+    addon.unwatch(watch)
+    response = update(addon, client, watch = revision)
+    
+    assert response["w"] == [revision + 1, []], "Watches should be sent again once changed"
+    
+def test_outdated_protocol(addon: Addon, client: TestClient):
+    """
+    Tests if updates from scripts that never performed a handshake are rejected before anything in them is handled
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    response = client.get("/update", params = {
+        "token": addon.token,
+        "session": addon.session,
+        "handled_calls": "[]",
+        "triggered_callbacks": "[]",
+        "dropped": json.dumps({"onPlayerJoin": 1})
+    })
+    
+    assert response.status_code == 400, "Updates without a protocol version should be rejected"
+    assert "outdated_protocol" in response.text, "The addon should be told its script is outdated"
+    assert addon.metrics.get("callbacks_dropped") == 0, "Rejected updates shouldn't be handled"
+    
+def test_lifespan(addon: Addon):
+    """
+    Tests if the addon grabs the event loop the server runs on, and lets go of it once the server stops
+    
+    Args:
+        addon (Addon): The Addon instance
+    """
+    
+    assert addon.loop is None, "There should be no event loop before the server starts"
+    
+    with TestClient(addon.app) as client:
+        assert addon.loop is not None, "The event loop should be grabbed once the server starts"
+        assert client.portal.call(asyncio.get_running_loop) is addon.loop, "The grabbed event loop should be the one the server runs on"
+        
+    assert addon.loop is None, "The event loop should be let go of once the server stops"
+    
+def test_call_async(addon: Addon, client: TestClient):
+    """
+    Tests if async calls wait for the addon to connect on the server's event loop, and resolve once handled through `/update`
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    function_call = asyncio.run_coroutine_threadsafe(addon.call_function_async("foo.bar", 1), addon.loop)
+    server_call = asyncio.run_coroutine_threadsafe(addon.call_async(CallEnum.GET_MAP_ID), addon.loop)
+    
+    while len(addon.calls) < 2:
+        time.sleep(0.01)
+    
+    # the event loop should keep serving requests while the calls wait for a connection
+    response = update(addon, client)
+    time.sleep(0.1)
+    
+    assert not function_call.done() and not server_call.done(), "Calls shouldn't resolve before they are handled"
+    
+    addon._update_connected()
+    assert addon.connected, "The addon should be connected after an update"
+    
+    call_ids = sorted(call[0] for call in response["c"])
+    assert len(call_ids) == 2, "Both calls should be sent to the addon"
+    
+    function_id, server_id = call_ids
+    update(addon, client, handled_calls = json.dumps([[function_id, [5, True]], [server_id, [3]]]), ack = server_id)
+    
+    assert function_call.result(timeout = 5) == (5, True), "The custom function call should resolve with its return values"
+    assert server_call.result(timeout = 5) == (3,), "The server function call should resolve with its return values"
+    assert len(addon.calls) == 0, "Handled calls should be removed"
+    
+def test_update_rtt(addon: Addon, client: TestClient):
+    """
+    Tests if the round trip time reported by the addon is recorded
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    update(addon, client)
+    assert addon.metrics.get("update_rtt_ms") == 0, "Nothing should be recorded before the addon measured a round trip"
+    
+    update(addon, client, rtt = 42.5)
+    assert addon.metrics.get("update_rtt_ms") == 42.5, "The reported round trip time should be recorded"
+    
+def test_overlapping_updates(addon: Addon, client: TestClient):
+    """
+    Tests if a handled call carried by overlapping updates is only resolved once
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    call, future = addon._create_call("foo.bar", [], False, False, CallPriorityEnum.NORMAL)
+    resolved = []
+    future.add_done_callback(lambda future: resolved.append(future.result()))
+    
+    handled_calls = json.dumps([[call.id, [7]]])
+    
+    update(addon, client, handled_calls = handled_calls)
+    update(addon, client, handled_calls = handled_calls)
+    
+    assert resolved == [(7,)], "The call should be resolved once, with its return values"
+    assert addon.metrics.get("handled_calls_unmatched") == 1, "The second copy of the handled call should be counted as unmatched"
+    
+def test_call_async_timeout_while_disconnected(addon: Addon, client: TestClient):
+    """
+    Tests if async calls that give up while waiting for a connection don't stop later calls from waiting for it
+    
+    Args:
+        addon (Addon): The Addon instance
+        client (TestClient): The test client
+    """
+    
+    abandoned = asyncio.run_coroutine_threadsafe(asyncio.wait_for(addon.call_async(CallEnum.GET_MAP_ID), 0.05), addon.loop)
+    
+    with pytest.raises(asyncio.TimeoutError):
+        abandoned.result(timeout = 5)
+        
+    assert not addon._connection.done(), "Giving up shouldn't cancel the connection for every other waiter"
+    
+    async_call = asyncio.run_coroutine_threadsafe(addon.call_function_async("foo.bar"), addon.loop)
+    sync_call = Future()
+    threading.Thread(target = lambda: sync_call.set_result(addon.call_function("foo.baz")), daemon = True).start()
+    
+    while len(addon.calls) < 3:
+        time.sleep(0.01)
+    
+    response = update(addon, client)
+    addon._update_connected()
+    
+    assert addon.connected, "The addon should be connected after an update"
+    
+    handled_calls = [[call[0], [call[0]]] for call in response["c"]]
+    update(addon, client, handled_calls = json.dumps(handled_calls))
+    
+    ids = {call[1]: call[0] for call in response["c"]}
+    assert async_call.result(timeout = 5) == (ids["foo.bar"],), "Async calls made after one gave up should still resolve"
+    assert sync_call.result(timeout = 5) == (ids["foo.baz"],), "Sync calls made after one gave up should still resolve"
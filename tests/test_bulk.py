@@ -0,0 +1,74 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+# // Imports
+from PythonToSW import (
+    BuiltinEnum,
+    VehicleComponentEnum,
+    PlayerState,
+    BATCH_FUNCTION_PATH,
+    get_builtin_path,
+    pack_component_reads,
+    unpack_players,
+    unpack_vehicle_positions,
+    unpack_vehicle_components
+)
+
+# // Main
+def test_builtin_path():
+    """
+    Tests if built-in functions resolve to their path in the in-game addon
+    """
+    
+    assert get_builtin_path(BuiltinEnum.GET_PLAYERS) == "SWToPython.Builtins.GetPlayers", "Built-in path is wrong"
+    assert get_builtin_path(BuiltinEnum.BATCH) == BATCH_FUNCTION_PATH, "Batch function should be a built-in"
+
+def test_unpack_players():
+    """
+    Tests if the flat array of players is unpacked into player states
+    """
+    
+    players = unpack_players([0, "host", False, False, False, 0, 1, "bob", 1.5, 2, -3.25, 12])
+    
+    assert players[0] == PlayerState(peer_id = 0, name = "host", position = None, vehicle_id = None), "Unreadable positions and no vehicle should be None"
+    assert players[1] == PlayerState(peer_id = 1, name = "bob", position = (1.5, 2, -3.25), vehicle_id = 12), "Player failed to unpack"
+    assert unpack_players({}) == [], "Empty arrays arrive as objects and should unpack to nothing"
+
+def test_unpack_vehicle_positions():
+    """
+    Tests if the flat array of vehicle positions is unpacked by vehicle ID
+    """
+    
+    assert unpack_vehicle_positions([4, 1, 2, 3, 9, 0, 0.5, 0]) == {4: (1, 2, 3), 9: (0, 0.5, 0)}, "Vehicle positions failed to unpack"
+
+def test_vehicle_components():
+    """
+    Tests if component reads are packed flat, and their values unpacked by vehicle ID
+    """
+    
+    reads = pack_component_reads([(VehicleComponentEnum.DIAL, "Speed"), (VehicleComponentEnum.BUTTON, "Lights")])
+    
+    assert reads == ["dial", "Speed", "button", "Lights"], "Reads should be packed as type and name pairs"
+    assert unpack_vehicle_components([10.5, True, False, False], [1, 2], 2) == {1: [10.5, True], 2: [False, False]}, "Values should be split by vehicle"
+    assert unpack_vehicle_components({}, [1], 0) == {1: []}, "No reads should unpack to empty lists"
+    assert unpack_vehicle_components({"1": 10.5, "2": True, "4": False}, [1, 2], 2) == {1: [10.5, True], 2: [None, False]}, "Failed reads should be None, apart from buttons that are off"
+    assert unpack_vehicle_components([10.5], [1, 2], 2) == {1: [10.5, None], 2: [None, None]}, "Failed reads at the end should be None"
@@ -0,0 +1,154 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+# // Imports
+import pytest
+
+from PythonToSW import (
+    CallCache,
+    CacheRule,
+    CallEnum,
+    CallbackEnum
+)
+
+# // Main
+class Clock():
+    """
+    A game tick clock that can be moved manually
+    """
+    
+    def __init__(self):
+        """
+        Initializes the clock at tick 0
+        """
+        
+        self.tick = 0
+        
+    def __call__(self) -> int|None:
+        """
+        Returns the current game tick
+        
+        Returns:
+            int|None: The game tick
+        """
+        
+        return self.tick
+
+@pytest.fixture(scope = "function")
+def clock() -> Clock:
+    """
+    Creates a Clock instance
+    
+    Returns:
+        Clock: The Clock instance
+    """
+    
+    return Clock()
+
+@pytest.fixture(scope = "function")
+def cache(clock: Clock) -> CallCache:
+    """
+    Creates a CallCache instance with a few rules
+    
+    Args:
+        clock (Clock): The Clock instance
+    
+    Returns:
+        CallCache: The CallCache instance
+    """
+    
+    return CallCache({
+        CallEnum.GET_ADDON_INDEX: CacheRule(),
+        CallEnum.GET_PLAYERS: CacheRule(ttl = 10, invalidate_on = {CallbackEnum.ON_PLAYER_JOIN: None}),
+        CallEnum.GET_VEHICLE_DATA: CacheRule(invalidate_on = {CallbackEnum.ON_VEHICLE_DESPAWN: 0})
+    }, clock)
+
+def test_hit_and_miss(cache: CallCache):
+    """
+    Tests if results are cached by function and arguments, and hits and misses are counted
+    
+    Args:
+        cache (CallCache): The CallCache instance
+    """
+    
+    assert cache.get(CallEnum.GET_ADDON_INDEX, ["a"]) is None, "Nothing should be cached yet"
+    
+    cache.put(CallEnum.GET_ADDON_INDEX, ["a"], (1, True), cache.generation(CallEnum.GET_ADDON_INDEX))
+    
+    assert cache.get(CallEnum.GET_ADDON_INDEX, ["a"]) == (1, True), "Result should be cached"
+    assert cache.get(CallEnum.GET_ADDON_INDEX, ["b"]) is None, "Results should be keyed by arguments"
+    assert cache.metrics.get("cache_hits") == 1, "Hits should be counted"
+    assert cache.metrics.get("cache_misses.getAddonIndex") == 2, "Misses should be counted per function"
+    assert not cache.is_cached(CallEnum.ANNOUNCE), "Functions without a rule should not be cached"
+
+def test_ttl(cache: CallCache, clock: Clock):
+    """
+    Tests if results expire after their TTL in game ticks, and when the game tick goes backwards
+    
+    Args:
+        cache (CallCache): The CallCache instance
+        clock (Clock): The Clock instance
+    """
+    
+    clock.tick = 100
+    cache.put(CallEnum.GET_PLAYERS, [], ([],), 0)
+    cache.put(CallEnum.GET_ADDON_INDEX, [], (1, True), 0)
+    
+    clock.tick = 109
+    assert cache.get(CallEnum.GET_PLAYERS, []) is not None, "Results should be kept until their TTL"
+    
+    clock.tick = 110
+    assert cache.get(CallEnum.GET_PLAYERS, []) is None, "Results should expire after their TTL"
+    assert cache.get(CallEnum.GET_ADDON_INDEX, []) is not None, "Results without a TTL should never expire"
+    
+    clock.tick = 5
+    assert cache.get(CallEnum.GET_ADDON_INDEX, []) is None, "Results from before the addon reloaded should be expired"
+    
+    clock.tick = None
+    cache.put(CallEnum.GET_ADDON_INDEX, [], (1, True), 0)
+    assert len(cache) == 0, "Nothing should be cached while the game tick is unknown"
+
+def test_invalidation(cache: CallCache):
+    """
+    Tests if game callbacks invalidate every result of a function, or only those with a matching argument
+    
+    Args:
+        cache (CallCache): The CallCache instance
+    """
+    
+    cache.put(CallEnum.GET_PLAYERS, [], ([],), 0)
+    cache.put(CallEnum.GET_VEHICLE_DATA, [1], ({},), 0)
+    cache.put(CallEnum.GET_VEHICLE_DATA, [2], ({},), 0)
+    
+    cache.on_callback(CallbackEnum.ON_VEHICLE_DESPAWN, [1, 0])
+    
+    assert cache.get(CallEnum.GET_VEHICLE_DATA, [1]) is None, "Results of the despawned vehicle should be invalidated"
+    assert cache.get(CallEnum.GET_VEHICLE_DATA, [2]) is not None, "Results of other vehicles should be kept"
+    
+    generation = cache.generation(CallEnum.GET_PLAYERS)
+    cache.on_callback(CallbackEnum.ON_PLAYER_JOIN, [0, "bob", 1, False, False])
+    
+    assert cache.get(CallEnum.GET_PLAYERS, []) is None, "Every result should be invalidated if no argument is matched"
+    
+    cache.put(CallEnum.GET_PLAYERS, [], ([],), generation)
+    assert cache.get(CallEnum.GET_PLAYERS, []) is None, "Results of calls made before an invalidation should not be stored"
+    assert set(cache.get_callbacks()) == {CallbackEnum.ON_PLAYER_JOIN, CallbackEnum.ON_VEHICLE_DESPAWN}, "Cache should listen for the callbacks in its rules"
@@ -0,0 +1,432 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+# // Imports
+import pytest
+import threading
+import time
+
+from PythonToSW import (
+    CallQueue,
+    CallBatch,
+    CallEnum,
+    CallPriorityEnum,
+    CallProgram,
+    BATCH_FUNCTION_PATH,
+    PROGRAM_FUNCTION_PATH
+)
+
+from PythonToSW.exceptions import PTSCallException
+from PythonToSW.calls import (
+    _set_result,
+    _set_exception
+)
+from concurrent.futures import Future
+
+# // Main
+@pytest.fixture(scope = "function")
+def queue() -> CallQueue:
+    """
+    Creates a CallQueue instance
+    
+    Returns:
+        CallQueue: The CallQueue instance
+    """
+    
+    return CallQueue()
+
+def test_create(queue: CallQueue):
+    """
+    Tests if created calls are given increasing IDs and can be looked up
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    first = queue.create("server.announce", ["a", "b"])
+    second = queue.create("server.getPlayers", [])
+    
+    assert second.id > first.id, "Call IDs should be increasing"
+    assert queue.get(first.id) is first, "Call should be retrievable by its ID"
+    assert first.id in queue, "Call ID should be in the queue"
+    assert len(queue) == 2, "Queue should contain two calls"
+
+def test_remove(queue: CallQueue):
+    """
+    Tests if calls can be removed from the queue, and only once
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    call = queue.create("server.announce", [])
+    
+    assert queue.remove(call), "Removing a queued call should return True"
+    assert not queue.remove(call), "Removing a call twice should return False"
+    assert queue.get(call.id) is None, "Removed call should not be retrievable"
+    assert queue.pop(call.id) is None, "Popping a removed call should return None"
+
+def test_after(queue: CallQueue):
+    """
+    Tests if only the calls after a watermark are returned, in order
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    calls = [queue.create("server.announce", [index]) for index in range(10)]
+    queue.remove(calls[7])
+    
+    after = queue.after(calls[4].id)
+    
+    assert after == [calls[5], calls[6], calls[8], calls[9]], "Calls after the watermark should be returned in order"
+    assert queue.after(calls[-1].id) == [], "No calls should be returned after the latest call"
+    assert queue.after(0) == [call for call in calls if call is not calls[7]], "All calls should be returned after 0"
+
+def test_concurrent_producers(queue: CallQueue):
+    """
+    Tests if calls created from many threads at once keep the queue ordered and complete
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    def produce():
+        for _ in range(1000):
+            queue.create("server.announce", [])
+    
+    threads = [threading.Thread(target = produce) for _ in range(8)]
+    
+    for thread in threads:
+        thread.start()
+    
+    for thread in threads:
+        thread.join()
+    
+    ids = [call.id for call in queue]
+    
+    assert len(ids) == 8000, "All created calls should be in the queue"
+    assert ids == sorted(ids), "Queue should be ordered by ID"
+
+    
+def test_batch(queue: CallQueue):
+    """
+    Tests if a batch adds all of its calls to the queue at once, with consecutive IDs
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    with CallBatch(queue) as batch:
+        first = batch.call(CallEnum.ANNOUNCE, "Title", "Message")
+        second = batch.call_function("foo.bar", 1)
+        
+        assert len(queue) == 0, "Calls should not be queued until the batch is flushed"
+        
+    calls = list(queue)
+    
+    assert [call.path for call in calls] == ["server.announce", "foo.bar"], "Batched calls should be queued in order"
+    assert calls[1].id == calls[0].id + 1, "Batched calls should have consecutive IDs"
+    
+    calls[1].future.set_result((5,))
+    assert second.result() == (5,), "Batch future should resolve with the call's result"
+    assert not first.done(), "Unresolved calls should not resolve other batch futures"
+    
+def test_batch_priority(queue: CallQueue):
+    """
+    Tests if a batch gives its priority to every call it queues
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    with CallBatch(queue, priority = CallPriorityEnum.HIGH) as batch:
+        batch.call(CallEnum.ANNOUNCE, "Title", "Message")
+        batch.call_function("foo.bar", 1)
+        
+    assert all(call.priority == CallPriorityEnum.HIGH for call in queue), "Batched calls should have the batch's priority"
+    
+def test_same_tick_batch(queue: CallQueue):
+    """
+    Tests if a same-tick batch is sent as one call, and its results are fanned out
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    with CallBatch(queue, same_tick = True) as batch:
+        first = batch.call(CallEnum.GET_PLAYERS)
+        second = batch.call_function("foo.bar", 1)
+        third = batch.call_function("foo.baz")
+        
+    calls = list(queue)
+    
+    assert len(calls) == 1, "A same-tick batch should be queued as one call"
+    assert calls[0].path == BATCH_FUNCTION_PATH, "A same-tick batch should call the in-game batch function"
+    assert calls[0].arguments == [[["server.getPlayers", []], ["foo.bar", [1]], ["foo.baz", []]]], "A same-tick batch should pass every call as an argument"
+    
+    calls[0].future.set_result(([[True, {}], [True, [1, 2]], [True, {"2": "b"}]],))
+    
+    assert first.result() == (), "Empty results should resolve to an empty tuple"
+    assert second.result() == (1, 2), "Results should be fanned out to each batch future"
+    assert third.result() == (None, "b"), "Results with nil holes should be converted back into a tuple"
+    
+def test_same_tick_batch_failure(queue: CallQueue):
+    """
+    Tests if a call failing in a same-tick batch only fails its own future
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    with CallBatch(queue, same_tick = True) as batch:
+        first = batch.call_function("foo.bar")
+        second = batch.call_function("foo.baz")
+        
+    list(queue)[0].future.set_result(([[False, "kaboom"], [True, [1]]],))
+    
+    with pytest.raises(PTSCallException, match = "kaboom"):
+        first.result()
+        
+    assert second.result() == (1,), "Calls after a failed one should still resolve"
+def test_program(queue: CallQueue):
+    """
+    Tests if a program is sent as one call with references to earlier steps, and only outputs are fanned out
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    with CallProgram(queue) as program:
+        vehicle = program.call(CallEnum.SPAWN_ADDON_VEHICLE, [1, 2], 0, 5)
+        keypad = program.call(CallEnum.SET_VEHICLE_KEYPAD, vehicle[0], "Code", 1234)
+        components = program.call(CallEnum.GET_VEHICLE_COMPONENTS, vehicle, vehicle[1]["transform"][13], output = True)
+        
+    calls = list(queue)
+    
+    assert len(calls) == 1, "A program should be queued as one call"
+    assert calls[0].path == PROGRAM_FUNCTION_PATH, "A program should call the in-game program function"
+    
+    steps, outputs = calls[0].arguments
+    
+    assert steps[1] == ["server.setVehicleKeypad", [{"$r": [0, 0]}, "Code", 1234]], "References should encode as step and return value indexes"
+    assert steps[2][1] == [{"$r": [0, 0]}, {"$r": [0, 1, "transform", 13]}], "Steps should refer to their first return value, and keys should be followed"
+    assert outputs == [2], "Only output steps should be requested"
+    
+    calls[0].future.set_result((True, [[{"id": 1}, True]]))
+    
+    assert components.future.result() == ({"id": 1}, True), "Outputs should be fanned out to their step"
+    assert keypad.future.result() == (), "Steps that aren't outputs should resolve to an empty tuple"
+    
+def test_program_cancelled_step(queue: CallQueue):
+    """
+    Tests if outputs still reach the right steps when an earlier output step was given up on
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    with CallProgram(queue) as program:
+        first = program.call_function("foo.bar", output = True)
+        second = program.call_function("foo.baz", output = True)
+        
+    first.future.cancel()
+    list(queue)[0].future.set_result((True, [[1], [2]]))
+    
+    assert second.future.result() == (2,), "Outputs of steps given up on should be skipped"
+
+def test_set_after_cancel():
+    """
+    Tests if setting the outcome of a future cancelled in the meantime is ignored instead of raising
+    """
+    
+    future = Future()
+    future.cancel()
+    
+    assert not _set_result(future, ()), "Results shouldn't be set on cancelled futures"
+    assert not _set_exception(future, PTSCallException("kaboom")), "Exceptions shouldn't be set on cancelled futures"
+    
+    future = Future()
+    
+    assert _set_result(future, (1,)), "Results should be set on pending futures"
+    assert future.result() == (1,), "The result should be set"
+
+def test_program_failure(queue: CallQueue):
+    """
+    Tests if a step failing in-game fails every step of the program, and references to other programs are rejected
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    program = CallProgram(queue)
+    step = program.call_function("foo.bar", output = True)
+    program.flush()
+    
+    list(queue)[0].future.set_result((False, 0, "kaboom"))
+    
+    with pytest.raises(PTSCallException, match = "kaboom"):
+        step.future.result()
+        
+    with pytest.raises(PTSCallException):
+        CallProgram(queue).call_function("foo.bar", step[0])
+
+def test_acknowledge(queue: CallQueue):
+    """
+    Tests if no_reply calls are removed once acknowledged, while other calls stay queued
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    first = queue.create("server.announce", [], no_reply = True)
+    second = queue.create("server.getPlayers", [])
+    third = queue.create("server.announce", [], no_reply = True)
+    
+    assert queue.acknowledge(second.id) == [first], "Only acknowledged no_reply calls should be removed"
+    assert second.id in queue, "Calls expecting a result should stay queued"
+    assert third.id in queue, "Unacknowledged no_reply calls should stay queued"
+    assert queue.acknowledge(second.id) == [], "Calls should only be acknowledged once"
+
+def test_expire():
+    """
+    Tests if sent calls are purged once past their deadline, and reported as cancelled
+    """
+    
+    queue = CallQueue(timeout = 5)
+    
+    sent = queue.create("server.announce", [])
+    queue.after(0)
+    unsent = queue.create("server.announce", [])
+    
+    assert queue.expire(sent.deadline - 1) == [], "Calls should not expire before their deadline"
+    assert queue.expire(sent.deadline) == [sent], "Sent calls should expire at their deadline"
+    assert unsent.id in queue, "Unsent calls should not expire"
+    assert queue.get_cancelled(0) == [sent.id], "Expired calls should be reported as cancelled"
+    assert queue.metrics.get("calls_expired") == 1, "Expired calls should be counted"
+
+def test_cancelled_resent():
+    """
+    Tests if cancelled calls are reported until the addon's watermark passes them, or for as long as calls can go unanswered
+    """
+    
+    queue = CallQueue(timeout = 5)
+    
+    first = queue.create("server.announce", [])
+    second = queue.create("server.announce", [])
+    queue.after(0)
+    
+    queue.cancel(first)
+    queue.cancel(second)
+    
+    assert queue.get_cancelled(0) == [first.id, second.id], "Cancelled calls should be reported"
+    assert queue.get_cancelled(0) == [first.id, second.id], "Cancelled calls should be reported again until the addon moves past them"
+    assert queue.get_cancelled(first.id) == [first.id, second.id], "Cancelled calls should be reported at least once after the addon moves past them"
+    assert queue.get_cancelled(first.id) == [second.id], "Cancelled calls should stop being reported once the addon has moved past them"
+    assert queue.get_cancelled(0, time.monotonic() + 5) == [second.id], "Cancelled calls should be reported at least once after they are forgotten"
+    assert queue.get_cancelled(0) == [], "Cancelled calls should be forgotten after being reported for as long as calls can go unanswered"
+
+def test_expire_scheduled():
+    """
+    Tests if scheduled calls have their deadline pushed back by how long they wait in-game
+    """
+    
+    queue = CallQueue(timeout = 5)
+    
+    call = queue.create("server.announce", [], delay = 600, schedule_seconds = 10)
+    queue.after(0)
+    
+    assert queue.expire(call.deadline - 10) == [], "Scheduled calls should not expire while waiting to be executed"
+    assert queue.expire(call.deadline) == [call], "Scheduled calls should expire once past their pushed back deadline"
+
+def test_cancel(queue: CallQueue):
+    """
+    Tests if cancelling a call's future removes it from the queue
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    call = queue.create("server.announce", [])
+    
+    assert queue.cancel(call), "Pending calls should be cancellable"
+    assert call.id not in queue, "Cancelled calls should be removed from the queue"
+    assert queue.get_cancelled(0) == [], "Unsent calls don't need to be reported as cancelled"
+    assert queue.metrics.get("calls_cancelled") == 1, "Cancelled calls should be counted"
+
+def test_shared_calls(queue: CallQueue):
+    """
+    Tests if identical read-only calls share one pending call and its result
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    first, first_future = queue.create_shared("server.getPlayers", [])
+    second, second_future = queue.create_shared("server.getPlayers", [])
+    other, _ = queue.create_shared("server.getVehicleData", [1])
+    
+    assert first is second, "Identical read-only calls should share one call"
+    assert other is not first, "Calls with different paths or arguments should not be shared"
+    assert len(queue) == 2, "Shared calls should only be queued once"
+    assert queue.metrics.get("calls_coalesced") == 1, "Coalesced calls should be counted"
+    
+    queue.remove(first)
+    first.future.set_result(([1, 2],))
+    
+    assert first_future.result() == ([1, 2],), "Every waiter should receive the result"
+    assert second_future.result() == ([1, 2],), "Every waiter should receive the result"
+    
+    third, _ = queue.create_shared("server.getPlayers", [])
+    assert third is not first, "Finished calls should not be shared"
+
+def test_shared_call_cancel(queue: CallQueue):
+    """
+    Tests if a shared call is only cancelled once every waiter gave up on it
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    call, first_future = queue.create_shared("server.getPlayers", [])
+    _, second_future = queue.create_shared("server.getPlayers", [])
+    
+    first_future.cancel()
+    assert call.id in queue and not call.future.cancelled(), "Shared calls should not be cancelled while someone is waiting on them"
+    
+    second_future.cancel()
+    assert call.id not in queue and call.future.cancelled(), "Shared calls should be cancelled once no one is waiting on them"
+
+def test_on_add(queue: CallQueue):
+    """
+    Tests if `on_add` is fired with the added calls
+    
+    Args:
+        queue (CallQueue): The CallQueue instance
+    """
+    
+    added = []
+    queue.on_add.subscribe(added.extend)
+    
+    call = queue.create("server.announce", [])
+    
+    assert added == [call], "on_add should be fired with the added calls"
@@ -21,8 +21,15 @@ limitations under the License.
 
 # // Imports
 import pytest
+import sys
+import asyncio
+import threading
+import time
 
-from PythonToSW import Event
+from PythonToSW import (
+    Event,
+    Dispatcher
+)
 
 # // Main
 @pytest.fixture(scope = "function")
@@ -73,6 +80,25 @@ def test_unsubscribe(event: Event):
     assert callback_1 not in event._callbacks, "Callback 1 should not be in event callbacks after unsubscribe (error with `.unsubscribe()` method)"
     assert callback_2 not in event._callbacks, "Callback 2 should not be in event callbacks after unsubscribe (error with `-=` operator)"
     
+def test_len(event: Event):
+    """
+    Tests if the length of an event is the amount of subscribed callbacks
+    
+    Args:
+        event (Event): The Event instance
+    """    
+    
+    callback = lambda: None
+    
+    assert len(event) == 0, "Event with no callbacks should have a length of 0"
+    
+    event += callback
+    assert len(event) == 1, "Event should have a length of 1 after subscribing"
+    
+    event -= callback
+    assert len(event) == 0, "Event should have a length of 0 after unsubscribing"
+    
+
 def test_fire(event: Event):
     """
     Tests if firing an event works
@@ -114,4 +140,146 @@ async def test_fire_async(event: Event):
 
     await event.fire_async()
     
-    assert count == 1, "Event should have been fired once, count is not 1"
\ No newline at end of file
+    assert count == 1, "Event should have been fired once, count is not 1"
+
+def test_partition(event: Event):
+    """
+    Tests if callbacks are sorted into sync and async ones as they subscribe and unsubscribe
+    
+    Args:
+        event (Event): The Event instance
+    """
+    
+    sync_callback = lambda: None
+    
+    async def async_callback():
+        pass
+    
+    event += sync_callback
+    event += async_callback
+    
+    assert event._sync_callbacks == (sync_callback,), "Sync callbacks should be sorted into the sync callbacks"
+    assert event._async_callbacks == (async_callback,), "Async callbacks should be sorted into the async callbacks"
+    
+    event -= async_callback
+    assert event._async_callbacks == (), "Unsubscribed callbacks should be removed from the sorted callbacks"
+
+@pytest.mark.asyncio
+async def test_fire_async_concurrent(monkeypatch: pytest.MonkeyPatch):
+    """
+    Tests if concurrent events run async callbacks at the same time, without one's exception stopping the others
+    
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Pytest's monkeypatch fixture
+    """
+    
+    reported = []
+    monkeypatch.setattr(sys, "excepthook", lambda *exc_info: reported.append(exc_info[1]))
+    
+    event = Event(concurrent = True)
+    steps = []
+    
+    async def first():
+        steps.append("first started")
+        await asyncio.sleep(0.01)
+        steps.append("first finished")
+    
+    async def fail():
+        raise RuntimeError("failed")
+    
+    async def second():
+        steps.append("second started")
+        await asyncio.sleep(0.01)
+        steps.append("second finished")
+    
+    event += first
+    event += fail
+    event += second
+    
+    await event.fire_async()
+    
+    assert steps[:2] == ["first started", "second started"], "Async callbacks should run at the same time"
+    assert sorted(steps[2:]) == ["first finished", "second finished"], "Every async callback should finish, even if another raised"
+    assert len(reported) == 1 and isinstance(reported[0], RuntimeError), "Exceptions should be reported instead of stopping the other callbacks"
+
+def wait_until(predicate, timeout: float = 2) -> bool:
+    """
+    Waits until a predicate is true, or the timeout passes
+    
+    Args:
+        predicate (Callable): The predicate
+        timeout (float, optional): How long to wait for, in seconds. Defaults to 2
+    
+    Returns:
+        bool: Whether or not the predicate became true
+    """
+    
+    deadline = time.monotonic() + timeout
+    
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+        
+    return predicate()
+
+def test_fire_threaded():
+    """
+    Tests if firing an event threaded calls its callbacks on a worker of its dispatcher
+    """
+    
+    event = Event(Dispatcher(max_workers = 1))
+    fired = threading.Event()
+    threads = []
+    
+    def callback(value):
+        threads.append(threading.current_thread())
+        fired.set()
+    
+    event += callback
+    event.fire_threaded(1)
+    
+    assert fired.wait(2), "Callback should have been fired"
+    assert threads[0] is not threading.current_thread(), "Callback should have been fired on another thread"
+
+def test_dispatcher_bounded():
+    """
+    Tests if the dispatcher never runs more than `max_workers` workers, and queues the rest
+    """
+    
+    dispatcher = Dispatcher(max_workers = 2)
+    release = threading.Event()
+    
+    for _ in range(10):
+        dispatcher.submit(release.wait)
+    
+    assert dispatcher.workers == 2, "Dispatcher should not start more workers than max_workers"
+    assert dispatcher.pending == 10, "Every submission should be pending while workers are busy"
+    
+    release.set()
+    
+    assert wait_until(lambda: dispatcher.pending == 0), "Queued submissions should be ran once workers are free"
+    
+    dispatcher.submit(lambda: None)
+    
+    assert wait_until(lambda: dispatcher.pending == 0), "Idle workers should pick up new submissions"
+    assert dispatcher.workers == 2, "Idle workers should be reused"
+
+def test_dispatcher_exception(monkeypatch: pytest.MonkeyPatch):
+    """
+    Tests if exceptions raised on a worker are reported without killing the worker
+    
+    Args:
+        monkeypatch (pytest.MonkeyPatch): Pytest's monkeypatch fixture
+    """
+    
+    reported = []
+    monkeypatch.setattr(sys, "excepthook", lambda *exc_info: reported.append(exc_info[1]))
+    
+    def fail():
+        raise RuntimeError("failed")
+    
+    dispatcher = Dispatcher(max_workers = 1)
+    dispatcher.submit(fail)
+    dispatcher.submit(lambda: None)
+    
+    assert wait_until(lambda: dispatcher.pending == 0), "Submissions after an exception should still be ran"
+    assert len(reported) == 1 and isinstance(reported[0], RuntimeError), "Exceptions should be reported through sys.excepthook"
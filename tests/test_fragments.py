@@ -0,0 +1,91 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+# // Imports
+import pytest
+
+from PythonToSW import FragmentAssembler
+
+# // Main
+@pytest.fixture(scope = "function")
+def assembler() -> FragmentAssembler:
+    """
+    Creates a FragmentAssembler instance
+    
+    Returns:
+        FragmentAssembler: The FragmentAssembler instance
+    """
+    
+    return FragmentAssembler()
+
+def test_reassemble(assembler: FragmentAssembler):
+    """
+    Tests if fragments received out of order are reassembled once all have arrived
+    
+    Args:
+        assembler (FragmentAssembler): The FragmentAssembler instance
+    """
+    
+    assert assembler.add(1, 2, 3, "c") == (0, None), "The first missing fragment should be needed next"
+    assert assembler.add(1, 0, 3, "a") == (1, None), "The first missing fragment should be needed next"
+    assert assembler.add(1, 1, 3, "b") == (3, "abc"), "Fragments should be joined in order once complete"
+    assert len(assembler) == 0, "Complete transfers should be forgotten"
+
+def test_resent_fragment(assembler: FragmentAssembler):
+    """
+    Tests if fragments resent after the transfer completed (the answer to the last fragment was lost) don't start it over
+    
+    Args:
+        assembler (FragmentAssembler): The FragmentAssembler instance
+    """
+    
+    assembler.add(1, 0, 2, "a")
+    
+    assert assembler.add(1, 1, 2, "b") == (2, "ab"), "Transfer should complete once every fragment has arrived"
+    assert assembler.add(1, 1, 2, "b") == (2, None), "Resent fragments of a completed transfer should be acknowledged without the payload"
+    assert assembler.add(1, 0, 2, "a") == (2, None), "Resent fragments of a completed transfer should be acknowledged without the payload"
+    assert len(assembler) == 0, "Resent fragments should not start a new transfer"
+
+def test_invalid_fragment(assembler: FragmentAssembler):
+    """
+    Tests if invalid fragments are rejected
+    
+    Args:
+        assembler (FragmentAssembler): The FragmentAssembler instance
+    """
+    
+    with pytest.raises(ValueError):
+        assembler.add(1, 3, 3, "a")
+        
+    with pytest.raises(ValueError):
+        assembler.add(1, 0, assembler.max_fragments + 1, "a")
+
+def test_timeout():
+    """
+    Tests if transfers that stop receiving fragments are discarded
+    """
+    
+    assembler = FragmentAssembler(timeout = -1)
+    assembler.add(1, 0, 2, "a")
+    
+    assert assembler.add(2, 0, 2, "a") == (1, None), "New transfers should be unaffected"
+    assert len(assembler) == 1, "Timed out transfers should be discarded"
@@ -0,0 +1,49 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+# // Imports
+from PythonToSW import PollScheduler
+
+# // Main
+def test_back_off_and_snap_back():
+    """
+    Tests if the poll interval backs off while idle and snaps back once there is work
+    """
+    
+    scheduler = PollScheduler(2, 16)
+    intervals = [scheduler.next_interval(0, 0) for _ in range(5)]
+    
+    assert intervals == [4, 8, 16, 16, 16], "Interval should double while idle, up to the maximum"
+    assert scheduler.next_interval(1, 0) == 2, "Pending calls should snap the interval back to the minimum"
+    
+    scheduler.next_interval(0, 0)
+    assert scheduler.next_interval(0, 3) == 2, "Callbacks should snap the interval back to the minimum"
+
+def test_recent_callbacks():
+    """
+    Tests if the poll interval doesn't back off right after a burst of callbacks
+    """
+    
+    scheduler = PollScheduler(2, 16)
+    scheduler.next_interval(0, 10)
+    
+    assert scheduler.next_interval(0, 0) == 2, "Interval should stay at the minimum while callbacks are recent"
@@ -0,0 +1,156 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+# // Imports
+import pytest
+from pydantic import ValidationError
+
+from PythonToSW import (
+    CallbackPolicy,
+    CallbackPolicyEnum,
+    CallbackFilter,
+    CallPriorityEnum,
+    Call,
+    HandledCall,
+    TriggeredCallback,
+    Subscriptions,
+    Watch,
+    Watches,
+    UpdateResponse,
+    Matrix
+)
+
+# // Main
+def test_encode_update():
+    """
+    Tests if updates are encoded as positional arrays with interned paths
+    """
+    
+    calls = [
+        Call(id = 1, path = "server.announce", arguments = ["a", Matrix(1, 2, 3)]),
+        Call(id = 2, path = "foo.bar", arguments = [], no_reply = True)
+    ]
+    
+    response = UpdateResponse(session = "abc", calls = calls, cancelled = [3])
+    compact = response.encode({"server.announce": 5})
+    
+    assert compact == {
+        "s": "abc",
+        "c": [[1, 5, ["a", Matrix(1, 2, 3).build()]], [2, "foo.bar", [], 1]],
+        "x": [3]
+    }, "Updates should use positional arrays and interned paths"
+    
+    
+    call = Call(id = 3, path = "foo.bar", arguments = [], priority = CallPriorityEnum.HIGH)
+    assert call.encode({}) == [3, "foo.bar", [], 0, 0], "Priority should be encoded after the no_reply flag"
+    
+    call = Call(id = 4, path = "foo.bar", arguments = [], delay = 30)
+    assert call.encode({}) == [4, "foo.bar", [], 0, 1, 30], "Delay should be encoded after the priority"
+    
+    call = Call(id = 5, path = "foo.bar", arguments = [], tick = 0)
+    assert call.encode({}) == [5, "foo.bar", [], 0, 1, 0, 0], "Target ticks should always be encoded, even tick 0"
+
+def test_encode_subscriptions():
+    """
+    Tests if subscriptions are only encoded when set
+    """
+    
+    response = UpdateResponse(session = "abc", calls = [])
+    assert "u" not in response.encode({}), "Subscriptions should be left out when the addon is up to date"
+    
+    response.subscriptions = Subscriptions(revision = 3, callbacks = ["onPlayerJoin"])
+    assert response.encode({})["u"] == [3, ["onPlayerJoin"], {}, {}], "Subscriptions should be a positional array"
+
+def test_decode_handled_call():
+    """
+    Tests if handled calls are decoded, with and without errors
+    """
+    
+    assert HandledCall.decode([4, [1, True]]) == HandledCall(id = 4, return_values = [1, True]), "Handled call failed to decode"
+    assert HandledCall.decode([4, {}]).return_values == [], "Empty Lua arrays should decode to an empty list"
+    assert HandledCall.decode([4, {}, "oops"]).error == "oops", "Handled call error failed to decode"
+
+def test_decode_triggered_callback():
+    """
+    Tests if triggered callbacks are decoded, with interned names
+    """
+    
+    callbacks = ["onCreate", "onPlayerJoin"]
+    
+    assert TriggeredCallback.decode(["onCreate", {}], callbacks) == TriggeredCallback(name = "onCreate", arguments = []), "Triggered callback failed to decode"
+    assert TriggeredCallback.decode([2, [1, "bob"]], callbacks).name == "onPlayerJoin", "Interned callback name failed to decode"
+    assert TriggeredCallback.decode(["onTick", {"2": 5}], callbacks) == TriggeredCallback(name = "onTick", arguments = [None, 5]), "Lua arrays with holes should keep their positions"
+
+def test_callback_policy():
+    """
+    Tests if callback policies are built, validated and encoded correctly
+    """
+    
+    policy = CallbackPolicy.aggregate(key = [0], sum = [1])
+    
+    assert policy.mode == CallbackPolicyEnum.AGGREGATE, "Aggregate policy has the wrong mode"
+    assert policy.encode() == ["aggregate", [0], [1], 1], "Policy should encode as a positional array"
+    assert CallbackPolicy.keep_all().mode == CallbackPolicyEnum.KEEP_ALL, "Default policy should keep all triggers"
+    
+    subscriptions = Subscriptions(revision = 1, callbacks = ["onVehicleLoad"], policies = {"onVehicleLoad": CallbackPolicy.sample(10)})
+    assert subscriptions.encode()[2] == {"onVehicleLoad": ["sample", [], [], 10]}, "Policies should be positional arrays"
+    
+    with pytest.raises(ValidationError):
+        CallbackPolicy.sample(0)
+        
+    with pytest.raises(ValidationError):
+        CallbackPolicy.latest(-1)
+
+def test_callback_filter():
+    """
+    Tests if callback filters match arguments and encode correctly
+    """
+    
+    callback_filter = CallbackFilter.prefix(0, "?") & CallbackFilter.one_of(1, [1, 2])
+    
+    assert callback_filter.matches(["?help", 1]), "Arguments passing every condition should match"
+    assert not callback_filter.matches(["help", 1]), "Argument without the prefix should not match"
+    assert not callback_filter.matches(["?help", 3]), "Argument not in the set should not match"
+    assert not callback_filter.matches(["?help"]), "Missing arguments should not match"
+    assert not CallbackFilter.prefix(0, "?").matches([5]), "Non-string arguments should not match a prefix"
+    assert CallbackFilter.equals(0, 5).matches([5]), "Equal argument should match"
+    
+    assert callback_filter.encode() == [[0, "prefix", "?"], [1, "in", [1, 2]]], "Filter should encode as positional conditions"
+
+def test_encode_watches():
+    """
+    Tests if watches are encoded with interned paths, and only sent when set
+    """
+    
+    watch = Watch(id = 1, path = "server.getVehiclePos", arguments = [5, Matrix(1, 2, 3)], period = 10)
+    watches = Watches(revision = 2, watches = [watch])
+    
+    assert watches.encode({"server.getVehiclePos": 4}) == [2, [[1, 4, [5, Matrix(1, 2, 3).build()], 10]]], "Watches should be positional arrays with interned paths"
+    assert watches.encode({})[1][0][1] == "server.getVehiclePos", "Paths that aren't interned should be sent as-is"
+    assert len(watches.encode({})[1][0]) == 4, "Sample state should not be sent to the addon"
+    
+    response = UpdateResponse(session = "abc", calls = [], watches = watches)
+    assert response.encode({})["w"][0] == 2, "Watches should be sent under `w`"
+    assert "w" not in UpdateResponse(session = "abc", calls = []).encode({}), "Watches should be left out when the addon is up to date"
+    
+    with pytest.raises(ValidationError):
+        Watch(id = 1, path = "foo", arguments = [], period = 0)
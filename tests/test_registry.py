@@ -0,0 +1,108 @@
+"""
+----------------------------------------------
+PythonToSW: A Python package that allows you to make Stormworks addons with Python.
+https://github.com/Cuh4/PythonToSW
+----------------------------------------------
+
+Copyright (C) 2025 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+
+
+# // Imports
+import pytest
+
+from PythonToSW import (
+    EntityRegistry,
+    CallbackEnum
+)
+
+# // Main
+@pytest.fixture(scope = "function")
+def registry() -> EntityRegistry:
+    """
+    Creates an EntityRegistry instance with a snapshot of one player, two vehicles and an object
+    
+    Returns:
+        EntityRegistry: The EntityRegistry instance
+    """
+    
+    registry = EntityRegistry()
+    
+    registry.begin_snapshot()
+    registry.apply_snapshot([
+        [0, "Host", "76561198000000000", True, True],
+        [10, 5, 0, True, 11, -1, -1, False],
+        [20]
+    ])
+    
+    return registry
+
+def test_snapshot(registry: EntityRegistry):
+    """
+    Tests if snapshots fill the registry
+    
+    Args:
+        registry (EntityRegistry): The EntityRegistry instance
+    """
+    
+    assert registry.synced, "Registry should be synced once a snapshot is applied"
+    assert registry.get_player(0).name == "Host", "Players should be looked up by peer ID"
+    assert registry.get_vehicle(10).owner == 0 and registry.get_vehicle(10).group_id == 5, "Vehicles should be looked up by vehicle ID"
+    assert registry.get_vehicle(11).owner is None, "Vehicles without an owner should have None as their owner"
+    assert [vehicle.vehicle_id for vehicle in registry.get_vehicles(owner = 0)] == [10], "Vehicles should be filterable by owner"
+    assert registry.is_object_loaded(20), "Loaded objects should be tracked"
+
+def test_callbacks(registry: EntityRegistry):
+    """
+    Tests if game callbacks keep the registry up to date
+    
+    Args:
+        registry (EntityRegistry): The EntityRegistry instance
+    """
+    
+    registry.on_callback(CallbackEnum.ON_PLAYER_JOIN, [76561198000000001, "Player", 1, False, True])
+    registry.on_callback(CallbackEnum.ON_PLAYER_LEAVE, ["76561198000000000", "Host", 0, True, True])
+    registry.on_callback(CallbackEnum.ON_VEHICLE_SPAWN, [12, 1, 0, 0, 0, 100, 6])
+    registry.on_callback(CallbackEnum.ON_VEHICLE_LOAD, [12])
+    registry.on_callback(CallbackEnum.ON_VEHICLE_DESPAWN, [10, 0])
+    registry.on_callback(CallbackEnum.ON_OBJECT_UNLOAD, [20])
+    
+    assert registry.get_player(1).steam_id == "76561198000000001", "Joined players should be added"
+    assert registry.get_player(0) is None, "Players that left should be removed"
+    assert registry.get_vehicle(12).loaded and registry.get_vehicle(12).group_id == 6, "Spawned vehicles should be added and loaded"
+    assert registry.get_vehicle(10) is None, "Despawned vehicles should be removed"
+    assert not registry.is_object_loaded(20), "Unloaded objects should be removed"
+
+def test_pending_snapshot():
+    """
+    Tests if callbacks that arrive while a snapshot is pending are applied on top of it
+    """
+    
+    registry = EntityRegistry()
+    
+    assert registry.begin_snapshot(), "Snapshot should begin"
+    assert not registry.begin_snapshot(), "Only one snapshot should be pending at once"
+    
+    registry.on_callback(CallbackEnum.ON_PLAYER_LEAVE, ["1", "Player", 1, False, True])
+    registry.on_callback(CallbackEnum.ON_VEHICLE_SPAWN, [12, -1, 0, 0, 0, 100, 6])
+    
+    assert registry.get_vehicle(12) is None, "Callbacks should be held back while a snapshot is pending"
+    
+    registry.apply_snapshot([[1, "Player", "1", False, True], {}, {}])
+    
+    assert registry.get_player(1) is None, "Held back callbacks should be applied on top of the snapshot"
+    assert registry.get_vehicle(12) is not None, "Held back callbacks should be applied on top of the snapshot"
+    assert registry.begin_snapshot(), "A new snapshot should begin once the last one was applied"
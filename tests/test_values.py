@@ -35,7 +35,7 @@ def _test_value(value: PythonToSW.BaseValue):
     """
     
     call = PythonToSW.Call(
-        id = "test",
+        id = 1,
         path = f"server.{PythonToSW.CallEnum.ADD_ADMIN}",
         arguments = [value],
         future = Future()